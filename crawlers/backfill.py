@@ -0,0 +1,327 @@
+"""
+대용량 과거 공고 backfill (긴 기간을 날짜 구간으로 나눠 크롤링)
+
+KEPCO 검색 결과 그리드는 1페이지(50행)만 파싱하므로 구간이 넓으면 결과가 잘림
+- 적응형 구간: 결과가 상한에 닿으면 구간을 반으로 줄여 다시 검색, 결과가 적으면 다음 구간을 2배로 확대
+- 동시 실행: 키워드 × 기간 조각(segment_days)을 병렬로 진행, 검색 동시 실행 수는 concurrency로 제한
+- checkpoint: 구간 완료마다 JSON 저장, 같은 backfill_id로 재실행 시 완료 구간은 건너뜀
+- coverage: 키워드별 완료 일수 / 누락 구간(gaps) / 1일 구간에서도 상한 도달(saturated) / 실패 구간
+
+사용법:
+    python -m kepco.crawler backfill -k 유연탄 --start 2022-01-01 --end 2024-12-31
+    python -m kepco.crawler backfill --resume <backfill_id>
+
+    POST /backfill {"keywords": ["유연탄"], "start_date": "2022-01-01"} → GET /backfill/{id}
+"""
+import os
+import re
+import json
+import uuid
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# kepco.crawler GRID_ROW_CAP (그리드 1페이지 행 수)
+DEFAULT_RESULT_CAP = 50
+BACKFILL_DIR = os.getenv("BACKFILL_DIR", os.path.join("data", "backfill"))
+
+DONE, SATURATED, FAILED = "done", "saturated", "failed"
+
+# (keyword, 시작일, 종료일) → 검색 결과 수
+Fetcher = Callable[[str, date, date], Awaitable[int]]
+
+
+@dataclass(slots=True)
+class BackfillWindow:
+    keyword: str
+    start: date
+    end: date
+    count: int = 0
+    status: str = DONE
+    error: Optional[str] = None
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "start": self.start.isoformat(), "end": self.end.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BackfillWindow":
+        return cls(
+            keyword=data["keyword"],
+            start=date.fromisoformat(data["start"]),
+            end=date.fromisoformat(data["end"]),
+            count=data.get("count", 0),
+            status=data.get("status", DONE),
+            error=data.get("error"),
+        )
+
+
+def find_gaps(start: date, end: date, windows: Iterable[BackfillWindow]) -> List[Tuple[date, date]]:
+    """[start, end] 중 windows가 덮지 않는 구간"""
+    gaps = []
+    cursor = start
+    for window in sorted(windows, key=lambda w: w.start):
+        if window.end < cursor:
+            continue
+        if window.start > end:
+            break
+        if window.start > cursor:
+            gaps.append((cursor, window.start - timedelta(days=1)))
+        cursor = window.end + timedelta(days=1)
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def split_range(start: date, end: date, segment_days: int) -> List[Tuple[date, date]]:
+    segments = []
+    cursor = start
+    while cursor <= end:
+        segment_end = min(end, cursor + timedelta(days=segment_days - 1))
+        segments.append((cursor, segment_end))
+        cursor = segment_end + timedelta(days=1)
+    return segments
+
+
+class Backfill:
+    """
+    keywords × [start, end] backfill 1회 실행 (checkpoint_path 지정 시 재개 가능)
+    fetch는 구간 1개를 크롤링·저장하고 결과 수를 반환 (kepco_fetcher)
+    """
+
+    def __init__(
+        self,
+        fetch: Fetcher,
+        keywords: List[str],
+        start: date,
+        end: date,
+        backfill_id: Optional[str] = None,
+        source: str = "KEPCO",
+        result_cap: int = DEFAULT_RESULT_CAP,
+        initial_days: int = 14,
+        max_days: int = 90,
+        segment_days: int = 180,
+        concurrency: int = 2,
+        retries: int = 1,
+        retry_seconds: float = 5.0,
+        checkpoint_path: Optional[str] = None,
+    ):
+        if start > end:
+            raise ValueError(f"start {start} is after end {end}")
+        if not keywords:
+            raise ValueError("keywords required")
+        if not 1 <= initial_days <= max_days:
+            raise ValueError("initial_days must be between 1 and max_days")
+        self.fetch = fetch
+        self.keywords = list(keywords)
+        self.start = start
+        self.end = end
+        self.id = backfill_id or uuid.uuid4().hex[:12]
+        self.source = source
+        self.result_cap = result_cap
+        self.initial_days = initial_days
+        self.max_days = max_days
+        self.segment_days = max(segment_days, 1)
+        self.concurrency = max(concurrency, 1)
+        self.retries = retries
+        self.retry_seconds = retry_seconds
+        self.checkpoint_path = checkpoint_path
+        self.windows: List[BackfillWindow] = []
+        self.status = "pending"
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # -------------------------------------------------
+    # checkpoint
+    # -------------------------------------------------
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "source": self.source,
+            "keywords": self.keywords,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "result_cap": self.result_cap,
+            "initial_days": self.initial_days,
+            "max_days": self.max_days,
+            "segment_days": self.segment_days,
+            "concurrency": self.concurrency,
+        }
+
+    def save(self):
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        tmp = f"{self.checkpoint_path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    **self._params(),
+                    "status": self.status,
+                    "updated_at": datetime.now().isoformat(),
+                    "windows": [w.to_dict() for w in self.windows],
+                }, f, ensure_ascii=False)
+            os.replace(tmp, self.checkpoint_path)
+        except OSError as e:
+            logger.warning(f"Backfill checkpoint not saved ({self.checkpoint_path}): {e}")
+
+    @classmethod
+    def resume(cls, checkpoint_path: str, fetch: Fetcher, **overrides) -> "Backfill":
+        """checkpoint의 완료 구간은 유지, 실패 구간은 다시 시도"""
+        with open(checkpoint_path, encoding="utf-8") as f:
+            data = json.load(f)
+        params = {
+            "backfill_id": data["id"],
+            "source": data.get("source", "KEPCO"),
+            "keywords": data["keywords"],
+            "start": date.fromisoformat(data["start"]),
+            "end": date.fromisoformat(data["end"]),
+            **{key: data[key] for key in ("result_cap", "initial_days", "max_days", "segment_days", "concurrency") if key in data},
+        }
+        params.update({key: value for key, value in overrides.items() if value is not None})
+        backfill = cls(fetch, checkpoint_path=checkpoint_path, **params)
+        backfill.windows = [
+            window for window in map(BackfillWindow.from_dict, data.get("windows", []))
+            if window.status != FAILED
+        ]
+        return backfill
+
+    # -------------------------------------------------
+    # 실행
+    # -------------------------------------------------
+
+    def plan(self) -> List[Tuple[str, date, date]]:
+        """완료되지 않은 구간 → (keyword, 조각 시작, 조각 끝), 최근 조각부터"""
+        segments = []
+        for keyword in self.keywords:
+            covered = [w for w in self.windows if w.keyword == keyword and w.status != FAILED]
+            for gap_start, gap_end in find_gaps(self.start, self.end, covered):
+                segments.extend((keyword, s, e) for s, e in split_range(gap_start, gap_end, self.segment_days))
+        return sorted(segments, key=lambda segment: segment[2], reverse=True)
+
+    def _record(self, window: BackfillWindow):
+        self.windows.append(window)
+        self.save()
+
+    async def _fetch(self, keyword: str, start: date, end: date) -> int:
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    return await self.fetch(keyword, start, end)
+                except Exception as e:
+                    if attempt == self.retries:
+                        raise
+                    logger.warning(f"Backfill '{keyword}' {start}~{end} failed ({e}), retrying")
+                    await asyncio.sleep(self.retry_seconds * (attempt + 1))
+
+    async def _walk(self, keyword: str, segment_start: date, segment_end: date):
+        """조각을 최근 날짜부터 거꾸로 진행, 상한 도달 시 구간 축소 / 결과가 적으면 확대"""
+        cursor = segment_end
+        size = self.initial_days
+        while cursor >= segment_start:
+            window_start = max(segment_start, cursor - timedelta(days=size - 1))
+            days = (cursor - window_start).days + 1
+            try:
+                count = await self._fetch(keyword, window_start, cursor)
+            except Exception as e:
+                logger.error(f"Backfill '{keyword}' {window_start}~{cursor} failed: {e}")
+                self._record(BackfillWindow(keyword, window_start, cursor, status=FAILED, error=f"{type(e).__name__}: {e}"))
+                cursor = window_start - timedelta(days=1)
+                continue
+
+            if count >= self.result_cap and days > 1:
+                # 잘렸을 수 있음 → 같은 끝 날짜에서 절반 구간으로 다시 (이미 저장된 공고는 upsert로 중복 없음)
+                size = max(1, days // 2)
+                continue
+
+            status = SATURATED if count >= self.result_cap else DONE
+            if status == SATURATED:
+                logger.warning(f"Backfill '{keyword}' {cursor}: {count} results in a single day, grid cap reached")
+            self._record(BackfillWindow(keyword, window_start, cursor, count=count, status=status))
+            cursor = window_start - timedelta(days=1)
+            if count < self.result_cap // 4:
+                size = min(self.max_days, days * 2)
+            elif count >= self.result_cap // 2:
+                size = max(1, days // 2)
+
+    async def run(self) -> Dict[str, Any]:
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.status = "running"
+        self.started_at = datetime.now()
+        segments = self.plan()
+        logger.info(f"Backfill {self.id}: {len(segments)} segments, {self.start} ~ {self.end}, keywords={self.keywords}")
+        self.save()
+        try:
+            await asyncio.gather(*(self._walk(*segment) for segment in segments))
+        except BaseException:
+            self.status = "interrupted"
+            raise
+        else:
+            self.status = "incomplete" if any(w.status == FAILED for w in self.windows) else "completed"
+        finally:
+            self.finished_at = datetime.now()
+            self.save()
+        return self.report()
+
+    # -------------------------------------------------
+    # coverage
+    # -------------------------------------------------
+
+    def report(self) -> Dict[str, Any]:
+        total_days = (self.end - self.start).days + 1
+        keywords = {}
+        for keyword in self.keywords:
+            windows = [w for w in self.windows if w.keyword == keyword]
+            covered = [w for w in windows if w.status != FAILED]
+            gaps = find_gaps(self.start, self.end, covered)
+            missing = sum((e - s).days + 1 for s, e in gaps)
+            keywords[keyword] = {
+                "covered_days": total_days - missing,
+                "total_days": total_days,
+                "coverage": round((total_days - missing) / total_days, 4),
+                "windows": len(covered),
+                "results": sum(w.count for w in covered),
+                "gaps": [{"start": s.isoformat(), "end": e.isoformat()} for s, e in gaps],
+                "saturated": [w.start.isoformat() for w in covered if w.status == SATURATED],
+                "failed": [w.to_dict() for w in windows if w.status == FAILED],
+            }
+        return {
+            **self._params(),
+            "status": self.status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "coverage": round(sum(k["covered_days"] for k in keywords.values()) / (total_days * len(keywords)), 4),
+            "results": sum(k["results"] for k in keywords.values()),
+            "keywords": keywords,
+        }
+
+
+def checkpoint_path_for(backfill_id: str, directory: str = BACKFILL_DIR) -> str:
+    """id(uuid hex)만 허용 → 외부 입력으로 directory 밖 경로를 읽거나 덮어쓰지 않음"""
+    if not re.fullmatch(r"[0-9a-f]+", backfill_id or ""):
+        raise ValueError(f"Invalid backfill id: {backfill_id!r}")
+    return os.path.join(directory, f"{backfill_id}.json")
+
+
+def kepco_fetcher(crawler) -> Fetcher:
+    """구간 1개 = KEPCO 키워드 1개 검색 (결과는 crawler.repo로 저장, 검색 / 날짜 필터 실패는 예외 → 구간 FAILED)"""
+    try:
+        from kepco.crawler import SearchConfig
+    except ImportError:
+        from crawlers.kepco.crawler import SearchConfig
+
+    async def fetch(keyword: str, start: date, end: date) -> int:
+        config = SearchConfig(keywords=[keyword], start_date=start.strftime("%Y/%m/%d"), end_date=end.strftime("%Y/%m/%d"),
+                              strict=True)
+        return len(await crawler.search(config))
+
+    return fetch
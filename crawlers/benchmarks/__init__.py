@@ -0,0 +1,9 @@
+"""
+CarbonFlow 오프라인 벤치마크
+- SRM 페이지/XHR 리플레이 (Playwright route)
+- 합성 HWP/HWPX 코퍼스
+- Fake Supabase 클라이언트
+
+실행:
+    cd crawlers && python -m benchmarks.run --output bench.json
+"""
@@ -0,0 +1,101 @@
+"""
+Fake Supabase 클라이언트
+SupabaseRepository가 사용하는 PostgREST 쿼리 빌더 부분집합을 메모리에서 흉내냄
+(table → select/eq/upsert/insert → execute)
+"""
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FakeResponse:
+    data: List[Dict[str, Any]]
+
+
+class FakeQuery:
+    """단일 테이블 쿼리 빌더"""
+
+    def __init__(self, client: "FakeSupabaseClient", table: str):
+        self.client = client
+        self.table = table
+        self._op = "select"
+        self._filters: List[tuple] = []
+        self._payload: Any = None
+        self._on_conflict: Optional[List[str]] = None
+
+    def select(self, columns: str = "*") -> "FakeQuery":
+        self._op = "select"
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        self._filters.append((column, value))
+        return self
+
+    def upsert(self, data: Any, on_conflict: str = "", **kwargs) -> "FakeQuery":
+        self._op = "upsert"
+        self._payload = data
+        self._on_conflict = [c.strip() for c in on_conflict.split(",") if c.strip()] or None
+        return self
+
+    def insert(self, data: Any, **kwargs) -> "FakeQuery":
+        self._op = "insert"
+        self._payload = data
+        return self
+
+    def execute(self) -> FakeResponse:
+        self.client.calls[(self.table, self._op)] += 1
+        rows = self.client.tables.setdefault(self.table, {})
+
+        if self._op == "select":
+            matched = [
+                dict(row) for row in rows.values()
+                if all(row.get(col) == val for col, val in self._filters)
+            ]
+            return FakeResponse(matched)
+
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        written = [self._write(rows, dict(item)) for item in payload]
+        return FakeResponse(written)
+
+    def _write(self, rows: Dict[str, Dict[str, Any]], item: Dict[str, Any]) -> Dict[str, Any]:
+        row_id = item.get("id")
+        if self._op == "upsert" and not row_id and self._on_conflict:
+            index = self.client.conflict_index(self.table, tuple(self._on_conflict))
+            row_id = index.get(tuple(item.get(col) for col in self._on_conflict))
+
+        if row_id and row_id in rows:
+            rows[row_id].update(item)
+        else:
+            row_id = row_id or str(uuid.uuid4())
+            rows[row_id] = {**item, "id": row_id}
+
+        row = rows[row_id]
+        for (table, columns), index in self.client.indexes.items():
+            if table == self.table:
+                index[tuple(row.get(col) for col in columns)] = row_id
+        return dict(row)
+
+
+class FakeSupabaseClient:
+    """메모리 기반 Supabase 클라이언트 대체 (호출 횟수 집계 포함)"""
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.calls: Counter = Counter()
+        # (table, on_conflict 컬럼) → {키: row id}  (upsert 충돌 검사 O(1))
+        self.indexes: Dict[tuple, Dict[tuple, str]] = {}
+
+    def conflict_index(self, table: str, columns: tuple) -> Dict[tuple, str]:
+        index = self.indexes.get((table, columns))
+        if index is None:
+            index = {
+                tuple(row.get(col) for col in columns): row_id
+                for row_id, row in self.tables.get(table, {}).items()
+            }
+            self.indexes[(table, columns)] = index
+        return index
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
@@ -0,0 +1,90 @@
+"""
+합성 HWP/HWPX 코퍼스 생성기
+- .hwp  : HWP5 시그니처 + UTF-16LE 본문 (파서 fallback 추출 경로와 동일한 형태)
+- .hwpx : OWPML zip 패키지 (Contents/section0.xml)
+크기별(목표 바이트) 문서를 결정적으로 생성하여 파싱 처리량 측정에 사용
+"""
+import os
+import random
+import zipfile
+from typing import List
+from xml.sax.saxutils import escape
+
+# HWP 5.0 파일 헤더 시그니처 (32바이트, NUL 패딩)
+HWP_SIGNATURE = b"HWP Document File".ljust(32, b"\x00")
+
+SPEC_BLOCK = """[규 격 서]
+1. 품명 : 발전용 유연탄 (Bituminous Coal)
+2. 발열량 (NAR) : {cv:,} kcal/kg 이상
+3. 유황분 (Total Sulfur) : {sulfur:.1f} % 이하
+4. 회분 (Ash) : {ash:.1f} % 이하
+5. 수분 (Total Moisture) : {moisture:.1f}% 이하
+6. 물량 : {qty:,} MT
+7. 인도조건 : CIF 당진항
+"""
+
+FILLER_LINES = [
+    "입찰참가자격은 국가종합전자조달시스템 입찰참가자격등록규정에 따라 등록한 자로 한다.",
+    "낙찰자 결정방법은 최저가 낙찰제로 하며 예정가격 이하로 입찰한 자 중 최저가격 입찰자를 낙찰자로 한다.",
+    "선적 전 검사(Pre-shipment Inspection)는 국제 공인 검정기관의 분석 결과를 기준으로 한다.",
+    "본 공고에 명시되지 않은 사항은 계약상대자와 협의하여 정한다.",
+    "The supplier shall provide the certificate of origin and the certificate of quality.",
+]
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def build_text(target_bytes: int, seed: int = 0) -> str:
+    """규격 블록 + 일반 공고문 문장으로 목표 크기(UTF-16 기준)의 본문 생성"""
+    rng = random.Random(seed)
+    parts = [SPEC_BLOCK.format(
+        cv=rng.choice([5400, 5600, 5800, 6000, 6300]),
+        sulfur=rng.uniform(0.4, 1.0),
+        ash=rng.uniform(8.0, 15.0),
+        moisture=rng.uniform(10.0, 18.0),
+        qty=rng.choice([50_000, 75_000, 150_000]),
+    )]
+    size = len(parts[0]) * 2
+    while size < target_bytes:
+        line = rng.choice(FILLER_LINES)
+        parts.append(line)
+        size += (len(line) + 1) * 2
+    return "\n".join(parts)
+
+
+def write_hwp(path: str, text: str):
+    """HWP5 시그니처 + UTF-16LE 본문"""
+    with open(path, "wb") as f:
+        f.write(HWP_SIGNATURE)
+        f.write(text.encode("utf-16-le"))
+
+
+def write_hwpx(path: str, text: str):
+    """OWPML 최소 패키지 (mimetype + section0.xml)"""
+    paragraphs = "".join(
+        f"<hp:p><hp:run><hp:t>{escape(line)}</hp:t></hp:run></hp:p>"
+        for line in text.splitlines()
+    )
+    section = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<hs:sec xmlns:hs="http://www.hancom.co.kr/hwpml/2011/section" '
+        'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">'
+        f"{paragraphs}</hs:sec>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("mimetype", "application/hwp+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("Contents/section0.xml", section)
+
+
+def generate_corpus(out_dir: str, sizes: List[int] = None, copies: int = 3) -> List[str]:
+    """크기별로 .hwp/.hwpx 문서를 copies개씩 생성하고 경로 목록 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for size in sizes or DEFAULT_SIZES:
+        for i in range(copies):
+            text = build_text(size, seed=size + i)
+            for ext, writer in ((".hwp", write_hwp), (".hwpx", write_hwpx)):
+                path = os.path.join(out_dir, f"spec_{size}_{i}{ext}")
+                writer(path, text)
+                paths.append(path)
+    return paths
@@ -0,0 +1,316 @@
+"""
+CarbonFlow 벤치마크 실행기
+결과를 JSON으로 출력하여 커밋 간 회귀 비교에 사용
+
+사용법:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output bench.json --compare baseline.json
+    python -m benchmarks.run --skip-browser --recordings benchmarks/recordings
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+try:
+    from crawlers.dto import TenderDTO, TenderSource, TenderSpecDTO
+    from crawlers.repository import BaseRepository, SupabaseRepository
+    from crawlers.memory_repository import InMemoryRepository
+    from crawlers.parsers.factory import ParserFactory
+    from crawlers.kepco.crawler import SearchConfig
+    from crawlers.netback import NetbackEngine, ScenarioGrid, MarketCalibration, MonteCarloSimulator
+    from crawlers.kepco.parser import HWPParser as LegacyHWPParser
+    from crawlers.benchmarks.fake_supabase import FakeSupabaseClient
+    from crawlers.benchmarks.hwp_corpus import generate_corpus, build_text, DEFAULT_SIZES
+    from crawlers.benchmarks.srm_replay import ReplayKEPCOCrawler
+except ImportError:
+    from dto import TenderDTO, TenderSource, TenderSpecDTO
+    from repository import BaseRepository, SupabaseRepository
+    from memory_repository import InMemoryRepository
+    from parsers.factory import ParserFactory
+    from kepco.crawler import SearchConfig
+    from netback import NetbackEngine, ScenarioGrid, MarketCalibration, MonteCarloSimulator
+    from kepco.parser import HWPParser as LegacyHWPParser
+    from benchmarks.fake_supabase import FakeSupabaseClient
+    from benchmarks.hwp_corpus import generate_corpus, build_text, DEFAULT_SIZES
+    from benchmarks.srm_replay import ReplayKEPCOCrawler
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """func를 repeat회 실행한 소요 시간 통계 (초)"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "repeat": repeat,
+    }
+
+
+def make_repository() -> BaseRepository:
+    """
+    BENCH_SUPABASE_URL이 있으면 로컬 PostgREST,
+    BENCH_REPOSITORY=memory면 InMemoryRepository, 그 외 Fake 클라이언트
+    """
+    url = os.getenv("BENCH_SUPABASE_URL")
+    key = os.getenv("BENCH_SUPABASE_KEY", "")
+    if url:
+        return SupabaseRepository(url, key)
+    if os.getenv("BENCH_REPOSITORY") == "memory":
+        return InMemoryRepository()
+    return SupabaseRepository("", "", client=FakeSupabaseClient())
+
+
+def _sample_tenders(count: int) -> List[TenderDTO]:
+    return [
+        TenderDTO(
+            bid_ntce_no=f"BENCH-{i:07d}",
+            bid_ntce_ord="00",
+            source=TenderSource.KEPCO,
+            bid_ntce_nm=f"발전용 유연탄 구매 입찰 {i}",
+            dminstt_nm="한국남동발전",
+            bid_clse_dt=datetime(2024, 1, 1, 10, 0),
+            raw_api_response={"announcement_no": f"BENCH-{i:07d}", "title": f"유연탄 {i}"},
+        )
+        for i in range(count)
+    ]
+
+
+# =====================================================
+# Benchmarks
+# =====================================================
+
+def bench_parse_throughput(corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """문서 파서 처리량 (크기/확장자별 docs/s, MB/s)"""
+    paths = generate_corpus(corpus_dir)
+    results = {}
+    for size in DEFAULT_SIZES:
+        for ext in (".hwp", ".hwpx"):
+            group = [p for p in paths if f"spec_{size}_" in p and p.endswith(ext)]
+            total_bytes = sum(os.path.getsize(p) for p in group)
+
+            def run():
+                for path in group:
+                    ParserFactory.get_parser(path).parse(path)
+
+            stats = _timed(run, repeat)
+            stats["docs_per_s"] = len(group) / stats["median_s"]
+            stats["mb_per_s"] = total_bytes / 1e6 / stats["median_s"]
+            results[f"{ext.lstrip('.')}_{size}"] = stats
+    return results
+
+
+def bench_spec_regex(repeat: int) -> Dict[str, Any]:
+    """legacy kepco.parser.parse_specs 정규식 추출 속도"""
+    parser = LegacyHWPParser()
+    results = {}
+    for size in DEFAULT_SIZES:
+        text = build_text(size)
+        stats = _timed(lambda: parser.parse_specs(text), repeat)
+        stats["mb_per_s"] = len(text.encode("utf-8")) / 1e6 / stats["median_s"]
+        results[str(size)] = stats
+    return results
+
+
+def bench_repository_throughput(count: int, repeat: int) -> Dict[str, Any]:
+    """upsert_tender 처리량 (신규 insert + 동일 키 update)"""
+    tenders = _sample_tenders(count)
+    results = {}
+    for phase in ("insert", "update"):
+        repo = make_repository()
+        fake = getattr(repo, "supabase", None)
+        fake = fake if isinstance(fake, FakeSupabaseClient) else None
+        if phase == "update":
+            for t in tenders:
+                repo.upsert_tender(t)
+        if fake:
+            fake.calls.clear()
+
+        def run():
+            for t in tenders:
+                repo.upsert_tender(t)
+
+        stats = _timed(run, repeat)
+        stats["ops_per_s"] = count / stats["median_s"]
+        if fake:
+            # N+1 쿼리 패턴 감지용 (op당 클라이언트 호출 수)
+            stats["client_calls_per_op"] = sum(fake.calls.values()) / (count * repeat)
+        results[phase] = stats
+    return results
+
+
+def bench_netback(specs: int, repeat: int) -> Dict[str, Any]:
+    """그리드 netback 계산 + 분포 요약 (spec × 시나리오/s)"""
+    engine = NetbackEngine(index_name="Newcastle")
+    grid = ScenarioGrid.around(
+        market_price_usd=130.0, freight_usd=15.0, fx_rate_krw=1350.0, steps=11,
+        insurance_pct=[0.10, 0.15, 0.20], import_duty_pct=[0.0, 1.0, 2.0],
+    )
+    tender_specs = [TenderSpecDTO(tender_id=f"BENCH-{i}", cv_min_kcal=5000 + i % 1000) for i in range(specs)]
+
+    stats = _timed(lambda: engine.run(tender_specs, grid).summaries(), repeat)
+    stats["scenarios_per_tender"] = grid.size
+    stats["scenarios_per_s"] = specs * grid.size / stats["median_s"]
+    return stats
+
+
+def bench_montecarlo(paths: int, repeat: int) -> Dict[str, Any]:
+    """tender 1건당 Monte Carlo 경로 처리량 (만기 샘플링 / 30일 평균가)"""
+    calibration = MarketCalibration(
+        index_name="Newcastle",
+        spot=np.array([130.0, 15.0, 1350.0]),
+        drift=np.zeros(3),
+        vol=np.array([0.02, 0.03, 0.006]),
+        corr=np.eye(3),
+        start=date(2024, 1, 1) - timedelta(days=365),
+        end=date(2024, 1, 1),
+    )
+    simulator = MonteCarloSimulator(calibration)
+    spec = [TenderSpecDTO(tender_id="BENCH", cv_min_kcal=5800)]
+    results = {}
+    for name, averaging in (("terminal", 0), ("avg30", 30)):
+        stats = _timed(lambda: simulator.run(spec, paths=paths, averaging_days=averaging, seed=1), repeat)
+        stats["paths_per_s"] = paths / stats["median_s"]
+        results[name] = stats
+    return results
+
+
+async def _bench_browser(recordings_dir: str, rows: int, repeat: int) -> Dict[str, Any]:
+    """리플레이 SRM 대상 크롤 지연시간 및 그리드 파싱 시간"""
+    crawl_samples, grid_samples = [], []
+    async with ReplayKEPCOCrawler(recordings_dir=recordings_dir, rows=rows) as crawler:
+        crawler.repo = make_repository()
+        config = SearchConfig(keywords=["유연탄"])
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = await crawler.search(config)
+            crawl_samples.append(time.perf_counter() - started)
+
+        context, page = await crawler._open_search_page()
+        try:
+            await crawler._search_keyword(page, "유연탄", config)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await crawler._parse_results(page)
+                grid_samples.append(time.perf_counter() - started)
+        finally:
+            await context.close()
+
+    return {
+        "crawl_latency": {"median_s": statistics.median(crawl_samples), "repeat": repeat, "rows": len(results)},
+        "grid_parse": {
+            "median_s": statistics.median(grid_samples),
+            "repeat": repeat,
+            "rows_per_s": min(rows, 50) / statistics.median(grid_samples),
+        },
+    }
+
+
+def bench_browser(recordings_dir: str, rows: int, repeat: int) -> Dict[str, Any]:
+    try:
+        return asyncio.run(_bench_browser(recordings_dir, rows, repeat))
+    except Exception as e:
+        # 브라우저 미설치 환경 등
+        return {"skipped": str(e).splitlines()[0]}
+
+
+# =====================================================
+# Report
+# =====================================================
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def _flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif key == "median_s":
+            flat[name] = value
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """baseline 대비 median이 threshold 비율 이상 느려진 항목"""
+    now, before = _flatten(current["results"]), _flatten(baseline["results"])
+    regressions = []
+    for name, value in sorted(now.items()):
+        old = before.get(name)
+        if old and value > old * (1 + threshold):
+            regressions.append(f"{name}: {old * 1000:.2f}ms -> {value * 1000:.2f}ms (+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CarbonFlow offline benchmarks")
+    parser.add_argument("--output", "-o", type=str, default="bench_output.json")
+    parser.add_argument("--compare", type=str, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regression threshold (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tenders", type=int, default=2000, help="Rows for repository throughput")
+    parser.add_argument("--netback-specs", type=int, default=200, help="Tender specs for the netback grid")
+    parser.add_argument("--mc-paths", type=int, default=100_000, help="Monte Carlo paths per tender")
+    parser.add_argument("--rows", type=int, default=50, help="Grid rows served by the SRM replay")
+    parser.add_argument("--recordings", type=str, default=None, help="Directory containing srm.har")
+    parser.add_argument("--skip-browser", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        results = {
+            "parse_throughput": bench_parse_throughput(corpus_dir, args.repeat),
+            "spec_regex": bench_spec_regex(args.repeat),
+            "repository_throughput": bench_repository_throughput(args.tenders, args.repeat),
+            "netback": bench_netback(args.netback_specs, args.repeat),
+            "montecarlo": bench_montecarlo(args.mc_paths, args.repeat),
+        }
+    if not args.skip_browser:
+        results["browser"] = bench_browser(args.recordings, args.rows, max(1, args.repeat // 2))
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repository": type(make_repository()).__name__ if not os.getenv("BENCH_SUPABASE_URL") else "postgrest",
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+SRM 페이지 리플레이 (Playwright route)
+- 기록된 HAR(srm.har)이 있으면 route_from_har로 재생
+- 없으면 실제 SRM의 DOM 구조(동적 ID, ExtJS 마스크, 그리드)를 흉내낸 합성 페이지 제공
+
+기록:
+    python -m benchmarks.srm_replay --record benchmarks/recordings --keyword 유연탄
+"""
+import os
+import json
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+try:
+    from crawlers.kepco.crawler import KEPCOCrawler, SearchConfig
+except ImportError:
+    from kepco.crawler import KEPCOCrawler, SearchConfig
+
+HAR_FILE = "srm.har"
+
+# 실제 SRM과 동일한 셀렉터 패턴을 만족하는 최소 ExtJS 흉내 페이지
+INDEX_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>KEPCO SRM (replay)</title></head>
+<body>
+<div class="x-menu"><span id="menuitem-1105-itemEl" class="x-menu-item-text">통합공고</span></div>
+<div id="search-panel" style="display:none">
+  <input id="textfield-1021-inputEl" type="text">
+  <input id="ext-comp-1031-inputEl" type="text">
+  <input id="ext-comp-1032-inputEl" type="text">
+  <a id="button-1041"><span class="x-btn-text">조회</span></a>
+  <div id="gridview-1051"></div>
+</div>
+<div id="mask" class="x-mask" style="display:none"></div>
+<script>
+  const mask = document.getElementById('mask');
+  document.getElementById('menuitem-1105-itemEl').addEventListener('click', () => {
+    document.getElementById('search-panel').style.display = 'block';
+  });
+  document.getElementById('button-1041').addEventListener('click', async () => {
+    mask.style.display = 'block';
+    const kw = document.getElementById('textfield-1021-inputEl').value;
+    const res = await fetch('/bid/list.do?keyword=' + encodeURIComponent(kw));
+    const rows = await res.json();
+    const grid = document.getElementById('gridview-1051');
+    grid.innerHTML = rows.map(r =>
+      '<div class="x-grid-row">' + r.map(c => '<div class="x-grid-cell-inner">' + c + '</div>').join('') + '</div>'
+    ).join('');
+    mask.style.display = 'none';
+  });
+</script>
+</body></html>
+"""
+
+
+def synthetic_rows(count: int, keyword: str = "유연탄") -> List[List[str]]:
+    """그리드 행 데이터 (공고번호, 공고명, 기관, 입찰방법, 공고일, 마감일, 상태)"""
+    base = datetime(2024, 1, 1, 10, 0)
+    rows = []
+    for i in range(count):
+        announced = base + timedelta(days=i % 60)
+        rows.append([
+            f"R24-{i:06d}",
+            f"발전용 {keyword} 구매 입찰 ({i}차)",
+            ["한국남동발전", "한국중부발전", "한국서부발전"][i % 3],
+            "전자입찰",
+            announced.strftime("%Y/%m/%d"),
+            (announced + timedelta(days=14)).strftime("%Y/%m/%d %H:%M"),
+            "공고중",
+        ])
+    return rows
+
+
+async def install_routes(context, recordings_dir: Optional[str] = None, rows: int = 50):
+    """컨텍스트에 SRM 리플레이 라우트 설치"""
+    har_path = os.path.join(recordings_dir, HAR_FILE) if recordings_dir else None
+    if har_path and os.path.exists(har_path):
+        await context.route_from_har(har_path, url=f"{KEPCOCrawler.BASE_URL}/**", not_found="abort")
+        return
+
+    async def handler(route):
+        url = route.request.url
+        if "/bid/list.do" in url:
+            await route.fulfill(
+                status=200,
+                content_type="application/json",
+                body=json.dumps(synthetic_rows(rows), ensure_ascii=False),
+            )
+        elif url.startswith(KEPCOCrawler.SEARCH_URL):
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=INDEX_HTML)
+        else:
+            await route.fulfill(status=404, body="")
+
+    await context.route(f"{KEPCOCrawler.BASE_URL}/**", handler)
+
+
+class ReplayKEPCOCrawler(KEPCOCrawler):
+    """모든 SRM 요청을 리플레이 라우트로 처리하는 크롤러"""
+
+    def __init__(self, *args, recordings_dir: Optional[str] = None, rows: int = 50, **kwargs):
+        kwargs.setdefault("reuse_session", False)
+        super().__init__(*args, **kwargs)
+        self.recordings_dir = recordings_dir
+        self.rows = rows
+
+    async def _create_context(self, storage_state: Optional[str] = None):
+        context = await super()._create_context(storage_state=storage_state)
+        await install_routes(context, self.recordings_dir, self.rows)
+        return context
+
+
+class RecordingKEPCOCrawler(KEPCOCrawler):
+    """실제 SRM 크롤링 트래픽을 HAR로 기록하는 크롤러"""
+
+    def __init__(self, *args, recordings_dir: str, **kwargs):
+        kwargs.setdefault("reuse_session", False)
+        super().__init__(*args, **kwargs)
+        self.recordings_dir = recordings_dir
+
+    async def _create_context(self, storage_state: Optional[str] = None):
+        os.makedirs(self.recordings_dir, exist_ok=True)
+        return await self.browser.new_context(
+            locale="ko-KR",
+            timezone_id="Asia/Seoul",
+            record_har_path=os.path.join(self.recordings_dir, HAR_FILE),
+            record_har_url_filter=f"{self.BASE_URL}/**",
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record live SRM traffic for offline replay")
+    parser.add_argument("--record", required=True, help="Output directory for srm.har")
+    parser.add_argument("--keyword", "-k", action="append", default=[])
+    args = parser.parse_args()
+
+    async def _run():
+        config = SearchConfig(keywords=args.keyword or ["유연탄"])
+        async with RecordingKEPCOCrawler(recordings_dir=args.record) as crawler:
+            crawler.repo = None  # 기록 중에는 DB 저장 안 함
+            await crawler.search(config)
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
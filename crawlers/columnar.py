@@ -0,0 +1,479 @@
+"""
+분석용 열 지향(columnar) 데이터셋 — Parquet / Arrow IPC
+
+tenders / tender_specs / market_data / netback_simulations를 출처(source) × 월(month) 파티션으로 저장
+    {root}/{dataset}/source=<출처>/month=<YYYY-MM>/part-<export 시각>-<id>.parquet|.arrow
+
+- append: 파티션별 새 part 파일 추가 (기존 파일은 수정하지 않음 → 증분 크롤링 결과 누적)
+  tmp 파일에 쓴 뒤 os.replace, 모든 행에 exported_at 기록
+- load: pyarrow.dataset + mmap 파일시스템 (IPC는 압축 없이 저장 → zero-copy)
+  latest=True면 키별 마지막 exported_at 행만 (같은 공고 재수집 시 최신 값)
+- compact: 파티션의 part 파일을 키 중복 제거 후 1개로 병합
+- export_repository: 저장소 → 데이터셋, watermark(_state.json) 이후 갱신된 행만 추가
+
+파티션 값:
+    source: tenders / market_data는 source 컬럼, 스펙 / 시뮬레이션은 해당 공고의 source (없으면 unknown)
+    month: tenders는 수집 월(created_at), 시장 데이터는 data_date, 시뮬레이션은 simulation_date
+시각은 UTC 기준 (시간대 없는 값은 그대로)
+
+사용법:
+    python -m columnar --root data/columnar --format parquet export
+    python -m columnar --root data/columnar import-json ../output/coal_tenders.json
+    python -m columnar --root data/columnar import-json ../output/kepco_v4_results.jsonl.gz
+    python -m columnar --root data/columnar compact --dataset tenders
+"""
+import os
+import json
+import uuid
+import logging
+import argparse
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_DIR = os.getenv("COLUMNAR_DIR", "data/columnar")
+
+FORMATS = {"parquet": ".parquet", "ipc": ".arrow"}
+PARQUET_COMPRESSION = "zstd"
+STATE_FILE = "_state.json"
+UNKNOWN = "unknown"
+
+if PYARROW_AVAILABLE:
+    _ARROW_TYPES = {
+        "string": pa.string,
+        "float": pa.float64,
+        "int": pa.int64,
+        "date": pa.date32,
+        "timestamp": lambda: pa.timestamp("us"),
+    }
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    name: str
+    fields: Tuple[Tuple[str, str], ...]      # (컬럼, 타입) — source / month는 파티션 경로
+    key: Tuple[str, ...]                     # latest / compact 중복 제거 키
+    month_from: Tuple[str, ...]              # 값이 있는 첫 컬럼의 월
+    watermark: Tuple[str, ...] = ("updated_at", "created_at")
+
+    @property
+    def schema(self) -> "pa.Schema":
+        return pa.schema([(name, _ARROW_TYPES[kind]()) for name, kind in self.fields] + [("exported_at", _ARROW_TYPES["timestamp"]())])
+
+
+DATASETS: Dict[str, DatasetSpec] = {spec.name: spec for spec in (
+    DatasetSpec(
+        "tenders",
+        (
+            ("id", "string"), ("bid_ntce_no", "string"), ("bid_ntce_ord", "string"), ("bid_ntce_nm", "string"),
+            ("ntce_div_cd", "string"), ("dminstt_nm", "string"), ("dminstt_cd", "string"),
+            ("asign_bdgt_amt", "float"), ("presmpt_prce", "float"), ("bid_clse_dt", "timestamp"),
+            ("bid_ntce_dtl_url", "string"), ("status", "string"), ("ai_summary", "string"),
+            ("relevance_score", "float"), ("raw_payload_hash", "string"),
+            ("created_at", "timestamp"), ("updated_at", "timestamp"),
+        ),
+        key=("source", "bid_ntce_no", "bid_ntce_ord"),
+        month_from=("created_at", "bid_clse_dt"),
+    ),
+    DatasetSpec(
+        "tender_specs",
+        (
+            ("id", "string"), ("tender_id", "string"), ("commodity_type", "string"),
+            ("cv_min_kcal", "int"), ("cv_max_kcal", "int"), ("cv_basis", "string"),
+            ("sulfur_max_pct", "float"), ("ash_max_pct", "float"), ("moisture_max_pct", "float"),
+            ("quantity_mt", "float"), ("origin", "string"), ("incoterms", "string"), ("delivery_port", "string"),
+            ("extraction_confidence", "string"), ("created_at", "timestamp"), ("updated_at", "timestamp"),
+        ),
+        key=("tender_id",),
+        month_from=("created_at",),
+    ),
+    DatasetSpec(
+        "market_data",
+        (
+            ("data_date", "date"), ("index_name", "string"), ("price_usd", "float"),
+            ("fx_rate_krw", "float"), ("freight_rate", "float"), ("created_at", "timestamp"),
+        ),
+        key=("data_date", "index_name"),
+        month_from=("data_date",),
+        watermark=("created_at",),
+    ),
+    DatasetSpec(
+        "netback_simulations",
+        (
+            ("id", "string"), ("tender_id", "string"), ("simulation_date", "date"),
+            ("market_price_usd", "float"), ("freight_cost", "float"), ("insurance_cost", "float"),
+            ("port_charges", "float"), ("import_duty", "float"), ("fx_rate", "float"),
+            ("netback_usd", "float"), ("netback_krw", "float"), ("assumptions", "string"),
+            ("created_at", "timestamp"),
+        ),
+        key=("id",),
+        month_from=("simulation_date", "created_at"),
+        watermark=("created_at",),
+    ),
+)}
+
+# 파티션 컬럼 (파일에는 저장하지 않고 경로에서 복원)
+PARTITION_FIELDS = ("source", "month")
+
+# =====================================================
+# 값 변환
+# =====================================================
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day)
+    else:
+        text = str(value).strip().replace("/", "-")
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _date(value: Any) -> Optional[date]:
+    parsed = _timestamp(value)
+    return parsed.date() if parsed else None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: Any) -> Optional[int]:
+    number = _float(value)
+    return int(number) if number is not None else None
+
+
+def _string(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value if isinstance(value, str) else str(getattr(value, "value", value))
+
+
+_CONVERTERS = {"string": _string, "float": _float, "int": _int, "date": _date, "timestamp": _timestamp}
+
+
+def month_of(row: Mapping[str, Any], spec: DatasetSpec) -> str:
+    for column in spec.month_from:
+        parsed = _timestamp(row.get(column))
+        if parsed:
+            return parsed.strftime("%Y-%m")
+    return UNKNOWN
+
+
+def source_of(row: Mapping[str, Any], tender_sources: Optional[Mapping[str, str]] = None) -> str:
+    source = _string(row.get("source"))
+    if not source and tender_sources is not None:
+        source = tender_sources.get(row.get("tender_id"))
+    return source or UNKNOWN
+
+
+def _partition_dir(base: str, source: str, month: str) -> str:
+    return os.path.join(base, f"source={quote(source, safe='')}", f"month={month}")
+
+
+# =====================================================
+# Store
+# =====================================================
+
+class ColumnarStore:
+    """root 아래 데이터셋 모음 (데이터셋 하나는 단일 형식)"""
+
+    def __init__(self, root: str = COLUMNAR_DIR, fmt: str = "parquet"):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for columnar export (pip install pyarrow)")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
+        self.root = root
+        self.fmt = fmt
+        self.extension = FORMATS[fmt]
+        self.filesystem = pafs.LocalFileSystem(use_mmap=True)
+
+    def _base(self, dataset: str) -> str:
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        return os.path.join(self.root, dataset)
+
+    def part_files(self, dataset: str) -> List[str]:
+        base = self._base(dataset)
+        files = []
+        for directory, _, names in os.walk(base):
+            files.extend(os.path.join(directory, name) for name in names if name.endswith(self.extension) and not name.startswith("."))
+        return sorted(files)
+
+    # -------------------------------------------------
+    # 쓰기
+    # -------------------------------------------------
+
+    def _write(self, table: "pa.Table", directory: str, exported_at: datetime) -> str:
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{exported_at.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}{self.extension}"
+        path = os.path.join(directory, name)
+        tmp = os.path.join(directory, f".{name}.tmp")     # 점 접두사 → 로드 대상 아님
+        if self.fmt == "parquet":
+            pq.write_table(table, tmp, compression=PARQUET_COMPRESSION)
+        else:
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+        return path
+
+    def append(
+        self,
+        dataset: str,
+        rows: Iterable[Mapping[str, Any]],
+        tender_sources: Optional[Mapping[str, str]] = None,
+        exported_at: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """행 → 파티션별 part 파일 1개씩 추가 → {partition 경로: 행 수}"""
+        spec = DATASETS[dataset]
+        exported_at = exported_at or datetime.now(timezone.utc).replace(tzinfo=None)
+        partitions: Dict[Tuple[str, str], List[Mapping[str, Any]]] = {}
+        for row in rows:
+            partitions.setdefault((source_of(row, tender_sources), month_of(row, spec)), []).append(row)
+
+        written = {}
+        base = self._base(dataset)
+        for (source, month), part_rows in sorted(partitions.items()):
+            columns = {
+                name: [_CONVERTERS[kind](row.get(name)) for row in part_rows]
+                for name, kind in spec.fields
+            }
+            columns["exported_at"] = [exported_at] * len(part_rows)
+            table = pa.table(columns, schema=spec.schema)
+            directory = _partition_dir(base, source, month)
+            self._write(table, directory, exported_at)
+            written[os.path.relpath(directory, self.root)] = len(part_rows)
+        if written:
+            logger.info(f"Columnar {dataset}: {sum(written.values())} rows → {len(written)} partitions")
+        return written
+
+    # -------------------------------------------------
+    # 읽기
+    # -------------------------------------------------
+
+    def dataset(self, dataset: str) -> "ds.Dataset":
+        """mmap 기반 pyarrow Dataset (source / month 파티션 필터로 파일 단위 pruning)"""
+        spec = DATASETS[dataset]
+        partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_FIELDS]), flavor="hive")
+        return ds.dataset(
+            self.part_files(dataset),
+            schema=spec.schema.append(pa.field("source", pa.string())).append(pa.field("month", pa.string())),
+            format="parquet" if self.fmt == "parquet" else "ipc",
+            filesystem=self.filesystem,
+            partitioning=partitioning,
+            partition_base_dir=self._base(dataset),
+        )
+
+    def load(
+        self,
+        dataset: str,
+        columns: Optional[Sequence[str]] = None,
+        filter: Optional["ds.Expression"] = None,
+        latest: bool = True,
+    ) -> "pa.Table":
+        """
+        데이터셋 → Table (예: filter=ds.field("month") >= "2025-01")
+        latest: 키별 마지막 exported_at 행만 (columns 지정 시 키 / exported_at 포함해서 읽은 뒤 선택)
+        """
+        spec = DATASETS[dataset]
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys([*columns, *(spec.key if latest else ()), *(("exported_at",) if latest else ())]))
+        table = self.dataset(dataset).to_table(columns=read_columns, filter=filter)
+        if latest:
+            table = latest_rows(table, spec.key)
+        return table.select(list(columns)) if columns is not None else table
+
+    # -------------------------------------------------
+    # 유지보수
+    # -------------------------------------------------
+
+    def compact(self, dataset: str) -> Dict[str, int]:
+        """파티션별 part 파일 병합 (키 중복 제거) → {partition 경로: 남은 행 수}"""
+        spec = DATASETS[dataset]
+        by_directory: Dict[str, List[str]] = {}
+        for path in self.part_files(dataset):
+            by_directory.setdefault(os.path.dirname(path), []).append(path)
+
+        compacted = {}
+        for directory, paths in by_directory.items():
+            if len(paths) < 2:
+                continue
+            dataset_ = ds.dataset(paths, schema=spec.schema, format="parquet" if self.fmt == "parquet" else "ipc", filesystem=self.filesystem)
+            table = latest_rows(dataset_.to_table(), tuple(k for k in spec.key if k not in PARTITION_FIELDS))
+            table = table.sort_by([("exported_at", "ascending")])
+            last = table.column("exported_at")[-1].as_py() if len(table) else datetime.now()
+            self._write(table, directory, last)
+            for path in paths:       # 새 파일 기록 후 삭제 (중간 실패 시 중복은 latest로 제거됨)
+                os.remove(path)
+            compacted[os.path.relpath(directory, self.root)] = len(table)
+        return compacted
+
+    # -------------------------------------------------
+    # 저장소 내보내기
+    # -------------------------------------------------
+
+    def _state_path(self) -> str:
+        return os.path.join(self.root, STATE_FILE)
+
+    def load_state(self) -> Dict[str, str]:
+        try:
+            with open(self._state_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: Dict[str, str]):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._state_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self._state_path())
+
+    def export_repository(self, repo, datasets: Optional[Sequence[str]] = None, full: bool = False) -> Dict[str, int]:
+        """저장소 행 중 watermark 이후 갱신분만 추가 (full=True면 전체) → {dataset: 행 수}"""
+        state = {} if full else self.load_state()
+        # 파티션 경로용 tender_id → source (스펙 / 시뮬레이션 행에는 source 없음)
+        tender_sources = {row["id"]: row["source"] for row in repo.list_tenders(columns="id,source") if row.get("id")}
+        tender_columns = ",".join(dict.fromkeys([name for name, _ in DATASETS["tenders"].fields] + ["source"]))
+        sources = {
+            "tenders": lambda: repo.list_tenders(columns=tender_columns, updated_since=state.get("tenders")),
+            "tender_specs": lambda: repo.list_tender_specs(updated_since=state.get("tender_specs")),
+            "market_data": repo.list_market_data,
+            "netback_simulations": repo.list_netback_simulations,
+        }
+
+        exported = {}
+        for name in datasets or DATASETS:
+            spec = DATASETS[name]
+            watermark = _timestamp(state.get(name))
+            rows, newest = [], watermark
+            for row in sources[name]():
+                changed = max((t for t in (_timestamp(row.get(c)) for c in spec.watermark) if t), default=None)
+                if watermark is not None and changed is not None and changed <= watermark:
+                    continue
+                rows.append(row)
+                if changed is not None and (newest is None or changed > newest):
+                    newest = changed
+            self.append(name, rows, tender_sources=tender_sources)
+            exported[name] = len(rows)
+            if newest is not None:
+                state[name] = newest.isoformat()
+        self._save_state(state)
+        return exported
+
+
+def latest_rows(table: "pa.Table", key: Sequence[str]) -> "pa.Table":
+    """키별 exported_at이 가장 늦은 행 (같으면 나중 행)"""
+    if len(table) == 0:
+        return table
+    ordered = table.take(pc.sort_indices(table, sort_keys=[("exported_at", "ascending")]))
+    ordered = ordered.append_column("__row", pa.array(range(len(ordered)), pa.int64()))
+    last = ordered.group_by(list(key), use_threads=False).aggregate([("__row", "max")]).column("__row_max")
+    return ordered.take(pc.take(last, pc.sort_indices(last))).drop_columns(["__row"])
+
+
+def kepco_rows(results: Iterable[Any]) -> List[Dict[str, Any]]:
+    """KEPCO 크롤러 TenderResult → tenders 행 (created_at = 수집 시각)"""
+    rows = []
+    for result in results:
+        record = result if isinstance(result, Mapping) else asdict(result)
+        rows.append({
+            "source": "KEPCO",
+            "bid_ntce_no": record.get("announcement_no"),
+            "bid_ntce_ord": "00",
+            "bid_ntce_nm": record.get("title"),
+            "dminstt_nm": record.get("organization"),
+            "bid_clse_dt": record.get("close_date"),
+            "bid_ntce_dtl_url": record.get("detail_url"),
+            "status": "OPEN",
+            "created_at": record.get("crawled_at"),
+        })
+    return rows
+
+
+def g2b_rows(items: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """G2B API 응답 항목 (output/coal_tenders.json) → tenders 행 (created_at = 등록일시)"""
+    try:
+        from dto import G2BApiResponse, TenderDTO
+        from repository import BaseRepository
+    except ImportError:
+        from crawlers.dto import G2BApiResponse, TenderDTO
+        from crawlers.repository import BaseRepository
+    rows = []
+    for item in items:
+        row = BaseRepository._tender_row(TenderDTO.from_g2b_api(G2BApiResponse.from_api_item(item)))
+        row["created_at"] = item.get("rgstDt") or item.get("bidNtceDt")
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar (Parquet / Arrow IPC) export for analytics")
+    parser.add_argument("--root", default=COLUMNAR_DIR)
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Append repository rows changed since the last export")
+    export.add_argument("--dataset", action="append", choices=list(DATASETS))
+    export.add_argument("--full", action="store_true", help="Ignore the watermark and export everything")
+    imported = sub.add_parser("import-json", help="Append a crawler JSON / JSONL file (G2B API items or KEPCO results)")
+    imported.add_argument("path")
+    compact = sub.add_parser("compact", help="Merge part files per partition, keeping the latest row per key")
+    compact.add_argument("--dataset", action="append", choices=list(DATASETS))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+
+    store = ColumnarStore(args.root, args.format)
+    if args.command == "export":
+        try:
+            from repository import create_repository
+        except ImportError:
+            from crawlers.repository import create_repository
+        repo = create_repository()
+        if repo is None:
+            raise SystemExit("SUPABASE_URL / SUPABASE_KEY (or REPOSITORY_BACKEND=memory) required")
+        print(json.dumps(store.export_repository(repo, args.dataset, full=args.full), indent=2))
+    elif args.command == "import-json":
+        if args.path.endswith((".jsonl", ".jsonl.gz", ".ndjson", ".ndjson.gz")):
+            try:
+                from jsonl import iter_jsonl
+            except ImportError:
+                from crawlers.jsonl import iter_jsonl
+            items = list(iter_jsonl(args.path))
+        else:
+            with open(args.path, encoding="utf-8") as f:
+                items = json.load(f)
+        rows = kepco_rows(items) if items and "announcement_no" in items[0] else g2b_rows(items)
+        print(json.dumps(store.append("tenders", rows), ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps({name: store.compact(name) for name in args.dataset or DATASETS}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
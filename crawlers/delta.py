@@ -0,0 +1,191 @@
+"""
+신규/변경 공고 delta (n8n 알림 분기용)
+
+- 알려진 공고 키 (source, bid_ntce_no, bid_ntce_ord) → 내용 fingerprint 해시 테이블
+- 첫 사용 시 tenders를 projection 1회 조회로 적재, 이후 repository listener로 증분 갱신 (행별 조회 없음)
+- upsert_tender 결과가 listener로 들어올 때 이전 fingerprint와 비교 → 신규(new) / 변경(changed) 판정
+- 크롤링 1회 = DeltaBatch 1개, 배치 동안 관찰된 new / changed 공고만 응답
+  (현재 배치는 contextvar: 동시 요청 / 같은 프로세스의 다른 writer 기록이 섞이지 않음)
+- 다른 replica / crawler-worker가 쓴 공고: 배치 진입 시 updated_at 워터마크 이후 행을 재조회해 조용히 반영,
+  미확인 키는 upsert 결과의 created_at != updated_at (이미 DB에 있던 행)이면 new로 표시하지 않음
+
+사용법:
+    delta = TenderDeltaIndex(repo)
+    with delta.batch() as batch:
+        results = await crawler.search(config)
+    batch.to_dict()     # new_tenders_count / changed_tenders_count / results
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ("source", "bid_ntce_no", "bid_ntce_ord")
+# 변경 판정 컬럼 (n8n 알림 / 시트에 노출되는 값)
+FINGERPRINT_COLUMNS = ("bid_ntce_nm", "dminstt_nm", "bid_clse_dt", "status", "bid_ntce_dtl_url")
+DELTA_COLUMNS = ",".join(KEY_COLUMNS + FINGERPRINT_COLUMNS + ("updated_at",))
+
+NEW = "new"
+CHANGED = "changed"
+
+
+def tender_key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (row.get("source"), row.get("bid_ntce_no"), row.get("bid_ntce_ord") or "00")
+
+
+def fingerprint(row: Dict[str, Any]) -> int:
+    return hash(tuple(row.get(column) for column in FINGERPRINT_COLUMNS))
+
+
+def existed_before(row: Dict[str, Any]) -> bool:
+    """upsert 결과 행이 이번 기록 전부터 DB에 있었는지 (INSERT는 created_at == updated_at, UPDATE 트리거가 updated_at 갱신)"""
+    created, updated = row.get("created_at"), row.get("updated_at")
+    return created is not None and updated is not None and created != updated
+
+
+def notification_item(row: Dict[str, Any], change: str) -> Dict[str, Any]:
+    """n8n 워크플로 필드 (n8n/kepco_workflow.json: Google Sheets / Slack / Email 매핑)"""
+    return {
+        "change": change,
+        "source": row.get("source"),
+        "tender_number": row.get("bid_ntce_no"),
+        "tender_ord": row.get("bid_ntce_ord") or "00",
+        "title": row.get("bid_ntce_nm"),
+        "organization": row.get("dminstt_nm"),
+        "deadline": row.get("bid_clse_dt"),
+        "status": row.get("status"),
+        "url": row.get("bid_ntce_dtl_url"),
+    }
+
+
+@dataclass(slots=True)
+class DeltaBatch:
+    """크롤링 1회 동안 관찰된 공고 (키별 첫 판정 유지: 신규 후 같은 배치에서 다시 써도 new)"""
+    changes: Dict[Tuple[str, str, str], Dict[str, Any]] = field(default_factory=dict)
+    # 배치 시작 전 fingerprint (실패 시 되돌려 다음 크롤링에서 다시 감지)
+    previous: Dict[Tuple[str, str, str], Optional[int]] = field(default_factory=dict)
+
+    @property
+    def seen(self) -> int:
+        return len(self.previous)
+
+    def record(self, key: Tuple[str, str, str], row: Dict[str, Any], change: Optional[str], previous: Optional[int]):
+        self.previous.setdefault(key, previous)
+        if change is None:
+            return
+        first = self.changes.get(key)
+        self.changes[key] = notification_item(row, first["change"] if first else change)
+
+    @property
+    def new(self) -> List[Dict[str, Any]]:
+        return [item for item in self.changes.values() if item["change"] == NEW]
+
+    @property
+    def changed(self) -> List[Dict[str, Any]]:
+        return [item for item in self.changes.values() if item["change"] == CHANGED]
+
+    def to_dict(self) -> Dict[str, Any]:
+        new, changed = self.new, self.changed
+        return {
+            "new_tenders_count": len(new),
+            "changed_tenders_count": len(changed),
+            "unchanged_count": self.seen - len(new) - len(changed),
+            "results": new + changed,
+        }
+
+
+class TenderDeltaIndex:
+    """알려진 공고 키 → fingerprint"""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._known: Dict[Tuple[str, str, str], int] = {}
+        # 실패한 배치에서 응답하지 못한 키 → 배치 전 fingerprint (다음 배치에서 다시 감지)
+        self._unreported: Dict[Tuple[str, str, str], Optional[int]] = {}
+        self._batch: ContextVar[Optional[DeltaBatch]] = ContextVar(f"delta_batch_{id(self)}", default=None)
+        self._watermark: Optional[str] = None
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def __contains__(self, key: Tuple[str, str, str]) -> bool:
+        return key in self._known
+
+    def load(self):
+        """tenders 키/fingerprint 컬럼만 1회 적재 + listener 등록"""
+        with self._lock:
+            if self._loaded:
+                return
+            rows = self.repo.list_tenders(columns=DELTA_COLUMNS)
+            self._known = {tender_key(row): fingerprint(row) for row in rows}
+            self._advance(rows)
+            self.repo.add_listener("tenders", self.observe)
+            self._loaded = True
+            logger.info(f"Delta index warmed: {len(self._known)} known tenders")
+
+    def sync(self) -> int:
+        """워터마크 이후 갱신된 공고 반영 (다른 replica / worker 기록, 알림 없이). 반영 건수 반환"""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                return 0
+            rows = self.repo.list_tenders(columns=DELTA_COLUMNS, updated_since=self._watermark)
+            for row in rows:
+                self._known[tender_key(row)] = fingerprint(row)
+            self._advance(rows)
+            return len(rows)
+
+    def _advance(self, rows: List[Dict[str, Any]]):
+        stamps = [row["updated_at"] for row in rows if row.get("updated_at")]
+        if stamps:
+            self._watermark = max([self._watermark, *stamps] if self._watermark else stamps)
+
+    def close(self):
+        if self._loaded:
+            self.repo.remove_listener("tenders", self.observe)
+            self._loaded = False
+
+    def observe(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """기록된 공고 반영, 현재 컨텍스트의 배치에 new / changed 기록. 변경 건수 반환"""
+        changes = 0
+        batch = self._batch.get()
+        with self._lock:
+            for row in rows:
+                if not row or not row.get("bid_ntce_no"):
+                    continue
+                key, value = tender_key(row), fingerprint(row)
+                unreported = key in self._unreported
+                previous = self._unreported[key] if unreported else self._known.get(key)
+                change = NEW if previous is None else CHANGED if previous != value else None
+                if change == NEW and not unreported and existed_before(row):
+                    # 색인에 없지만 DB에는 이미 있던 공고 (다른 writer가 먼저 기록·알림)
+                    change = None
+                self._known[key] = value
+                changes += change is not None
+                if batch is not None:
+                    batch.record(key, row, change, previous)
+                    self._unreported.pop(key, None)
+        return changes
+
+    @contextmanager
+    def batch(self) -> Iterator[DeltaBatch]:
+        """with 블록(같은 컨텍스트)의 upsert_tender 결과를 delta로 수집 (블록 진입 전 적재/동기화 완료)"""
+        self.sync()
+        batch = DeltaBatch()
+        token = self._batch.set(batch)
+        try:
+            yield batch
+        except BaseException:
+            # 응답되지 않은 delta는 미확인 상태로 되돌림 (알림 누락 방지)
+            with self._lock:
+                for key, previous in batch.previous.items():
+                    self._unreported[key] = previous
+            raise
+        finally:
+            self._batch.reset(token)
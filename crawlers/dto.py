@@ -1,10 +1,14 @@
 """
 CarbonFlow DTO (Data Transfer Objects)
 실제 API 응답 필드를 기반으로 설계된 데이터 모델
+- 모든 DTO는 __slots__ 기반 (인스턴스당 __dict__ 없음)
+- 원본 응답은 RawPayload(JSON bytes)로 보관하여 중첩 dict 복사 방지
 """
-from dataclasses import dataclass, field
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Union
 from enum import Enum
 
 
@@ -58,12 +62,72 @@ class Incoterms(str, Enum):
     DAP = "DAP"
 
 
+# =====================================================
+# Raw Payload
+# =====================================================
+
+class RawPayload(Mapping):
+    """
+    원본 JSON 페이로드
+    직렬화된 bytes만 보관하고 첫 키 접근 시 디코드 (읽기 전용 Mapping)
+    수만 건 backfill에서 행마다 중첩 dict를 들고 있지 않도록 하기 위함
+    """
+    __slots__ = ("_raw", "_decoded")
+
+    def __init__(self, raw: Union[bytes, str]):
+        self._raw = raw.encode("utf-8") if isinstance(raw, str) else bytes(raw)
+        self._decoded: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_obj(cls, obj: Any) -> "RawPayload":
+        """dict / 리스트 등 JSON 호환 객체를 압축 JSON bytes로 보관"""
+        if isinstance(obj, RawPayload):
+            return obj
+        return cls(json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str))
+
+    @classmethod
+    def from_record(cls, record: Any) -> "RawPayload":
+        """dataclass 인스턴스를 asdict 깊은 복사 없이 직렬화"""
+        return cls.from_obj({f.name: getattr(record, f.name) for f in fields(record)})
+
+    @property
+    def raw(self) -> bytes:
+        return self._raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        """bytes에서 새로 디코드한 독립 dict (호출자가 수정해도 캐시 / 원본 불변)"""
+        return json.loads(self._raw)
+
+    def _data(self) -> Dict[str, Any]:
+        if self._decoded is None:
+            self._decoded = json.loads(self._raw)
+        return self._decoded
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data())
+
+    def __len__(self) -> int:
+        return len(self._data())
+
+    def __eq__(self, other: Any) -> bool:
+        # 같은 bytes면 디코드 생략, 아니면 내용 비교 (직렬화 공백 / 키 순서 차이 무시)
+        if isinstance(other, RawPayload) and self._raw == other._raw:
+            return True
+        return isinstance(other, Mapping) and self._data() == dict(other)
+
+    def __repr__(self) -> str:
+        return f"RawPayload({len(self._raw)} bytes)"
+
+
 # =====================================================
 # G2B API Response DTO
 # (실제 API 응답 필드 기반)
 # =====================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class G2BApiResponse:
     """
     나라장터 입찰공고 API 응답 DTO
@@ -95,14 +159,44 @@ class G2BApiResponse:
     bidNtceDtlUrl: Optional[str] = None     # 공고상세URL
     
     # 원본 데이터
-    raw_response: Dict[str, Any] = field(default_factory=dict)
+    raw_response: Union[RawPayload, Dict[str, Any]] = field(default_factory=dict)
+    
+    @classmethod
+    def from_api_item(cls, item: Union[bytes, str, Dict[str, Any]]) -> "G2BApiResponse":
+        """API 응답 item(JSON bytes 또는 dict)에서 생성 - 원본은 RawPayload로 보관"""
+        raw = RawPayload(item) if isinstance(item, (bytes, str)) else RawPayload.from_obj(item)
+        data = raw.to_dict()
+        
+        def _amount(key: str) -> Optional[float]:
+            value = data.get(key)
+            try:
+                return float(value) if value not in (None, "") else None
+            except (TypeError, ValueError):
+                return None
+        
+        return cls(
+            bidNtceNo=data.get("bidNtceNo", ""),
+            bidNtceOrd=data.get("bidNtceOrd", ""),
+            bidClsfcNo=data.get("bidClsfcNo", ""),
+            rbidNo=data.get("rbidNo", ""),
+            ntceDivCd=data.get("ntceDivCd", ""),
+            bidNtceNm=data.get("bidNtceNm", ""),
+            asignBdgtAmt=_amount("asignBdgtAmt"),
+            presmptPrce=_amount("presmptPrce"),
+            bidClseDt=data.get("bidClseDt") or None,
+            rgstDt=data.get("rgstDt") or None,
+            dminsttNm=data.get("dminsttNm") or None,
+            dminsttCd=data.get("dminsttCd") or None,
+            bidNtceDtlUrl=data.get("bidNtceDtlUrl") or None,
+            raw_response=raw,
+        )
 
 
 # =====================================================
 # Domain DTOs
 # =====================================================
 
-@dataclass
+@dataclass(slots=True)
 class TenderDTO:
     """입찰 공고 DTO"""
     id: Optional[str] = None
@@ -120,7 +214,7 @@ class TenderDTO:
     ai_summary: Optional[str] = None        # AI 요약
     relevance_score: Optional[float] = None # 관련도 점수 (0.0~1.0)
     status: TenderStatus = TenderStatus.OPEN
-    raw_api_response: Dict[str, Any] = field(default_factory=dict)
+    raw_api_response: Union[RawPayload, Dict[str, Any]] = field(default_factory=dict)
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -149,12 +243,12 @@ class TenderDTO:
             bid_clse_dt=bid_clse_dt,
             bid_ntce_dtl_url=api_response.bidNtceDtlUrl,
             status=TenderStatus.OPEN,
-            raw_api_response=api_response.raw_response,
+            raw_api_response=api_response.raw_response,  # 참조 공유 (복사 없음)
             created_at=datetime.now()
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TenderAttachmentDTO:
     """입찰 공고 첨부파일 DTO"""
     id: Optional[str] = None
@@ -167,7 +261,7 @@ class TenderAttachmentDTO:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TenderSpecDTO:
     """입찰 공고 스펙 DTO (HWP 파싱 결과)"""
     id: Optional[str] = None
@@ -183,10 +277,11 @@ class TenderSpecDTO:
     origin: Optional[str] = None            # 원산지
     incoterms: Optional[Incoterms] = None
     delivery_port: Optional[str] = None     # 납품항
+    extraction_confidence: Optional[Dict[str, float]] = None   # 필드별 추출 신뢰도 (0~1, parsers/specs.py)
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipmentDTO:
     """선박 운항 정보 DTO"""
     id: Optional[str] = None
@@ -209,7 +304,7 @@ class ShipmentDTO:
     updated_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DemurrageCalcDTO:
     """체선료 계산 DTO"""
     id: Optional[str] = None
@@ -225,7 +320,7 @@ class DemurrageCalcDTO:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketDataDTO:
     """시장 데이터 DTO"""
     id: Optional[str] = None
@@ -238,7 +333,7 @@ class MarketDataDTO:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class NetbackSimulationDTO:
     """Netback 시뮬레이션 DTO"""
     id: Optional[str] = None
@@ -254,3 +349,18 @@ class NetbackSimulationDTO:
     netback_krw: Optional[float] = None     # 예상 순수익 (KRW/MT)
     assumptions: Dict[str, Any] = field(default_factory=dict)
     created_at: Optional[datetime] = None
+
+
+# =====================================================
+# Query DTOs
+# =====================================================
+
+@dataclass(slots=True)
+class TenderFilter:
+    """tenders 목록 조회 조건 (DB 쿼리 조건으로 그대로 전달)"""
+    source: Optional[str] = None
+    status: List[str] = field(default_factory=list)
+    dminstt_nm: Optional[str] = None
+    closing_from: Optional[datetime] = None     # bid_clse_dt >=
+    closing_to: Optional[datetime] = None       # bid_clse_dt <=
+    title_contains: Optional[str] = None        # bid_ntce_nm ILIKE (trigram 인덱스)
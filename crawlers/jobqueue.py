@@ -0,0 +1,624 @@
+"""
+크롤링 작업 대기열 (supabase/migrations/005_crawl_jobs.sql)
+crawler-worker 컨테이너 N개가 같은 Postgres 대기열에서 작업을 나눠 가져가 처리 (수평 확장)
+
+- 작업 단위: source × keyword × 날짜 구간 (plan_units)
+- 가져가기: FOR UPDATE SKIP LOCKED (worker 간 잠금 대기 없음), 같은 단위는 대기/실행 중 1건만
+- lease + heartbeat: 실행 중 주기적으로 lease 연장, worker가 죽으면 만료 후 다른 worker가 회수
+  heartbeat 실패(lease 상실) 시 진행 중인 크롤링 취소
+- 재시도: 실패 시 지수 backoff 후 다시 대기, max_attempts 초과 시 failed
+
+사용법:
+    python -m jobqueue enqueue --keyword 유연탄 --start 2024-01-01 --end 2024-12-31 --window-days 7
+    python -m jobqueue worker --concurrency 1
+    python -m jobqueue stats
+
+    docker compose up --scale crawler-worker=4
+"""
+import os
+import uuid
+import socket
+import asyncio
+import logging
+import argparse
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+# 재시도 대기: base * 2^(attempts-1) 초, 최대 cap
+RETRY_BASE_SECONDS = 30.0
+RETRY_CAP_SECONDS = 1800.0
+
+
+def retry_delay(attempts: int, base: float = RETRY_BASE_SECONDS, cap: float = RETRY_CAP_SECONDS) -> float:
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+class LeaseLost(RuntimeError):
+    """lease가 만료되어 다른 worker에게 넘어간 작업"""
+
+
+@dataclass(frozen=True, slots=True)
+class CrawlUnit:
+    source: str
+    keyword: str
+    window_start: date
+    window_end: date
+
+
+def plan_units(
+    sources: Sequence[str],
+    keywords: Sequence[str],
+    start: date,
+    end: date,
+    window_days: int = 7,
+) -> List[CrawlUnit]:
+    """[start, end]를 window_days 구간으로 분할 (최근 구간부터) × source × keyword"""
+    if start > end:
+        raise ValueError(f"start {start} is after end {end}")
+    if window_days < 1:
+        raise ValueError("window_days must be >= 1")
+    units = []
+    window_end = end
+    while window_end >= start:
+        window_start = max(start, window_end - timedelta(days=window_days - 1))
+        for source in sources:
+            for keyword in keywords:
+                units.append(CrawlUnit(source, keyword, window_start, window_end))
+        window_end = window_start - timedelta(days=1)
+    return units
+
+
+@dataclass(slots=True)
+class CrawlJob:
+    id: int
+    source: str
+    keyword: str
+    window_start: date
+    window_end: date
+    status: str
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = 3
+    batch_id: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "CrawlJob":
+        return cls(**{name: row.get(name) for name in cls.__dataclass_fields__ if name in row})
+
+    @property
+    def unit(self) -> CrawlUnit:
+        return CrawlUnit(self.source, self.keyword, self.window_start, self.window_end)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "source": self.source,
+            "keyword": self.keyword,
+            "window_start": self.window_start.isoformat(),
+            "window_end": self.window_end.isoformat(),
+            "status": self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "batch_id": self.batch_id,
+            "lease_owner": self.lease_owner,
+            "result": self.result,
+            "last_error": self.last_error,
+        }
+
+
+# =====================================================
+# Queue
+# =====================================================
+
+class JobQueue(ABC):
+    """작업 대기열 인터페이스 (PostgresJobQueue: 실 DB, InMemoryJobQueue: 테스트 / 단일 프로세스)"""
+
+    @abstractmethod
+    def enqueue(self, units: Iterable[CrawlUnit], priority: int = 0, batch_id: Optional[str] = None, max_attempts: int = 3) -> int:
+        """등록한 작업 수 (같은 단위가 대기/실행 중이면 건너뜀)"""
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float, limit: int = 1) -> List[CrawlJob]:
+        """만료된 lease 회수 후 실행 가능한 작업을 우선순위 순으로 가져감"""
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """lease 연장, 이미 다른 worker에게 넘어갔으면 False"""
+
+    @abstractmethod
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool: ...
+
+    @abstractmethod
+    def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        """재시도 대기(queued) 또는 최종 실패(failed) 상태 반환, lease 상실 시 None"""
+
+    @abstractmethod
+    def stats(self, batch_id: Optional[str] = None) -> Dict[str, int]: ...
+
+    @abstractmethod
+    def list_jobs(self, batch_id: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> List[CrawlJob]: ...
+
+
+_JOB_COLUMNS = (
+    "id, source, keyword, window_start, window_end, status, priority, attempts, max_attempts, "
+    "batch_id, lease_owner, lease_expires_at, result, last_error"
+)
+
+_REAP_SQL = """
+UPDATE crawl_jobs
+SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+    last_error = 'lease expired (worker ' || COALESCE(lease_owner, '?') || ')',
+    lease_owner = NULL,
+    lease_expires_at = NULL,
+    available_at = NOW(),
+    finished_at = CASE WHEN attempts >= max_attempts THEN NOW() END
+WHERE id IN (
+    SELECT id FROM crawl_jobs
+    WHERE status = 'running' AND lease_expires_at < NOW()
+    FOR UPDATE SKIP LOCKED
+)
+"""
+
+_CLAIM_SQL = f"""
+WITH next AS (
+    SELECT id FROM crawl_jobs
+    WHERE status = 'queued' AND available_at <= NOW()
+    ORDER BY priority DESC, available_at, id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE crawl_jobs AS j
+SET status = 'running',
+    attempts = j.attempts + 1,
+    lease_owner = %(owner)s,
+    lease_expires_at = NOW() + make_interval(secs => %(lease)s),
+    heartbeat_at = NOW(),
+    started_at = COALESCE(j.started_at, NOW())
+FROM next
+WHERE j.id = next.id
+RETURNING {", ".join(f"j.{c.strip()}" for c in _JOB_COLUMNS.split(","))}
+"""
+
+_HEARTBEAT_SQL = """
+UPDATE crawl_jobs
+SET heartbeat_at = NOW(), lease_expires_at = NOW() + make_interval(secs => %(lease)s)
+WHERE id = %(id)s AND lease_owner = %(owner)s AND status = 'running'
+"""
+
+_COMPLETE_SQL = """
+UPDATE crawl_jobs
+SET status = 'succeeded', result = %(result)s, finished_at = NOW(), lease_owner = NULL, lease_expires_at = NULL
+WHERE id = %(id)s AND lease_owner = %(owner)s AND status = 'running'
+"""
+
+_FAIL_SQL = """
+UPDATE crawl_jobs
+SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+    available_at = NOW() + make_interval(secs => LEAST(%(cap)s, %(base)s * power(2, GREATEST(attempts - 1, 0)))),
+    last_error = %(error)s,
+    lease_owner = NULL,
+    lease_expires_at = NULL,
+    finished_at = CASE WHEN attempts >= max_attempts THEN NOW() END
+WHERE id = %(id)s AND lease_owner = %(owner)s AND status = 'running'
+RETURNING status
+"""
+
+
+class PostgresJobQueue(JobQueue):
+    """crawl_jobs 테이블 (DATABASE_URL 직접 연결, 호출마다 짧은 트랜잭션 1개)"""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _cursor(self) -> Iterator[Any]:
+        import psycopg2
+        import psycopg2.extras
+
+        with self._lock:
+            if self._conn is None or self._conn.closed:
+                self._conn = psycopg2.connect(self.dsn)
+            try:
+                with self._conn, self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                    yield cur
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                # 연결 끊김 → 다음 호출에서 재연결
+                self._conn.close()
+                self._conn = None
+                raise
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def enqueue(self, units: Iterable[CrawlUnit], priority: int = 0, batch_id: Optional[str] = None, max_attempts: int = 3) -> int:
+        import psycopg2.extras
+
+        rows = [(u.source, u.keyword, u.window_start, u.window_end, priority, max_attempts, batch_id) for u in units]
+        if not rows:
+            return 0
+        with self._cursor() as cur:
+            inserted = psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO crawl_jobs (source, keyword, window_start, window_end, priority, max_attempts, batch_id)
+                VALUES %s
+                ON CONFLICT (source, keyword, window_start, window_end) WHERE status IN ('queued', 'running')
+                DO NOTHING
+                RETURNING id
+                """,
+                rows,
+                page_size=1000,
+                fetch=True,
+            )
+        return len(inserted)
+
+    def claim(self, worker_id: str, lease_seconds: float, limit: int = 1) -> List[CrawlJob]:
+        with self._cursor() as cur:
+            cur.execute(_REAP_SQL)
+            cur.execute(_CLAIM_SQL, {"limit": limit, "owner": worker_id, "lease": lease_seconds})
+            jobs = [CrawlJob.from_row(row) for row in cur.fetchall()]
+        return sorted(jobs, key=lambda job: (-job.priority, job.id))
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        with self._cursor() as cur:
+            cur.execute(_HEARTBEAT_SQL, {"id": job_id, "owner": worker_id, "lease": lease_seconds})
+            return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        import psycopg2.extras
+
+        with self._cursor() as cur:
+            cur.execute(_COMPLETE_SQL, {"id": job_id, "owner": worker_id, "result": psycopg2.extras.Json(result)})
+            return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        with self._cursor() as cur:
+            cur.execute(_FAIL_SQL, {
+                "id": job_id, "owner": worker_id, "error": error[:2000],
+                "base": RETRY_BASE_SECONDS, "cap": RETRY_CAP_SECONDS,
+            })
+            row = cur.fetchone()
+        return row["status"] if row else None
+
+    def stats(self, batch_id: Optional[str] = None) -> Dict[str, int]:
+        with self._cursor() as cur:
+            if batch_id:
+                cur.execute("SELECT status, COUNT(*) AS n FROM crawl_jobs WHERE batch_id = %s GROUP BY status", (batch_id,))
+            else:
+                cur.execute("SELECT status, COUNT(*) AS n FROM crawl_jobs GROUP BY status")
+            counts = {row["status"]: row["n"] for row in cur.fetchall()}
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+
+    def list_jobs(self, batch_id: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> List[CrawlJob]:
+        clauses, params = [], []
+        if batch_id:
+            clauses.append("batch_id = %s")
+            params.append(batch_id)
+        if status:
+            clauses.append("status = %s")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._cursor() as cur:
+            cur.execute(f"SELECT {_JOB_COLUMNS} FROM crawl_jobs {where} ORDER BY id DESC LIMIT %s", (*params, limit))
+            return [CrawlJob.from_row(row) for row in cur.fetchall()]
+
+
+class InMemoryJobQueue(JobQueue):
+    """PostgresJobQueue와 같은 상태 전이를 메모리에서 구현 (테스트 / REPOSITORY_BACKEND=memory)"""
+
+    def __init__(self, clock: Optional[Callable[[], datetime]] = None):
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._jobs: Dict[int, CrawlJob] = {}
+        self._available_at: Dict[int, datetime] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _active_units(self) -> set:
+        return {job.unit for job in self._jobs.values() if job.status in (QUEUED, RUNNING)}
+
+    def enqueue(self, units: Iterable[CrawlUnit], priority: int = 0, batch_id: Optional[str] = None, max_attempts: int = 3) -> int:
+        with self._lock:
+            active = self._active_units()
+            count = 0
+            for unit in units:
+                if unit in active:
+                    continue
+                job = CrawlJob(self._next_id, unit.source, unit.keyword, unit.window_start, unit.window_end,
+                               QUEUED, priority=priority, max_attempts=max_attempts, batch_id=batch_id)
+                self._jobs[job.id] = job
+                self._available_at[job.id] = self.clock()
+                self._next_id += 1
+                active.add(unit)
+                count += 1
+            return count
+
+    def _release(self, job: CrawlJob, error: str, now: datetime, delay: float = 0.0) -> str:
+        job.status = FAILED if job.attempts >= job.max_attempts else QUEUED
+        job.last_error = error
+        job.lease_owner = None
+        job.lease_expires_at = None
+        self._available_at[job.id] = now + timedelta(seconds=delay)
+        return job.status
+
+    def claim(self, worker_id: str, lease_seconds: float, limit: int = 1) -> List[CrawlJob]:
+        with self._lock:
+            now = self.clock()
+            for job in self._jobs.values():
+                if job.status == RUNNING and job.lease_expires_at < now:
+                    self._release(job, f"lease expired (worker {job.lease_owner})", now)
+
+            ready = sorted(
+                (job for job in self._jobs.values() if job.status == QUEUED and self._available_at[job.id] <= now),
+                key=lambda job: (-job.priority, self._available_at[job.id], job.id),
+            )[:limit]
+            for job in ready:
+                job.status = RUNNING
+                job.attempts += 1
+                job.lease_owner = worker_id
+                job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+            return [CrawlJob.from_row({n: getattr(job, n) for n in CrawlJob.__dataclass_fields__}) for job in ready]
+
+    def _owned(self, job_id: int, worker_id: str) -> Optional[CrawlJob]:
+        job = self._jobs.get(job_id)
+        return job if job is not None and job.status == RUNNING and job.lease_owner == worker_id else None
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            job = self._owned(job_id, worker_id)
+            if job is None:
+                return False
+            job.lease_expires_at = self.clock() + timedelta(seconds=lease_seconds)
+            return True
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        with self._lock:
+            job = self._owned(job_id, worker_id)
+            if job is None:
+                return False
+            job.status = SUCCEEDED
+            job.result = result
+            job.lease_owner = None
+            job.lease_expires_at = None
+            return True
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        with self._lock:
+            job = self._owned(job_id, worker_id)
+            if job is None:
+                return None
+            return self._release(job, error, self.clock(), retry_delay(job.attempts))
+
+    def stats(self, batch_id: Optional[str] = None) -> Dict[str, int]:
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+            for job in self._jobs.values():
+                if batch_id is None or job.batch_id == batch_id:
+                    counts[job.status] += 1
+            return counts
+
+    def list_jobs(self, batch_id: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> List[CrawlJob]:
+        with self._lock:
+            jobs = [
+                job for job in sorted(self._jobs.values(), key=lambda job: -job.id)
+                if (batch_id is None or job.batch_id == batch_id) and (status is None or job.status == status)
+            ]
+            return jobs[:limit]
+
+
+def create_job_queue() -> Optional[JobQueue]:
+    """DATABASE_URL → PostgresJobQueue, REPOSITORY_BACKEND=memory → InMemoryJobQueue, 둘 다 없으면 None"""
+    dsn = os.getenv("DATABASE_URL")
+    if dsn:
+        return PostgresJobQueue(dsn)
+    if os.getenv("REPOSITORY_BACKEND", "").lower() == "memory":
+        return InMemoryJobQueue()
+    return None
+
+
+# =====================================================
+# Worker
+# =====================================================
+
+Handler = Callable[[CrawlJob], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class Worker:
+    """
+    대기열 → handler 실행 (최대 concurrency개 동시), 실행 중 heartbeat로 lease 연장
+    DB 호출은 asyncio.to_thread로 실행 (브라우저 이벤트 루프 blocking 방지)
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Handler,
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        lease_seconds: float = 300.0,
+        heartbeat_seconds: float = 60.0,
+        poll_seconds: float = 5.0,
+    ):
+        if heartbeat_seconds >= lease_seconds:
+            raise ValueError("heartbeat_seconds must be shorter than lease_seconds")
+        self.queue = queue
+        self.handler = handler
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.processed: Dict[str, int] = {SUCCEEDED: 0, FAILED: 0, QUEUED: 0, "lease_lost": 0}
+
+    async def _heartbeat(self, job: CrawlJob, task: asyncio.Task):
+        while not task.done():
+            await asyncio.sleep(self.heartbeat_seconds)
+            if task.done():
+                return
+            try:
+                alive = await asyncio.to_thread(self.queue.heartbeat, job.id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                # 일시적 DB 오류는 다음 주기에 재시도 (lease 만료 전까지 여유)
+                logger.warning(f"Heartbeat failed for job {job.id}: {e}")
+                continue
+            if not alive:
+                logger.warning(f"Lease lost for job {job.id}, cancelling")
+                task.cancel()
+                return
+
+    async def process(self, job: CrawlJob) -> str:
+        """작업 1건 실행 → 최종 상태 (succeeded / queued(재시도) / failed / lease_lost)"""
+        logger.info(f"[{self.worker_id}] job {job.id}: {job.source} '{job.keyword}' {job.window_start}~{job.window_end} (attempt {job.attempts})")
+        task = asyncio.ensure_future(self.handler(job))
+        beat = asyncio.ensure_future(self._heartbeat(job, task))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if beat.done():
+                outcome = "lease_lost"
+            else:
+                raise
+        except Exception as e:
+            outcome = await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, f"{type(e).__name__}: {e}") or "lease_lost"
+            logger.error(f"Job {job.id} failed ({outcome}): {e}")
+        else:
+            done = await asyncio.to_thread(self.queue.complete, job.id, self.worker_id, result)
+            outcome = SUCCEEDED if done else "lease_lost"
+        finally:
+            beat.cancel()
+        self.processed[outcome] += 1
+        return outcome
+
+    async def run(self, stop: Optional[asyncio.Event] = None, max_jobs: Optional[int] = None):
+        """stop 설정 또는 max_jobs 처리 시 종료 (진행 중인 작업은 완료까지 대기)"""
+        stop = stop or asyncio.Event()
+        running: set = set()
+        started = 0
+        while not stop.is_set() and (max_jobs is None or started < max_jobs):
+            free = self.concurrency - len(running)
+            if max_jobs is not None:
+                free = min(free, max_jobs - started)
+            jobs = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds, free) if free > 0 else []
+            for job in jobs:
+                running.add(asyncio.ensure_future(self.process(job)))
+            started += len(jobs)
+
+            if running and (jobs or len(running) >= self.concurrency):
+                _, running = await asyncio.wait(running, timeout=self.poll_seconds, return_when=asyncio.FIRST_COMPLETED)
+            elif not jobs:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        if running:
+            await asyncio.wait(running)
+
+
+def kepco_handler(crawler) -> Handler:
+    """
+    작업 1건 = KEPCO 키워드 1개 × 날짜 구간 검색 (worker 수명 동안 브라우저 재사용)
+    strict: 검색 / 날짜 필터 / 그리드 실패는 예외 → 0건 성공이 아니라 재시도 / 실패 처리
+    """
+    try:
+        from kepco.crawler import SearchConfig
+    except ImportError:
+        from crawlers.kepco.crawler import SearchConfig
+
+    async def handle(job: CrawlJob) -> Dict[str, Any]:
+        if job.source != "KEPCO":
+            raise ValueError(f"Unsupported source: {job.source}")
+        config = SearchConfig(
+            keywords=[job.keyword],
+            start_date=job.window_start.strftime("%Y/%m/%d"),
+            end_date=job.window_end.strftime("%Y/%m/%d"),
+            strict=True,
+        )
+        results = await crawler.search(config)
+        return {"count": len(results), "tender_numbers": [r.announcement_no for r in results]}
+
+    return handle
+
+
+# =====================================================
+# CLI
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl job queue (crawl_jobs)")
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="Postgres DSN (default: DATABASE_URL)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Split a date range into keyword × window × source jobs")
+    enqueue.add_argument("--keyword", "-k", action="append", required=True)
+    enqueue.add_argument("--source", action="append", default=None, help="Source (default: KEPCO)")
+    enqueue.add_argument("--start", type=date.fromisoformat, required=True)
+    enqueue.add_argument("--end", type=date.fromisoformat, default=date.today())
+    enqueue.add_argument("--window-days", type=int, default=7)
+    enqueue.add_argument("--priority", type=int, default=0)
+    enqueue.add_argument("--max-attempts", type=int, default=3)
+    enqueue.add_argument("--batch-id")
+
+    worker = sub.add_parser("worker", help="Pull and run jobs until interrupted")
+    worker.add_argument("--concurrency", type=int, default=int(os.getenv("WORKER_CONCURRENCY", "1")))
+    worker.add_argument("--lease-seconds", type=float, default=300.0)
+    worker.add_argument("--heartbeat-seconds", type=float, default=60.0)
+    worker.add_argument("--poll-seconds", type=float, default=5.0)
+    worker.add_argument("--max-jobs", type=int)
+    worker.add_argument("--headed", action="store_true", help="Show browser window")
+
+    stats = sub.add_parser("stats", help="Job counts by status")
+    stats.add_argument("--batch-id")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    if not args.dsn:
+        raise SystemExit("DATABASE_URL (or --dsn) required")
+    queue = PostgresJobQueue(args.dsn)
+
+    if args.command == "enqueue":
+        units = plan_units(args.source or ["KEPCO"], args.keyword, args.start, args.end, args.window_days)
+        count = queue.enqueue(units, priority=args.priority, batch_id=args.batch_id, max_attempts=args.max_attempts)
+        print(f"Enqueued {count} / {len(units)} jobs")
+    elif args.command == "stats":
+        print(queue.stats(args.batch_id))
+    else:
+        try:
+            from kepco.crawler import KEPCOCrawler
+        except ImportError:
+            from crawlers.kepco.crawler import KEPCOCrawler
+
+        async def _run():
+            async with KEPCOCrawler(headless=not args.headed) as crawler:
+                w = Worker(
+                    queue, kepco_handler(crawler),
+                    concurrency=args.concurrency,
+                    lease_seconds=args.lease_seconds,
+                    heartbeat_seconds=args.heartbeat_seconds,
+                    poll_seconds=args.poll_seconds,
+                )
+                logger.info(f"Worker {w.worker_id} started")
+                await w.run(max_jobs=args.max_jobs)
+                logger.info(f"Worker {w.worker_id} finished: {w.processed}")
+
+        asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
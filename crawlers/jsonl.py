@@ -0,0 +1,174 @@
+"""
+JSONL(NDJSON) 스트리밍 출력 — 결과 1건 = 1줄, 생성 즉시 기록
+
+- JsonlWriter: 레코드마다 한 줄 append + flush (tail -f로 진행 중 결과 확인 가능, 중단 시 기록분 보존)
+  .gz 경로면 gzip (재시작 시 기존 파일은 회전 후 새 파일, 평문은 이어 쓰기)
+  max_bytes / max_records 초과 시 회전: 닫은 파일을 <이름>.<시각>.jsonl[.gz]로 os.replace → 새 파일
+- iter_jsonl: 회전된 파일(오래된 순) → 현재 파일 순서로 한 줄씩 지연 읽기
+  중단으로 잘린 마지막 줄 / gzip 꼬리는 건너뜀 (경고 로그)
+
+사용법:
+    with JsonlWriter("output/kepco_v4_results.jsonl.gz", max_bytes=64 << 20) as writer:
+        crawler.on_result = writer.write
+    for record in iter_jsonl("output/kepco_v4_results.jsonl.gz"):
+        ...
+"""
+import os
+import io
+import glob
+import gzip
+import json
+import zlib
+import logging
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JSONL_ROTATE_BYTES = int(os.getenv("JSONL_ROTATE_BYTES", str(64 << 20)))
+
+
+def _split(path: str) -> Tuple[str, str]:
+    """'out/results.jsonl.gz' → ('out/results', '.jsonl.gz')"""
+    for suffix in (".jsonl.gz", ".ndjson.gz", ".jsonl", ".ndjson", ".gz"):
+        if path.endswith(suffix):
+            return path[:-len(suffix)], suffix
+    return os.path.splitext(path)
+
+
+def _line(record: Any) -> bytes:
+    if is_dataclass(record) and not isinstance(record, type):
+        record = asdict(record)
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class JsonlWriter:
+    """한 줄씩 append하는 JSONL 파일 (스레드 안전)"""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = JSONL_ROTATE_BYTES,
+        max_records: Optional[int] = None,
+        flush_every: int = 1,
+    ):
+        self.path = path
+        self.compressed = path.endswith(".gz")
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.flush_every = max(1, flush_every)
+        self.records = 0            # 현재 파일 기록 건수 (이번 실행분)
+        self.total = 0              # 이번 실행 전체 기록 건수
+        self.rotated: List[str] = []
+        self._written = 0           # 현재 파일 크기 (압축 전 기준)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._file: Optional[io.BufferedIOBase] = None
+        self._open()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        existing = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if existing and self.compressed:
+            # 이전 실행의 gzip 꼬리가 잘렸을 수 있음 → 이어 쓰지 않고 회전 (뒤 member까지 읽지 못하게 되는 것 방지)
+            self._move_aside()
+            existing = 0
+        elif existing:
+            with open(self.path, "rb") as f:      # 이전 실행이 줄 중간에 중단됐으면 줄바꿈부터
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    with open(self.path, "ab") as fix:
+                        fix.write(b"\n")
+        self._file = gzip.open(self.path, "ab") if self.compressed else open(self.path, "ab")
+        self._written = existing
+        self.records = 0
+
+    def write(self, record: Any):
+        data = _line(record)
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"JsonlWriter closed: {self.path}")
+            self._file.write(data)
+            self._written += len(data)
+            self.records += 1
+            self.total += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+            if (self.max_bytes and self._written >= self.max_bytes) or (self.max_records and self.records >= self.max_records):
+                self._rotate()
+
+    def _flush(self):
+        # gzip은 Z_SYNC_FLUSH → 지금까지 기록분을 바로 해제 가능
+        self._file.flush()
+        self._pending = 0
+
+    def _move_aside(self) -> str:
+        stem, suffix = _split(self.path)
+        target = f"{stem}.{datetime.now().strftime('%Y%m%dT%H%M%S%f')}{suffix}"
+        os.replace(self.path, target)
+        self.rotated.append(target)
+        logger.info(f"Rotated {self.path} → {target}")
+        return target
+
+    def _rotate(self) -> str:
+        self._file.close()
+        self._file = None
+        target = self._move_aside()
+        self._open()
+        return target
+
+    def rotate(self) -> Optional[str]:
+        """현재 파일을 닫고 회전 (비어 있으면 생략)"""
+        with self._lock:
+            if self._file is None or self._written == 0:
+                return None
+            return self._rotate()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def jsonl_files(path: str) -> List[str]:
+    """회전된 파일(이름의 시각 순) + 현재 파일"""
+    stem, suffix = _split(path)
+    rotated = sorted(p for p in glob.glob(f"{glob.escape(stem)}.*{suffix}") if p != path and p.endswith(suffix)
+                     and os.path.basename(p)[len(os.path.basename(stem)) + 1:-len(suffix)].isalnum())
+    return rotated + ([path] if os.path.exists(path) else [])
+
+
+def _lines(path: str) -> Iterator[bytes]:
+    if not path.endswith(".gz"):
+        with open(path, "rb") as f:
+            yield from f
+        return
+    with gzip.open(path, "rb") as f:
+        try:
+            yield from f
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            logger.warning(f"{path}: truncated gzip stream ({e}), stopping at last complete record")
+
+
+def iter_jsonl(path: str, include_rotated: bool = True) -> Iterator[Dict[str, Any]]:
+    """레코드 지연 읽기 (한 줄씩, 전체를 메모리에 올리지 않음)"""
+    for file_path in jsonl_files(path) if include_rotated else [path]:
+        for number, raw in enumerate(_lines(file_path), 1):
+            if not raw.strip():
+                continue
+            try:
+                yield json.loads(raw)
+            except json.JSONDecodeError:
+                logger.warning(f"{file_path}:{number}: skipping incomplete record")
@@ -6,9 +6,11 @@ Browser Agent 탐색 결과 기반 개선:
 - 동적 ID 패턴 대응 (textfield-XXXX-inputEl)
 - ExtJS 로딩 마스크 대기
 - 첨부파일 탭 (공고문) 접근
+- 세션(storage_state) 재사용으로 랜딩 시퀀스 생략
 
 사용법:
     python crawler.py --keyword "유연탄" --headed
+    python crawler.py backfill --keyword "유연탄" --start 2022-01-01 --end 2024-12-31
 """
 import os
 import asyncio
@@ -17,8 +19,8 @@ import json
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import List, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional, Set
+from dataclasses import dataclass, asdict, replace
 from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -26,14 +28,22 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 # Import Repository Integration
 try:
     # Local development (run from workflow_n8n/ root)
-    from crawlers.dto import TenderDTO, TenderSpecDTO, TenderSource, TenderStatus
-    from crawlers.repository import SupabaseRepository
-    from crawlers.kepco.parser import HWPParser
+    from crawlers.dto import RawPayload, TenderAttachmentDTO, TenderDTO, TenderSource, TenderStatus
+    from crawlers.repository import BaseRepository, create_repository
+    from crawlers.parsers.factory import ParserFactory
+    from crawlers.tracing import traced, CRAWL_RESULTS
+    from crawlers.backfill import Backfill, checkpoint_path_for, kepco_fetcher
+    from crawlers.columnar import ColumnarStore, kepco_rows
+    from crawlers.jsonl import JsonlWriter
 except ImportError:
     # Docker container (run from /app/)
-    from dto import TenderDTO, TenderSpecDTO, TenderSource, TenderStatus
-    from repository import SupabaseRepository
-    from kepco.parser import HWPParser
+    from dto import RawPayload, TenderAttachmentDTO, TenderDTO, TenderSource, TenderStatus
+    from repository import BaseRepository, create_repository
+    from parsers.factory import ParserFactory
+    from tracing import traced, CRAWL_RESULTS
+    from backfill import Backfill, checkpoint_path_for, kepco_fetcher
+    from columnar import ColumnarStore, kepco_rows
+    from jsonl import JsonlWriter
 
 # Load environment variables
 load_dotenv()
@@ -58,6 +68,7 @@ class SearchConfig:
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     max_results: int = 100
+    strict: bool = False        # 검색 / 날짜 필터 / 결과 파싱 실패를 빈 결과로 삼키지 않고 예외 (backfill 구간 FAILED 기록용)
     
     @classmethod
     def default(cls):
@@ -70,9 +81,9 @@ class SearchConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TenderResult:
-    """입찰 공고 결과"""
+    """입찰 공고 결과 (불변 / __slots__)"""
     announcement_no: str
     title: str
     organization: str
@@ -102,6 +113,8 @@ class KEPCOCrawler:
     
     BASE_URL = "https://srm.kepco.net"
     SEARCH_URL = "https://srm.kepco.net/index.do"
+    # 검색 결과 그리드 1페이지만 파싱 (넓은 기간은 backfill 구간 분할)
+    GRID_ROW_CAP = 50
     
     # 발견된 동적 ID 패턴 (숫자 부분은 변동됨)
     SELECTOR_PATTERNS = {
@@ -133,20 +146,38 @@ class KEPCOCrawler:
         "download_button": ".x-btn-text:has-text('공고문저장')",
     }
     
-    def __init__(self, headless: bool = True, download_dir: str = "downloads"):
+    # 저장된 세션 유효 기간 (만료 시 전체 네비게이션 수행)
+    SESSION_TTL = timedelta(hours=6)
+    
+    def __init__(
+        self,
+        headless: bool = True,
+        download_dir: str = "downloads",
+        session_dir: str = "data",
+        reuse_session: bool = True,
+        repo: Optional[BaseRepository] = None,
+        on_result: Optional[Callable[["TenderResult"], None]] = None,
+    ):
         self.headless = headless
         self.download_dir = download_dir
         self.browser: Optional[Browser] = None
         self.playwright = None
         
-        # Initialize Supabase Repository
-        url = os.getenv("SUPABASE_URL")
-        key = os.getenv("SUPABASE_KEY")
-        self.repo = SupabaseRepository(url, key) if url and key else None
+        # 세션 재사용 설정 (storage_state + 통합공고 진입 정보)
+        self.reuse_session = reuse_session
+        self.session_dir = session_dir
+        self.storage_state_path = os.path.join(session_dir, "kepco_storage_state.json")
+        self.session_meta_path = os.path.join(session_dir, "kepco_session.json")
+        
+        # Initialize Repository (주입 없으면 환경 변수 기반: Supabase / in-memory / record-replay)
+        self.repo = repo if repo is not None else create_repository()
         
         if not self.repo:
             logger.warning("Supabase URL/KEY not found in env. Data will not be saved to DB.")
 
+        # 결과 1건마다 호출 (JSONL 스트리밍 기록 등) - 키워드 검색 완료 시점, 재시도 시 공고번호 기준 중복 생략
+        self.on_result = on_result
+
         
     async def __aenter__(self):
         await self.start()
@@ -155,6 +186,7 @@ class KEPCOCrawler:
     async def __aexit__(self, *args):
         await self.close()
     
+    @traced("kepco", "start")
     async def start(self):
         """브라우저 시작 - 스텔스 설정"""
         self.playwright = await async_playwright().start()
@@ -177,16 +209,158 @@ class KEPCOCrawler:
             await self.playwright.stop()
         logger.info("Browser closed")
     
-    async def _create_context(self):
-        """브라우저 컨텍스트 생성"""
+    async def _create_context(self, storage_state: Optional[str] = None):
+        """브라우저 컨텍스트 생성 (저장된 storage_state 있으면 복원)"""
         return await self.browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080},
             locale="ko-KR",
             timezone_id="Asia/Seoul",
             accept_downloads=True,
+            storage_state=storage_state,
         )
     
+    # =====================================================
+    # 세션 재사용
+    # =====================================================
+    
+    def _load_session(self) -> Optional[dict]:
+        """저장된 세션 메타데이터 로드 (없거나 만료되면 None)"""
+        if not self.reuse_session:
+            return None
+        if not (os.path.exists(self.session_meta_path) and os.path.exists(self.storage_state_path)):
+            return None
+        
+        try:
+            with open(self.session_meta_path, "r", encoding="utf-8") as f:
+                session = json.load(f)
+            saved_at = datetime.fromisoformat(session["saved_at"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Session metadata unreadable: {e}")
+            return None
+        
+        if datetime.now() - saved_at > self.SESSION_TTL:
+            logger.info("Saved session expired")
+            return None
+        return session
+    
+    async def _save_session(self, context, page: Page, menu_item_id: Optional[str]):
+        """storage_state 및 통합공고 진입 정보 저장"""
+        if not self.reuse_session:
+            return
+        
+        try:
+            os.makedirs(self.session_dir, exist_ok=True)
+            await context.storage_state(path=self.storage_state_path)
+            session = {
+                "deep_link": page.url,
+                "menu_item_id": menu_item_id,
+                "saved_at": datetime.now().isoformat(),
+            }
+            with open(self.session_meta_path, "w", encoding="utf-8") as f:
+                json.dump(session, f, ensure_ascii=False, indent=2)
+            logger.info("Session saved")
+        except Exception as e:
+            logger.warning(f"Session save failed: {e}")
+    
+    def _clear_session(self):
+        """저장된 세션 삭제 (stale 세션 재사용 방지)"""
+        for path in (self.session_meta_path, self.storage_state_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    async def _is_search_ready(self, page: Page, timeout: int = 5000) -> bool:
+        """검색 입력 필드 표시 여부로 통합공고 화면 진입 확인"""
+        try:
+            search_input = page.locator(self.SELECTOR_PATTERNS["search_input"]).first
+            await search_input.wait_for(state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeout:
+            return False
+    
+    async def _restore_search_view(self, page: Page, session: dict) -> bool:
+        """저장된 세션으로 통합공고 화면 직접 진입 (실패 시 False)"""
+        try:
+            logger.info(f"Restoring session: {session['deep_link']}")
+            await page.goto(session["deep_link"], wait_until="domcontentloaded", timeout=30000)
+            await self._wait_for_loading(page)
+            
+            if await self._is_search_ready(page, timeout=3000):
+                return True
+            
+            # 딥링크가 메인 화면이면 메뉴 항목만 바로 클릭 (고정 대기 없음)
+            # 동적 ID가 바뀌었을 수 있으므로 텍스트 셀렉터도 함께 사용
+            selector = self.SELECTOR_PATTERNS["menu_info"]
+            menu_item_id = session.get("menu_item_id")
+            if menu_item_id:
+                selector = f"[id='{menu_item_id}'], {selector}"
+            menu_item = page.locator(selector).first
+            await menu_item.wait_for(state="attached", timeout=5000)
+            await menu_item.dispatch_event("click")
+            await self._wait_for_loading(page)
+            return await self._is_search_ready(page)
+        except Exception as e:
+            logger.debug(f"Session restore failed: {e}")
+        return False
+    
+    @traced("kepco", "open_search_page")
+    async def _open_search_page(self):
+        """통합공고 검색 화면 열기 - 세션 재사용, 실패 시 전체 네비게이션"""
+        session = self._load_session()
+        
+        if session:
+            context = await self._create_context(storage_state=self.storage_state_path)
+            try:
+                page = await context.new_page()
+                restored = await self._restore_search_view(page, session)
+            except Exception:
+                await context.close()
+                raise
+            if restored:
+                logger.info("Landed on 통합공고 via saved session")
+                return context, page
+            
+            logger.info("Saved session is stale, falling back to full navigation")
+            await context.close()
+            self._clear_session()
+        
+        context = await self._create_context()
+        page = None
+        try:
+            page = await context.new_page()
+            
+            # 메인 페이지 접속
+            logger.info(f"Navigating to {self.SEARCH_URL}")
+            await page.goto(self.SEARCH_URL, wait_until="domcontentloaded", timeout=30000)
+            await self._wait_for_loading(page)
+            await asyncio.sleep(3)  # ExtJS 초기화 대기
+            
+            # 통합공고 페이지로 이동
+            menu_item_id = await self._navigate_to_announcements(page)
+        except Exception:
+            # 호출자는 context를 받지 못하므로 여기서 정리
+            if page is not None:
+                await self._error_screenshot(page)
+            await context.close()
+            raise
+        
+        # 검색 화면 진입이 확인된 경우에만 세션 저장 (실패한 화면을 재사용하지 않도록)
+        if await self._is_search_ready(page):
+            await self._save_session(context, page, menu_item_id)
+        else:
+            logger.warning("통합공고 search view not detected after navigation, session not saved")
+        return context, page
+    
+    async def _error_screenshot(self, page: Page):
+        try:
+            timestamp = datetime.now().strftime('%H%M%S')
+            await page.screenshot(path=f"{self.download_dir}/error_{timestamp}.png")
+        except Exception as e:
+            logger.debug(f"Error screenshot failed: {e}")
+    
+    @traced("kepco", "wait_for_loading")
     async def _wait_for_loading(self, page: Page, timeout: int = 10000):
         """ExtJS 로딩 마스크가 사라질 때까지 대기"""
         try:
@@ -195,30 +369,32 @@ class KEPCOCrawler:
         except PlaywrightTimeout:
             pass  # No loading mask or already hidden
     
-    async def _navigate_to_announcements(self, page: Page):
-        """통합공고 페이지로 이동 (정보공개 → 통합공고)"""
+    @traced("kepco", "navigate_to_announcements")
+    async def _navigate_to_announcements(self, page: Page) -> Optional[str]:
+        """통합공고 페이지로 이동 (정보공개 → 통합공고), 클릭한 메뉴 항목 ID 반환"""
         logger.info("Navigating to 통합공고 page...")
+        menu_item_id = None
         
         # 정보공개 메뉴 클릭 시도 (여러 방법)
         try:
             # 방법 1: 메뉴 자바스크립트로 직접 호출
-            await page.evaluate("""
+            menu_item_id = await page.evaluate("""
                 () => {
                     // ExtJS 메뉴 시스템 직접 호출 시도
                     var menuItem = document.querySelector('[id*="menuitem"][id*="itemEl"]');
                     if (menuItem && menuItem.innerText.includes('통합공고')) {
                         menuItem.click();
-                        return true;
+                        return menuItem.id;
                     }
                     // 정보공개 메뉴 찾기
                     var menus = document.querySelectorAll('.x-menu-item-text');
                     for (var m of menus) {
                         if (m.innerText.includes('통합공고')) {
                             m.click();
-                            return true;
+                            return m.id || (m.closest('[id]') || {}).id || null;
                         }
                     }
-                    return false;
+                    return null;
                 }
             """)
         except Exception as e:
@@ -227,56 +403,74 @@ class KEPCOCrawler:
         # 페이지 로딩 대기
         await self._wait_for_loading(page)
         await asyncio.sleep(2)  # ExtJS 렌더링 대기
+        return menu_item_id
     
+    async def search(self, config: SearchConfig) -> List[TenderResult]:
+        """입찰 공고 검색 (키워드마다 on_result 전달, 전달한 공고번호는 재시도에서도 다시 보내지 않음)"""
+        return await self._search(config, set())
+
+    def _emit(self, results: List[TenderResult], emitted: Set[str]):
+        if not self.on_result:
+            return
+        for result in results:
+            if result.announcement_no not in emitted:
+                emitted.add(result.announcement_no)
+                self.on_result(result)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type((PlaywrightTimeout, Exception)),
         before_sleep=lambda rs: logger.warning(f"Retry attempt {rs.attempt_number}")
     )
-    async def search(self, config: SearchConfig) -> List[TenderResult]:
-        """입찰 공고 검색"""
+    @traced("kepco", "search")
+    async def _search(self, config: SearchConfig, emitted: Set[str]) -> List[TenderResult]:
         if not self.browser:
             await self.start()
         
         all_results = []
-        context = await self._create_context()
-        page = await context.new_page()
+        context = None
         
         try:
-            # 메인 페이지 접속
-            logger.info(f"Navigating to {self.SEARCH_URL}")
-            await page.goto(self.SEARCH_URL, wait_until="domcontentloaded", timeout=30000)
-            await self._wait_for_loading(page)
-            await asyncio.sleep(3)  # ExtJS 초기화 대기
-            
-            # 통합공고 페이지로 이동
-            await self._navigate_to_announcements(page)
+            # 통합공고 화면 진입 (저장된 세션 우선, 실패 시 context는 _open_search_page에서 정리)
+            context, page = await self._open_search_page()
             
             # 각 키워드로 검색
             for keyword in config.keywords:
                 logger.info(f"Searching: {keyword}")
                 results = await self._search_keyword(page, keyword, config)
-                
-                for r in results:
-                    r.keyword_matched = keyword
-                    
                 all_results.extend(results)
+                self._emit(results, emitted)
                 logger.info(f"Found {len(results)} results for '{keyword}'")
                 
         except Exception as e:
             logger.error(f"Crawling error: {e}")
-            timestamp = datetime.now().strftime('%H%M%S')
-            await page.screenshot(path=f"{self.download_dir}/error_{timestamp}.png")
+            self._clear_session()  # 재시도 시 전체 네비게이션
+            if context is not None:
+                await self._error_screenshot(page)
             raise
             
         finally:
-            await context.close()
+            if context is not None:
+                await context.close()
+            await asyncio.to_thread(self._refresh_summary)     # 동기 HTTP 호출 → 이벤트 루프 차단 방지
         
         # 중복 제거
         unique = {r.announcement_no: r for r in all_results}
+        CRAWL_RESULTS.labels("KEPCO").inc(len(unique))
         return list(unique.values())
     
+    def _refresh_summary(self):
+        """배치 저장 후 대시보드 집계 갱신 (변경 없으면 DB에서 생략, 실패해도 크롤링 결과는 유지)"""
+        if not self.repo:
+            return
+        try:
+            if self.repo.refresh_tender_summary():
+                logger.info("Dashboard summary refreshed")
+        except Exception as e:
+            logger.warning(f"Dashboard summary refresh failed: {e}")
+
+    @traced("kepco", "search_keyword")
     async def _search_keyword(self, page: Page, keyword: str, config: SearchConfig) -> List[TenderResult]:
         """키워드로 검색 - 동적 ID 패턴 대응"""
         results = []
@@ -296,7 +490,11 @@ class KEPCOCrawler:
                     if count >= 2:
                         await date_inputs.nth(0).fill(config.start_date)
                         await date_inputs.nth(1).fill(config.end_date or datetime.now().strftime("%Y/%m/%d"))
+                    elif config.strict:
+                        raise RuntimeError(f"Date inputs not found ({count})")
                 except Exception as e:
+                    if config.strict:
+                        raise
                     logger.debug(f"Date filter skipped: {e}")
             
             # 조회 버튼 클릭
@@ -313,14 +511,17 @@ class KEPCOCrawler:
             await asyncio.sleep(2)
             
             # 결과 파싱
-            results = await self._parse_results(page)
+            results = await self._parse_results(page, keyword, strict=config.strict)
             
         except Exception as e:
+            if config.strict:
+                raise
             logger.warning(f"Search error for '{keyword}': {e}")
         
         return results
     
-    async def _parse_results(self, page: Page) -> List[TenderResult]:
+    @traced("kepco", "parse_results")
+    async def _parse_results(self, page: Page, keyword: str = "", strict: bool = False) -> List[TenderResult]:
         """검색 결과 파싱 - 그리드에서 데이터 추출 및 DB 저장"""
         results = []
         
@@ -330,7 +531,7 @@ class KEPCOCrawler:
             row_count = await rows.count()
             logger.debug(f"Found {row_count} grid rows")
             
-            for i in range(min(row_count, 50)):
+            for i in range(min(row_count, self.GRID_ROW_CAP)):
                 row = rows.nth(i)
                 cells = row.locator(self.SELECTOR_PATTERNS["grid_cells"])
                 
@@ -351,7 +552,7 @@ class KEPCOCrawler:
                             close_date=texts[5] if len(texts) > 5 else "",
                             status=texts[6] if len(texts) > 6 else "",
                             detail_url=f"{self.BASE_URL}/notice/{texts[0]}",
-                            keyword_matched="",
+                            keyword_matched=keyword,
                             crawled_at=datetime.now().isoformat(),
                             attachments=[]
                         )
@@ -378,7 +579,7 @@ class KEPCOCrawler:
                                     bid_clse_dt=bid_clse_dt,
                                     bid_ntce_dtl_url=tender_result.detail_url,
                                     status=TenderStatus.OPEN, # Default, logic can be improved
-                                    raw_api_response=asdict(tender_result)
+                                    raw_api_response=RawPayload.from_record(tender_result)
                                 )
                                 self.repo.upsert_tender(dto)
                                 logger.info(f"Saved to DB: {tender_result.announcement_no}")
@@ -386,40 +587,39 @@ class KEPCOCrawler:
                                 logger.error(f"DB Save Error: {db_err}")
 
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Parse Result Error: {e}")
 
         return results
 
+    @traced("kepco", "process_attachments")
     async def process_attachments(self, tender_id: str, file_paths: List[str]):
-        """첨부파일(HWP) 처리 및 스펙 추출"""
+        """첨부파일(HWP/PDF/XLSX/DOCX) 처리 및 스펙 추출"""
         if not self.repo:
             return
 
-        parser = HWPParser()
         for path in file_paths:
-            if not os.path.exists(path):
+            if not os.path.exists(path) or not ParserFactory.supports(path):
                 continue
-                
-            if path.lower().endswith('.hwp'):
-                try:
-                    logger.info(f"Parsing HWP: {path}")
-                    text = parser.extract_text(path)
-                    specs = parser.parse_specs(text)
-                    
-                    if specs:
-                        logger.info(f"Extracted Specs: {specs}")
-                        # DTO 생성
-                        spec_dto = TenderSpecDTO(
-                            tender_id=tender_id,
-                            calorific_value=specs.get("gcv"),
-                            sulfur_content=specs.get("sulfur"),
-                            ash_content=specs.get("ash"),
-                            moisture_content=specs.get("moisture"),
-                            volatile_matter=specs.get("volatile"),
-                        )
-                        self.repo.upsert_tender_spec(spec_dto)
-                except Exception as e:
-                    logger.error(f"HWP Parsing failed for {path}: {e}")
+
+            try:
+                logger.info(f"Parsing attachment: {path}")
+                parser = ParserFactory.get_parser(path)
+                # 파싱은 CPU 작업 → 이벤트 루프 밖에서
+                document = await asyncio.to_thread(parser.parse, path)
+                self.repo.upsert_attachment(TenderAttachmentDTO(
+                    tender_id=tender_id,
+                    file_name=os.path.basename(path),
+                    file_type=document.file_type,
+                    extracted_text=document.full_text,
+                    is_parsed=True,
+                ))
+                if document.coal_spec:
+                    logger.info(f"Extracted Specs: {document.coal_spec}")
+                    self.repo.upsert_tender_spec(document.coal_spec.to_tender_spec(tender_id))
+            except Exception as e:
+                logger.error(f"Attachment parsing failed for {path}: {e}")
 
 
 # =====================================================
@@ -431,11 +631,38 @@ def main():
     parser.add_argument("--keyword", "-k", action="append", default=[])
     parser.add_argument("--days", "-d", type=int, default=30)
     parser.add_argument("--output", "-o", type=str, default="output")
+    parser.add_argument("--format", choices=["json", "jsonl", "parquet", "ipc"], default="json",
+                        help="jsonl: stream results to <output>/kepco_v4_results.jsonl once each search succeeds; "
+                             "parquet/ipc: append to <output>/columnar/tenders (source/month partitions)")
+    parser.add_argument("--gzip", action="store_true", help="Compress JSONL output (.jsonl.gz)")
     parser.add_argument("--headed", action="store_true", help="Show browser window")
+    parser.add_argument("--no-session", action="store_true", help="Disable session reuse (always full navigation)")
+
+    sub = parser.add_subparsers(dest="command")
+    backfill = sub.add_parser("backfill", help="Crawl a long date range in adaptive windows with checkpoints")
+    # SUPPRESS: 서브커맨드 앞에 준 전역 옵션 값을 기본값으로 덮어쓰지 않음 (-k 석탄 --headed backfill ...)
+    backfill.add_argument("--keyword", "-k", action="append", default=argparse.SUPPRESS)
+    backfill.add_argument("--start", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date())
+    backfill.add_argument("--end", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(), default=datetime.now().date())
+    backfill.add_argument("--initial-days", type=int, default=14)
+    backfill.add_argument("--max-days", type=int, default=90)
+    backfill.add_argument("--concurrency", type=int, default=2)
+    backfill.add_argument("--resume", metavar="BACKFILL_ID", help="Continue from data/backfill/<id>.json")
+    backfill.add_argument("--jsonl", action="store_true",
+                          help="Stream results to <output>/kepco_backfill_<id>.jsonl (one batch per finished window, tail while running)")
+    backfill.add_argument("--output", "-o", type=str, default=argparse.SUPPRESS)
+    backfill.add_argument("--gzip", action="store_true", default=argparse.SUPPRESS, help="Compress JSONL output (.jsonl.gz)")
+    backfill.add_argument("--headed", action="store_true", default=argparse.SUPPRESS, help="Show browser window")
+    backfill.add_argument("--no-session", action="store_true", default=argparse.SUPPRESS,
+                          help="Disable session reuse (always full navigation)")
     
     args = parser.parse_args()
     
     keywords = args.keyword if args.keyword else ["유연탄", "석탄", "연료탄"]
+
+    if args.command == "backfill":
+        _backfill(args, keywords)
+        return
     
     end = datetime.now()
     start = end - timedelta(days=args.days)
@@ -452,12 +679,34 @@ def main():
     logger.info(f"Date range: {config.start_date} ~ {config.end_date}")
     
     async def _run():
-        async with KEPCOCrawler(headless=not args.headed) as crawler:
+        os.makedirs(args.output, exist_ok=True)
+        if args.format == "jsonl":
+            output_file = f"{args.output}/kepco_v4_results.jsonl" + (".gz" if args.gzip else "")
+            # 키워드별 검색 → 결과는 키워드 완료마다 기록, 전체 목록은 들고 있지 않음
+            total, seen = 0, set()
+            with JsonlWriter(output_file) as writer:
+                def write(result: TenderResult):
+                    nonlocal total
+                    if result.announcement_no not in seen:
+                        seen.add(result.announcement_no)
+                        total += 1
+                        writer.write(result)
+                async with KEPCOCrawler(headless=not args.headed, reuse_session=not args.no_session, on_result=write) as crawler:
+                    for keyword in keywords:
+                        await crawler.search(replace(config, keywords=[keyword]))
+            logger.info(f"Total results: {total} (streamed to: {output_file})")
+            return
+
+        async with KEPCOCrawler(headless=not args.headed, reuse_session=not args.no_session) as crawler:
             results = await crawler.search(config)
             
             logger.info(f"Total results: {len(results)}")
             
-            os.makedirs(args.output, exist_ok=True)
+            if args.format != "json":
+                store = ColumnarStore(os.path.join(args.output, "columnar"), args.format)
+                partitions = store.append("tenders", kepco_rows(results))
+                logger.info(f"Appended to: {store.root}/tenders ({partitions})")
+                return
             output_file = f"{args.output}/kepco_v4_results.json"
             with open(output_file, "w", encoding="utf-8") as f:
                 json.dump([asdict(r) for r in results], f, ensure_ascii=False, indent=2)
@@ -466,5 +715,37 @@ def main():
     asyncio.run(_run())
 
 
+def _backfill(args, keywords: List[str]):
+    """backfill 서브커맨드: 구간별 크롤링 → 진행 상황 checkpoint → coverage 리포트 출력"""
+    async def _run():
+        async with KEPCOCrawler(headless=not args.headed, reuse_session=not args.no_session) as crawler:
+            fetch = kepco_fetcher(crawler)
+            if args.resume:
+                job = Backfill.resume(checkpoint_path_for(args.resume), fetch, concurrency=args.concurrency)
+            else:
+                if args.start is None:
+                    raise SystemExit("--start (or --resume) required")
+                job = Backfill(
+                    fetch, keywords, args.start, args.end,
+                    result_cap=KEPCOCrawler.GRID_ROW_CAP,
+                    initial_days=args.initial_days,
+                    max_days=args.max_days,
+                    concurrency=args.concurrency,
+                )
+                job.checkpoint_path = checkpoint_path_for(job.id)
+            logger.info(f"Backfill {job.id} (checkpoint: {job.checkpoint_path})")
+            if not args.jsonl:
+                return await job.run()
+            # resume 시 같은 파일에 이어 기록
+            output_file = f"{args.output}/kepco_backfill_{job.id}.jsonl" + (".gz" if args.gzip else "")
+            with JsonlWriter(output_file) as writer:
+                crawler.on_result = writer.write
+                logger.info(f"Streaming results to: {output_file}")
+                return await job.run()
+
+    report = asyncio.run(_run())
+    logger.info(f"Backfill {report['id']} {report['status']}: coverage {report['coverage']:.1%}, {report['results']} results")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
 if __name__ == "__main__":
     main()
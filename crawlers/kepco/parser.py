@@ -4,6 +4,11 @@ import logging
 import re
 from typing import Optional, Dict
 
+try:
+    from crawlers.tracing import traced
+except ImportError:
+    from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 class HWPParser:
@@ -16,6 +21,7 @@ class HWPParser:
     def __init__(self):
         pass
 
+    @traced("parser", "hwp.extract_text")
     def extract_text(self, file_path: str) -> str:
         """HWP 파일에서 텍스트 추출 (PrvText 우선, BodyText 시도)"""
         try:
@@ -57,6 +63,7 @@ class HWPParser:
             logger.error(f"Text extraction failed: {e}")
             return ""
 
+    @traced("parser", "hwp.parse_specs")
     def parse_specs(self, text: str) -> Dict[str, str]:
         """텍스트에서 석탄 규격 추출"""
         specs = {}
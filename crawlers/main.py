@@ -1,23 +1,146 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
-from datetime import datetime
+import json
+import logging
+import asyncio
+import threading
+from datetime import date, datetime, timedelta
 
 # Import crawlers
 # from g2b.crawler import G2BCrawler (Disabled)
 from kepco.crawler import KEPCOCrawler, SearchConfig
+from tracing import render_metrics, METRICS_CONTENT_TYPE
+from repository import BaseRepository, create_repository
+from search import SpecIndex, TenderSearch
+from dto import TenderFilter
+from pagination import (
+    TENDER_COLUMNS, TENDER_HEAVY_COLUMNS, TENDER_KEY_COLUMNS,
+    etag, etag_matches, paginate_attachments, paginate_tenders, projection,
+)
+from summary import DashboardSummary
+from delta import TenderDeltaIndex
+from scheduler import CrawlScheduler, ScheduleEntry, SingleFlight, load_schedule
+from jobqueue import JobQueue, create_job_queue, plan_units
+from backfill import Backfill, checkpoint_path_for, kepco_fetcher
+from scoring import TenderScorer, create_scorer, score_pending
 
 app = FastAPI(title="CarbonFlow Crawler API")
 
+# 대시보드(브라우저)에서 목록 API 직접 호출
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",") if o.strip()],
+    allow_methods=["GET", "POST"],
+    allow_headers=["If-None-Match"],
+    expose_headers=["ETag"],
+)
+
 class SearchRequest(BaseModel):
     keyword: str
     days: int = 30
+    delta: bool = False     # True: 신규/변경 공고만 응답 (n8n 알림 분기)
+
+class SimilarSpecRequest(BaseModel):
+    cv_min_kcal: Optional[int] = None
+    cv_max_kcal: Optional[int] = None
+    cv_basis: Optional[str] = None
+    sulfur_max_pct: Optional[float] = None
+    ash_max_pct: Optional[float] = None
+    moisture_max_pct: Optional[float] = None
+    quantity_mt: Optional[float] = None
+    incoterms: Optional[str] = None
+    origin: Optional[str] = None
+    k: int = 10
+    exclude_tender_ids: List[str] = []
+    same_incoterms: bool = False
+    require_cv_overlap: bool = False
+
+class CrawlJobsRequest(BaseModel):
+    keywords: List[str]
+    start_date: date
+    end_date: Optional[date] = None
+    window_days: int = 7
+    sources: List[str] = ["KEPCO"]
+    priority: int = 0
+    batch_id: Optional[str] = None
+
+class BackfillRequest(BaseModel):
+    keywords: List[str] = []
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    initial_days: int = 14
+    max_days: int = 90
+    concurrency: int = 2
+    resume_id: Optional[str] = None     # 지정 시 checkpoint에서 재개
+
+# 공유 Repository (crawler 쓰기가 같은 인스턴스의 listener로 인덱스에 반영되도록)
+_repo: Optional[BaseRepository] = None
+_spec_index: Optional[SpecIndex] = None
+_tender_search: Optional[TenderSearch] = None
+_delta_index: Optional[TenderDeltaIndex] = None
+_scheduler: Optional[CrawlScheduler] = None
+_job_queue: Optional[JobQueue] = None
+_scorer: Optional[TenderScorer] = None
+# 실행 중 / 완료된 backfill (재시작 후에는 checkpoint 파일에서 조회)
+_backfills: dict = {}
+_backfill_tasks: set = set()    # 이벤트 루프는 task를 약한 참조로만 보관 → 실행 중 GC 방지
+# 스케줄 실행과 수동 /crawl/kepco 호출이 같은 키워드를 동시에 크롤링하지 않도록 공유
+_single_flight = SingleFlight()
+_state_lock = threading.Lock()
+
+def get_repository() -> Optional[BaseRepository]:
+    global _repo
+    with _state_lock:
+        if _repo is None:
+            _repo = create_repository()
+        return _repo
+
+def get_spec_index() -> SpecIndex:
+    """유사 입찰 인덱스 (첫 요청 시 tender_specs 1회 적재, 이후 listener로 증분 갱신)"""
+    global _spec_index
+    repo = get_repository()
+    if repo is None:
+        raise HTTPException(status_code=503, detail="Repository not configured")
+    with _state_lock:
+        if _spec_index is None:
+            _spec_index = SpecIndex.from_repository(repo)
+        return _spec_index
+
+def get_tender_search() -> TenderSearch:
+    """전문 검색 (DB RPC 우선, 없으면 로컬 역색인)"""
+    global _tender_search
+    repo = get_repository()
+    if repo is None:
+        raise HTTPException(status_code=503, detail="Repository not configured")
+    with _state_lock:
+        if _tender_search is None:
+            _tender_search = TenderSearch(repo)
+        return _tender_search
+
+def get_delta_index() -> TenderDeltaIndex:
+    """신규/변경 공고 판정 (첫 요청 시 tenders 키 1회 적재, 이후 listener로 증분 갱신)"""
+    global _delta_index
+    repo = get_repository()
+    if repo is None:
+        raise HTTPException(status_code=503, detail="Repository not configured")
+    with _state_lock:
+        if _delta_index is None:
+            _delta_index = TenderDeltaIndex(repo)
+        return _delta_index
 
 @app.get("/")
 def health_check():
     return {"status": "ok", "service": "carbonflow-crawler"}
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus 메트릭 (단계별 소요 시간 / 호출 수)"""
+    return Response(content=render_metrics(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
 # @app.post("/crawl/g2b")
 # def crawl_g2b(request: SearchRequest):
 #     """G2B 나라장터 공고 검색"""
@@ -37,8 +160,375 @@ async def crawl_kepco(request: SearchRequest):
             start_date=None, # Defaults in crawler
             end_date=None
         )
-        async with KEPCOCrawler(headless=True) as crawler:
-            results = await crawler.search(config)
-            return {"count": len(results), "results": results}
+        with _single_flight.acquire("KEPCO", [request.keyword]) as keywords:
+            if not keywords:
+                raise HTTPException(status_code=409, detail=f"Crawl already running for '{request.keyword}'")
+
+            if request.delta:
+                # 알려진 공고 키는 batch() 진입 시 크롤링 전에 적재
+                delta = get_delta_index()
+                async with KEPCOCrawler(headless=True, repo=get_repository()) as crawler:
+                    with delta.batch() as batch:
+                        results = await crawler.search(config)
+                return {"count": len(results), **batch.to_dict()}
+
+            async with KEPCOCrawler(headless=True, repo=get_repository()) as crawler:
+                results = await crawler.search(config)
+                return {"count": len(results), "results": results}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/specs/similar")
+def similar_specs(request: SimilarSpecRequest):
+    """스펙 기준 유사 과거 입찰 top-k"""
+    options = request.model_dump(include={"exclude_tender_ids", "same_incoterms", "require_cv_overlap"})
+    spec = request.model_dump(exclude={"k", "exclude_tender_ids", "same_incoterms", "require_cv_overlap"})
+    matches = get_spec_index().query(spec, k=request.k, **options)
+    return {"count": len(matches), "results": [m.to_dict() for m in matches]}
+
+@app.get("/tenders/{tender_id}/similar")
+def similar_tenders(tender_id: str, k: int = 10, same_incoterms: bool = False, require_cv_overlap: bool = False):
+    """색인된 입찰 스펙 기준 유사 과거 입찰 top-k"""
+    try:
+        matches = get_spec_index().similar_to_tender(
+            tender_id, k=k, same_incoterms=same_incoterms, require_cv_overlap=require_cv_overlap
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"count": len(matches), "results": [m.to_dict() for m in matches]}
+
+@app.post("/specs/index/rebuild")
+def rebuild_spec_index():
+    """유사 입찰 인덱스 재구축 (외부에서 tender_specs를 직접 수정한 경우)"""
+    global _spec_index
+    with _state_lock:
+        if _spec_index is not None:
+            _spec_index.close()
+            _spec_index = None
+    return {"indexed": len(get_spec_index())}
+
+@app.get("/search")
+def search_tenders(q: str, limit: int = 20, source: Optional[str] = None):
+    """공고명 / 수요기관 / 첨부파일 텍스트 전문 검색 (예: q=유연탄 NAR 5800)"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    results = get_tender_search().search(q, limit=min(max(limit, 1), 100), source=source)
+    return {"count": len(results), "results": results}
+
+def _conditional(request: Request, payload: dict) -> Response:
+    """ETag 응답 (If-None-Match 일치 시 본문 없이 304)"""
+    tag = etag(payload)
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+def _require_repository() -> BaseRepository:
+    repo = get_repository()
+    if repo is None:
+        raise HTTPException(status_code=503, detail="Repository not configured")
+    return repo
+
+@app.get("/tenders")
+def list_tenders(
+    request: Request,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    source: Optional[str] = None,
+    status: Optional[str] = None,
+    dminstt_nm: Optional[str] = None,
+    closing_from: Optional[datetime] = None,
+    closing_to: Optional[datetime] = None,
+    q: Optional[str] = None,
+):
+    """
+    공고 목록 (마감일 최신순 keyset 페이지)
+    fields: 콤마 구분 컬럼 (기본: raw_api_response 제외), status: 콤마 구분 (OPEN,CLOSED)
+    """
+    filters = TenderFilter(
+        source=source,
+        status=[s.strip() for s in status.split(",") if s.strip()] if status else [],
+        dminstt_nm=dminstt_nm,
+        closing_from=closing_from,
+        closing_to=closing_to,
+        title_contains=q,
+    )
+    try:
+        page = paginate_tenders(_require_repository(), filters, fields=fields, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional(request, page.to_dict())
+
+@app.get("/tenders/{tender_id}")
+def get_tender(request: Request, tender_id: str, fields: Optional[str] = None):
+    try:
+        columns = projection(fields, TENDER_COLUMNS, TENDER_HEAVY_COLUMNS, TENDER_KEY_COLUMNS).split(",")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    row = _require_repository().get_tender_by_id(tender_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Tender {tender_id} not found")
+    return _conditional(request, {name: row.get(name) for name in columns})
+
+@app.get("/tenders/{tender_id}/raw")
+def get_tender_raw(request: Request, tender_id: str):
+    """원본 응답 (raw_payloads에서 필요할 때만 조회 / 압축 해제)"""
+    payload = _require_repository().get_tender_raw_payload(tender_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Raw payload for tender {tender_id} not found")
+    return _conditional(request, payload.to_dict())
+
+@app.get("/tenders/{tender_id}/attachments")
+def list_tender_attachments(
+    request: Request,
+    tender_id: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """첨부파일 목록 (기본: extracted_text 제외)"""
+    try:
+        page = paginate_attachments(_require_repository(), tender_id, fields=fields, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional(request, page.to_dict())
+
+@app.get("/dashboard/summary")
+def dashboard_summary(request: Request, source: Optional[str] = None, top: int = 10):
+    """대시보드 KPI (tender_summary 집계 행 합산, 전체 tenders 스캔 없음)"""
+    rows = _require_repository().get_tender_summary(source=source)
+    return _conditional(request, DashboardSummary.from_rows(rows, top_n=min(max(top, 1), 50)).to_dict())
+
+@app.get("/dashboard/deadlines")
+def dashboard_deadlines(request: Request, limit: int = 10, source: Optional[str] = None):
+    """마감 임박 OPEN 공고 (마감일 오름차순)"""
+    columns = "id,bid_ntce_no,bid_ntce_nm,dminstt_nm,bid_clse_dt,source,status"
+    rows = _require_repository().list_upcoming_deadlines(limit=min(max(limit, 1), 100), source=source, columns=columns)
+    return _conditional(request, {"count": len(rows), "items": rows})
+
+@app.post("/dashboard/summary/refresh")
+def refresh_dashboard_summary(force: bool = False):
+    """집계 갱신 (크롤링 배치 후 자동 호출, 변경 없으면 생략)"""
+    return {"refreshed": _require_repository().refresh_tender_summary(force=force)}
+
+def get_scorer() -> TenderScorer:
+    """관련도 점수 (로컬 모델 + GEMINI_API_KEY 있으면 애매한 공고만 LLM)"""
+    global _scorer
+    with _state_lock:
+        if _scorer is None:
+            _scorer = create_scorer()
+        return _scorer
+
+def get_job_queue() -> JobQueue:
+    """crawl_jobs 대기열 (DATABASE_URL, 처리는 crawler-worker 컨테이너)"""
+    global _job_queue
+    with _state_lock:
+        if _job_queue is None:
+            _job_queue = create_job_queue()
+        if _job_queue is None:
+            raise HTTPException(status_code=503, detail="Job queue not configured (DATABASE_URL)")
+        return _job_queue
+
+# =====================================================
+# Scheduler (SCHEDULER_ENABLED=1)
+# =====================================================
+
+async def _run_scheduled_crawl(entry: ScheduleEntry, keywords: List[str]) -> dict:
+    """스케줄 실행: 크롤러 직접 호출, 이력에는 건수와 신규/변경 공고 번호만 보관"""
+    if entry.source != "KEPCO":
+        raise ValueError(f"Unsupported schedule source: {entry.source}")
+    end = datetime.now()
+    config = SearchConfig(
+        keywords=keywords,
+        start_date=(end - timedelta(days=entry.days)).strftime("%Y/%m/%d"),
+        end_date=end.strftime("%Y/%m/%d"),
+    )
+    repo = get_repository()
+    async with KEPCOCrawler(headless=True, repo=repo) as crawler:
+        if not (entry.delta and repo is not None):
+            result = {"count": len(await crawler.search(config))}
+        else:
+            with get_delta_index().batch() as batch:
+                results = await crawler.search(config)
+            delta = batch.to_dict()
+            result = {
+                "count": len(results),
+                "new_tenders_count": delta["new_tenders_count"],
+                "changed_tenders_count": delta["changed_tenders_count"],
+                "tender_numbers": [item["tender_number"] for item in delta["results"]],
+            }
+    if repo is not None:
+        result["scoring"] = await _score_new_tenders(repo)
+    return result
+
+async def _score_new_tenders(repo: BaseRepository) -> Optional[dict]:
+    """크롤링 후 관련도 점수 (실패해도 크롤링 결과는 유지)"""
+    try:
+        return await asyncio.to_thread(score_pending, repo, get_scorer())
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Relevance scoring failed: {e}")
+        return None
+
+def _nearest_deadline(source: str) -> Optional[datetime]:
+    repo = get_repository()
+    if repo is None:
+        return None
+    rows = repo.list_upcoming_deadlines(limit=1, source=source, columns="bid_clse_dt")
+    return datetime.fromisoformat(rows[0]["bid_clse_dt"]) if rows else None
+
+def _require_scheduler() -> CrawlScheduler:
+    if _scheduler is None:
+        raise HTTPException(status_code=503, detail="Scheduler not enabled (SCHEDULER_ENABLED=1)")
+    return _scheduler
+
+@app.on_event("startup")
+async def start_scheduler():
+    global _scheduler
+    if os.getenv("SCHEDULER_ENABLED", "").lower() not in ("1", "true", "yes"):
+        return
+    _scheduler = CrawlScheduler(
+        load_schedule(os.getenv("SCHEDULE_FILE")),
+        runner=_run_scheduled_crawl,
+        deadline_probe=_nearest_deadline,
+        single_flight=_single_flight,
+        max_concurrent=int(os.getenv("SCHEDULER_MAX_CONCURRENT", "1")),
+        state_path=os.getenv("SCHEDULER_STATE_PATH") or None,
+    )
+    await _scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    if _scheduler is not None:
+        await _scheduler.stop()
+
+@app.get("/scheduler/jobs")
+def scheduler_jobs():
+    scheduler = _require_scheduler()
+    next_runs = scheduler.next_runs()
+    return {
+        "running": [{"source": source, "keyword": keyword} for source, keyword in _single_flight.active()],
+        "jobs": [{**entry.to_dict(), "next_run": next_runs.get(name)} for name, entry in scheduler.entries.items()],
+    }
+
+@app.get("/scheduler/runs")
+def scheduler_runs(limit: int = 50, entry: Optional[str] = None):
+    runs = _require_scheduler().runs(limit=min(max(limit, 1), 200), entry=entry)
+    return {"count": len(runs), "runs": runs}
+
+@app.post("/scheduler/jobs/{name}/run", status_code=202)
+async def trigger_scheduled_crawl(name: str):
+    try:
+        record = _require_scheduler().trigger(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Schedule {name} not found")
+    return record.to_dict()
+
+# =====================================================
+# Relevance scoring (python -m scoring)
+# =====================================================
+
+@app.post("/scoring/run")
+def run_scoring(limit: int = 500):
+    """relevance_score가 없는 공고 점수 매기기"""
+    return score_pending(_require_repository(), get_scorer(), limit=min(max(limit, 1), 5000))
+
+@app.get("/scoring/stats")
+def scoring_stats():
+    scorer = get_scorer()
+    return {
+        "model_trained": scorer.model.trained,
+        "llm_enabled": scorer.llm is not None,
+        "cache_entries": len(scorer.cache),
+        "counts": dict(scorer.stats),
+    }
+
+# =====================================================
+# Job queue (python -m jobqueue worker)
+# =====================================================
+
+@app.post("/jobs/crawl", status_code=202)
+def enqueue_crawl_jobs(req: CrawlJobsRequest):
+    """기간을 keyword × 날짜 구간 × source 작업으로 나눠 등록 (이미 대기/실행 중인 단위는 건너뜀)"""
+    try:
+        units = plan_units(req.sources, req.keywords, req.start_date, req.end_date or date.today(), req.window_days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    queue = get_job_queue()
+    enqueued = queue.enqueue(units, priority=req.priority, batch_id=req.batch_id)
+    return {"planned": len(units), "enqueued": enqueued, "batch_id": req.batch_id}
+
+@app.get("/jobs/stats")
+def crawl_job_stats(batch_id: Optional[str] = None):
+    return get_job_queue().stats(batch_id)
+
+@app.get("/jobs")
+def list_crawl_jobs(batch_id: Optional[str] = None, status: Optional[str] = None, limit: int = 50):
+    jobs = get_job_queue().list_jobs(batch_id=batch_id, status=status, limit=min(max(limit, 1), 200))
+    return {"count": len(jobs), "jobs": [job.to_dict() for job in jobs]}
+
+# =====================================================
+# Backfill (python -m kepco.crawler backfill)
+# =====================================================
+
+async def _run_backfill(job: Backfill):
+    try:
+        async with KEPCOCrawler(headless=True, repo=get_repository()) as crawler:
+            job.fetch = kepco_fetcher(crawler)
+            await job.run()
+    except Exception as e:
+        # 브라우저 시작 실패 등 run() 이전 오류도 상태에 반영 (같은 id로 재개 가능)
+        logging.getLogger(__name__).error(f"Backfill {job.id} failed: {e}")
+        if job.status == "running":
+            job.status = "interrupted"
+            job.save()
+
+@app.post("/backfill", status_code=202)
+async def start_backfill(req: BackfillRequest):
+    """긴 기간 backfill을 백그라운드로 시작 (진행 상황은 GET /backfill/{id})"""
+    running = _backfills.get(req.resume_id)
+    if running is not None and running.status == "running":
+        raise HTTPException(status_code=409, detail=f"Backfill {req.resume_id} already running")
+    try:
+        if req.resume_id:
+            path = checkpoint_path_for(req.resume_id)
+            if not os.path.exists(path):
+                raise HTTPException(status_code=404, detail=f"Backfill {req.resume_id} not found")
+            job = Backfill.resume(path, fetch=None, concurrency=min(max(req.concurrency, 1), 4))
+        else:
+            if not req.keywords or req.start_date is None:
+                raise HTTPException(status_code=400, detail="keywords and start_date required")
+            job = Backfill(
+                None, req.keywords, req.start_date, req.end_date or date.today(),
+                result_cap=KEPCOCrawler.GRID_ROW_CAP,
+                initial_days=req.initial_days,
+                max_days=req.max_days,
+                concurrency=min(max(req.concurrency, 1), 4),
+            )
+            job.checkpoint_path = checkpoint_path_for(job.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job.status = "running"
+    _backfills[job.id] = job
+    task = asyncio.create_task(_run_backfill(job))
+    _backfill_tasks.add(task)
+    task.add_done_callback(_backfill_tasks.discard)
+    return job.report()
+
+@app.get("/backfill/{backfill_id}")
+def get_backfill(backfill_id: str):
+    """진행 상황 / coverage 리포트"""
+    job = _backfills.get(backfill_id)
+    if job is None:
+        try:
+            path = checkpoint_path_for(backfill_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not os.path.exists(path):
+            raise HTTPException(status_code=404, detail=f"Backfill {backfill_id} not found")
+        job = Backfill.resume(path, fetch=None)
+        with open(path, encoding="utf-8") as f:
+            job.status = json.load(f).get("status", "interrupted")
+    return job.report()
@@ -0,0 +1,7 @@
+"""
+시장 데이터 (market_data) 시계열 조회 / 일괄 적재
+"""
+from .store import MarketDataStore, MarketSeries
+from .importer import MarketDataImporter, ImportStats, normalize_index
+
+__all__ = ['MarketDataStore', 'MarketSeries', 'MarketDataImporter', 'ImportStats', 'normalize_index']
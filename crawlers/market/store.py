@@ -0,0 +1,244 @@
+"""
+market_data 시계열 저장소
+지수별 시계열을 열(column) 배열로 적재하여 구간 조회 / as-of 조회 / 롤링 통계 / 지수 간 스프레드를 벡터 연산으로 처리
+
+- 지수별 1회 조회 후 캐시, upsert_market_data 시 해당 지수 캐시 무효화 (repository listener)
+- 롤링 통계는 관측치(행) 기준 window, 누적합으로 O(n)
+- 결측값은 NaN (가격/환율/운임 중 일부만 있는 행 허용)
+"""
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+try:
+    from tracing import traced
+except ImportError:
+    from crawlers.tracing import traced
+
+DateLike = Union[date, datetime, str, np.datetime64]
+
+# 열 이름 → market_data 컬럼
+COLUMNS = {"price": "price_usd", "fx": "fx_rate_krw", "freight": "freight_rate"}
+
+# 전체 기간 조회 범위
+_MIN_DATE = date(1900, 1, 1)
+_MAX_DATE = date(9999, 12, 31)
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        value = value[:10]      # ISO 타임스탬프(시간대 포함)는 날짜만 사용
+    return np.datetime64(value, "D")
+
+
+def _to_days(values: Iterable[DateLike]) -> np.ndarray:
+    return np.array([_to_day(v) for v in values], dtype="datetime64[D]")
+
+
+def _rolling_sums(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """window 구간 (합, 제곱합, 유효 개수) — NaN 제외"""
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    def windowed(a: np.ndarray) -> np.ndarray:
+        c = np.concatenate(([0.0], np.cumsum(a)))
+        end = np.arange(1, len(a) + 1)
+        return c[end] - c[np.maximum(end - window, 0)]
+
+    return windowed(filled), windowed(filled ** 2), windowed(valid.astype(np.float64))
+
+
+@dataclass(slots=True)
+class MarketSeries:
+    """단일 지수 시계열 (data_date 오름차순, 날짜 중복 없음)"""
+    index_name: str
+    dates: np.ndarray           # datetime64[D]
+    price: np.ndarray           # price_usd
+    fx: np.ndarray              # fx_rate_krw
+    freight: np.ndarray         # freight_rate
+
+    @classmethod
+    def from_rows(cls, index_name: str, rows: Sequence[Dict[str, Any]]) -> "MarketSeries":
+        rows = sorted(rows, key=lambda r: str(r["data_date"]))
+
+        def column(name: str) -> np.ndarray:
+            return np.array([np.nan if r.get(name) is None else float(r[name]) for r in rows], dtype=np.float64)
+
+        return cls(
+            index_name=index_name,
+            dates=_to_days(r["data_date"] for r in rows),
+            price=column("price_usd"),
+            fx=column("fx_rate_krw"),
+            freight=column("freight_rate"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown market column: {name} (expected one of {sorted(COLUMNS)})")
+        return getattr(self, name)
+
+    def between(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> "MarketSeries":
+        """[start, end] 구간 (배열 view, 복사 없음)"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _to_day(start), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, _to_day(end), side="right"))
+        return MarketSeries(self.index_name, self.dates[lo:hi], self.price[lo:hi], self.fx[lo:hi], self.freight[lo:hi])
+
+    def asof_index(self, when: Iterable[DateLike], max_staleness_days: Optional[int] = None) -> np.ndarray:
+        """각 시점 이전(당일 포함) 마지막 관측 위치, 없거나 너무 오래되면 -1"""
+        targets = _to_days(when)
+        idx = np.searchsorted(self.dates, targets, side="right") - 1
+        if max_staleness_days is not None and len(self.dates):
+            stale = (targets - self.dates[np.maximum(idx, 0)]).astype(np.int64) > max_staleness_days
+            idx = np.where(stale, -1, idx)
+        return idx
+
+    def asof(self, when: Iterable[DateLike], column: str = "price", max_staleness_days: Optional[int] = None) -> np.ndarray:
+        """as-of 조인 (예: 입찰 마감일 기준 가격), 값이 없으면 NaN"""
+        idx = self.asof_index(when, max_staleness_days)
+        values = self.column(column)
+        if not len(values):
+            return np.full(len(idx), np.nan)
+        return np.where(idx >= 0, values[np.maximum(idx, 0)], np.nan)
+
+    def asof_row(self, when: DateLike, max_staleness_days: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """단일 시점 as-of 행 (market_data row 형식)"""
+        i = int(self.asof_index([when], max_staleness_days)[0])
+        if i < 0:
+            return None
+
+        def value(a: np.ndarray) -> Optional[float]:
+            return None if np.isnan(a[i]) else float(a[i])
+
+        return {
+            "data_date": str(self.dates[i]),
+            "index_name": self.index_name,
+            "price_usd": value(self.price),
+            "fx_rate_krw": value(self.fx),
+            "freight_rate": value(self.freight),
+        }
+
+    def rolling_mean(self, window: int, column: str = "price", min_periods: Optional[int] = None) -> np.ndarray:
+        """최근 window개 관측치 평균 (유효값이 min_periods 미만이면 NaN)"""
+        total, _, count = _rolling_sums(self.column(column), window)
+        min_periods = window if min_periods is None else min_periods
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count >= max(min_periods, 1), total / count, np.nan)
+
+    def log_returns(self, column: str = "price") -> np.ndarray:
+        """연속 관측 간 log 수익률 (첫 값은 NaN)"""
+        values = self.column(column)
+        out = np.full(len(values), np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[1:] = np.diff(np.log(values))
+        return out
+
+    def rolling_vol(
+        self,
+        window: int,
+        column: str = "price",
+        annualize: Optional[int] = None,
+        min_periods: Optional[int] = None,
+    ) -> np.ndarray:
+        """log 수익률의 롤링 표준편차 (표본, ddof=1), annualize=252 등이면 연율화"""
+        total, squares, count = _rolling_sums(self.log_returns(column), window)
+        min_periods = window if min_periods is None else min_periods
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (squares - total ** 2 / count) / (count - 1)
+            vol = np.sqrt(np.maximum(variance, 0.0))
+        vol = np.where(count >= max(min_periods, 2), vol, np.nan)
+        return vol * np.sqrt(annualize) if annualize else vol
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self.asof_row(self.dates[-1]) if len(self.dates) else None
+
+
+class MarketDataStore:
+    """
+    Repository 위의 market_data 캐시
+
+    사용법:
+        store = MarketDataStore(repo)
+        nc = store.series("Newcastle")
+        prices = nc.asof([t["bid_clse_dt"] for t in tenders])
+        vol30 = nc.rolling_vol(30, annualize=252)
+        spread = store.spread("Newcastle", "ICI4")
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._cache: Dict[str, MarketSeries] = {}
+        self._lock = threading.Lock()
+        self._version = 0       # 무효화 횟수 (조회 중 무효화된 결과는 캐시하지 않음)
+        self.loads = 0
+        repo.add_market_data_listener(self.invalidate)
+
+    def close(self):
+        self.repo.remove_market_data_listener(self.invalidate)
+
+    def invalidate(self, index_names: Optional[Set[str]] = None):
+        """지정 지수(없으면 전체) 캐시 제거"""
+        with self._lock:
+            self._version += 1
+            if index_names is None:
+                self._cache.clear()
+            else:
+                for name in index_names:
+                    self._cache.pop(name, None)
+
+    @traced("market", "load")
+    def load(self, index_names: Optional[List[str]] = None) -> Dict[str, MarketSeries]:
+        """지정 지수(없으면 전체)를 1회 조회(페이지 단위)로 적재"""
+        with self._lock:
+            version = self._version
+        if index_names:
+            rows = self.repo.get_market_data_between(_MIN_DATE, _MAX_DATE, index_names)
+        else:
+            rows = self.repo.list_market_data()
+        grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in index_names or []}
+        for row in rows:
+            grouped.setdefault(row["index_name"], []).append(row)
+
+        loaded = {name: MarketSeries.from_rows(name, group) for name, group in grouped.items()}
+        with self._lock:
+            self.loads += 1
+            if version == self._version:
+                self._cache.update(loaded)
+        return loaded
+
+    def series(self, index_name: str) -> MarketSeries:
+        with self._lock:
+            cached = self._cache.get(index_name)
+        if cached is not None:
+            return cached
+        return self.load([index_name])[index_name]
+
+    def between(self, index_name: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> MarketSeries:
+        return self.series(index_name).between(start, end)
+
+    def asof(self, index_name: str, when: Iterable[DateLike], column: str = "price", max_staleness_days: Optional[int] = None) -> np.ndarray:
+        return self.series(index_name).asof(when, column, max_staleness_days)
+
+    def spread(
+        self,
+        index_a: str,
+        index_b: str,
+        column: str = "price",
+        asof: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (날짜, a - b)
+        asof=False: 두 지수 모두 관측된 날짜만, asof=True: a의 날짜에 b를 as-of로 맞춤
+        """
+        a, b = self.series(index_a), self.series(index_b)
+        if asof:
+            return a.dates, a.column(column) - b.asof(a.dates, column)
+        dates, ia, ib = np.intersect1d(a.dates, b.dates, assume_unique=True, return_indices=True)
+        return dates, a.column(column)[ia] - b.column(column)[ib]
@@ -0,0 +1,530 @@
+"""
+In-Memory Repository
+SupabaseRepository와 동일한 인터페이스/제약조건(UNIQUE, FK, NOT NULL)을 메모리에서 구현
+- 네트워크 없이 테스트 및 크롤러/파서 부하 실험
+- 메서드 호출 수(calls)와 Supabase 기준 쿼리 왕복 수(queries)를 집계하여 N+1 패턴 감지
+"""
+import uuid
+import functools
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from dto import RawPayload, TenderDTO, TenderAttachmentDTO, TenderSpecDTO, ShipmentDTO, DemurrageCalcDTO, MarketDataDTO, NetbackSimulationDTO, TenderFilter
+    from repository import BaseRepository, _enum_value, _group_by_columns, _iso
+    from summary import SUMMARY_KEY_COLUMNS, SUMMARY_TZ, aggregate_tenders, summary_key
+    from payloads import decode_row
+except ImportError:
+    from crawlers.dto import RawPayload, TenderDTO, TenderAttachmentDTO, TenderSpecDTO, ShipmentDTO, DemurrageCalcDTO, MarketDataDTO, NetbackSimulationDTO, TenderFilter
+    from crawlers.repository import BaseRepository, _enum_value, _group_by_columns, _iso
+    from crawlers.summary import SUMMARY_KEY_COLUMNS, SUMMARY_TZ, aggregate_tenders, summary_key
+    from crawlers.payloads import decode_row
+
+
+class IntegrityError(ValueError):
+    """스키마 제약조건 위반 (UNIQUE / FOREIGN KEY / NOT NULL)"""
+
+
+def _counted(func):
+    """public 메서드 호출 수 집계"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self.calls[func.__name__] += 1
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+class InMemoryRepository(BaseRepository):
+    """
+    메모리 기반 Repository
+    제약조건은 supabase/migrations/001_initial_schema.sql, 007_raw_payloads.sql 기준
+    """
+
+    UNIQUE_KEYS: Dict[str, List[Tuple[str, ...]]] = {
+        "tenders": [("source", "bid_ntce_no", "bid_ntce_ord")],
+        "market_data": [("data_date", "index_name")],
+    }
+
+    # table → (column, referenced table)
+    FOREIGN_KEYS: Dict[str, List[Tuple[str, str]]] = {
+        "tenders": [("raw_payload_hash", "raw_payloads")],
+        "tender_attachments": [("tender_id", "tenders")],
+        "tender_specs": [("tender_id", "tenders")],
+        "demurrage_calculations": [("shipment_id", "shipments")],
+        "netback_simulations": [("tender_id", "tenders")],
+    }
+
+    NOT_NULL: Dict[str, List[str]] = {
+        "tenders": ["bid_ntce_no", "bid_ntce_nm", "source"],
+        "tender_attachments": ["file_name"],
+        "shipments": ["vessel_name"],
+        "market_data": ["data_date", "index_name"],
+        "netback_simulations": ["simulation_date"],
+    }
+
+    # updated_at 트리거가 있는 테이블
+    UPDATED_AT_TABLES = {"tenders", "tender_specs", "shipments"}
+
+    def __init__(self):
+        super().__init__()
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        # (table, unique columns) → {key: id}
+        self._unique: Dict[Tuple[str, Tuple[str, ...]], Dict[tuple, str]] = defaultdict(dict)
+        # (table, fk column) → {value: {id, ...}}
+        self._fk_index: Dict[Tuple[str, str], Dict[Any, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self.calls: Counter = Counter()
+        self.queries: Counter = Counter()
+        # tender_summary materialized view (refresh 전까지 이전 집계 유지)
+        self._summary: List[Dict[str, Any]] = []
+        self._summary_dirty = False
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.queries.clear()
+
+    # =====================================================
+    # Table primitives (Supabase 요청 1건 = query 1회로 집계)
+    # =====================================================
+
+    def _select(self, table: str, **filters: Any) -> List[Dict[str, Any]]:
+        self.queries[(table, "select")] += 1
+        rows = self.tables[table]
+
+        # PK / FK 컬럼 필터는 인덱스 사용
+        candidates: Iterable[str] = rows.keys()
+        for column, value in filters.items():
+            if column == "id":
+                candidates = [value] if value in rows else []
+                break
+            if (table, column) in self._fk_index:
+                candidates = self._fk_index[(table, column)].get(value, ())
+                break
+
+        return [
+            dict(rows[row_id]) for row_id in candidates
+            if all(rows[row_id].get(col) == val for col, val in filters.items())
+        ]
+
+    def _insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        self.queries[(table, "insert")] += 1
+        return self._write(table, row, conflict=None)
+
+    def _insert_many(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.queries[(table, "insert")] += 1
+        # PostgREST 다건 insert는 한 트랜잭션 → 전체 검증 후 기록
+        for row in rows:
+            self._check_not_null(table, row)
+            self._check_foreign_keys(table, row)
+        return [self._write(table, row, conflict=None) for row in rows]
+
+    def _upsert_many(self, table: str, rows: List[Dict[str, Any]], on_conflict: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        self.queries[(table, "upsert")] += 1
+        for row in rows:
+            self._check_not_null(table, row)
+            self._check_foreign_keys(table, row)
+        return [self._write(table, row, conflict=on_conflict or ("id",)) for row in rows]
+
+    def _upsert(self, table: str, row: Dict[str, Any], on_conflict: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        self.queries[(table, "upsert")] += 1
+        return self._write(table, row, conflict=on_conflict or ("id",))
+
+    def _write(self, table: str, row: Dict[str, Any], conflict: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+        rows = self.tables[table]
+        self._check_not_null(table, row)
+        self._check_foreign_keys(table, row)
+
+        # 충돌 대상 row 결정
+        existing_id = None
+        if conflict == ("id",):
+            existing_id = row.get("id") if row.get("id") in rows else None
+        elif conflict:
+            existing_id = self._unique[(table, conflict)].get(tuple(row.get(c) for c in conflict))
+
+        row_id = existing_id or row.get("id") or str(uuid.uuid4())
+        self._check_unique(table, row, row_id)
+
+        now = datetime.now().isoformat()
+        if existing_id:
+            old = rows[existing_id]
+            self._unindex(table, old)
+            new = {**old, **row, "id": existing_id}
+            if table in self.UPDATED_AT_TABLES:
+                new["updated_at"] = now
+        else:
+            new = {**row, "id": row_id, "created_at": now}
+            if table in self.UPDATED_AT_TABLES:
+                new["updated_at"] = now
+
+        rows[row_id] = new
+        self._index(table, new)
+        return dict(new)
+
+    def _check_not_null(self, table: str, row: Dict[str, Any]):
+        for column in self.NOT_NULL.get(table, []):
+            if column in row and row[column] is None:
+                raise IntegrityError(f'null value in column "{column}" of relation "{table}"')
+
+    def _check_foreign_keys(self, table: str, row: Dict[str, Any]):
+        for column, ref_table in self.FOREIGN_KEYS.get(table, []):
+            value = row.get(column)
+            if value and value not in self.tables[ref_table]:
+                raise IntegrityError(f'insert or update on table "{table}" violates foreign key "{column}"')
+
+    def _check_unique(self, table: str, row: Dict[str, Any], row_id: str):
+        current = self.tables[table].get(row_id, {})
+        for columns in self.UNIQUE_KEYS.get(table, []):
+            key = tuple(row.get(c, current.get(c)) for c in columns)
+            owner = self._unique[(table, columns)].get(key)
+            if owner and owner != row_id:
+                raise IntegrityError(f'duplicate key value violates unique constraint {table}{columns}')
+
+    def _index(self, table: str, row: Dict[str, Any]):
+        for columns in self.UNIQUE_KEYS.get(table, []):
+            self._unique[(table, columns)][tuple(row.get(c) for c in columns)] = row["id"]
+        for column, _ in self.FOREIGN_KEYS.get(table, []):
+            self._fk_index[(table, column)][row.get(column)].add(row["id"])
+
+    def _unindex(self, table: str, row: Dict[str, Any]):
+        for columns in self.UNIQUE_KEYS.get(table, []):
+            self._unique[(table, columns)].pop(tuple(row.get(c) for c in columns), None)
+        for column, _ in self.FOREIGN_KEYS.get(table, []):
+            self._fk_index[(table, column)][row.get(column)].discard(row["id"])
+
+    # =====================================================
+    # Tenders
+    # =====================================================
+
+    @_counted
+    def upsert_tender(self, tender: TenderDTO) -> Dict[str, Any]:
+        conflict = ("source", "bid_ntce_no", "bid_ntce_ord")
+        key = (_enum_value(tender.source), tender.bid_ntce_no, tender.bid_ntce_ord)
+        previous_id = self._unique[("tenders", conflict)].get(key)
+        previous = self.tables["tenders"].get(previous_id) if previous_id else None
+
+        row = self._write_tender(tender, lambda data: self._upsert("tenders", data, on_conflict=conflict))
+        # 004_dashboard_summary.sql 트리거와 동일: 신규 또는 집계 컬럼 변경 시에만 dirty
+        if previous is None or summary_key(previous) != summary_key(row):
+            self._summary_dirty = True
+        self._notify("tenders", [row])
+        return row
+
+    @_counted
+    def get_tender_by_id(self, tender_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("tenders", id=tender_id)
+        return rows[0] if rows else None
+
+    @_counted
+    def get_tender_by_notice_no(self, source: str, bid_ntce_no: str, bid_ntce_ord: str = "00") -> Optional[Dict[str, Any]]:
+        rows = self._select("tenders", source=source, bid_ntce_no=bid_ntce_no, bid_ntce_ord=bid_ntce_ord)
+        return rows[0] if rows else None
+
+    @staticmethod
+    def _is_missing_payload(error: Exception) -> bool:
+        return isinstance(error, IntegrityError) and 'foreign key "raw_payload_hash"' in str(error)
+
+    def _insert_raw_payload(self, row: Dict[str, Any]):
+        # ON CONFLICT (content_hash) DO NOTHING
+        self.queries[("raw_payloads", "upsert")] += 1
+        self.tables["raw_payloads"].setdefault(row["content_hash"], {**row, "id": row["content_hash"]})
+
+    @_counted
+    def get_raw_payload(self, content_hash: str) -> Optional[RawPayload]:
+        rows = self._select("raw_payloads", id=content_hash)
+        return decode_row(rows[0]) if rows else None
+
+    @_counted
+    def get_tender_raw_payload(self, tender_id: str) -> Optional[RawPayload]:
+        rows = self._select("tenders", id=tender_id)
+        if not rows:
+            return None
+        if rows[0].get("raw_payload_hash"):
+            return self.get_raw_payload(rows[0]["raw_payload_hash"])
+        legacy = rows[0].get("raw_api_response")
+        return RawPayload.from_obj(legacy) if legacy else None
+
+    @_counted
+    def list_unscored_tenders(self, limit: int = 500, columns: str = "*") -> List[Dict[str, Any]]:
+        rows = sorted((row for row in self._select("tenders") if row.get("relevance_score") is None), key=lambda row: row["id"])
+        return self._project(rows[:limit], columns)
+
+    @_counted
+    def bulk_update_tender_scores(self, scores: List[Dict[str, Any]], chunk_size: int = 500) -> int:
+        conflict = ("source", "bid_ntce_no", "bid_ntce_ord")
+        written = []
+        for start in range(0, len(scores), chunk_size):
+            written.extend(self._upsert_many("tenders", scores[start:start + chunk_size], on_conflict=conflict))
+        self._notify("tenders", written)
+        return len(written)
+
+    @staticmethod
+    def _project(rows: List[Dict[str, Any]], columns: str) -> List[Dict[str, Any]]:
+        if columns.strip() == "*":
+            return rows
+        names = [c.strip() for c in columns.split(",")]
+        return [{name: row.get(name) for name in names} for row in rows]
+
+    @_counted
+    def list_tenders(self, columns: str = "*", page_size: int = 1000, updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+        rows = self._select("tenders")
+        if updated_since is not None:
+            rows = [row for row in rows if (row.get("updated_at") or "") >= updated_since]
+        return self._project(rows, columns)
+
+    @_counted
+    def list_tenders_page(
+        self,
+        columns: str,
+        filters: TenderFilter,
+        after: Optional[Tuple[Optional[str], str]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        closing_from, closing_to = _iso(filters.closing_from), _iso(filters.closing_to)
+        title = (filters.title_contains or "").lower()
+
+        def matches(row: Dict[str, Any]) -> bool:
+            close = row.get("bid_clse_dt")
+            return (
+                (not filters.source or row.get("source") == filters.source)
+                and (not filters.status or row.get("status") in filters.status)
+                and (not filters.dminstt_nm or row.get("dminstt_nm") == filters.dminstt_nm)
+                and (not closing_from or (close is not None and close >= closing_from))
+                and (not closing_to or (close is not None and close <= closing_to))
+                and (not title or title in (row.get("bid_ntce_nm") or "").lower())
+            )
+
+        # ORDER BY bid_clse_dt DESC NULLS FIRST, id DESC
+        def order_key(row: Dict[str, Any]) -> Tuple[int, str, str]:
+            close = row.get("bid_clse_dt")
+            return (1, "", row["id"]) if close is None else (0, close, row["id"])
+
+        rows = sorted((row for row in self._select("tenders") if matches(row)), key=order_key, reverse=True)
+        if after is not None:
+            bound = order_key({"bid_clse_dt": after[0], "id": after[1]})
+            rows = [row for row in rows if order_key(row) < bound]
+        return self._project(rows[:limit], columns)
+
+    @_counted
+    def upsert_attachment(self, attachment: TenderAttachmentDTO) -> Dict[str, Any]:
+        data = self._attachment_row(attachment)
+        if attachment.id:
+            data["id"] = attachment.id
+            row = self._upsert("tender_attachments", data)
+        else:
+            # SupabaseRepository와 동일하게 (tender_id, file_name) 조회 후 갱신/삽입
+            existing = self._select("tender_attachments", tender_id=attachment.tender_id, file_name=attachment.file_name)
+            if existing:
+                data["id"] = existing[0]["id"]
+                row = self._upsert("tender_attachments", data)
+            else:
+                row = self._insert("tender_attachments", data)
+        self._notify("tender_attachments", [row])
+        return row
+
+    @_counted
+    def get_attachments_by_tender_id(self, tender_id: str) -> List[Dict[str, Any]]:
+        return self._select("tender_attachments", tender_id=tender_id)
+
+    @_counted
+    def list_attachments(self, columns: str = "*", page_size: int = 1000) -> List[Dict[str, Any]]:
+        return self._project(self._select("tender_attachments"), columns)
+
+    @_counted
+    def list_attachments_page(self, tender_id: str, columns: str, after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        rows = sorted(self._select("tender_attachments", tender_id=tender_id), key=lambda row: row["id"])
+        if after_id:
+            rows = [row for row in rows if row["id"] > after_id]
+        return self._project(rows[:limit], columns)
+
+    @_counted
+    def upsert_tender_spec(self, spec: TenderSpecDTO) -> Dict[str, Any]:
+        data = self._spec_row(spec)
+        if spec.id:
+            data["id"] = spec.id
+            row = self._upsert("tender_specs", data)
+        else:
+            existing = self._select("tender_specs", tender_id=spec.tender_id)
+            if existing:
+                data["id"] = existing[0]["id"]
+                row = self._upsert("tender_specs", data)
+            else:
+                row = self._insert("tender_specs", data)
+        self._notify("tender_specs", [row])
+        return row
+
+    @_counted
+    def get_tender_spec_by_tender_id(self, tender_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("tender_specs", tender_id=tender_id)
+        return rows[0] if rows else None
+
+    @_counted
+    def list_tender_specs(self, page_size: int = 1000, updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+        rows = self._select("tender_specs")
+        if updated_since is not None:
+            rows = [row for row in rows if (row.get("updated_at") or "") >= updated_since]
+        return rows
+
+    # =====================================================
+    # Dashboard summary
+    # =====================================================
+
+    @_counted
+    def get_tender_summary(self, source: Optional[str] = None, page_size: int = 1000) -> List[Dict[str, Any]]:
+        self.queries[("tender_summary", "select")] += 1
+        rows = [dict(row) for row in self._summary if not source or row["source"] == source]
+        return sorted(rows, key=lambda row: tuple((row[c] is None, row[c] or "") for c in SUMMARY_KEY_COLUMNS))
+
+    @_counted
+    def refresh_tender_summary(self, force: bool = False) -> bool:
+        self.queries[("rpc", "refresh_tender_summary")] += 1
+        if not (self._summary_dirty or force):
+            return False
+        self._summary_dirty = False
+        self._summary = aggregate_tenders(self.tables["tenders"].values())
+        return True
+
+    @_counted
+    def list_upcoming_deadlines(self, limit: int = 10, source: Optional[str] = None, columns: str = "*") -> List[Dict[str, Any]]:
+        now = datetime.now(SUMMARY_TZ)
+
+        def closes_at(row: Dict[str, Any]) -> Optional[datetime]:
+            if not row.get("bid_clse_dt"):
+                return None
+            close = datetime.fromisoformat(row["bid_clse_dt"])
+            return close if close.tzinfo else close.replace(tzinfo=SUMMARY_TZ)
+
+        rows = [
+            (close, row) for row in self._select("tenders", status="OPEN")
+            if (not source or row.get("source") == source) and (close := closes_at(row)) is not None and close >= now
+        ]
+        rows.sort(key=lambda item: (item[0], item[1]["id"]))
+        return self._project([row for _, row in rows[:limit]], columns)
+
+    # =====================================================
+    # Shipments / Demurrage
+    # =====================================================
+
+    @_counted
+    def upsert_shipment(self, shipment: ShipmentDTO) -> Dict[str, Any]:
+        data = self._shipment_row(shipment)
+        if shipment.id:
+            data["id"] = shipment.id
+            return self._upsert("shipments", data)
+        return self._insert("shipments", data)
+
+    @_counted
+    def get_shipment_by_id(self, shipment_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("shipments", id=shipment_id)
+        return rows[0] if rows else None
+
+    @_counted
+    def list_active_shipments(self) -> List[Dict[str, Any]]:
+        return [row for row in self._select("shipments") if row.get("current_status") != "COMPLETED"]
+
+    @_counted
+    def bulk_upsert_shipments(self, shipments: List[ShipmentDTO], chunk_size: int = 500) -> List[Dict[str, Any]]:
+        rows = [{**self._shipment_row(s), "id": s.id} for s in shipments]
+        written = []
+        for start in range(0, len(rows), chunk_size):
+            written.extend(self._upsert_many("shipments", rows[start:start + chunk_size]))
+        return written
+
+    @_counted
+    def upsert_demurrage_calc(self, calc: DemurrageCalcDTO) -> Dict[str, Any]:
+        data = self._demurrage_row(calc)
+        if calc.id:
+            data["id"] = calc.id
+            return self._upsert("demurrage_calculations", data)
+        return self._insert("demurrage_calculations", data)
+
+    @_counted
+    def get_demurrage_by_shipment_id(self, shipment_id: str) -> List[Dict[str, Any]]:
+        return self._select("demurrage_calculations", shipment_id=shipment_id)
+
+    @_counted
+    def list_demurrage_calcs(self, shipment_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        if shipment_ids is not None and not shipment_ids:
+            return []
+        rows = self._select("demurrage_calculations")
+        if shipment_ids is not None:
+            wanted = set(shipment_ids)
+            rows = [row for row in rows if row.get("shipment_id") in wanted]
+        return rows
+
+    @_counted
+    def bulk_upsert_demurrage_calcs(self, calcs: List[DemurrageCalcDTO], chunk_size: int = 500) -> List[Dict[str, Any]]:
+        updates = [{**self._demurrage_row(c), "id": c.id} for c in calcs if c.id]
+        inserts = [self._demurrage_row(c) for c in calcs if not c.id]
+        written = []
+        for start in range(0, len(updates), chunk_size):
+            written.extend(self._upsert_many("demurrage_calculations", updates[start:start + chunk_size]))
+        for start in range(0, len(inserts), chunk_size):
+            written.extend(self._insert_many("demurrage_calculations", inserts[start:start + chunk_size]))
+        return written
+
+    # =====================================================
+    # Market Data / Netback
+    # =====================================================
+
+    @_counted
+    def upsert_market_data(self, data: MarketDataDTO) -> Dict[str, Any]:
+        row = self._upsert("market_data", self._market_data_row(data), on_conflict=("data_date", "index_name"))
+        self._notify_market_data([data.index_name])
+        return row
+
+    @_counted
+    def bulk_upsert_market_data(self, data: List[MarketDataDTO], chunk_size: int = 1000) -> int:
+        rows = [self._market_data_row(d) for d in data]
+        for group in _group_by_columns(rows):
+            for start in range(0, len(group), chunk_size):
+                self._upsert_many("market_data", group[start:start + chunk_size], on_conflict=("data_date", "index_name"))
+        if rows:
+            self._notify_market_data({d.index_name for d in data})
+        return len(rows)
+
+    @_counted
+    def get_market_data(self, data_date: date, index_name: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("market_data", data_date=data_date.isoformat(), index_name=index_name)
+        return rows[0] if rows else None
+
+    @_counted
+    def get_market_data_between(self, start: date, end: date, index_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        rows = [
+            row for row in self._select("market_data")
+            if start.isoformat() <= row["data_date"] <= end.isoformat()
+            and (not index_names or row["index_name"] in index_names)
+        ]
+        return sorted(rows, key=lambda row: row["data_date"])
+
+    @_counted
+    def list_market_data(self, page_size: int = 1000) -> List[Dict[str, Any]]:
+        return self._select("market_data")
+
+    @_counted
+    def upsert_netback_simulation(self, sim: NetbackSimulationDTO) -> Dict[str, Any]:
+        data = self._simulation_row(sim)
+        if sim.id:
+            data["id"] = sim.id
+            return self._upsert("netback_simulations", data)
+        return self._insert("netback_simulations", data)
+
+    @_counted
+    def get_netback_simulation_by_id(self, sim_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("netback_simulations", id=sim_id)
+        return rows[0] if rows else None
+
+    @_counted
+    def get_simulations_by_tender_id(self, tender_id: str) -> List[Dict[str, Any]]:
+        return self._select("netback_simulations", tender_id=tender_id)
+
+    @_counted
+    def bulk_insert_netback_simulations(self, sims: List[NetbackSimulationDTO], chunk_size: int = 500) -> List[Dict[str, Any]]:
+        rows = [self._simulation_row(sim) for sim in sims]
+        inserted = []
+        for start in range(0, len(rows), chunk_size):
+            inserted.extend(self._insert_many("netback_simulations", rows[start:start + chunk_size]))
+        return inserted
+
+    @_counted
+    def list_netback_simulations(self, page_size: int = 1000) -> List[Dict[str, Any]]:
+        return self._select("netback_simulations")
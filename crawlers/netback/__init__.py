@@ -0,0 +1,10 @@
+"""
+Netback 시뮬레이션
+"""
+from .engine import NetbackEngine, NetbackResult, ScenarioGrid, INDEX_REFERENCES, to_nar
+from .montecarlo import MarketCalibration, MonteCarloSimulator, MonteCarloResult
+
+__all__ = [
+    'NetbackEngine', 'NetbackResult', 'ScenarioGrid', 'INDEX_REFERENCES', 'to_nar',
+    'MarketCalibration', 'MonteCarloSimulator', 'MonteCarloResult',
+]
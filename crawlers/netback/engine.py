@@ -0,0 +1,332 @@
+"""
+Netback 시뮬레이션 엔진 (NumPy 벡터화)
+tender_specs × (시장가 × 운임 × 환율 × 보험료율 × 관세율) 그리드를 한 번의 브로드캐스트 연산으로 계산
+
+    netback_usd = 조정가 - 운임 - 보험료 - 항비 - 관세
+    조정가      = 지수가격 × (스펙 NAR 발열량 / 지수 기준 NAR 발열량)
+    보험료      = 조정가 × insurance_pct / 100
+    관세        = 조정가 × import_duty_pct / 100
+    netback_krw = netback_usd × 환율
+
+발열량 기준 환산 (ISO 1928 근사):
+    GAR = ADB × (100 - TM) / (100 - IM)
+    NAR = GAR - 5.83 × (TM + 8.94 × H)      (kcal/kg, TM/IM/H는 %)
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from dto import CVBasis, NetbackSimulationDTO, TenderSpecDTO
+    from tracing import traced
+except ImportError:
+    from crawlers.dto import CVBasis, NetbackSimulationDTO, TenderSpecDTO
+    from crawlers.tracing import traced
+
+SpecLike = Union[TenderSpecDTO, Mapping[str, Any]]
+
+# 지수별 기준 발열량 (kcal/kg, 기준)
+INDEX_REFERENCES: Dict[str, Tuple[float, CVBasis]] = {
+    "Newcastle": (6000.0, CVBasis.NAR),
+    "ICI1": (6500.0, CVBasis.GAR),
+    "ICI3": (5000.0, CVBasis.GAR),
+    "ICI4": (4200.0, CVBasis.GAR),
+    "Indonesian": (4200.0, CVBasis.GAR),
+}
+
+# 그리드 축 순서 (결과 배열의 spec 축 다음 차원)
+AXES = ("market_price_usd", "freight_usd", "fx_rate_krw", "insurance_pct", "import_duty_pct")
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_BASIS_CODES = {CVBasis.NAR.value: 0, CVBasis.GAR.value: 1, CVBasis.ADB.value: 2}
+
+
+def _field(spec: SpecLike, name: str) -> Any:
+    if isinstance(spec, Mapping):
+        return spec.get(name)
+    return getattr(spec, name, None)
+
+
+def _basis_code(value: Any) -> int:
+    value = value.value if hasattr(value, "value") else value
+    return _BASIS_CODES.get(str(value or CVBasis.NAR.value).upper(), 0)
+
+
+def to_nar(
+    cv_kcal: np.ndarray,
+    basis: np.ndarray,
+    total_moisture_pct: np.ndarray,
+    inherent_moisture_pct: float = 8.0,
+    hydrogen_pct: float = 4.0,
+) -> np.ndarray:
+    """
+    발열량 배열을 NAR 기준으로 환산
+    basis: 0=NAR, 1=GAR, 2=ADB (spec_arrays 참고)
+    """
+    cv_kcal = np.asarray(cv_kcal, dtype=np.float64)
+    basis = np.asarray(basis)
+    tm = np.asarray(total_moisture_pct, dtype=np.float64)
+
+    gar = np.where(basis == 2, cv_kcal * (100.0 - tm) / (100.0 - inherent_moisture_pct), cv_kcal)
+    return np.where(basis == 0, cv_kcal, gar - 5.83 * (tm + 8.94 * hydrogen_pct))
+
+
+def netback_usd(adjusted_price: Any, freight_usd: Any, rate_pct: Any, port_charges_usd: float = 0.0) -> Any:
+    """조정가에서 운임/항비와 가격 비례 비용(보험료 + 관세, %)을 차감한 netback (USD/MT)"""
+    return adjusted_price * (1.0 - rate_pct / 100.0) - freight_usd - port_charges_usd
+
+
+@dataclass(slots=True)
+class ScenarioGrid:
+    """
+    시나리오 그리드 축 (모든 조합 = size 개 시나리오)
+    port_charges_usd는 축이 아닌 고정값 (USD/MT)
+    """
+    market_price_usd: Sequence[float]
+    freight_usd: Sequence[float]
+    fx_rate_krw: Sequence[float]
+    insurance_pct: Sequence[float] = (0.15,)
+    import_duty_pct: Sequence[float] = (0.0,)
+    port_charges_usd: float = 0.0
+
+    @classmethod
+    def around(
+        cls,
+        market_price_usd: float,
+        freight_usd: float,
+        fx_rate_krw: float,
+        price_spread_pct: float = 20.0,
+        freight_spread_pct: float = 30.0,
+        fx_spread_pct: float = 5.0,
+        steps: int = 11,
+        **kwargs: Any,
+    ) -> "ScenarioGrid":
+        """기준값 ± spread% 범위를 steps 등분한 그리드"""
+        def axis(center: float, spread_pct: float) -> np.ndarray:
+            return np.linspace(center * (1 - spread_pct / 100), center * (1 + spread_pct / 100), steps)
+
+        return cls(
+            market_price_usd=axis(market_price_usd, price_spread_pct),
+            freight_usd=axis(freight_usd, freight_spread_pct),
+            fx_rate_krw=axis(fx_rate_krw, fx_spread_pct),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_market_data(cls, row: Mapping[str, Any], default_freight_usd: float = 15.0, **kwargs: Any) -> "ScenarioGrid":
+        """market_data row(가격/환율/운임) 기준 그리드"""
+        freight = row.get("freight_rate")
+        return cls.around(
+            market_price_usd=float(row["price_usd"]),
+            freight_usd=float(freight) if freight is not None else default_freight_usd,
+            fx_rate_krw=float(row["fx_rate_krw"]),
+            **kwargs,
+        )
+
+    def axes(self) -> List[np.ndarray]:
+        return [np.asarray(getattr(self, name), dtype=np.float64).ravel() for name in AXES]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(a) for a in self.axes())
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def base_case(self) -> Dict[str, float]:
+        """각 축의 중앙값 시나리오"""
+        return {name: float(a[len(a) // 2]) for name, a in zip(AXES, self.axes())}
+
+
+@dataclass(slots=True)
+class NetbackResult:
+    """
+    엔진 결과
+    netback_usd / netback_krw: shape = (len(specs),) + grid.shape
+    """
+    tender_ids: List[Optional[str]]
+    grid: ScenarioGrid
+    index_name: str
+    cv_nar: np.ndarray
+    cv_factor: np.ndarray
+    netback_usd: np.ndarray
+    netback_krw: np.ndarray
+    _summary: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """spec별 분포 요약 (percentile / 평균 / 손실 확률)을 한 번에 계산"""
+        if self._summary is not None:
+            return self._summary
+
+        n = len(self.tender_ids)
+        if n == 0:
+            self._summary = []
+            return self._summary
+        usd = self.netback_usd.reshape(n, -1)
+        krw = self.netback_krw.reshape(n, -1)
+        usd_pct = np.percentile(usd, PERCENTILES, axis=1)
+        krw_pct = np.percentile(krw, PERCENTILES, axis=1)
+        stats = {
+            "usd_mean": usd.mean(axis=1),
+            "usd_std": usd.std(axis=1),
+            "usd_min": usd.min(axis=1),
+            "usd_max": usd.max(axis=1),
+            "krw_mean": krw.mean(axis=1),
+            "prob_loss": (usd < 0).mean(axis=1),
+        }
+
+        summaries = []
+        for i in range(n):
+            summary = {key: float(values[i]) for key, values in stats.items()}
+            for p, u, k in zip(PERCENTILES, usd_pct[:, i], krw_pct[:, i]):
+                summary[f"usd_p{p}"] = float(u)
+                summary[f"krw_p{p}"] = float(k)
+            summaries.append(summary)
+        self._summary = summaries
+        return summaries
+
+    def base_case(self) -> Tuple[np.ndarray, np.ndarray]:
+        """그리드 중앙 시나리오의 spec별 netback (usd, krw)"""
+        center = tuple(length // 2 for length in self.grid.shape)
+        index = (slice(None),) + center
+        return self.netback_usd[index], self.netback_krw[index]
+
+    def to_simulations(self, simulation_date: Optional[date] = None) -> List[NetbackSimulationDTO]:
+        """spec당 1건의 요약 DTO (기준 시나리오 값 + assumptions에 그리드/분포)"""
+        simulation_date = simulation_date or date.today()
+        base = self.grid.base_case()
+        base_usd, base_krw = self.base_case()
+        price = base["market_price_usd"]
+        grid_info = {
+            "index_name": self.index_name,
+            "shape": list(self.grid.shape),
+            "scenarios": self.grid.size,
+            "axes": {name: [round(float(v), 4) for v in a] for name, a in zip(AXES, self.grid.axes())},
+            "port_charges_usd": float(self.grid.port_charges_usd),
+        }
+
+        simulations = []
+        for i, summary in enumerate(self.summaries()):
+            adjusted = price * float(self.cv_factor[i])
+            simulations.append(NetbackSimulationDTO(
+                tender_id=self.tender_ids[i],
+                simulation_date=simulation_date,
+                market_price_usd=round(adjusted, 2),
+                freight_cost=round(base["freight_usd"], 2),
+                insurance_cost=round(adjusted * base["insurance_pct"] / 100, 2),
+                port_charges=round(float(self.grid.port_charges_usd), 2),
+                import_duty=round(adjusted * base["import_duty_pct"] / 100, 2),
+                fx_rate=round(base["fx_rate_krw"], 4),
+                netback_usd=round(float(base_usd[i]), 2),
+                netback_krw=round(float(base_krw[i]), 2),
+                assumptions={
+                    "engine": "grid",
+                    "grid": grid_info,
+                    "index_price_usd": round(price, 2),
+                    "cv_nar_kcal": None if np.isnan(self.cv_nar[i]) else round(float(self.cv_nar[i]), 1),
+                    "cv_factor": round(float(self.cv_factor[i]), 6),
+                    "distribution": {k: round(v, 4) for k, v in summary.items()},
+                },
+            ))
+        return simulations
+
+
+class NetbackEngine:
+    """
+    벡터화 Netback 엔진
+
+    사용법:
+        engine = NetbackEngine(index_name="Newcastle")
+        grid = ScenarioGrid.around(market_price_usd=130, freight_usd=15, fx_rate_krw=1350)
+        result = engine.run(specs, grid)
+        engine.persist(repo, result)
+    """
+
+    def __init__(
+        self,
+        index_name: str = "Newcastle",
+        reference_cv_kcal: Optional[float] = None,
+        reference_basis: Optional[CVBasis] = None,
+        default_moisture_pct: float = 12.0,
+        inherent_moisture_pct: float = 8.0,
+        hydrogen_pct: float = 4.0,
+        dtype: Any = np.float64,
+    ):
+        ref_cv, ref_basis = INDEX_REFERENCES.get(index_name, (6000.0, CVBasis.NAR))
+        self.index_name = index_name
+        self.reference_cv_kcal = reference_cv_kcal or ref_cv
+        self.reference_basis = reference_basis or ref_basis
+        self.default_moisture_pct = default_moisture_pct
+        self.inherent_moisture_pct = inherent_moisture_pct
+        self.hydrogen_pct = hydrogen_pct
+        self.dtype = dtype
+
+    @property
+    def reference_nar(self) -> float:
+        return float(to_nar(
+            np.array([self.reference_cv_kcal]),
+            np.array([_basis_code(self.reference_basis)]),
+            np.array([self.default_moisture_pct]),
+            self.inherent_moisture_pct,
+            self.hydrogen_pct,
+        )[0])
+
+    def spec_arrays(self, specs: Sequence[SpecLike]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        specs → (발열량, 기준 코드, 전수분) 배열
+        발열량은 min/max 중간값 (한쪽만 있으면 그 값, 둘 다 없으면 NaN)
+        """
+        n = len(specs)
+        cv = np.full(n, np.nan)
+        basis = np.zeros(n, dtype=np.int8)
+        moisture = np.full(n, self.default_moisture_pct)
+        for i, spec in enumerate(specs):
+            bounds = [v for v in (_field(spec, "cv_min_kcal"), _field(spec, "cv_max_kcal")) if v is not None]
+            if bounds:
+                cv[i] = sum(bounds) / len(bounds)
+            basis[i] = _basis_code(_field(spec, "cv_basis"))
+            tm = _field(spec, "moisture_max_pct")
+            if tm is not None:
+                moisture[i] = tm
+        return cv, basis, moisture
+
+    def cv_factors(self, specs: Sequence[SpecLike]) -> Tuple[np.ndarray, np.ndarray]:
+        """spec별 (NAR 발열량, 지수 대비 가격 조정 계수). 발열량 미상이면 계수 1.0"""
+        cv, basis, moisture = self.spec_arrays(specs)
+        nar = to_nar(cv, basis, moisture, self.inherent_moisture_pct, self.hydrogen_pct)
+        factor = np.where(np.isnan(nar), 1.0, nar / self.reference_nar)
+        return nar, factor
+
+    @traced("netback", "run")
+    def run(self, specs: Sequence[SpecLike], grid: ScenarioGrid) -> NetbackResult:
+        price, freight, fx, insurance, duty = (a.astype(self.dtype) for a in grid.axes())
+        nar, factor = self.cv_factors(specs)
+
+        # (spec, price, freight, fx, insurance, duty) 브로드캐스트
+        adjusted = factor.astype(self.dtype)[:, None, None, None, None, None] * price[None, :, None, None, None, None]
+        freight = freight[None, None, :, None, None, None]
+        fx = fx[None, None, None, :, None, None]
+        rates = insurance[:, None] + duty[None, :]
+
+        usd = netback_usd(adjusted, freight, rates, self.dtype(grid.port_charges_usd))
+        usd = np.broadcast_to(usd, (len(specs),) + grid.shape)
+        krw = usd * fx
+
+        return NetbackResult(
+            tender_ids=[_field(spec, "tender_id") for spec in specs],
+            grid=grid,
+            index_name=self.index_name,
+            cv_nar=nar,
+            cv_factor=factor,
+            netback_usd=usd,
+            netback_krw=krw,
+        )
+
+    @staticmethod
+    def persist(repo, result: NetbackResult, simulation_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """요약 결과를 단일 bulk insert로 저장"""
+        return repo.bulk_insert_netback_simulations(result.to_simulations(simulation_date))
@@ -0,0 +1,340 @@
+"""
+Monte Carlo Netback 리스크 시뮬레이션
+market_data 이력으로 (가격, 운임, 환율) 상관 GBM을 캘리브레이션하고
+tender spec별 netback 분포(percentile / VaR / CVaR / 손실 확률)를 계산
+
+- 경로는 shard_size 단위 shard로 나누고 SeedSequence.spawn으로 shard별 시드 부여
+  → 직렬/병렬 실행 및 워커 수와 무관하게 같은 seed면 같은 결과
+- paths ≥ parallel_threshold 이면 ProcessPoolExecutor로 shard 분산
+- averaging_days > 0 이면 인도 기간 평균가(일별 경로) 기준, 아니면 만기 시점 값(정확 샘플링)
+"""
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+try:
+    from dto import NetbackSimulationDTO
+    from tracing import traced
+except ImportError:
+    from crawlers.dto import NetbackSimulationDTO
+    from crawlers.tracing import traced
+
+from .engine import NetbackEngine, SpecLike, _field, netback_usd
+
+# 확률 요인 순서
+FACTORS = ("price_usd", "freight_usd", "fx_rate_krw")
+
+# 이력이 부족할 때의 일간 변동성 (log, 1일)
+DEFAULT_DAILY_VOL = (0.020, 0.030, 0.006)
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+@dataclass(slots=True)
+class MarketCalibration:
+    """
+    요인별 현재값 / 일간 log drift / 일간 변동성 / 상관행렬
+    (달력일 기준, 관측 간격이 불규칙하면 sqrt(간격)으로 정규화)
+    """
+    index_name: str
+    spot: np.ndarray
+    drift: np.ndarray
+    vol: np.ndarray
+    corr: np.ndarray
+    observations: int = 0
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Mapping[str, Any]],
+        index_name: str = "Newcastle",
+        use_drift: bool = False,
+        default_freight_usd: float = 15.0,
+    ) -> "MarketCalibration":
+        """
+        market_data rows → 캘리브레이션
+        가격은 index_name 행의 price_usd, 환율/운임은 같은 날짜의 어느 지수 행이든 사용
+        """
+        series: List[Dict[date, float]] = [{}, {}, {}]
+        for row in rows:
+            day = row["data_date"]
+            day = date.fromisoformat(day) if isinstance(day, str) else day
+            if row.get("index_name") == index_name and row.get("price_usd") is not None:
+                series[0][day] = float(row["price_usd"])
+            if row.get("freight_rate") is not None:
+                series[1].setdefault(day, float(row["freight_rate"]))
+            if row.get("fx_rate_krw") is not None:
+                series[2].setdefault(day, float(row["fx_rate_krw"]))
+
+        if not series[0] or not series[2]:
+            raise ValueError(f"market_data history has no {index_name} price or FX observations")
+
+        spot = np.array([
+            s[max(s)] if s else default_freight_usd for s in series
+        ])
+        drift = np.zeros(3)
+        vol = np.array(DEFAULT_DAILY_VOL)
+        for i, s in enumerate(series):
+            returns = cls._scaled_returns(s)
+            if len(returns) >= 2:
+                vol[i] = returns.std(ddof=1)
+                if use_drift:
+                    drift[i] = returns.mean()
+
+        corr = np.eye(3)
+        common = sorted(set(series[0]) & set(series[1]) & set(series[2]))
+        if len(common) >= 4:
+            joint = np.column_stack([cls._scaled_returns({d: s[d] for d in common}) for s in series])
+            if np.all(joint.std(axis=0) > 0):
+                corr = np.corrcoef(joint, rowvar=False)
+
+        days = sorted(series[0])
+        return cls(
+            index_name=index_name,
+            spot=spot,
+            drift=drift,
+            vol=vol,
+            corr=corr,
+            observations=len(days),
+            start=days[0],
+            end=days[-1],
+        )
+
+    @staticmethod
+    def _scaled_returns(series: Dict[date, float]) -> np.ndarray:
+        """연속 관측 간 log 수익률 / sqrt(간격 일수) (1일 기준으로 정규화)"""
+        days = sorted(series)
+        if len(days) < 2:
+            return np.empty(0)
+        values = np.log([series[d] for d in days])
+        gaps = np.array([(b - a).days for a, b in zip(days, days[1:])], dtype=np.float64)
+        return np.diff(values) / np.sqrt(gaps)
+
+    @property
+    def cholesky(self) -> np.ndarray:
+        # 수치 오차로 양의 정부호가 아니면 대각 보정
+        try:
+            return np.linalg.cholesky(self.corr)
+        except np.linalg.LinAlgError:
+            return np.linalg.cholesky(self.corr + np.eye(3) * 1e-6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index_name": self.index_name,
+            "spot": dict(zip(FACTORS, map(float, self.spot))),
+            "daily_drift": dict(zip(FACTORS, map(float, self.drift))),
+            "daily_vol": dict(zip(FACTORS, map(float, self.vol))),
+            "corr": [[round(float(v), 4) for v in row] for row in self.corr],
+            "observations": self.observations,
+            "window": [self.start.isoformat() if self.start else None, self.end.isoformat() if self.end else None],
+        }
+
+
+def _sample_shard(
+    seed: np.random.SeedSequence,
+    paths: int,
+    spot: np.ndarray,
+    drift: np.ndarray,
+    vol: np.ndarray,
+    chol: np.ndarray,
+    horizon_days: int,
+    averaging_days: int,
+) -> np.ndarray:
+    """
+    shard 1개 샘플링 → (paths, 3) 요인 값
+    (ProcessPoolExecutor에서 pickle 가능하도록 모듈 함수)
+    """
+    rng = np.random.default_rng(seed)
+    mu = drift - 0.5 * vol ** 2
+
+    # 평균 기간 시작 시점까지 정확 샘플링
+    t0 = max(horizon_days - max(averaging_days - 1, 0), 0)
+    z = rng.standard_normal((paths, 3)) @ chol.T
+    log_s = np.log(spot) + mu * t0 + vol * math.sqrt(t0) * z
+
+    if averaging_days <= 1:
+        return np.exp(log_s)
+
+    # 이후 일별 경로 평균 (산술 평균)
+    steps = rng.standard_normal((paths, averaging_days - 1, 3)) @ chol.T
+    path = log_s[:, None, :] + np.cumsum(mu + vol * steps, axis=1)
+    return (np.exp(log_s) + np.exp(path).sum(axis=1)) / averaging_days
+
+
+@dataclass(slots=True)
+class MonteCarloResult:
+    """spec별 분포 요약 (표본 배열은 보관하지 않음)"""
+    tender_ids: List[Optional[str]]
+    calibration: MarketCalibration
+    params: Dict[str, Any]
+    cv_factor: np.ndarray
+    summaries: List[Dict[str, float]] = field(default_factory=list)
+
+    def to_simulations(self, simulation_date: Optional[date] = None) -> List[NetbackSimulationDTO]:
+        """spec당 1건 (현재값 기준 비용 + 기대 netback, assumptions에 분포/캘리브레이션)"""
+        simulation_date = simulation_date or date.today()
+        price, freight, fx = map(float, self.calibration.spot)
+        rate = self.params["insurance_pct"], self.params["import_duty_pct"]
+        calibration = self.calibration.to_dict()
+
+        simulations = []
+        for i, summary in enumerate(self.summaries):
+            adjusted = price * float(self.cv_factor[i])
+            simulations.append(NetbackSimulationDTO(
+                tender_id=self.tender_ids[i],
+                simulation_date=simulation_date,
+                market_price_usd=round(adjusted, 2),
+                freight_cost=round(freight, 2),
+                insurance_cost=round(adjusted * rate[0] / 100, 2),
+                port_charges=round(self.params["port_charges_usd"], 2),
+                import_duty=round(adjusted * rate[1] / 100, 2),
+                fx_rate=round(fx, 4),
+                netback_usd=round(summary["usd_mean"], 2),
+                netback_krw=round(summary["krw_mean"], 2),
+                assumptions={
+                    "engine": "monte_carlo",
+                    **self.params,
+                    "cv_factor": round(float(self.cv_factor[i]), 6),
+                    "calibration": calibration,
+                    "distribution": {k: round(v, 4) for k, v in summary.items()},
+                },
+            ))
+        return simulations
+
+
+class MonteCarloSimulator:
+    """
+    상관 GBM 기반 Netback 분포 시뮬레이터
+
+    사용법:
+        rows = repo.get_market_data_between(date(2024, 1, 1), date.today())
+        simulator = MonteCarloSimulator.from_repository(repo, index_name="Newcastle")
+        result = simulator.run(specs, paths=100_000, horizon_days=45, seed=42)
+        simulator.persist(repo, result)
+    """
+
+    def __init__(
+        self,
+        calibration: MarketCalibration,
+        engine: Optional[NetbackEngine] = None,
+        shard_size: int = 50_000,
+        parallel_threshold: int = 400_000,
+        max_workers: Optional[int] = None,
+    ):
+        self.calibration = calibration
+        self.engine = engine or NetbackEngine(index_name=calibration.index_name)
+        self.shard_size = shard_size
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @classmethod
+    def from_repository(
+        cls,
+        repo,
+        index_name: str = "Newcastle",
+        lookback_days: int = 365,
+        end: Optional[date] = None,
+        use_drift: bool = False,
+        **kwargs: Any,
+    ) -> "MonteCarloSimulator":
+        """최근 lookback_days 구간 market_data로 캘리브레이션 (조회 1회)"""
+        end = end or date.today()
+        rows = repo.get_market_data_between(end - timedelta(days=lookback_days), end)
+        return cls(MarketCalibration.from_rows(rows, index_name=index_name, use_drift=use_drift), **kwargs)
+
+    @traced("netback", "monte_carlo.sample")
+    def sample(self, paths: int, horizon_days: int = 30, averaging_days: int = 0, seed: Optional[int] = None) -> np.ndarray:
+        """(paths, 3) 요인 표본 [가격, 운임, 환율]"""
+        cal = self.calibration
+        chol = cal.cholesky
+        shard_sizes = [min(self.shard_size, paths - start) for start in range(0, paths, self.shard_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(shard_sizes))
+        args = [
+            (s, n, cal.spot, cal.drift, cal.vol, chol, horizon_days, averaging_days)
+            for s, n in zip(seeds, shard_sizes)
+        ]
+
+        workers = min(self.max_workers, len(args))
+        if paths >= self.parallel_threshold and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shards = list(pool.map(_sample_shard, *zip(*args)))
+        else:
+            shards = [_sample_shard(*a) for a in args]
+        return np.concatenate(shards) if shards else np.empty((0, 3))
+
+    @traced("netback", "monte_carlo")
+    def run(
+        self,
+        specs: Sequence[SpecLike],
+        paths: int = 100_000,
+        horizon_days: int = 30,
+        averaging_days: int = 0,
+        seed: Optional[int] = None,
+        insurance_pct: float = 0.15,
+        import_duty_pct: float = 0.0,
+        port_charges_usd: float = 0.0,
+    ) -> MonteCarloResult:
+        if seed is None:
+            # 재현 가능하도록 실제 사용한 엔트로피를 기록
+            seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+
+        samples = self.sample(paths, horizon_days, averaging_days, seed)
+        price, freight, fx = samples[:, 0], samples[:, 1], samples[:, 2]
+        _, factors = self.engine.cv_factors(specs)
+
+        summaries = []
+        for factor in factors:
+            usd = netback_usd(price * factor, freight, insurance_pct + import_duty_pct, port_charges_usd)
+            summaries.append(self._summarize(usd, usd * fx))
+
+        return MonteCarloResult(
+            tender_ids=[_field(spec, "tender_id") for spec in specs],
+            calibration=self.calibration,
+            params={
+                "paths": paths,
+                "seed": seed,
+                "horizon_days": horizon_days,
+                "averaging_days": averaging_days,
+                "insurance_pct": insurance_pct,
+                "import_duty_pct": import_duty_pct,
+                "port_charges_usd": port_charges_usd,
+            },
+            cv_factor=factors,
+            summaries=summaries,
+        )
+
+    @staticmethod
+    def _summarize(usd: np.ndarray, krw: np.ndarray) -> Dict[str, float]:
+        """
+        VaR / CVaR는 기대 netback 대비 하방 편차 (USD/MT)
+        var_95 = mean - p5, cvar_95 = mean - E[netback | netback ≤ p5]
+        """
+        mean = float(usd.mean())
+        usd_pct = np.percentile(usd, PERCENTILES)
+        krw_pct = np.percentile(krw, (5, 50, 95))
+        summary = {
+            "usd_mean": mean,
+            "usd_std": float(usd.std()),
+            "krw_mean": float(krw.mean()),
+            "prob_loss": float((usd < 0).mean()),
+        }
+        for p, value in zip(PERCENTILES, usd_pct):
+            summary[f"usd_p{p}"] = float(value)
+        for p, value in zip((5, 50, 95), krw_pct):
+            summary[f"krw_p{p}"] = float(value)
+        for level, p in (("95", usd_pct[1]), ("99", usd_pct[0])):
+            summary[f"var_{level}"] = mean - float(p)
+            summary[f"cvar_{level}"] = mean - float(usd[usd <= p].mean())
+        return summary
+
+    @staticmethod
+    def persist(repo, result: MonteCarloResult, simulation_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """요약 결과를 netback_simulations에 bulk insert"""
+        return repo.bulk_insert_netback_simulations(result.to_simulations(simulation_date))
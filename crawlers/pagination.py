@@ -0,0 +1,165 @@
+"""
+목록 조회 API 공통 (keyset pagination / projection / ETag)
+
+- 커서: 이전 페이지 마지막 행의 정렬 키를 base64url(JSON)로 인코딩 (OFFSET 없이 인덱스 범위 스캔)
+    tenders: (bid_clse_dt, id), ORDER BY bid_clse_dt DESC (NULL 먼저), id DESC
+    tender_attachments: id, ORDER BY id
+    디코딩 시 id는 UUID, bid_clse_dt는 ISO-8601만 허용 (PostgREST 필터 문자열에 들어감, 위반 시 ValueError → 400)
+- projection: 기본값은 무거운 컬럼(raw_api_response, extracted_text) 제외, fields=로 명시 요청 가능
+- ETag: 응답 본문 해시 (If-None-Match 일치 시 304, 본문 전송 생략)
+"""
+import json
+import uuid
+import base64
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from dto import TenderFilter
+except ImportError:
+    from crawlers.dto import TenderFilter
+
+TENDER_COLUMNS = (
+    "id", "bid_ntce_no", "bid_ntce_ord", "bid_clsfc_no", "rbid_no", "ntce_div_cd", "bid_ntce_nm",
+    "asign_bdgt_amt", "presmpt_prce", "bid_clse_dt", "dminstt_nm", "dminstt_cd", "bid_ntce_dtl_url",
+    "rgst_dt", "source", "ai_summary", "relevance_score", "status", "raw_api_response",
+    "raw_payload_hash", "created_at", "updated_at",
+)
+TENDER_HEAVY_COLUMNS = ("raw_api_response",)
+TENDER_KEY_COLUMNS = ("id", "bid_clse_dt")
+
+ATTACHMENT_COLUMNS = (
+    "id", "tender_id", "file_name", "file_type", "file_url", "file_size_bytes",
+    "extracted_text", "is_parsed", "parse_error", "created_at",
+)
+ATTACHMENT_HEAVY_COLUMNS = ("extracted_text",)
+ATTACHMENT_KEY_COLUMNS = ("id",)
+
+MAX_PAGE_SIZE = 200
+
+
+def projection(fields: Optional[str], allowed: Sequence[str], heavy: Sequence[str], keys: Sequence[str]) -> str:
+    """
+    fields("a,b,c") → select 컬럼 문자열 (커서 키 컬럼은 항상 포함)
+    fields 미지정 시 heavy 컬럼을 제외한 전체
+    """
+    if not fields:
+        names = [c for c in allowed if c not in heavy]
+    else:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [n for n in names if n not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        names = [k for k in keys if k not in names] + names
+    return ",".join(dict.fromkeys(names))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if (
+        not isinstance(values, list) or len(values) != size or not isinstance(values[-1], str)
+        or not all(v is None or isinstance(v, str) for v in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_id(value: str) -> str:
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise ValueError("Invalid cursor: id is not a UUID")
+
+
+def _cursor_timestamp(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError("Invalid cursor: bid_clse_dt is not an ISO-8601 timestamp")
+    return value
+
+
+def etag(payload: Any) -> str:
+    """JSON 직렬화 결과 기준 weak ETag"""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return f'W/"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak 비교 (W/ 접두어 무시)
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return tag.removeprefix("W/") in candidates
+
+
+@dataclass(slots=True)
+class Page:
+    """목록 페이지 (next_cursor가 None이면 마지막 페이지)"""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": len(self.items), "items": self.items, "next_cursor": self.next_cursor}
+
+
+def _page_size(limit: int) -> int:
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def paginate_tenders(
+    repo,
+    filters: Optional[TenderFilter] = None,
+    fields: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Page:
+    """tenders keyset 페이지 (limit + 1건 조회로 다음 페이지 존재 여부 판단)"""
+    limit = _page_size(limit)
+    columns = projection(fields, TENDER_COLUMNS, TENDER_HEAVY_COLUMNS, TENDER_KEY_COLUMNS)
+    after: Optional[Tuple[Optional[str], str]] = None
+    if cursor:
+        close_dt, last_id = decode_cursor(cursor, 2)
+        after = (_cursor_timestamp(close_dt), _cursor_id(last_id))
+
+    rows = repo.list_tenders_page(columns, filters or TenderFilter(), after, limit + 1)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.get("bid_clse_dt"), last["id"]])
+    return Page(rows, next_cursor)
+
+
+def paginate_attachments(
+    repo,
+    tender_id: str,
+    fields: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Page:
+    limit = _page_size(limit)
+    columns = projection(fields, ATTACHMENT_COLUMNS, ATTACHMENT_HEAVY_COLUMNS, ATTACHMENT_KEY_COLUMNS)
+    after_id = _cursor_id(decode_cursor(cursor, 1)[0]) if cursor else None
+
+    rows = repo.list_attachments_page(tender_id, columns, after_id, limit + 1)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]["id"]])
+    return Page(rows, next_cursor)
@@ -1,6 +1,12 @@
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Iterator
+
+try:
+    from crawlers.dto import CVBasis, Incoterms, TenderSpecDTO
+except ImportError:
+    from dto import CVBasis, Incoterms, TenderSpecDTO
 
 @dataclass
 class CoalSpec:
@@ -13,6 +19,26 @@ class CoalSpec:
     quantity_mt: Optional[float] = None
     origin: Optional[str] = None
     incoterms: Optional[str] = None
+    cv_basis: Optional[str] = None          # NAR / GAR / ADB as stated in the document
+    delivery_port: Optional[str] = None
+    confidence: Dict[str, float] = field(default_factory=dict)   # field name → 0..1 (parsers/specs.py)
+
+    def to_tender_spec(self, tender_id: str) -> TenderSpecDTO:
+        """Map to the tender_specs row DTO"""
+        return TenderSpecDTO(
+            tender_id=tender_id,
+            cv_min_kcal=self.calorific_value_min,
+            cv_max_kcal=self.calorific_value_max,
+            cv_basis=CVBasis(self.cv_basis) if self.cv_basis in CVBasis.__members__ else CVBasis.NAR,
+            sulfur_max_pct=self.sulfur_max,
+            ash_max_pct=self.ash_max,
+            moisture_max_pct=self.moisture_max,
+            quantity_mt=self.quantity_mt,
+            origin=self.origin,
+            incoterms=Incoterms(self.incoterms) if self.incoterms in Incoterms.__members__ else None,
+            delivery_port=self.delivery_port,
+            extraction_confidence=dict(self.confidence) or None,
+        )
 
 @dataclass
 class ParsedDocument:
@@ -25,14 +51,145 @@ class ParsedDocument:
     keywords_found: List[str]
     metadata: Dict[str, Any] = None
 
+@dataclass
+class DocumentPage:
+    """One lazily produced unit of a document (PDF page, XLSX sheet, DOCX block)"""
+    number: int
+    text: str
+    label: str = ""
+    tables: List[List[List[str]]] = field(default_factory=list)   # rows of cell text, when the source is tabular
+
 class BaseParser(ABC):
-    """Abstract Base Parser Interface"""
-    
+    """
+    Abstract Base Parser Interface
+
+    Subclasses yield pages via iter_pages; parse() runs the shared extraction path:
+    keyword scan per page → table-aware spec extraction (parsers/specs.py) only on pages
+    with coal keywords, whole-text regexes filling fields no table row produced.
+    """
+
+    FILE_TYPE = ""
+    EXTENSIONS: List[str] = []
+
+    COAL_KEYWORDS = [
+        "유연탄", "석탄", "연료", "thermal coal", "bituminous",
+        "발열량", "calorific", "kcal", "NAR", "GAR",
+        "황분", "sulfur", "유황",
+        "회분", "ash",
+        "인도네시아", "호주", "러시아"
+    ]
+
+    PATTERNS = {
+        "calorific_value": [
+            r"발열량[:\s]*(\d{4,5})\s*[kK]cal",
+            r"(\d{4,5})\s*[kK]cal/[kK]g",
+            r"NAR[:\s]*(\d{4,5})",
+            r"GAR[:\s]*(\d{4,5})",
+        ],
+        "sulfur": [
+            r"황분[:\s]*(\d+\.?\d*)\s*%",
+            r"유황[:\s]*(\d+\.?\d*)\s*%",
+            r"[Ss]ulfur[:\s]*(\d+\.?\d*)\s*%",
+            r"S[:\s]*(\d+\.?\d*)\s*%\s*[이하|max]",
+        ],
+        "ash": [
+            r"회분[:\s]*(\d+\.?\d*)\s*%",
+            r"[Aa]sh[:\s]*(\d+\.?\d*)\s*%",
+        ],
+        "moisture": [
+            r"수분[:\s]*(\d+\.?\d*)\s*%",
+            r"[Mm]oisture[:\s]*(\d+\.?\d*)\s*%",
+            r"TM[:\s]*(\d+\.?\d*)\s*%",
+        ],
+        "quantity": [
+            r"(\d{1,3}(?:,\d{3})*)\s*(?:MT|톤|ton)",
+            r"물량[:\s]*(\d{1,3}(?:,\d{3})*)",
+        ],
+    }
+
+    INCOTERMS_PATTERN = re.compile(r'\b(FOB|CIF|CFR|DES|DAP)\b', re.IGNORECASE)
+
+    # Distinct keywords needed before a document counts as coal related
+    MIN_KEYWORDS = 2
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compiled = {key: [re.compile(p, re.IGNORECASE) for p in patterns] for key, patterns in cls.PATTERNS.items()}
+        cls._keywords_lower = [(kw, kw.lower()) for kw in cls.COAL_KEYWORDS]
+
     @abstractmethod
+    def iter_pages(self, file_path: str) -> Iterator[DocumentPage]:
+        """Yield document pages lazily (one page/sheet/block at a time)"""
+        pass
+
     def parse(self, file_path: str) -> ParsedDocument:
         """Parse a file and return structured data"""
-        pass
-    
+        if not self.validate_extension(file_path, self.EXTENSIONS):
+            raise ValueError(f"Invalid file type for {type(self).__name__}: {file_path}")
+
+        texts: List[str] = []
+        relevant: List[DocumentPage] = []
+        keywords: Dict[str, None] = {}
+        for page in self.iter_pages(file_path):
+            texts.append(page.text)
+            found = self._find_keywords(page.text)
+            if found:
+                relevant.append(page)
+                keywords.update(dict.fromkeys(found))
+
+        found_keywords = [kw for kw in self.COAL_KEYWORDS if kw in keywords]
+        is_coal = len(found_keywords) >= self.MIN_KEYWORDS
+        spec = self.extract_spec(relevant) if is_coal else None
+
+        return ParsedDocument(
+            file_path=file_path,
+            file_type=self.FILE_TYPE,
+            full_text="\n".join(texts),
+            coal_spec=spec,
+            is_coal_related=is_coal,
+            keywords_found=found_keywords,
+            metadata={
+                "pages": len(texts),
+                "relevant_pages": [page.label or page.number for page in relevant],
+            },
+        )
+
     def validate_extension(self, file_path: str, allowed_extensions: List[str]) -> bool:
         """Helper to validate file extension"""
         return any(file_path.lower().endswith(ext) for ext in allowed_extensions)
+
+    def _find_keywords(self, text: str) -> List[str]:
+        text_lower = text.lower()
+        return [kw for kw, kw_lower in self._keywords_lower if kw_lower in text_lower]
+
+    def extract_spec(self, pages: List[DocumentPage]) -> CoalSpec:
+        """Spec from page tables / "label : value" lines, regex fallback on the page text"""
+        from .specs import SpecExtractor
+        return SpecExtractor(text_fallback=self._extract_spec).extract(pages)
+
+    def _extract_spec(self, text: str) -> CoalSpec:
+        spec = CoalSpec()
+
+        # Helper to find first match
+        def find_val(key, cast_func):
+            for pattern in self._compiled[key]:
+                match = pattern.search(text)
+                if match:
+                    try:
+                        val_str = match.group(1).replace(',', '')
+                        return cast_func(val_str)
+                    except ValueError:
+                        continue
+            return None
+
+        spec.calorific_value_min = find_val("calorific_value", int)
+        spec.sulfur_max = find_val("sulfur", float)
+        spec.ash_max = find_val("ash", float)
+        spec.moisture_max = find_val("moisture", float)
+        spec.quantity_mt = find_val("quantity", float)
+
+        match = self.INCOTERMS_PATTERN.search(text)
+        if match:
+            spec.incoterms = match.group(1).upper()
+
+        return spec
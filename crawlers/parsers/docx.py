@@ -0,0 +1,81 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List
+from .base import BaseParser, DocumentPage, ParsedDocument
+
+try:
+    from crawlers.tracing import traced
+except ImportError:
+    from tracing import traced
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+class DOCXParser(BaseParser):
+    """
+    DOCX Parser (streams word/document.xml with iterparse, no extra dependency)
+
+    Pages are blocks: body paragraphs up to a page break, and each top-level table
+    (rows of cell text, also rendered as "cell : cell" lines).
+    """
+
+    FILE_TYPE = 'docx'
+    EXTENSIONS = ['.docx']
+
+    @traced("parser", "docx.parse")
+    def parse(self, file_path: str) -> ParsedDocument:
+        return super().parse(file_path)
+
+    def iter_pages(self, file_path: str) -> Iterator[DocumentPage]:
+        number = 0
+        paragraphs: List[str] = []
+        depth = 0               # table nesting (nested tables stay inside their cell)
+        rows: List[List[str]] = []
+        row: List[str] = []
+        cell: List[str] = []
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as stream:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    if tag == f"{_W}tbl":
+                        depth += 1
+                        if depth == 1 and paragraphs:
+                            number += 1
+                            yield DocumentPage(number=number, text="\n".join(paragraphs))
+                            paragraphs = []
+                    continue
+
+                if tag == f"{_W}p":
+                    text = "".join(t.text or "" for t in elem.iter(f"{_W}t")).strip()
+                    page_break = any(br.get(f"{_W}type") == "page" for br in elem.iter(f"{_W}br"))
+                    if depth:
+                        if text:
+                            cell.append(text)
+                    else:
+                        if text:
+                            paragraphs.append(text)
+                        if page_break and paragraphs:
+                            number += 1
+                            yield DocumentPage(number=number, text="\n".join(paragraphs))
+                            paragraphs = []
+                        elem.clear()        # body paragraphs are done; table content is cleared with the table
+                elif tag == f"{_W}tc" and depth == 1:
+                    row.append(" ".join(cell))
+                    cell = []
+                elif tag == f"{_W}tr" and depth == 1:
+                    while row and not row[-1]:
+                        row.pop()
+                    if any(row):
+                        rows.append(row)
+                    row = []
+                elif tag == f"{_W}tbl":
+                    depth -= 1
+                    if depth == 0:
+                        if rows:
+                            number += 1
+                            text = "\n".join(" : ".join(c for c in r if c) for r in rows)
+                            yield DocumentPage(number=number, text=text, label=f"table {number}", tables=[rows])
+                        rows = []
+                        elem.clear()
+        if paragraphs:
+            number += 1
+            yield DocumentPage(number=number, text="\n".join(paragraphs))
@@ -1,35 +1,57 @@
-from typing import Dict, Type
+from typing import Dict, List, Type
 from .base import BaseParser
 from .hwp import HWPParser
+from .pdf import PDFParser
+from .xlsx import XLSXParser
+from .docx import DOCXParser
 
 class ParserFactory:
     """Factory to provide appropriate parser for file types"""
-    
-    _parsers: Dict[str, Type[BaseParser]] = {
-        '.hwp': HWPParser,
-        '.hwpx': HWPParser,
-        # Future: .pdf, .docx
-    }
-    
+
+    _parsers: Dict[str, Type[BaseParser]] = {}
+
+    @classmethod
+    def register(cls, parser_cls: Type[BaseParser]):
+        """Register a parser for each of its EXTENSIONS"""
+        for ext in parser_cls.EXTENSIONS:
+            cls._parsers[ext] = parser_cls
+        return parser_cls
+
+    @classmethod
+    def supported_extensions(cls) -> List[str]:
+        return sorted(cls._parsers)
+
+    @classmethod
+    def supports(cls, file_path: str) -> bool:
+        return cls._extension(file_path) in cls._parsers
+
+    @staticmethod
+    def _extension(file_path: str) -> str:
+        return '.' + file_path.split('.')[-1].lower() if '.' in file_path else ''
+
     @classmethod
     def get_parser(cls, file_path: str) -> BaseParser:
         """
         Get compatible parser instance for the file
-        
+
         Args:
             file_path: Path to the file to parse
-        
+
         Returns:
             Instance of suitable Parser class
-            
+
         Raises:
             ValueError: If no parser is found for the file extension
         """
-        ext = '.' + file_path.split('.')[-1].lower() if '.' in file_path else ''
-        
+        ext = cls._extension(file_path)
+
         parser_cls = cls._parsers.get(ext)
         if not parser_cls:
             # Fallback or raise? For now raise to be explicit
             raise ValueError(f"No parser available for file type: {ext}")
-            
+
         return parser_cls()
+
+
+for _parser_cls in (HWPParser, PDFParser, XLSXParser, DOCXParser):
+    ParserFactory.register(_parser_cls)
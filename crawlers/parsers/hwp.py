@@ -1,7 +1,13 @@
 import re
 import os
-from typing import List, Optional
-from .base import BaseParser, ParsedDocument, CoalSpec
+import zlib
+from typing import Iterator
+from .base import BaseParser, DocumentPage, ParsedDocument
+
+try:
+    from crawlers.tracing import traced
+except ImportError:
+    from tracing import traced
 
 # Placeholder for hwp5 import - intended for Linux environment
 try:
@@ -11,82 +17,115 @@ try:
 except ImportError:
     HWP5_AVAILABLE = False
 
+try:
+    import olefile
+    OLEFILE_AVAILABLE = True
+except ImportError:
+    OLEFILE_AVAILABLE = False
+
 class HWPParser(BaseParser):
     """
     HWP Parser implementation compatible with Linux (using hwp5/pyhwp)
     """
     
-    COAL_KEYWORDS = [
-        "유연탄", "석탄", "연료", "thermal coal", "bituminous",
-        "발열량", "calorific", "kcal", "NAR", "GAR",
-        "황분", "sulfur", "유황",
-        "회분", "ash",
-        "인도네시아", "호주", "러시아"
-    ]
-    
-    PATTERNS = {
-        "calorific_value": [
-            r"발열량[:\s]*(\d{4,5})\s*[kK]cal",
-            r"(\d{4,5})\s*[kK]cal/[kK]g",
-            r"NAR[:\s]*(\d{4,5})",
-            r"GAR[:\s]*(\d{4,5})",
-        ],
-        "sulfur": [
-            r"황분[:\s]*(\d+\.?\d*)\s*%",
-            r"유황[:\s]*(\d+\.?\d*)\s*%",
-            r"[Ss]ulfur[:\s]*(\d+\.?\d*)\s*%",
-            r"S[:\s]*(\d+\.?\d*)\s*%\s*[이하|max]",
-        ],
-        "ash": [
-            r"회분[:\s]*(\d+\.?\d*)\s*%",
-            r"[Aa]sh[:\s]*(\d+\.?\d*)\s*%",
-        ],
-        "moisture": [
-            r"수분[:\s]*(\d+\.?\d*)\s*%",
-            r"[Mm]oisture[:\s]*(\d+\.?\d*)\s*%",
-            r"TM[:\s]*(\d+\.?\d*)\s*%",
-        ],
-        "quantity": [
-            r"(\d{1,3}(?:,\d{3})*)\s*(?:MT|톤|ton)",
-            r"물량[:\s]*(\d{1,3}(?:,\d{3})*)",
-        ],
-    }
+    FILE_TYPE = 'hwp'
+    EXTENSIONS = ['.hwp', '.hwpx']
 
+    # HWP v5 record tag for paragraph text (HWPTAG_BEGIN + 51)
+    HWPTAG_PARA_TEXT = 67
+    # Control characters occupying 8 WCHARs (extended / inline controls), the rest of 0-31 take one
+    _WIDE_CONTROLS = frozenset((1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23))
+
+    @traced("parser", "hwp.parse")
     def parse(self, file_path: str) -> ParsedDocument:
-        if not self.validate_extension(file_path, ['.hwp', '.hwpx']):
-            raise ValueError(f"Invalid file type for HWPParser: {file_path}")
-            
-        full_text = self._extract_text(file_path)
-        keywords = self._find_keywords(full_text)
-        is_coal = len(keywords) >= 2
-        spec = self._extract_spec(full_text) if is_coal else None
-        
-        return ParsedDocument(
-            file_path=file_path,
-            file_type='hwp',
-            full_text=full_text,
-            coal_spec=spec,
-            is_coal_related=is_coal,
-            keywords_found=keywords,
-            metadata={}
-        )
+        return super().parse(file_path)
+
+    def iter_pages(self, file_path: str) -> Iterator[DocumentPage]:
+        """One page per BodyText section; PrvText (first-page preview) only when there is no body text"""
+        if OLEFILE_AVAILABLE and olefile.isOleFile(file_path):
+            pages = [page for page in self._iter_sections(file_path) if page.text.strip()]
+            if pages:
+                yield from pages
+                return
+            preview = self._preview_text(file_path)
+            if preview.strip():
+                yield DocumentPage(number=1, text=preview, label="PrvText")
+                return
+
+        # Binary extraction has no page boundaries → whole document is one page
+        yield DocumentPage(number=1, text=self._extract_fallback(file_path))
 
     def _extract_text(self, file_path: str) -> str:
-        """Extract text using best available method"""
-        # 1. Try hwp5 (Linux/Docker friendly)
-        if HWP5_AVAILABLE:
-            try:
-                # Basic usage of hwp5txt to get content
-                # Note: hwp5txt usually outputs to stdout or file, we might need subprocess if library usage is tricky
-                # For now, let's assume we can use the library wrapper or fallback to subprocess
-                # As a safe bet in this environment without verifying hwp5 internal API, let's use subprocess if needed
-                # However, for this implementation let's try the fallback binary extraction first which is robust for simple text
-                pass 
-            except Exception:
-                pass
-        
-        # 2. Fallback: Binary extraction (robust for simple Korean text in HWP v5)
-        return self._extract_fallback(file_path)
+        """Whole document text (BodyText → PrvText → binary fallback)"""
+        return "\n".join(page.text for page in self.iter_pages(file_path))
+
+    def _iter_sections(self, file_path: str) -> Iterator[DocumentPage]:
+        try:
+            with olefile.OleFileIO(file_path) as ole:
+                compressed = True
+                if ole.exists("FileHeader"):
+                    header = ole.openstream("FileHeader").read()
+                    compressed = len(header) < 40 or bool(int.from_bytes(header[36:40], "little") & 1)
+                sections = sorted(
+                    (entry[1] for entry in ole.listdir() if entry[0] == "BodyText" and entry[1].startswith("Section")),
+                    key=lambda name: int(name[7:] or 0),
+                )
+                for number, section in enumerate(sections, 1):
+                    data = ole.openstream(f"BodyText/{section}").read()
+                    if compressed:
+                        try:
+                            data = zlib.decompress(data, -15)
+                        except zlib.error:
+                            continue
+                    yield DocumentPage(number=number, text=self._section_text(data), label=section)
+        except Exception:
+            return
+
+    def _section_text(self, data: bytes) -> str:
+        """Paragraph text records of one decompressed section (record headers and controls skipped)"""
+        paragraphs = []
+        offset = 0
+        while offset + 4 <= len(data):
+            header = int.from_bytes(data[offset:offset + 4], "little")
+            offset += 4
+            tag, size = header & 0x3FF, header >> 20
+            if size == 0xFFF:
+                size = int.from_bytes(data[offset:offset + 4], "little")
+                offset += 4
+            if tag == self.HWPTAG_PARA_TEXT:
+                paragraphs.append(self._para_text(data[offset:offset + size]))
+            offset += size
+        return "\n".join(text for text in paragraphs if text.strip())
+
+    def _para_text(self, data: bytes) -> str:
+        chars = []
+        units = len(data) // 2
+        i = 0
+        while i < units:
+            code = int.from_bytes(data[2 * i:2 * i + 2], "little")
+            if code >= 32:
+                chars.append(chr(code))
+                i += 1
+            elif code in self._WIDE_CONTROLS:
+                if code == 9:
+                    chars.append("\t")     # tab: keeps "label<TAB>value" rows splittable
+                i += 8
+            else:
+                if code in (10, 13):
+                    chars.append("\n")
+                elif code in (30, 31):
+                    chars.append(" ")       # non-breaking / fixed-width space
+                i += 1
+        return "".join(chars).strip()
+
+    def _preview_text(self, file_path: str) -> str:
+        try:
+            with olefile.OleFileIO(file_path) as ole:
+                if ole.exists("PrvText"):
+                    return ole.openstream("PrvText").read().decode("utf-16-le", errors="ignore")
+        except Exception:
+            pass
+        return ""
 
     def _extract_fallback(self, file_path: str) -> str:
         """
@@ -113,49 +152,3 @@ class HWPParser(BaseParser):
         except Exception as e:
             print(f"Extraction error: {e}")
             return ""
-
-    def _find_keywords(self, text: str) -> List[str]:
-        found = []
-        text_lower = text.lower()
-        for kw in self.COAL_KEYWORDS:
-            if kw.lower() in text_lower:
-                found.append(kw)
-        return found
-
-    def _extract_spec(self, text: str) -> CoalSpec:
-        spec = CoalSpec()
-        
-        # Helper to find first match
-        def find_val(key, cast_func):
-            for pattern in self.PATTERNS[key]:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    try:
-                        val_str = match.group(1).replace(',', '')
-                        return cast_func(val_str)
-                    except ValueError:
-                        continue
-            return None
-
-        # Min/Max logic for Calorific Value
-        for pattern in self.PATTERNS["calorific_value"]:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                val = int(match.group(1).replace(',', ''))
-                if spec.calorific_value_min is None:
-                    spec.calorific_value_min = val
-                else:
-                    spec.calorific_value_max = val
-                break # Take the first clearly identified one
-
-        spec.sulfur_max = find_val("sulfur", float)
-        spec.ash_max = find_val("ash", float)
-        spec.moisture_max = find_val("moisture", float)
-        spec.quantity_mt = find_val("quantity", float)
-        
-        incoterms_pattern = r'\b(FOB|CIF|CFR|DES|DAP)\b'
-        match = re.search(incoterms_pattern, text, re.IGNORECASE)
-        if match:
-            spec.incoterms = match.group(1).upper()
-            
-        return spec
@@ -0,0 +1,42 @@
+from typing import Iterator, Optional
+from .base import BaseParser, DocumentPage, ParsedDocument
+
+try:
+    from crawlers.tracing import traced
+except ImportError:
+    from tracing import traced
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+class PDFParser(BaseParser):
+    """
+    PDF Parser (text layer via pypdf, one page at a time)
+
+    Scanned PDFs without a text layer yield empty pages (no OCR).
+    """
+
+    FILE_TYPE = 'pdf'
+    EXTENSIONS = ['.pdf']
+
+    def __init__(self, max_pages: Optional[int] = None):
+        # Spec sheets sit near the front; cap very long attachments (drawings, contracts)
+        self.max_pages = max_pages
+
+    @traced("parser", "pdf.parse")
+    def parse(self, file_path: str) -> ParsedDocument:
+        return super().parse(file_path)
+
+    def iter_pages(self, file_path: str) -> Iterator[DocumentPage]:
+        if not PYPDF_AVAILABLE:
+            raise RuntimeError("pypdf is required for PDF parsing (pip install pypdf)")
+        reader = PdfReader(file_path)
+        if reader.is_encrypted:
+            reader.decrypt("")      # owner-password only PDFs open with an empty user password
+        for number, page in enumerate(reader.pages, 1):
+            if self.max_pages and number > self.max_pages:
+                break
+            yield DocumentPage(number=number, text=page.extract_text() or "")
@@ -0,0 +1,402 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .base import CoalSpec, DocumentPage
+
+# Field → label aliases. Hangul aliases match as substrings of the label with whitespace removed;
+# Latin aliases match whole words only ("ash" must not match "Cash deposit" / "Washing plant" / "Flash point")
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "calorific_value": ("발열량", "열량", "calorific value", "calorific", "heating value", "gcv", "ncv", "gar", "nar", "cv"),
+    "sulfur": ("전유황", "유황분", "유황", "황분", "total sulfur", "sulfur", "sulphur", "ts", "s"),
+    "ash": ("회분", "ash content", "ash"),
+    "moisture": ("전수분", "수분", "total moisture", "moisture", "tm"),
+    "quantity": ("구매물량", "구매량", "물량", "수량", "quantity", "qty"),
+    "origin": ("원산지", "생산국", "산지", "country of origin", "origin"),
+    "delivery_port": ("납품항", "하역항", "양하항", "도착항", "인도항", "인도장소", "납품장소",
+                      "port of discharge", "discharge port", "delivery port", "destination"),
+    "incoterms": ("인도조건", "가격조건", "거래조건", "incoterms", "delivery terms", "trade terms"),
+}
+
+# Short aliases only count as an exact label (avoid "s" / "cv" matching inside other words)
+EXACT_ONLY = {"s", "ts", "tm", "cv", "gar", "nar", "gcv", "ncv", "qty"}
+
+# Labels that mention a field word but describe something else
+EXCLUDED_LABELS = ("융점", "fusion", "휘발", "volatile", "고정탄소", "fixedcarbon", "hgi", "입도", "size", "내재수분", "inherent")
+
+HEADER_ROLES: Dict[str, Tuple[str, ...]] = {
+    "label": ("항목", "구분", "품질항목", "분석항목", "item", "parameter", "property", "description"),
+    "min": ("최소", "최저", "하한", "min", "minimum"),
+    "max": ("최대", "최고", "상한", "max", "maximum"),
+    "unit": ("단위", "unit", "units"),
+    "basis": ("분석기준", "basis"),
+    "value": ("기준", "규격", "기준치", "보증치", "보증", "규격치", "spec", "specification", "value", "typical", "guaranteed", "rejection"),
+    "remarks": ("비고", "remark", "remarks", "note"),
+}
+
+PERCENT_FIELDS = ("sulfur", "ash", "moisture")
+TEXT_FIELDS = ("origin", "delivery_port")
+
+# Plausible ranges after unit normalization
+RANGES = {
+    "calorific_value": (2500, 8500),      # kcal/kg
+    "sulfur": (0.0, 5.0),                 # %
+    "ash": (0.0, 50.0),
+    "moisture": (0.0, 65.0),
+    "quantity": (100.0, 20_000_000.0),    # MT
+}
+
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_NUMBER_RE = re.compile(_NUMBER)
+_RANGE_RE = re.compile(rf"({_NUMBER})\s*(?:~|∼|〜|–|-|to)\s*({_NUMBER})", re.IGNORECASE)
+_MIN_RE = re.compile(r"이상|초과|min(?:imum)?\b|≥|>=|>|not\s*less", re.IGNORECASE)
+_MAX_RE = re.compile(r"이하|미만|max(?:imum)?\b|≤|<=|<|not\s*more|not\s*exceed", re.IGNORECASE)
+_BASIS_RE = re.compile(r"\b(NAR|GAR|ADB|NCV|GCV|ARB)\b|순발열량|총발열량|gross|net", re.IGNORECASE)
+_INCOTERMS_RE = re.compile(r"\b(FOB|CIF|CFR|DES|DAP)\b", re.IGNORECASE)
+_NUMBERING_RE = re.compile(r"^\s*(?:\d+[.)]|[가-하][.)]|[-•·*○□■▶])\s*")
+_LINE_SPLIT_RE = re.compile(r"\s*\|\s*|\t+|\s{2,}|\s*[:：]\s*")
+
+
+BASIS_ALIASES = {"nar": "NAR", "ncv": "NAR", "arb": "NAR", "net": "NAR", "순발열량": "NAR",
+                 "gar": "GAR", "gcv": "GAR", "gross": "GAR", "총발열량": "GAR", "adb": "ADB"}
+
+# Confidence components
+SOURCE_CONFIDENCE = {"table": 0.7, "line": 0.55, "text": 0.35}
+UNIT_BONUS = 0.15
+BOUND_BONUS = 0.1
+HEADER_BONUS = 0.05
+
+
+def _key(text: str) -> str:
+    return re.sub(r"\s+", "", text or "").lower()
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _word_pattern(alias: str) -> "re.Pattern[str]":
+    # "total sulfur" also matches "totalsulfur" / "total  sulfur", never inside a longer word
+    words = r"\s*".join(re.escape(word) for word in alias.split())
+    return re.compile(rf"(?<![a-z]){words}(?![a-z])")
+
+
+_WORD_ALIASES = {alias: _word_pattern(alias) for aliases in FIELD_ALIASES.values() for alias in aliases
+                 if alias.isascii() and alias not in EXACT_ONLY}
+
+
+def match_field(label: str) -> Optional[str]:
+    """Row label → CoalSpec field (None for unrelated rows)"""
+    text = _NUMBERING_RE.sub("", label or "").lower().strip()
+    key = _key(text)
+    if not key or any(word in key for word in EXCLUDED_LABELS):
+        return None
+    bare_text = re.sub(r"\(.*?\)|\[.*?\]", "", text)
+    bare = _key(bare_text)
+    for field_name, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in EXACT_ONLY:
+                if bare == alias or bare.startswith(alias + "(") or key == alias:
+                    return field_name
+            elif alias in _WORD_ALIASES:
+                pattern = _WORD_ALIASES[alias]
+                if pattern.search(bare_text) or (len(alias) > 3 and pattern.search(text)):
+                    return field_name
+            elif alias in bare:
+                return field_name
+    return None
+
+
+@dataclass
+class Candidate:
+    field: str
+    value: object
+    confidence: float
+    bound: Optional[str] = None       # "min" / "max" for calorific value
+
+
+@dataclass
+class _Header:
+    label: int = 0
+    min: Optional[int] = None
+    max: Optional[int] = None
+    unit: Optional[int] = None
+    basis: Optional[int] = None
+    values: Tuple[int, ...] = ()
+
+
+def _header(row: Sequence[str]) -> Optional[_Header]:
+    roles: Dict[str, List[int]] = {}
+    for index, cell in enumerate(row):
+        key = _key(cell)
+        for role, words in HEADER_ROLES.items():
+            if key and any(key == w or (len(w) > 2 and key.startswith(w)) for w in words):
+                roles.setdefault(role, []).append(index)
+                break
+    if len(roles) < 2 or match_field(row[0] if row else ""):
+        return None
+    return _Header(
+        label=roles.get("label", [0])[0],
+        min=roles.get("min", [None])[0],
+        max=roles.get("max", [None])[0],
+        unit=roles.get("unit", [None])[0],
+        basis=roles.get("basis", [None])[0],
+        values=tuple(roles.get("value", ())),
+    )
+
+
+class SpecExtractor:
+    """
+    Table-aware coal spec extraction
+
+    Rows come from DocumentPage.tables (XLSX/DOCX) or from "label : value" lines of flat
+    text (HWP/PDF). Each row label maps to a CoalSpec field; the value cells are parsed with
+    unit normalization (MJ/kg, kJ/kg → kcal/kg; 천톤/만톤/kt → MT) and explicit bounds
+    (이상/이하, min/max columns, ranges). Whole-text regexes only fill fields no row produced.
+    Per-field confidence = source + unit + bound (+ header) components.
+    """
+
+    def __init__(self, text_fallback=None):
+        # text_fallback: callable(text) → CoalSpec (BaseParser._extract_spec)
+        self.text_fallback = text_fallback
+
+    # -------------------------------------------------
+    # Entry points
+    # -------------------------------------------------
+
+    def extract(self, pages: Iterable[DocumentPage]) -> CoalSpec:
+        candidates: List[Candidate] = []
+        texts = []
+        for page in pages:
+            texts.append(page.text)
+            if page.tables:
+                for table in page.tables:
+                    candidates.extend(self.from_table(table))
+            else:
+                candidates.extend(self.from_text(page.text))
+        if self.text_fallback is not None and not self._complete(candidates):
+            candidates.extend(self._from_fallback("\n".join(texts)))
+        return self.merge(candidates)
+
+    @staticmethod
+    def _complete(candidates: List[Candidate]) -> bool:
+        """Every field the regex fallback could supply already came from a row"""
+        found = {c.field for c in candidates}
+        return {"calorific_value", "sulfur", "ash", "moisture", "quantity", "incoterms"} <= found
+
+    def from_table(self, rows: Sequence[Sequence[str]]) -> List[Candidate]:
+        candidates: List[Candidate] = []
+        header: Optional[_Header] = None
+        for row in rows:
+            cells = [str(cell or "").strip() for cell in row]
+            if not any(cells):
+                continue
+            found = _header(cells)
+            if found is not None:
+                header = found
+                continue
+            candidates.extend(self._row(cells, header, "table"))
+        return candidates
+
+    def from_text(self, text: str) -> List[Candidate]:
+        candidates: List[Candidate] = []
+        for line in text.splitlines():
+            # Only "label : value" style lines can be rows (cheap substring checks before any regex)
+            if ":" not in line and "：" not in line and "|" not in line and "\t" not in line and "  " not in line.strip():
+                continue
+            line = _NUMBERING_RE.sub("", line).strip()
+            if not line:
+                continue
+            cells = [cell for cell in _LINE_SPLIT_RE.split(line, maxsplit=3) if cell]
+            if len(cells) >= 2:
+                candidates.extend(self._row(cells, None, "line"))
+        return candidates
+
+    # -------------------------------------------------
+    # Rows
+    # -------------------------------------------------
+
+    def _row(self, cells: List[str], header: Optional[_Header], source: str) -> List[Candidate]:
+        label_index = header.label if header and header.label < len(cells) else 0
+        field_name = match_field(cells[label_index])
+        if field_name is None and header is None:
+            # Label in a later column (e.g. "1 | 발열량 | ...")
+            for index, cell in enumerate(cells[1:3], 1):
+                field_name = match_field(cell)
+                if field_name:
+                    label_index = index
+                    break
+        if field_name is None:
+            return []
+
+        label = cells[label_index]
+        cell_at = lambda index: cells[index] if index is not None and index < len(cells) else ""
+        unit = cell_at(header.unit) if header else ""
+        basis = cell_at(header.basis) if header else ""
+        if header and header.values:
+            values = [cell_at(index) for index in header.values]
+        else:
+            skip = {label_index}
+            if header:
+                skip.update(i for i in (header.unit, header.basis, header.min, header.max) if i is not None)
+            values = [cell for index, cell in enumerate(cells) if index not in skip]
+        value_text = " ".join(v for v in values if v)
+        base = SOURCE_CONFIDENCE[source] + (HEADER_BONUS if header else 0.0)
+
+        if field_name in TEXT_FIELDS or field_name == "incoterms":
+            # Text values may sit in any non-label column (e.g. the 최소 column of a merged row)
+            text = " ".join(cell for index, cell in enumerate(cells) if index != label_index and cell != unit)
+            if field_name == "incoterms":
+                return self._incoterms(text, base)
+            text = _clean_text(text)
+            return [Candidate(field_name, text, round(min(base + 0.1, 1.0), 2))] if text else []
+
+        context = " ".join([label, unit, basis, value_text])
+        if header and (header.min is not None or header.max is not None):
+            candidates = []
+            for bound, index in (("min", header.min), ("max", header.max)):
+                text = cell_at(index)
+                if _NUMBER_RE.search(text):
+                    candidates.extend(self._numeric(field_name, text, f"{context} {text}", base + BOUND_BONUS, bound))
+            if candidates:
+                return candidates
+        return self._numeric(field_name, value_text, context, base)
+
+    def _numeric(self, field_name: str, value_text: str, context: str, base: float, bound: Optional[str] = None) -> List[Candidate]:
+        value_range = _RANGE_RE.search(value_text)
+        if value_range:
+            low, high = _number(value_range.group(1)), _number(value_range.group(2))
+            pairs = [(low, "min"), (high, "max")] if field_name == "calorific_value" else [(high, "max")]
+            if field_name == "quantity":
+                pairs = [(low, None)]
+            explicit = True
+        else:
+            number = _NUMBER_RE.search(value_text)
+            if not number:
+                return []
+            if bound is None:
+                tail = value_text[number.end():] + " " + value_text[:number.start()]
+                bound = "min" if _MIN_RE.search(tail) else "max" if _MAX_RE.search(tail) else None
+            explicit = bound is not None
+            pairs = [(_number(number.group(0)), bound)]
+
+        candidates = []
+        for raw, pair_bound in pairs:
+            value, unit_known = normalize(field_name, raw, context)
+            if value is None:
+                continue
+            confidence = base + (UNIT_BONUS if unit_known else 0.0) + (BOUND_BONUS if explicit else 0.0)
+            if field_name == "calorific_value":
+                pair_bound = pair_bound or "min"      # a bare calorific value is the guaranteed minimum
+                candidates.append(Candidate(field_name, value, round(min(confidence, 1.0), 2), pair_bound))
+                basis = detect_basis(context)
+                if basis:
+                    candidates.append(Candidate("cv_basis", basis, round(min(base + UNIT_BONUS, 1.0), 2)))
+            else:
+                candidates.append(Candidate(field_name, value, round(min(confidence, 1.0), 2)))
+        return candidates
+
+    def _incoterms(self, value_text: str, base: float) -> List[Candidate]:
+        match = _INCOTERMS_RE.search(value_text)
+        if not match:
+            return []
+        candidates = [Candidate("incoterms", match.group(1).upper(), round(min(base + 0.2, 1.0), 2))]
+        # "CIF 당진항" → remainder is the delivery port
+        port = _clean_text(value_text[:match.start()] + " " + value_text[match.end():])
+        if port:
+            candidates.append(Candidate("delivery_port", port, round(base - 0.1, 2)))
+        return candidates
+
+    def _from_fallback(self, text: str) -> List[Candidate]:
+        spec = self.text_fallback(text)
+        confidence = SOURCE_CONFIDENCE["text"]
+        candidates = []
+        for field_name, attr in (("sulfur", "sulfur_max"), ("ash", "ash_max"), ("moisture", "moisture_max"), ("quantity", "quantity_mt")):
+            value = getattr(spec, attr)
+            if value is not None and _in_range(field_name, value):
+                candidates.append(Candidate(field_name, value, confidence))
+        if spec.calorific_value_min is not None and _in_range("calorific_value", spec.calorific_value_min):
+            candidates.append(Candidate("calorific_value", spec.calorific_value_min, confidence, "min"))
+        if spec.incoterms:
+            candidates.append(Candidate("incoterms", spec.incoterms, confidence))
+        return candidates
+
+    # -------------------------------------------------
+    # Merge
+    # -------------------------------------------------
+
+    @staticmethod
+    def merge(candidates: Iterable[Candidate]) -> CoalSpec:
+        """Highest-confidence candidate per field (first wins on ties)"""
+        best: Dict[str, Candidate] = {}
+        for candidate in candidates:
+            key = candidate.field if candidate.field != "calorific_value" else f"calorific_value_{candidate.bound}"
+            if key not in best or candidate.confidence > best[key].confidence:
+                best[key] = candidate
+
+        spec = CoalSpec()
+        targets = {
+            "calorific_value_min": "calorific_value_min",
+            "calorific_value_max": "calorific_value_max",
+            "sulfur": "sulfur_max",
+            "ash": "ash_max",
+            "moisture": "moisture_max",
+            "quantity": "quantity_mt",
+            "origin": "origin",
+            "delivery_port": "delivery_port",
+            "incoterms": "incoterms",
+            "cv_basis": "cv_basis",
+        }
+        for key, attr in targets.items():
+            if key in best:
+                value = best[key].value
+                setattr(spec, attr, int(round(value)) if key.startswith("calorific") else value)
+                spec.confidence[attr] = best[key].confidence
+        low, high = spec.calorific_value_min, spec.calorific_value_max
+        if low is not None and high is not None and low > high:
+            spec.calorific_value_min, spec.calorific_value_max = high, low
+        return spec
+
+
+# =====================================================
+# Units
+# =====================================================
+
+def normalize(field_name: str, value: float, context: str) -> Tuple[Optional[float], bool]:
+    """Value in field units (kcal/kg, %, MT) → (value or None if implausible, unit recognized)"""
+    lowered = context.lower()
+    unit_known = False
+    if field_name == "calorific_value":
+        if re.search(r"mj\s*/\s*kg", lowered):
+            value, unit_known = value * 238.846, True
+        elif re.search(r"kj\s*/\s*kg", lowered):
+            value, unit_known = value / 4.1868, True
+        elif re.search(r"btu\s*/\s*lb", lowered):
+            value, unit_known = value * 0.5556, True
+        elif re.search(r"kcal", lowered):
+            unit_known = True
+    elif field_name in PERCENT_FIELDS:
+        unit_known = "%" in context or "percent" in lowered or "wt" in lowered
+    elif field_name == "quantity":
+        if re.search(r"만\s*톤", context):
+            value, unit_known = value * 10_000, True
+        elif re.search(r"천\s*톤|\bkt\b|\bkmt\b|['‘’]000\s*mt", lowered) and value < 100_000:
+            value, unit_known = value * 1_000, True
+        elif re.search(r"m/?t\b|톤|\bton|\bt\b", lowered):
+            unit_known = True
+    return (value, unit_known) if _in_range(field_name, value) else (None, unit_known)
+
+
+def detect_basis(text: str) -> Optional[str]:
+    match = _BASIS_RE.search(text)
+    return BASIS_ALIASES.get(match.group(0).lower()) if match else None
+
+
+def _in_range(field_name: str, value: float) -> bool:
+    low, high = RANGES[field_name]
+    return low <= value <= high
+
+
+def _clean_text(text: str) -> str:
+    text = re.sub(r"\s+", " ", text or "").strip(" :-|,")
+    return text[:100]
@@ -0,0 +1,57 @@
+from typing import Iterator, List, Optional
+from .base import BaseParser, DocumentPage, ParsedDocument
+
+try:
+    from crawlers.tracing import traced
+except ImportError:
+    from tracing import traced
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+class XLSXParser(BaseParser):
+    """
+    XLSX Parser (openpyxl read-only, one sheet at a time)
+
+    Each row becomes a "cell : cell" line so label/value rows of spec tables
+    read like the "발열량 : 5800 kcal/kg" text the shared patterns expect.
+    """
+
+    FILE_TYPE = 'xlsx'
+    EXTENSIONS = ['.xlsx', '.xlsm']
+
+    def __init__(self, max_rows: Optional[int] = 5000):
+        # Spec tables are small; skip the tail of data dumps
+        self.max_rows = max_rows
+
+    @traced("parser", "xlsx.parse")
+    def parse(self, file_path: str) -> ParsedDocument:
+        return super().parse(file_path)
+
+    def iter_pages(self, file_path: str) -> Iterator[DocumentPage]:
+        if not OPENPYXL_AVAILABLE:
+            raise RuntimeError("openpyxl is required for XLSX parsing (pip install openpyxl)")
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for number, sheet in enumerate(workbook.worksheets, 1):
+                rows: List[List[str]] = []
+                for values in sheet.iter_rows(values_only=True, max_row=self.max_rows):
+                    cells = [_cell_text(value) for value in values]
+                    while cells and not cells[-1]:
+                        cells.pop()
+                    if any(cells):
+                        rows.append(cells)
+                text = "\n".join(" : ".join(cell for cell in row if cell) for row in rows)
+                yield DocumentPage(number=number, text=text, label=sheet.title, tables=[rows] if rows else [])
+        finally:
+            workbook.close()
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
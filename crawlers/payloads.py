@@ -0,0 +1,96 @@
+"""
+원본 응답(raw_api_response) 저장 형식 (supabase/migrations/007_raw_payloads.sql)
+
+tenders 행에는 content_hash만 두고 본문은 raw_payloads에 1회 저장
+- canonical JSON: 키 정렬 + 공백 제거, 크롤링마다 바뀌는 키(VOLATILE_KEYS) 제외 → 내용이 같으면 같은 해시
+- 압축: zstd (zstandard 설치 시), 없으면 zlib / 압축 이득이 없으면 identity
+- body는 bytea (PostgREST JSON에서는 \\x hex 문자열)
+"""
+import json
+import zlib
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    from dto import RawPayload
+except ImportError:
+    from crawlers.dto import RawPayload
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# KEPCO TenderResult.crawled_at 등 수집 시각 (내용 변경 아님)
+VOLATILE_KEYS = frozenset({"crawled_at"})
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+
+def canonical(payload: Union[RawPayload, Dict[str, Any]]) -> bytes:
+    data = payload.to_dict() if isinstance(payload, RawPayload) else payload
+    if isinstance(data, dict) and VOLATILE_KEYS & data.keys():
+        data = {key: value for key, value in data.items() if key not in VOLATILE_KEYS}
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def compress(raw: bytes) -> Tuple[str, bytes]:
+    if ZSTD_AVAILABLE:
+        codec, body = "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        codec, body = "zlib", zlib.compress(raw, ZLIB_LEVEL)
+    return (codec, body) if len(body) < len(raw) else ("identity", raw)
+
+
+def decompress(codec: str, body: bytes) -> bytes:
+    if codec == "identity":
+        return body
+    if codec == "zlib":
+        return zlib.decompress(body)
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard not installed, cannot read zstd payload")
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError(f"Unknown payload codec: {codec}")
+
+
+def _bytea(value: Union[str, bytes, memoryview]) -> bytes:
+    """PostgREST bytea(\\x hex 문자열) / 메모리 bytes → bytes"""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+    return bytes(value)
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedPayload:
+    content_hash: str
+    codec: str
+    body: bytes
+    raw_size: int
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "content_hash": self.content_hash,
+            "codec": self.codec,
+            "body": "\\x" + self.body.hex(),
+            "raw_size": self.raw_size,
+        }
+
+
+def encode(payload: Union[RawPayload, Dict[str, Any], None]) -> Optional[EncodedPayload]:
+    """빈 응답은 저장하지 않음 (None)"""
+    if payload is None or (not isinstance(payload, RawPayload) and not payload):
+        return None
+    raw = canonical(payload)
+    if raw in (b"{}", b"null"):
+        return None
+    codec, body = compress(raw)
+    return EncodedPayload(hashlib.sha256(raw).hexdigest(), codec, body, len(raw))
+
+
+def decode_row(row: Dict[str, Any]) -> RawPayload:
+    """raw_payloads 행 → RawPayload (JSON 디코드는 첫 키 접근 시)"""
+    return RawPayload(decompress(row["codec"], _bytea(row["body"])))
@@ -1,55 +1,433 @@
 import os
-from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from abc import ABC, abstractmethod
+from datetime import datetime, date, timezone
+from typing import Callable, Iterable, List, Optional, Dict, Any, Set, Tuple
+import httpx
 from supabase import create_client, Client
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
 from pydantic import BaseModel
 
 # DTO imports (assuming they are in the same package or accessible)
 try:
-    from dto import TenderDTO, TenderAttachmentDTO, TenderSpecDTO, TenderStatus, ShipmentDTO, ShipmentStatus, DemurrageCalcDTO, MarketDataDTO, NetbackSimulationDTO
+    from dto import RawPayload, TenderDTO, TenderAttachmentDTO, TenderSpecDTO, TenderStatus, ShipmentDTO, ShipmentStatus, DemurrageCalcDTO, MarketDataDTO, NetbackSimulationDTO, TenderFilter
+    from tracing import instrument
+    from summary import SUMMARY_KEY_COLUMNS
+    from payloads import decode_row, encode as encode_payload
 except ImportError:
     # For standalone testing if imports fail relative to path
-    from crawlers.dto import TenderDTO, TenderAttachmentDTO, TenderSpecDTO, TenderStatus, ShipmentDTO, ShipmentStatus, DemurrageCalcDTO, MarketDataDTO, NetbackSimulationDTO
+    from crawlers.dto import RawPayload, TenderDTO, TenderAttachmentDTO, TenderSpecDTO, TenderStatus, ShipmentDTO, ShipmentStatus, DemurrageCalcDTO, MarketDataDTO, NetbackSimulationDTO, TenderFilter
+    from crawlers.tracing import instrument
+    from crawlers.summary import SUMMARY_KEY_COLUMNS
+    from crawlers.payloads import decode_row, encode as encode_payload
 
-class SupabaseRepository:
-    def __init__(self, url: str, key: str):
-        self.supabase: Client = create_client(url, key)
+def _enum_value(value: Any) -> Any:
+    return value.value if hasattr(value, 'value') else value
 
-    def upsert_tender(self, tender: TenderDTO) -> Dict[str, Any]:
-        """
-        Tender 데이터를 Upsert 합니다.
-        (source, bid_ntce_no, bid_ntce_ord) 조합이 Unique Key입니다.
-        """
-        # DTO to Dict conversion
-        data = {
+
+def _iso(value: Optional[Any]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _group_by_columns(rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """None 값 열을 뺀 row를 열 구성별로 묶음 (부분 upsert: 빠진 열은 기존 값 유지)"""
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        compact = {k: v for k, v in row.items() if v is not None}
+        groups.setdefault(tuple(compact), []).append(compact)
+    return list(groups.values())
+
+
+class BaseRepository(ABC):
+    """
+    Repository 인터페이스
+    SupabaseRepository(실 DB)와 InMemoryRepository(테스트/부하 실험)가 구현
+    DTO → row 변환은 구현체 간 동일한 결과를 위해 여기서 공유
+    """
+
+    # 이미 저장된 raw_payloads 해시 (프로세스 내, 상한 초과 시 비움)
+    KNOWN_PAYLOADS_MAX = 100_000
+
+    def __init__(self):
+        self._listeners: Dict[str, List[Callable[[Any], None]]] = {}
+        self._known_payloads: Set[str] = set()
+
+    # =====================================================
+    # Change listeners (캐시 / 인덱스 갱신용)
+    # =====================================================
+
+    def add_listener(self, table: str, callback: Callable[[Any], None]):
+        """table 쓰기 후 호출 (market_data: 변경된 index_name 집합, tender_specs: 기록된 row 목록)"""
+        self._listeners.setdefault(table, []).append(callback)
+
+    def remove_listener(self, table: str, callback: Callable[[Any], None]):
+        callbacks = self._listeners.get(table, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def _notify(self, table: str, changes: Any):
+        if changes:
+            for callback in list(self._listeners.get(table, ())):
+                callback(changes)
+
+    def add_market_data_listener(self, callback: Callable[[Set[str]], None]):
+        self.add_listener("market_data", callback)
+
+    def remove_market_data_listener(self, callback: Callable[[Set[str]], None]):
+        self.remove_listener("market_data", callback)
+
+    def _notify_market_data(self, index_names: Iterable[str]):
+        self._notify("market_data", set(index_names))
+
+    # =====================================================
+    # DTO → Row 변환
+    # =====================================================
+
+    @staticmethod
+    def _tender_row(tender: TenderDTO) -> Dict[str, Any]:
+        return {
             "bid_ntce_no": tender.bid_ntce_no,
             "bid_ntce_ord": tender.bid_ntce_ord,
-            "source": tender.source.value if hasattr(tender.source, 'value') else tender.source,
+            "source": _enum_value(tender.source),
             "bid_ntce_nm": tender.bid_ntce_nm,
             "ntce_div_cd": tender.ntce_div_cd,
             "dminstt_nm": tender.dminstt_nm,
             "dminstt_cd": tender.dminstt_cd,
             "asign_bdgt_amt": tender.asign_bdgt_amt,
             "presmpt_prce": tender.presmpt_prce,
-            "bid_clse_dt": tender.bid_clse_dt.isoformat() if tender.bid_clse_dt else None,
+            "bid_clse_dt": _iso(tender.bid_clse_dt),
             "bid_ntce_dtl_url": tender.bid_ntce_dtl_url,
-            "status": tender.status.value if hasattr(tender.status, 'value') else tender.status,
-            "raw_api_response": tender.raw_api_response,
-            "ai_summary": tender.ai_summary,
-            "relevance_score": tender.relevance_score,
-            # created_at and updated_at are handled by DB triggers, 
+            "status": _enum_value(tender.status),
+            # 원본 응답은 raw_payloads에 별도 저장 (_save_raw_payload → raw_payload_hash)
+            # ai_summary / relevance_score는 값이 있을 때만 전송 (재크롤링 upsert가 점수 단계 결과를 지우지 않도록)
+            **{key: value for key, value in (("ai_summary", tender.ai_summary), ("relevance_score", tender.relevance_score))
+               if value is not None},
+            # created_at and updated_at are handled by DB triggers,
             # but we can optionally send them if we want to force a specific time.
             # Generally better to let DB handle it on insert, and maybe updated_at on update.
         }
 
-        # Remove None values if you want default behavior, or keep them to set NULL
+    def _save_raw_payload(self, payload: Any) -> Optional[str]:
+        """원본 응답 압축 저장 → content_hash (같은 해시가 이미 저장됐으면 전송 생략)"""
+        encoded = encode_payload(payload)
+        if encoded is None:
+            return None
+        if encoded.content_hash not in self._known_payloads:
+            self._insert_raw_payload(encoded.to_row())
+            if len(self._known_payloads) >= self.KNOWN_PAYLOADS_MAX:
+                self._known_payloads.clear()
+            self._known_payloads.add(encoded.content_hash)
+        return encoded.content_hash
+
+    def _tender_write_row(self, tender: TenderDTO) -> Dict[str, Any]:
+        """upsert_tender 전송 행 (원본 응답이 없으면 기존 raw_payload_hash 유지)"""
+        data = self._tender_row(tender)
+        content_hash = self._save_raw_payload(tender.raw_api_response)
+        if content_hash:
+            data["raw_payload_hash"] = content_hash
+        return data
+
+    def _write_tender(self, tender: TenderDTO, write: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        write(row)로 tender 기록
+        캐시에 있던 해시의 본문이 그사이 prune_raw_payloads(다른 프로세스 포함)로 삭제되어 FK 위반이면
+        캐시에서 빼고 본문 재저장 후 1회 재시도
+        """
+        data = self._tender_write_row(tender)
+        try:
+            return write(data)
+        except Exception as e:
+            content_hash = data.get("raw_payload_hash")
+            if not content_hash or not self._is_missing_payload(e):
+                raise
+            self._known_payloads.discard(content_hash)
+            self._save_raw_payload(tender.raw_api_response)
+            return write(data)
+
+    @staticmethod
+    def _is_missing_payload(error: Exception) -> bool:
+        """tenders.raw_payload_hash FK 위반 여부"""
+        return False
+
+    @staticmethod
+    def _attachment_row(attachment: TenderAttachmentDTO) -> Dict[str, Any]:
+        return {
+            "tender_id": attachment.tender_id,
+            "file_name": attachment.file_name,
+            "file_type": attachment.file_type,
+            "file_url": attachment.file_url,
+            "extracted_text": attachment.extracted_text,
+            "is_parsed": attachment.is_parsed
+        }
+
+    @staticmethod
+    def _spec_row(spec: TenderSpecDTO) -> Dict[str, Any]:
+        return {
+            "tender_id": spec.tender_id,
+            "commodity_type": spec.commodity_type,
+            "cv_min_kcal": spec.cv_min_kcal,
+            "cv_max_kcal": spec.cv_max_kcal,
+            "cv_basis": _enum_value(spec.cv_basis),
+            "sulfur_max_pct": spec.sulfur_max_pct,
+            "ash_max_pct": spec.ash_max_pct,
+            "moisture_max_pct": spec.moisture_max_pct,
+            "quantity_mt": spec.quantity_mt,
+            "origin": spec.origin,
+            "incoterms": _enum_value(spec.incoterms),
+            "delivery_port": spec.delivery_port,
+            "extraction_confidence": spec.extraction_confidence,
+        }
+
+    @staticmethod
+    def _shipment_row(shipment: ShipmentDTO) -> Dict[str, Any]:
+        return {
+            "vessel_name": shipment.vessel_name,
+            "mmsi": shipment.mmsi,
+            "imo_number": shipment.imo_number,
+            "voyage_number": shipment.voyage_number,
+            "cargo_qty_mt": shipment.cargo_qty_mt,
+            "loading_port": shipment.loading_port,
+            "discharge_port": shipment.discharge_port,
+            "laycan_start": _iso(shipment.laycan_start),
+            "laycan_end": _iso(shipment.laycan_end),
+            "eta": _iso(shipment.eta),
+            "etb": _iso(shipment.etb),
+            "current_status": _enum_value(shipment.current_status),
+            "current_lat": shipment.current_lat,
+            "current_lng": shipment.current_lng,
+            "last_position_at": _iso(shipment.last_position_at)
+        }
+
+    @staticmethod
+    def _demurrage_row(calc: DemurrageCalcDTO) -> Dict[str, Any]:
+        return {
+            "shipment_id": calc.shipment_id,
+            "contract_laytime_hrs": calc.contract_laytime_hrs,
+            "actual_laytime_hrs": calc.actual_laytime_hrs,
+            "weather_delay_hrs": calc.weather_delay_hrs,
+            "dem_rate_daily_usd": calc.dem_rate_daily_usd,
+            "total_demurrage_usd": calc.total_demurrage_usd,
+            "total_despatch_usd": calc.total_despatch_usd,
+            "calculation_log": calc.calculation_log,
+            "sof_file_url": calc.sof_file_url
+        }
+
+    @staticmethod
+    def _market_data_row(data: MarketDataDTO) -> Dict[str, Any]:
+        return {
+            "data_date": _iso(data.data_date),
+            "index_name": data.index_name,
+            "price_usd": data.price_usd,
+            "fx_rate_krw": data.fx_rate_krw,
+            "freight_rate": data.freight_rate,
+            "source": data.source
+        }
+
+    @staticmethod
+    def _simulation_row(sim: NetbackSimulationDTO) -> Dict[str, Any]:
+        return {
+            "tender_id": sim.tender_id,
+            "simulation_date": _iso(sim.simulation_date),
+            "market_price_usd": sim.market_price_usd,
+            "freight_cost": sim.freight_cost,
+            "insurance_cost": sim.insurance_cost,
+            "port_charges": sim.port_charges,
+            "import_duty": sim.import_duty,
+            "fx_rate": sim.fx_rate,
+            "netback_usd": sim.netback_usd,
+            "netback_krw": sim.netback_krw,
+            "assumptions": sim.assumptions
+        }
+
+    # =====================================================
+    # Tenders
+    # =====================================================
+
+    @abstractmethod
+    def upsert_tender(self, tender: TenderDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_tender_by_id(self, tender_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_tender_by_notice_no(self, source: str, bid_ntce_no: str, bid_ntce_ord: str = "00") -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_tenders(self, columns: str = "*", page_size: int = 1000, updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """전체 공고 (updated_since: 해당 시각 이후 갱신된 공고만, 경계 포함)"""
+
+    @abstractmethod
+    def list_tenders_page(
+        self,
+        columns: str,
+        filters: TenderFilter,
+        after: Optional[Tuple[Optional[str], str]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        keyset 페이지: ORDER BY bid_clse_dt DESC (NULL 먼저), id DESC
+        after = 이전 페이지 마지막 행의 (bid_clse_dt, id)
+        """
+
+    @abstractmethod
+    def _insert_raw_payload(self, row: Dict[str, Any]):
+        """raw_payloads insert (content_hash 충돌 시 무시)"""
+
+    @abstractmethod
+    def get_raw_payload(self, content_hash: str) -> Optional[RawPayload]: ...
+
+    @abstractmethod
+    def get_tender_raw_payload(self, tender_id: str) -> Optional[RawPayload]:
+        """공고 원본 응답 (raw_payloads 조회, 이관 전 행은 raw_api_response)"""
+
+    @abstractmethod
+    def list_unscored_tenders(self, limit: int = 500, columns: str = "*") -> List[Dict[str, Any]]:
+        """relevance_score IS NULL, id 순"""
+
+    @abstractmethod
+    def bulk_update_tender_scores(self, scores: List[Dict[str, Any]], chunk_size: int = 500) -> int:
+        """(source, bid_ntce_no, bid_ntce_ord) 기준 relevance_score / ai_summary 일괄 갱신 (bid_ntce_nm 포함)"""
+
+    @abstractmethod
+    def upsert_attachment(self, attachment: TenderAttachmentDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_attachments_by_tender_id(self, tender_id: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_attachments(self, columns: str = "*", page_size: int = 1000) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_attachments_page(self, tender_id: str, columns: str, after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """keyset 페이지: WHERE tender_id = ? AND id > after_id ORDER BY id"""
+
+    @abstractmethod
+    def upsert_tender_spec(self, spec: TenderSpecDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_tender_spec_by_tender_id(self, tender_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_tender_specs(self, page_size: int = 1000, updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """전체 스펙 (updated_since: 해당 시각 이후 갱신된 스펙만, 경계 포함)"""
+
+    # =====================================================
+    # Dashboard summary (supabase/migrations/004_dashboard_summary.sql)
+    # =====================================================
+
+    @abstractmethod
+    def get_tender_summary(self, source: Optional[str] = None, page_size: int = 1000) -> List[Dict[str, Any]]:
+        """tender_summary 집계 행: (source, status, dminstt_nm, close_date) → tender_count, budget_sum"""
+
+    @abstractmethod
+    def refresh_tender_summary(self, force: bool = False) -> bool:
+        """tenders 변경(dirty) 시에만 집계 갱신, 갱신했으면 True"""
+
+    @abstractmethod
+    def list_upcoming_deadlines(self, limit: int = 10, source: Optional[str] = None, columns: str = "*") -> List[Dict[str, Any]]:
+        """OPEN 공고 중 마감 전, 마감일 오름차순"""
+
+    # =====================================================
+    # Shipments / Demurrage
+    # =====================================================
+
+    @abstractmethod
+    def upsert_shipment(self, shipment: ShipmentDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_shipment_by_id(self, shipment_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_active_shipments(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def bulk_upsert_shipments(self, shipments: List[ShipmentDTO], chunk_size: int = 500) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def upsert_demurrage_calc(self, calc: DemurrageCalcDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_demurrage_by_shipment_id(self, shipment_id: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_demurrage_calcs(self, shipment_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def bulk_upsert_demurrage_calcs(self, calcs: List[DemurrageCalcDTO], chunk_size: int = 500) -> List[Dict[str, Any]]: ...
+
+    # =====================================================
+    # Market Data / Netback
+    # =====================================================
+
+    @abstractmethod
+    def upsert_market_data(self, data: MarketDataDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def bulk_upsert_market_data(self, data: List[MarketDataDTO], chunk_size: int = 1000) -> int: ...
+
+    @abstractmethod
+    def get_market_data(self, data_date: date, index_name: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_market_data_between(self, start: date, end: date, index_names: Optional[List[str]] = None) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_market_data(self, page_size: int = 1000) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def upsert_netback_simulation(self, sim: NetbackSimulationDTO) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_netback_simulation_by_id(self, sim_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_simulations_by_tender_id(self, tender_id: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def bulk_insert_netback_simulations(self, sims: List[NetbackSimulationDTO], chunk_size: int = 500) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def list_netback_simulations(self, page_size: int = 1000) -> List[Dict[str, Any]]: ...
+
+
+@instrument("repository")
+class SupabaseRepository(BaseRepository):
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        client: Optional[Client] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        super().__init__()
+        # client: 벤치마크/테스트용 대체 클라이언트 주입 (없으면 Supabase 연결)
+        self.supabase: Client = client or create_client(url, key)
+
+        # transport: PostgREST HTTP 계층 교체 (record/replay 등)
+        if transport is not None:
+            postgrest = self.supabase.postgrest
+            session = postgrest.session
+            postgrest.session = type(session)(
+                base_url=session.base_url,
+                headers=session.headers,
+                timeout=session.timeout,
+                transport=transport,
+                follow_redirects=True,
+            )
+
+    def upsert_tender(self, tender: TenderDTO) -> Dict[str, Any]:
+        """
+        Tender 데이터를 Upsert 합니다.
+        (source, bid_ntce_no, bid_ntce_ord) 조합이 Unique Key입니다.
+        """
+        # DTO to Dict conversion (원본 응답은 raw_payloads, 행에는 해시만)
         # For upsert, we need to handle the conflict.
-        
-        response = self.supabase.table("tenders").upsert(
-            data, 
+        response = self._write_tender(tender, lambda data: self.supabase.table("tenders").upsert(
+            data,
             on_conflict="source, bid_ntce_no, bid_ntce_ord"
-        ).execute()
-        
+        ).execute())
+        self._notify("tenders", response.data)
+
         return response.data[0] if response.data else None
 
     def get_tender_by_id(self, tender_id: str) -> Optional[Dict[str, Any]]:
@@ -64,15 +442,128 @@ class SupabaseRepository:
             .execute()
         return response.data[0] if response.data else None
 
+    def _list_all(self, table: str, columns: str, page_size: int, order: Tuple[str, ...] = ("id",), **filters: Any) -> List[Dict[str, Any]]:
+        # PostgREST max-rows 제한 대비 페이지 단위 전체 조회 (order: 페이지 경계가 안정적인 unique 정렬 키)
+        def build():
+            query = self.supabase.table(table).select(columns)
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            return query
+        return self._paged(build, order, page_size)
+
+    @staticmethod
+    def _paged(build: Callable[[], Any], order: Tuple[str, ...], page_size: int = 1000) -> List[Dict[str, Any]]:
+        # build(): 필터까지 적용한 새 query, 페이지마다 .range()로 잘라 모두 조회
+        rows: List[Dict[str, Any]] = []
+        while True:
+            query = build()
+            for column in order:
+                query = query.order(column)
+            response = query.range(len(rows), len(rows) + page_size - 1).execute()
+            rows.extend(response.data)
+            if len(response.data) < page_size:
+                return rows
+
+    def list_tenders(self, columns: str = "*", page_size: int = 1000, updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+        if updated_since is None:
+            return self._list_all("tenders", columns, page_size)
+        return self._paged(
+            lambda: self.supabase.table("tenders").select(columns).gte("updated_at", updated_since),
+            ("id",), page_size,
+        )
+
+    def list_tenders_page(
+        self,
+        columns: str,
+        filters: TenderFilter,
+        after: Optional[Tuple[Optional[str], str]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        query = self.supabase.table("tenders").select(columns)
+        if filters.source:
+            query = query.eq("source", filters.source)
+        if filters.status:
+            query = query.in_("status", filters.status)
+        if filters.dminstt_nm:
+            query = query.eq("dminstt_nm", filters.dminstt_nm)
+        if filters.closing_from:
+            query = query.gte("bid_clse_dt", _iso(filters.closing_from))
+        if filters.closing_to:
+            query = query.lte("bid_clse_dt", _iso(filters.closing_to))
+        if filters.title_contains:
+            pattern = filters.title_contains.replace("%", r"\%").replace("_", r"\_")
+            query = query.ilike("bid_ntce_nm", f"%{pattern}%")
+
+        # (bid_clse_dt, id) < after — DESC 정렬에서 NULL 마감일이 먼저 오므로 NULL 구간 이후는 전체 non-NULL
+        if after is not None:
+            close_dt, last_id = after
+            if close_dt is None:
+                query = query.or_(f"and(bid_clse_dt.is.null,id.lt.{last_id}),bid_clse_dt.not.is.null")
+            else:
+                query = query.or_(f'bid_clse_dt.lt."{close_dt}",and(bid_clse_dt.eq."{close_dt}",id.lt.{last_id})')
+
+        response = query.order("bid_clse_dt", desc=True, nullsfirst=True)\
+            .order("id", desc=True)\
+            .limit(limit)\
+            .execute()
+        return response.data
+
+    def search_tenders(self, query: str, limit: int = 20, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        # 전문 검색 RPC (supabase/migrations/002_search.sql)
+        response = self.supabase.rpc("search_tenders", {
+            "query": query,
+            "max_results": limit,
+            "source_filter": source
+        }).execute()
+        return response.data
+
+    @staticmethod
+    def _is_missing_payload(error: Exception) -> bool:
+        # 23503 foreign_key_violation (제약 이름 tenders_raw_payload_hash_fkey)
+        return isinstance(error, APIError) and error.code == "23503" and "raw_payload_hash" in f"{error.message} {error.details}"
+
+    def _insert_raw_payload(self, row: Dict[str, Any]):
+        self.supabase.table("raw_payloads").upsert(
+            row,
+            on_conflict="content_hash",
+            ignore_duplicates=True,
+            returning=ReturnMethod.minimal,
+        ).execute()
+
+    def get_raw_payload(self, content_hash: str) -> Optional[RawPayload]:
+        response = self.supabase.table("raw_payloads").select("codec, body").eq("content_hash", content_hash).execute()
+        return decode_row(response.data[0]) if response.data else None
+
+    def get_tender_raw_payload(self, tender_id: str) -> Optional[RawPayload]:
+        response = self.supabase.table("tenders").select("raw_payload_hash, raw_api_response").eq("id", tender_id).execute()
+        if not response.data:
+            return None
+        row = response.data[0]
+        if row.get("raw_payload_hash"):
+            return self.get_raw_payload(row["raw_payload_hash"])
+        return RawPayload.from_obj(row["raw_api_response"]) if row.get("raw_api_response") else None
+
+    def list_unscored_tenders(self, limit: int = 500, columns: str = "*") -> List[Dict[str, Any]]:
+        response = self.supabase.table("tenders").select(columns)\
+            .is_("relevance_score", "null")\
+            .order("id")\
+            .limit(limit)\
+            .execute()
+        return response.data
+
+    def bulk_update_tender_scores(self, scores: List[Dict[str, Any]], chunk_size: int = 500) -> int:
+        # 기존 공고만 대상 → ON CONFLICT 경로에서 전달한 컬럼만 갱신
+        written = []
+        for start in range(0, len(scores), chunk_size):
+            written.extend(self.supabase.table("tenders").upsert(
+                scores[start:start + chunk_size],
+                on_conflict="source, bid_ntce_no, bid_ntce_ord"
+            ).execute().data)
+        self._notify("tenders", written)
+        return len(written)
+
     def upsert_attachment(self, attachment: TenderAttachmentDTO) -> Dict[str, Any]:
-        data = {
-            "tender_id": attachment.tender_id,
-            "file_name": attachment.file_name,
-            "file_type": attachment.file_type,
-            "file_url": attachment.file_url,
-            "extracted_text": attachment.extracted_text,
-            "is_parsed": attachment.is_parsed
-        }
+        data = self._attachment_row(attachment)
         
         # If ID exists, we can use it to update, otherwise insert.
         # However, attachments don't have a natural unique key other than ID.
@@ -94,28 +585,25 @@ class SupabaseRepository:
                 response = self.supabase.table("tender_attachments").upsert(data).execute()
             else:
                 response = self.supabase.table("tender_attachments").insert(data).execute()
-                
+
+        self._notify("tender_attachments", response.data)
         return response.data[0] if response.data else None
 
     def get_attachments_by_tender_id(self, tender_id: str) -> List[Dict[str, Any]]:
         response = self.supabase.table("tender_attachments").select("*").eq("tender_id", tender_id).execute()
         return response.data
 
+    def list_attachments(self, columns: str = "*", page_size: int = 1000) -> List[Dict[str, Any]]:
+        return self._list_all("tender_attachments", columns, page_size)
+
+    def list_attachments_page(self, tender_id: str, columns: str, after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        query = self.supabase.table("tender_attachments").select(columns).eq("tender_id", tender_id)
+        if after_id:
+            query = query.gt("id", after_id)
+        return query.order("id").limit(limit).execute().data
+
     def upsert_tender_spec(self, spec: TenderSpecDTO) -> Dict[str, Any]:
-        data = {
-            "tender_id": spec.tender_id,
-            "commodity_type": spec.commodity_type,
-            "cv_min_kcal": spec.cv_min_kcal,
-            "cv_max_kcal": spec.cv_max_kcal,
-            "cv_basis": spec.cv_basis.value if hasattr(spec.cv_basis, 'value') else spec.cv_basis,
-            "sulfur_max_pct": spec.sulfur_max_pct,
-            "ash_max_pct": spec.ash_max_pct,
-            "moisture_max_pct": spec.moisture_max_pct,
-            "quantity_mt": spec.quantity_mt,
-            "origin": spec.origin,
-            "incoterms": spec.incoterms.value if hasattr(spec.incoterms, 'value') else spec.incoterms,
-            "delivery_port": spec.delivery_port
-        }
+        data = self._spec_row(spec)
 
         if spec.id:
             data["id"] = spec.id
@@ -131,7 +619,8 @@ class SupabaseRepository:
                 response = self.supabase.table("tender_specs").upsert(data).execute()
             else:
                 response = self.supabase.table("tender_specs").insert(data).execute()
-                
+
+        self._notify("tender_specs", response.data)
         return response.data[0] if response.data else None
 
     def get_tender_spec_by_tender_id(self, tender_id: str) -> Optional[Dict[str, Any]]:
@@ -139,28 +628,38 @@ class SupabaseRepository:
         response = self.supabase.table("tender_specs").select("*").eq("tender_id", tender_id).execute()
         return response.data[0] if response.data else None
 
+    def list_tender_specs(self, page_size: int = 1000, updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+        # 전체 스펙 (유사 입찰 인덱스 구축용)
+        if updated_since is None:
+            return self._list_all("tender_specs", "*", page_size)
+        return self._paged(
+            lambda: self.supabase.table("tender_specs").select("*").gte("updated_at", updated_since),
+            ("id",), page_size,
+        )
+
+    def get_tender_summary(self, source: Optional[str] = None, page_size: int = 1000) -> List[Dict[str, Any]]:
+        filters = {"source": source} if source else {}
+        return self._list_all("tender_summary", "*", page_size, order=SUMMARY_KEY_COLUMNS, **filters)
+
+    def refresh_tender_summary(self, force: bool = False) -> bool:
+        response = self.supabase.rpc("refresh_tender_summary", {"force": force}).execute()
+        return bool(response.data)
+
+    def list_upcoming_deadlines(self, limit: int = 10, source: Optional[str] = None, columns: str = "*") -> List[Dict[str, Any]]:
+        # idx_tenders_open_clse_dt (partial index) 범위 스캔
+        query = self.supabase.table("tenders").select(columns)\
+            .eq("status", TenderStatus.OPEN.value)\
+            .gte("bid_clse_dt", datetime.now(timezone.utc).isoformat())
+        if source:
+            query = query.eq("source", source)
+        return query.order("bid_clse_dt").order("id").limit(limit).execute().data
+
     # =====================================================
     # Shipments
     # =====================================================
 
     def upsert_shipment(self, shipment: ShipmentDTO) -> Dict[str, Any]:
-        data = {
-            "vessel_name": shipment.vessel_name,
-            "mmsi": shipment.mmsi,
-            "imo_number": shipment.imo_number,
-            "voyage_number": shipment.voyage_number,
-            "cargo_qty_mt": shipment.cargo_qty_mt,
-            "loading_port": shipment.loading_port,
-            "discharge_port": shipment.discharge_port,
-            "laycan_start": shipment.laycan_start.isoformat() if shipment.laycan_start else None,
-            "laycan_end": shipment.laycan_end.isoformat() if shipment.laycan_end else None,
-            "eta": shipment.eta.isoformat() if shipment.eta else None,
-            "etb": shipment.etb.isoformat() if shipment.etb else None,
-            "current_status": shipment.current_status.value if hasattr(shipment.current_status, 'value') else shipment.current_status,
-            "current_lat": shipment.current_lat,
-            "current_lng": shipment.current_lng,
-            "last_position_at": shipment.last_position_at.isoformat() if shipment.last_position_at else None
-        }
+        data = self._shipment_row(shipment)
 
         if shipment.id:
             data["id"] = shipment.id
@@ -175,22 +674,28 @@ class SupabaseRepository:
         response = self.supabase.table("shipments").select("*").eq("id", shipment_id).execute()
         return response.data[0] if response.data else None
 
+    def list_active_shipments(self) -> List[Dict[str, Any]]:
+        # 운항 완료 전 선박 (위치 추적 대상, max-rows 제한 대비 페이지 조회)
+        return self._paged(
+            lambda: self.supabase.table("shipments").select("*")
+            .or_(f"current_status.is.null,current_status.neq.{ShipmentStatus.COMPLETED.value}"),
+            ("id",),
+        )
+
+    def bulk_upsert_shipments(self, shipments: List[ShipmentDTO], chunk_size: int = 500) -> List[Dict[str, Any]]:
+        # 기존 선박 상태 일괄 갱신 (id 필수)
+        rows = [{**self._shipment_row(s), "id": s.id} for s in shipments]
+        written = []
+        for start in range(0, len(rows), chunk_size):
+            written.extend(self.supabase.table("shipments").upsert(rows[start:start + chunk_size]).execute().data)
+        return written
+
     # =====================================================
     # Demurrage Calculations
     # =====================================================
 
     def upsert_demurrage_calc(self, calc: DemurrageCalcDTO) -> Dict[str, Any]:
-        data = {
-            "shipment_id": calc.shipment_id,
-            "contract_laytime_hrs": calc.contract_laytime_hrs,
-            "actual_laytime_hrs": calc.actual_laytime_hrs,
-            "weather_delay_hrs": calc.weather_delay_hrs,
-            "dem_rate_daily_usd": calc.dem_rate_daily_usd,
-            "total_demurrage_usd": calc.total_demurrage_usd,
-            "total_despatch_usd": calc.total_despatch_usd,
-            "calculation_log": calc.calculation_log,
-            "sof_file_url": calc.sof_file_url
-        }
+        data = self._demurrage_row(calc)
         
         if calc.id:
             data["id"] = calc.id
@@ -204,28 +709,57 @@ class SupabaseRepository:
         response = self.supabase.table("demurrage_calculations").select("*").eq("shipment_id", shipment_id).execute()
         return response.data
 
+    def list_demurrage_calcs(self, shipment_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        if shipment_ids is not None and not shipment_ids:
+            return []
+
+        def build():
+            query = self.supabase.table("demurrage_calculations").select("*")
+            return query.in_("shipment_id", shipment_ids) if shipment_ids is not None else query
+        return self._paged(build, ("id",))
+
+    def bulk_upsert_demurrage_calcs(self, calcs: List[DemurrageCalcDTO], chunk_size: int = 500) -> List[Dict[str, Any]]:
+        # id 있는 row(갱신)와 없는 row(신규)는 컬럼 구성이 달라 요청을 분리
+        updates = [{**self._demurrage_row(c), "id": c.id} for c in calcs if c.id]
+        inserts = [self._demurrage_row(c) for c in calcs if not c.id]
+        written = []
+        for start in range(0, len(updates), chunk_size):
+            written.extend(self.supabase.table("demurrage_calculations").upsert(updates[start:start + chunk_size]).execute().data)
+        for start in range(0, len(inserts), chunk_size):
+            written.extend(self.supabase.table("demurrage_calculations").insert(inserts[start:start + chunk_size]).execute().data)
+        return written
+
     # =====================================================
     # Market Data
     # =====================================================
 
     def upsert_market_data(self, data: MarketDataDTO) -> Dict[str, Any]:
-        payload = {
-            "data_date": data.data_date.isoformat() if data.data_date else None,
-            "index_name": data.index_name,
-            "price_usd": data.price_usd,
-            "fx_rate_krw": data.fx_rate_krw,
-            "freight_rate": data.freight_rate,
-            "source": data.source
-        }
+        payload = self._market_data_row(data)
         
         # Unique key: data_date + index_name
         response = self.supabase.table("market_data").upsert(
             payload,
             on_conflict="data_date, index_name"
         ).execute()
-        
+        self._notify_market_data([data.index_name])
+
         return response.data[0] if response.data else None
 
+    def bulk_upsert_market_data(self, data: List[MarketDataDTO], chunk_size: int = 1000) -> int:
+        # 과거 시세 일괄 적재 (chunk당 요청 1회, 응답 본문 생략), listener 알림은 1회
+        # 값이 없는 열은 payload에서 빼서 기존 값 유지 (PostgREST는 요청에 있는 열만 갱신 → 열 구성별로 묶어 전송)
+        rows = [self._market_data_row(d) for d in data]
+        for group in _group_by_columns(rows):
+            for start in range(0, len(group), chunk_size):
+                self.supabase.table("market_data").upsert(
+                    group[start:start + chunk_size],
+                    on_conflict="data_date, index_name",
+                    returning="minimal"
+                ).execute()
+        if rows:
+            self._notify_market_data({d.index_name for d in data})
+        return len(rows)
+
     def get_market_data(self, data_date: date, index_name: str) -> Optional[Dict[str, Any]]:
         response = self.supabase.table("market_data").select("*")\
             .eq("data_date", data_date.isoformat())\
@@ -233,24 +767,25 @@ class SupabaseRepository:
             .execute()
         return response.data[0] if response.data else None
 
+    def get_market_data_between(self, start: date, end: date, index_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        # 기간 조회 (data_date 오름차순, 시뮬레이션 캘리브레이션용), max-rows 제한 대비 페이지 단위
+        def build():
+            query = self.supabase.table("market_data").select("*")\
+                .gte("data_date", start.isoformat())\
+                .lte("data_date", end.isoformat())
+            return query.in_("index_name", index_names) if index_names else query
+        return self._paged(build, ("data_date", "index_name"))
+
+    def list_market_data(self, page_size: int = 1000) -> List[Dict[str, Any]]:
+        # 전체 시계열 (columnar export용)
+        return self._list_all("market_data", "*", page_size)
+
     # =====================================================
     # Netback Simulations
     # =====================================================
 
     def upsert_netback_simulation(self, sim: NetbackSimulationDTO) -> Dict[str, Any]:
-        data = {
-            "tender_id": sim.tender_id,
-            "simulation_date": sim.simulation_date.isoformat() if sim.simulation_date else None,
-            "market_price_usd": sim.market_price_usd,
-            "freight_cost": sim.freight_cost,
-            "insurance_cost": sim.insurance_cost,
-            "port_charges": sim.port_charges,
-            "import_duty": sim.import_duty,
-            "fx_rate": sim.fx_rate,
-            "netback_usd": sim.netback_usd,
-            "netback_krw": sim.netback_krw,
-            "assumptions": sim.assumptions
-        }
+        data = self._simulation_row(sim)
 
         if sim.id:
             data["id"] = sim.id
@@ -268,4 +803,47 @@ class SupabaseRepository:
         response = self.supabase.table("netback_simulations").select("*").eq("tender_id", tender_id).execute()
         return response.data
 
+    def bulk_insert_netback_simulations(self, sims: List[NetbackSimulationDTO], chunk_size: int = 500) -> List[Dict[str, Any]]:
+        # 엔진 결과 일괄 저장 (chunk당 요청 1회)
+        rows = [self._simulation_row(sim) for sim in sims]
+        inserted = []
+        for start in range(0, len(rows), chunk_size):
+            response = self.supabase.table("netback_simulations").insert(rows[start:start + chunk_size]).execute()
+            inserted.extend(response.data)
+        return inserted
+
+    def list_netback_simulations(self, page_size: int = 1000) -> List[Dict[str, Any]]:
+        return self._list_all("netback_simulations", "*", page_size)
+
+
+
+
+def create_repository() -> Optional[BaseRepository]:
+    """
+    환경 변수 기반 Repository 생성
+    - REPOSITORY_BACKEND=memory : InMemoryRepository (DB 없이 부하/처리량 실험)
+    - SUPABASE_CASSETTE=<path>  : PostgREST 트래픽 record/replay (SUPABASE_CASSETTE_MODE=record|replay)
+    - SUPABASE_URL / SUPABASE_KEY 미설정 시 None
+    """
+    if os.getenv("REPOSITORY_BACKEND", "").lower() == "memory":
+        try:
+            from memory_repository import InMemoryRepository
+        except ImportError:
+            from crawlers.memory_repository import InMemoryRepository
+        return InMemoryRepository()
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if not (url and key):
+        return None
+
+    transport = None
+    cassette = os.getenv("SUPABASE_CASSETTE")
+    if cassette:
+        try:
+            from transport import RecordReplayTransport
+        except ImportError:
+            from crawlers.transport import RecordReplayTransport
+        transport = RecordReplayTransport(cassette, mode=os.getenv("SUPABASE_CASSETTE_MODE", "replay"))
 
+    return SupabaseRepository(url, key, transport=transport)
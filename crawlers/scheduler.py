@@ -0,0 +1,538 @@
+"""
+크롤링 스케줄러 (crawler 서비스 내장)
+n8n HTTP 호출 대신 서비스 안에서 크롤러를 직접 실행
+
+- cron 표현식 (분 시 일 월 요일, n8n 형식의 초 포함 6필드도 허용 - 초는 무시), 시간대 Asia/Seoul
+- jitter: 예정 시각 + 0~jitter_seconds 임의 지연 (외부 사이트 동시 접속 분산)
+- single-flight: (source, keyword) 단위 잠금, 실행 중인 키워드는 건너뜀 (/crawl/kepco 수동 호출과 공유)
+- 놓친 실행 보충: 예정 시각이 지난 실행은 catch_up_hours 이내면 1회로 합쳐 실행, 초과분은 missed 기록
+  state_path 지정 시 마지막 예정 시각을 저장하여 재시작 후에도 보충
+- 마감 임박 우선순위: deadline_probe(source)가 urgent_hours 이내 마감을 반환하면
+    대기열 우선순위 상향 + urgent_cron(지정 시) 추가 실행
+  (probe는 동기 DB 조회: source별 deadline_ttl_seconds 캐시, 이벤트 루프에서는 asyncio.to_thread로만 갱신)
+- 실행 이력: 최근 history_size 건 (queued / running / success / failed / skipped / missed)
+
+사용법:
+    scheduler = CrawlScheduler([ScheduleEntry("kepco-coal", "30 8 * * *", keywords=["유연탄"])], runner=run_crawl)
+    await scheduler.start()
+    ...
+    await scheduler.stop()
+"""
+import os
+import json
+import heapq
+import random
+import asyncio
+import logging
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_TZ = timezone(timedelta(hours=9))
+
+# 다음 실행 시각 탐색 상한 (예: 2월 30일처럼 도달할 수 없는 표현식)
+_MAX_SEARCH_DAYS = 366 * 5
+
+
+# =====================================================
+# Cron
+# =====================================================
+
+class CronExpression:
+    """
+    5필드 cron (분 시 일 월 요일) - *, */n, a-b, a-b/n, a/n, 목록(a,b)
+    요일 0 또는 7 = 일요일, 일/요일이 모두 지정되면 둘 중 하나만 맞아도 실행 (표준 cron)
+    """
+
+    FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) == 6:
+            parts = parts[1:]
+        if len(parts) != 5:
+            raise ValueError(f"Invalid cron expression (expected 5 fields): {expression!r}")
+
+        values = [self._parse_field(part, lo, hi) for part, (_, lo, hi) in zip(parts, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self._day_any = parts[2] == "*"
+        self._weekday_any = parts[4] == "*"
+
+    @staticmethod
+    def _parse_field(text: str, lo: int, hi: int) -> FrozenSet[int]:
+        values: Set[int] = set()
+        for item in text.split(","):
+            body, _, step_text = item.partition("/")
+            step = int(step_text) if step_text else 1
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {item!r}")
+            if body == "*":
+                start, end = lo, hi
+            elif "-" in body:
+                start, end = (int(v) for v in body.split("-", 1))
+            else:
+                start = int(body)
+                end = hi if step_text else start
+            if not (lo <= start <= end <= hi):
+                raise ValueError(f"Cron value out of range {lo}-{hi}: {item!r}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._day_any or self._weekday_any:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def matches(self, dt: datetime) -> bool:
+        return dt.month in self.months and self._day_matches(dt) and dt.hour in self.hours and dt.minute in self.minutes
+
+    def next_after(self, dt: datetime) -> datetime:
+        """dt 이후(초과) 첫 실행 시각 (분 단위, dt의 시간대 유지)"""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=_MAX_SEARCH_DAYS)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            else:
+                later = [m for m in self.minutes if m >= t.minute]
+                if later:
+                    return t.replace(minute=min(later))
+                t = t.replace(minute=0) + timedelta(hours=1)
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+
+# =====================================================
+# Single-flight
+# =====================================================
+
+class SingleFlight:
+    """(source, keyword) 실행 중 표시 - 같은 키워드 중복 크롤링 방지 (이벤트 루프 단일 스레드 기준)"""
+
+    def __init__(self):
+        self._active: Set[Tuple[str, str]] = set()
+
+    def active(self) -> List[Tuple[str, str]]:
+        return sorted(self._active)
+
+    @contextmanager
+    def acquire(self, source: str, keywords: Iterable[str]) -> Iterator[List[str]]:
+        """실행 가능한(다른 실행이 잡고 있지 않은) 키워드 목록을 잡고 반환, 블록 종료 시 해제"""
+        acquired = [k for k in dict.fromkeys(keywords) if (source, k) not in self._active]
+        self._active.update((source, k) for k in acquired)
+        try:
+            yield acquired
+        finally:
+            self._active.difference_update((source, k) for k in acquired)
+
+
+# =====================================================
+# Schedule / run history
+# =====================================================
+
+@dataclass(slots=True)
+class ScheduleEntry:
+    """스케줄 1건 (keywords는 한 번의 크롤링에서 함께 검색)"""
+    name: str
+    cron: str
+    source: str = "KEPCO"
+    keywords: List[str] = field(default_factory=lambda: ["유연탄"])
+    days: int = 7                       # 검색 기간 (오늘 - days ~ 오늘)
+    delta: bool = True                  # 신규/변경 공고 집계 (delta.TenderDeltaIndex)
+    jitter_seconds: int = 0
+    catch_up_hours: float = 6.0         # 놓친 실행 보충 허용 범위 (0 = 보충 안 함)
+    priority: int = 0                   # 클수록 먼저 실행
+    urgent_cron: Optional[str] = None   # 마감 임박 공고가 있을 때 추가 실행
+    urgent_hours: float = 24.0
+    enabled: bool = True
+    _crons: Tuple[CronExpression, Optional[CronExpression]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        # 잘못된 표현식은 등록 시점에 오류
+        self._crons = (CronExpression(self.cron), CronExpression(self.urgent_cron) if self.urgent_cron else None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScheduleEntry":
+        names = {f.name for f in fields(cls) if f.init}
+        unknown = set(data) - names
+        if unknown:
+            raise ValueError(f"Unknown schedule fields: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+
+@dataclass(slots=True)
+class RunRecord:
+    run_id: int
+    entry: str
+    source: str
+    keywords: List[str]
+    trigger: str                        # cron / urgent / catch_up / manual
+    scheduled_for: datetime
+    priority: int
+    status: str = "queued"
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "entry": self.entry,
+            "source": self.source,
+            "keywords": self.keywords,
+            "trigger": self.trigger,
+            "scheduled_for": self.scheduled_for.isoformat(),
+            "priority": self.priority,
+            "status": self.status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": round((self.finished_at - self.started_at).total_seconds(), 3)
+            if self.started_at and self.finished_at else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+Runner = Callable[[ScheduleEntry, List[str]], Awaitable[Dict[str, Any]]]
+DeadlineProbe = Callable[[str], Optional[datetime]]
+
+
+def load_schedule(path: Optional[str] = None) -> List[ScheduleEntry]:
+    """JSON 파일([{name, cron, ...}])에서 스케줄 로드, 파일이 없으면 기본 스케줄"""
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return [ScheduleEntry.from_dict(item) for item in json.load(f)]
+    return [ScheduleEntry(**item) for item in DEFAULT_SCHEDULE]
+
+
+# n8n/kepco_workflow.json 과 동일한 기본 일정 (매일 08:30 KST)
+DEFAULT_SCHEDULE: List[Dict[str, Any]] = [
+    {"name": "kepco-coal", "cron": "30 8 * * *", "source": "KEPCO", "keywords": ["유연탄"], "days": 7, "jitter_seconds": 120},
+]
+
+
+# =====================================================
+# Scheduler
+# =====================================================
+
+class CrawlScheduler:
+    """
+    cron 스케줄 → 우선순위 대기열 → 최대 max_concurrent 동시 실행
+
+    tick(now)로 예정 시각이 된 항목을 대기열에 넣고, 실행 슬롯이 비면 우선순위 순으로 시작
+    start()는 tick을 다음 예정 시각까지 대기하며 반복하는 백그라운드 task 실행
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[ScheduleEntry],
+        runner: Runner,
+        deadline_probe: Optional[DeadlineProbe] = None,
+        deadline_ttl_seconds: float = 300.0,
+        single_flight: Optional[SingleFlight] = None,
+        max_concurrent: int = 1,
+        history_size: int = 200,
+        state_path: Optional[str] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.entries: Dict[str, ScheduleEntry] = {}
+        for entry in entries:
+            if entry.name in self.entries:
+                raise ValueError(f"Duplicate schedule name: {entry.name}")
+            self.entries[entry.name] = entry
+        self.runner = runner
+        self.deadline_probe = deadline_probe
+        self.deadline_ttl = timedelta(seconds=deadline_ttl_seconds)
+        self._deadlines: Dict[str, Tuple[datetime, Optional[datetime]]] = {}     # source → (만료 시각, 최근 마감)
+        self.single_flight = single_flight or SingleFlight()
+        self.max_concurrent = max(1, max_concurrent)
+        self.history: deque = deque(maxlen=history_size)
+        self.state_path = state_path
+        self.clock = clock or (lambda: datetime.now(SCHEDULER_TZ))
+        self.rng = rng or random.Random()
+
+        self._queue: List[Tuple[int, datetime, int, RunRecord]] = []     # (-priority, 예정 시각, run_id, 기록)
+        self._running: Dict[int, asyncio.Task] = {}
+        self._ids = itertools.count(1)
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # name → (예정 시각, jitter 적용 실행 시각, trigger)
+        self._next: Dict[str, Tuple[datetime, datetime, str]] = {}
+        self._last_scheduled: Dict[str, datetime] = self._load_state()
+
+        now = self.clock()
+        for entry in self.entries.values():
+            if entry.enabled:
+                self._plan(entry, now, resume=True)
+
+    # -------------------------------------------------
+    # 예정 시각 계산
+    # -------------------------------------------------
+
+    def _probe(self, source: str) -> Optional[datetime]:
+        try:
+            closing = self.deadline_probe(source)
+        except Exception as e:
+            logger.warning(f"Deadline probe failed for {source}: {e}")
+            return None
+        if closing is not None and closing.tzinfo is None:
+            closing = closing.replace(tzinfo=SCHEDULER_TZ)
+        return closing
+
+    async def refresh_deadlines(self, now: Optional[datetime] = None):
+        """만료된 source별 마감 캐시를 스레드에서 갱신 (tick 전에 호출, 이벤트 루프 blocking 방지)"""
+        if self.deadline_probe is None:
+            return
+        now = now or self.clock()
+        for source in sorted({entry.source for entry in self.entries.values() if entry.enabled}):
+            cached = self._deadlines.get(source)
+            if cached is None or cached[0] <= now:
+                closing = await asyncio.to_thread(self._probe, source)
+                self._deadlines[source] = (now + self.deadline_ttl, closing)
+
+    def _closing(self, source: str, now: datetime) -> Optional[datetime]:
+        cached = self._deadlines.get(source)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖 (생성 / 동기 호출): 직접 조회
+            closing = self._probe(source)
+            self._deadlines[source] = (now + self.deadline_ttl, closing)
+            return closing
+        # 이벤트 루프 안에서는 동기 조회하지 않음 (refresh_deadlines가 갱신할 때까지 마지막 값)
+        return cached[1] if cached else None
+
+    def _urgent(self, entry: ScheduleEntry, now: datetime) -> bool:
+        if self.deadline_probe is None:
+            return False
+        closing = self._closing(entry.source, now)
+        if closing is None:
+            return False
+        return now <= closing <= now + timedelta(hours=entry.urgent_hours)
+
+    def _plan(self, entry: ScheduleEntry, now: datetime, resume: bool = False):
+        cron, urgent_cron = entry._crons
+        last = self._last_scheduled.get(entry.name)
+
+        # 재시작: 마지막 예정 이후 놓친 실행이 있으면 즉시 1회 보충 대상으로
+        if resume and last is not None:
+            missed = cron.next_after(last)
+            if missed <= now:
+                self._next[entry.name] = (missed, now, "catch_up")
+                return
+
+        scheduled, trigger = cron.next_after(now), "cron"
+        if urgent_cron is not None and self._urgent(entry, now):
+            urgent_at = urgent_cron.next_after(now)
+            if urgent_at < scheduled:
+                scheduled, trigger = urgent_at, "urgent"
+        jitter = timedelta(seconds=self.rng.uniform(0, entry.jitter_seconds)) if entry.jitter_seconds else timedelta(0)
+        self._next[entry.name] = (scheduled, scheduled + jitter, trigger)
+
+    def next_runs(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"scheduled_for": scheduled.isoformat(), "fire_at": fire_at.isoformat(), "trigger": trigger}
+            for name, (scheduled, fire_at, trigger) in self._next.items()
+        }
+
+    # -------------------------------------------------
+    # 대기열
+    # -------------------------------------------------
+
+    def _record(self, entry: ScheduleEntry, trigger: str, scheduled_for: datetime, now: datetime) -> RunRecord:
+        # 마감 임박 공고가 있는 source는 같은 시각 대기 항목보다 먼저
+        priority = entry.priority + (1000 if self._urgent(entry, now) else 0)
+        record = RunRecord(next(self._ids), entry.name, entry.source, list(entry.keywords), trigger, scheduled_for, priority)
+        self.history.append(record)
+        return record
+
+    def _enqueue(self, record: RunRecord) -> bool:
+        # 같은 스케줄이 이미 대기 중이면 합침 (실행 지연 중 누적 방지)
+        if any(queued.entry == record.entry for _, _, _, queued in self._queue):
+            record.status = "skipped"
+            record.error = "Already queued"
+            return False
+        heapq.heappush(self._queue, (-record.priority, record.scheduled_for, record.run_id, record))
+        return True
+
+    def tick(self, now: Optional[datetime] = None) -> List[RunRecord]:
+        """예정 시각이 된 항목을 대기열에 추가 (대기열에 넣은 기록 반환)"""
+        now = now or self.clock()
+        fired, queued = False, []
+        for name, (scheduled, fire_at, trigger) in list(self._next.items()):
+            if fire_at > now:
+                continue
+            entry = self.entries[name]
+            fired = True
+            self._last_scheduled[name] = scheduled
+            # 루프 지연(절전, 장시간 blocking)으로 늦게 깨어난 경우도 보충 실행으로 기록
+            if now - fire_at > timedelta(minutes=1):
+                trigger = "catch_up"
+            record = self._record(entry, trigger, scheduled, now)
+            # 여러 번 놓쳤어도 1회로 합침, 보충 허용 범위를 넘으면 실행하지 않고 기록만
+            if now - scheduled > timedelta(hours=entry.catch_up_hours, seconds=entry.jitter_seconds + 60):
+                record.status = "missed"
+                logger.warning(f"Schedule {name} missed run at {scheduled.isoformat()}")
+            elif self._enqueue(record):
+                queued.append(record)
+            self._plan(entry, now)
+        if fired:
+            self._save_state()
+        return queued
+
+    def trigger(self, name: str) -> RunRecord:
+        """수동 실행 (대기열 맨 앞 우선순위)"""
+        entry = self.entries.get(name)
+        if entry is None:
+            raise KeyError(name)
+        now = self.clock()
+        record = self._record(entry, "manual", now, now)
+        record.priority += 10_000
+        self._enqueue(record)
+        if self._wake is not None:
+            self._wake.set()
+        return record
+
+    # -------------------------------------------------
+    # 실행
+    # -------------------------------------------------
+
+    def dispatch(self) -> List[asyncio.Task]:
+        """빈 실행 슬롯만큼 대기열에서 꺼내 실행 task 생성 (실행 중인 이벤트 루프 필요)"""
+        started = []
+        while self._queue and len(self._running) < self.max_concurrent:
+            _, _, run_id, record = heapq.heappop(self._queue)
+            task = asyncio.get_running_loop().create_task(self._execute(record))
+            self._running[run_id] = task
+            task.add_done_callback(lambda _, run_id=run_id: self._finished(run_id))
+            started.append(task)
+        return started
+
+    def _finished(self, run_id: int):
+        self._running.pop(run_id, None)
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _execute(self, record: RunRecord):
+        entry = self.entries[record.entry]
+        with self.single_flight.acquire(entry.source, entry.keywords) as keywords:
+            if not keywords:
+                record.status = "skipped"
+                record.error = "All keywords already running"
+                logger.info(f"Schedule {entry.name} skipped: already running")
+                return
+            record.keywords = keywords
+            record.status = "running"
+            record.started_at = self.clock()
+            try:
+                record.result = await self.runner(entry, keywords)
+                record.status = "success"
+            except asyncio.CancelledError:
+                record.status = "failed"
+                record.error = "cancelled"
+                raise
+            except Exception as e:
+                record.status = "failed"
+                record.error = str(e)
+                logger.error(f"Schedule {entry.name} failed: {e}")
+            finally:
+                record.finished_at = self.clock()
+
+    async def run_pending(self, now: Optional[datetime] = None):
+        """tick + dispatch 후 시작한 실행 완료까지 대기 (테스트 / 1회 실행용)"""
+        await self.refresh_deadlines(now)
+        self.tick(now)
+        while self._queue or self._running:
+            self.dispatch()
+            if self._running:
+                await asyncio.wait(list(self._running.values()))
+
+    async def _loop(self):
+        while True:
+            self._wake.clear()
+            await self.refresh_deadlines()
+            self.tick()
+            self.dispatch()
+            now = self.clock()
+            upcoming = [fire_at for _, fire_at, _ in self._next.values()]
+            delay = min([(t - now).total_seconds() for t in upcoming] + [60.0])
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(delay, 0.05))
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        # 이벤트 루프 안에서 생성된 경우 마감 캐시 없이 계획됨 → 갱신 후 다시 계획
+        if self.deadline_probe is not None:
+            now = self.clock()
+            await self.refresh_deadlines(now)
+            for entry in self.entries.values():
+                if entry.enabled:
+                    self._plan(entry, now, resume=True)
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        logger.info(f"Scheduler started: {', '.join(self.entries)}")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        tasks = [self._task, *self._running.values()]
+        for task in tasks[1:]:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._save_state()
+
+    def runs(self, limit: int = 50, entry: Optional[str] = None) -> List[Dict[str, Any]]:
+        records = [r for r in reversed(self.history) if entry is None or r.entry == entry]
+        return [r.to_dict() for r in records[:limit]]
+
+    # -------------------------------------------------
+    # 상태 저장 (마지막 예정 시각)
+    # -------------------------------------------------
+
+    def _load_state(self) -> Dict[str, datetime]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return {name: datetime.fromisoformat(value) for name, value in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Scheduler state ignored ({self.state_path}): {e}")
+            return {}
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        tmp = f"{self.state_path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({name: value.isoformat() for name, value in self._last_scheduled.items()}, f)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            logger.warning(f"Scheduler state not saved ({self.state_path}): {e}")
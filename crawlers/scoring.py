@@ -0,0 +1,458 @@
+"""
+공고 관련도 점수 (tenders.relevance_score / ai_summary)
+
+1단계 로컬 분류 (호출 비용 없음):
+    logit = bias + 키워드 가중치 합(COAL_TERMS) + naive Bayes 토큰 log-odds (학습 모델이 있을 때)
+    (키워드 점수는 사전 항, 모델은 키워드 규칙과 독립된 레이블로만 학습 → 같은 신호를 두 번 세지 않음)
+2단계 LLM (애매한 구간 low < p < high만):
+    공고명 해시 기준 중복 제거 → batch_size건씩 1회 호출 → 결과 캐시 (같은 공고명은 재호출 없음)
+    LLM 실패 시 로컬 점수 사용 (캐시하지 않음 → 다음 실행에서 재시도)
+
+학습 데이터 (키워드 규칙으로 만든 레이블은 쓰지 않음):
+    - JSON 목록 (--data): label / relevant 필드가 있는 레코드만
+    - 무관 공고 목록 (--negatives, 일반 G2B 공고 표본 등): 레이블 없는 레코드를 0으로
+    - 캐시의 LLM 판정 결과 (운영 중 누적)
+
+사용법:
+    python -m scoring train --data labeled.json --negatives ../output/coal_tenders.json
+    python -m scoring score --limit 500
+"""
+import os
+import re
+import json
+import math
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+try:
+    from search import tokenize
+except ImportError:
+    from crawlers.search import tokenize
+
+try:
+    import google.generativeai as genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.getenv("RELEVANCE_MODEL_PATH", os.path.join("data", "relevance_model.json"))
+CACHE_PATH = os.getenv("RELEVANCE_CACHE_PATH", os.path.join("data", "relevance_cache.json"))
+
+# 점수 대상 projection
+SCORING_COLUMNS = "id, source, bid_ntce_no, bid_ntce_ord, bid_ntce_nm, dminstt_nm, ai_summary"
+
+# 공고명 부분 문자열 → logit 가중치 (석탄 직접 언급 / 발전 연료·물류 문맥)
+COAL_TERMS: Dict[str, float] = {
+    "유연탄": 4.0, "연료탄": 4.0, "무연탄": 3.5, "역청탄": 3.5, "석탄": 3.5, "coal": 3.5,
+    "저열량탄": 3.5, "고열량탄": 3.5, "발전용탄": 3.5, "탄종": 2.0,
+    "발열량": 1.5, "kcal": 1.5, "nar": 1.0, "gar": 1.0,
+    "발전연료": 1.5, "연료": 1.0, "화력": 1.0, "저탄장": 1.5, "하역": 0.5, "해상운송": 0.5, "용선": 0.5,
+}
+LOCAL_BIAS = -2.0
+NB_CLIP = 6.0
+
+
+def title_hash(title: str) -> str:
+    """공백/대소문자 정규화 후 sha1 (정정 공고 등 같은 공고명은 같은 키)"""
+    normalized = re.sub(r"\s+", " ", (title or "").strip().lower())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def keyword_logit(title: str) -> float:
+    text = (title or "").lower().replace(" ", "")
+    return sum(weight for term, weight in COAL_TERMS.items() if term in text)
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+# =====================================================
+# 로컬 모델
+# =====================================================
+
+class RelevanceModel:
+    """토큰(2-gram) multinomial naive Bayes (사전확률 제외, 우도비만 키워드 점수에 더함)"""
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.counts: Dict[int, Counter] = {0: Counter(), 1: Counter()}
+        self.totals = {0: 0, 1: 0}
+        self.docs = {0: 0, 1: 0}
+
+    @property
+    def trained(self) -> bool:
+        return self.docs[0] > 0 and self.docs[1] > 0
+
+    def fit(self, titles: Sequence[str], labels: Sequence[int]) -> "RelevanceModel":
+        for title, label in zip(titles, labels):
+            tokens = set(tokenize(title))
+            label = 1 if label else 0
+            self.counts[label].update(tokens)
+            self.totals[label] += len(tokens)
+            self.docs[label] += 1
+        if not self.trained:
+            raise ValueError(f"both classes required (positive={self.docs[1]}, negative={self.docs[0]})")
+        return self
+
+    def log_odds(self, title: str) -> float:
+        if not self.trained:
+            return 0.0
+        vocab = len(set(self.counts[0]) | set(self.counts[1]))
+        score = 0.0
+        for token in set(tokenize(title)):
+            if token not in self.counts[0] and token not in self.counts[1]:
+                continue
+            pos = (self.counts[1][token] + self.alpha) / (self.totals[1] + self.alpha * vocab)
+            neg = (self.counts[0][token] + self.alpha) / (self.totals[0] + self.alpha * vocab)
+            score += math.log(pos / neg)
+        return max(-NB_CLIP, min(NB_CLIP, score))
+
+    def predict(self, title: str) -> float:
+        return _sigmoid(LOCAL_BIAS + keyword_logit(title) + self.log_odds(title))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "alpha": self.alpha,
+            "docs": self.docs,
+            "totals": self.totals,
+            "counts": {str(label): dict(counter) for label, counter in self.counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RelevanceModel":
+        model = cls(alpha=data.get("alpha", 1.0))
+        model.docs = {int(k): v for k, v in data["docs"].items()}
+        model.totals = {int(k): v for k, v in data["totals"].items()}
+        model.counts = {int(k): Counter(v) for k, v in data["counts"].items()}
+        return model
+
+    def save(self, path: str = MODEL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> "RelevanceModel":
+        """모델 파일이 없으면 키워드 규칙만 쓰는 빈 모델"""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Relevance model ignored ({path}): {e}")
+            return cls()
+
+
+def load_labeled_titles(path: str, default: Optional[int] = None) -> List[Tuple[str, int]]:
+    """JSON 목록 → (공고명, 레이블), 레이블 없는 레코드는 default (None이면 제외)"""
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    examples = []
+    for record in records:
+        title = record.get("title") or record.get("bid_ntce_nm") or record.get("bidNtceNm")
+        if not title:
+            continue
+        label = record.get("label", record.get("relevant"))
+        if label is None:
+            label = default
+        if label is None:
+            continue
+        examples.append((title, int(bool(label))))
+    return examples
+
+
+# =====================================================
+# LLM 단계
+# =====================================================
+
+@dataclass(slots=True)
+class Verdict:
+    score: float
+    summary: Optional[str] = None
+    source: str = "llm"
+
+
+class LLMClassifier(Protocol):
+    batch_size: int
+
+    def classify(self, items: Sequence[Tuple[str, str, Optional[str]]]) -> Dict[str, Verdict]:
+        """(key, 공고명, 수요기관) 목록 → key별 판정 (1회 호출)"""
+        ...
+
+
+_PROMPT = """다음은 한국 공공기관 입찰 공고 목록입니다.
+각 공고가 발전용/산업용 석탄(유연탄, 연료탄 등) 구매·운송과 관련된 정도를 0.0~1.0으로 평가하고,
+한국어 한 문장으로 요약하세요. JSON 배열만 출력하세요: [{{"id": "...", "score": 0.0, "summary": "..."}}]
+
+{items}"""
+
+
+class GeminiClassifier:
+    """Gemini 1회 호출로 batch_size건 판정 (GEMINI_API_KEY)"""
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-pro", batch_size: int = 20):
+        if not GEMINI_AVAILABLE:
+            raise RuntimeError("google-generativeai not installed")
+        genai.configure(api_key=api_key or os.environ["GEMINI_API_KEY"])
+        self.model = genai.GenerativeModel(model)
+        self.batch_size = batch_size
+
+    def classify(self, items: Sequence[Tuple[str, str, Optional[str]]]) -> Dict[str, Verdict]:
+        lines = "\n".join(
+            json.dumps({"id": key, "title": title, "organization": org or ""}, ensure_ascii=False)
+            for key, title, org in items
+        )
+        response = self.model.generate_content(_PROMPT.format(items=lines), generation_config={"temperature": 0})
+        return parse_verdicts(response.text, {key for key, _, _ in items})
+
+
+def parse_verdicts(text: str, keys: Iterable[str]) -> Dict[str, Verdict]:
+    """LLM 응답 JSON → 요청한 key만, 점수는 0~1로 제한"""
+    match = re.search(r"\[.*\]", text or "", re.S)
+    if not match:
+        raise ValueError("LLM response has no JSON array")
+    wanted = set(keys)
+    verdicts = {}
+    for item in json.loads(match.group(0)):
+        key = str(item.get("id"))
+        if key in wanted and item.get("score") is not None:
+            verdicts[key] = Verdict(max(0.0, min(1.0, float(item["score"]))), (item.get("summary") or None))
+    return verdicts
+
+
+def create_llm_classifier() -> Optional[LLMClassifier]:
+    if not (GEMINI_AVAILABLE and os.getenv("GEMINI_API_KEY")):
+        return None
+    return GeminiClassifier(batch_size=int(os.getenv("RELEVANCE_LLM_BATCH", "20")))
+
+
+# =====================================================
+# 캐시 / 점수 단계
+# =====================================================
+
+class ScoreCache:
+    """공고명 해시 → LLM 판정 (최대 max_entries, 오래된 것부터 제거, path 지정 시 JSON 저장)"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 50_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Verdict]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for key, value in json.load(f).items():
+                        self._entries[key] = Verdict(**value)
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Relevance cache ignored ({path}): {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Verdict]:
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+            return verdict
+
+    def put(self, key: str, verdict: Verdict):
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[str, Verdict]]:
+        with self._lock:
+            return list(self._entries.items())
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        try:
+            with self._lock, open(tmp, "w", encoding="utf-8") as f:
+                json.dump({key: asdict(v) for key, v in self._entries.items()}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Relevance cache not saved ({self.path}): {e}")
+
+
+@dataclass(slots=True)
+class TenderScore:
+    row: Dict[str, Any]
+    score: float
+    summary: Optional[str]
+    source: str             # local / llm / cache
+
+    def to_row(self) -> Dict[str, Any]:
+        """bulk_update_tender_scores 입력 (요약이 없으면 기존 요약 유지)"""
+        return {
+            "source": self.row["source"],
+            "bid_ntce_no": self.row["bid_ntce_no"],
+            "bid_ntce_ord": self.row["bid_ntce_ord"],
+            "bid_ntce_nm": self.row["bid_ntce_nm"],
+            "relevance_score": round(self.score, 2),
+            "ai_summary": self.summary or self.row.get("ai_summary"),
+        }
+
+
+class TenderScorer:
+    """로컬 분류 → 애매한 공고만 LLM 배치 호출 (결과는 공고명 해시로 캐시)"""
+
+    def __init__(
+        self,
+        model: Optional[RelevanceModel] = None,
+        llm: Optional[LLMClassifier] = None,
+        cache: Optional[ScoreCache] = None,
+        low: float = 0.3,
+        high: float = 0.7,
+        max_llm_calls: Optional[int] = None,
+    ):
+        self.model = model or RelevanceModel()
+        self.llm = llm
+        self.cache = cache or ScoreCache()
+        self.low = low
+        self.high = high
+        self.max_llm_calls = max_llm_calls
+        self.stats: Counter = Counter()
+
+    def score(self, rows: Sequence[Dict[str, Any]]) -> List[TenderScore]:
+        results: List[Optional[TenderScore]] = [None] * len(rows)
+        pending: "OrderedDict[str, List[int]]" = OrderedDict()
+        local: Dict[int, float] = {}
+
+        for i, row in enumerate(rows):
+            title = row.get("bid_ntce_nm") or ""
+            key = title_hash(title)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = TenderScore(row, cached.score, cached.summary, "cache")
+                self.stats["cache"] += 1
+                continue
+            p = self.model.predict(title)
+            local[i] = p
+            if self.llm is not None and self.low < p < self.high:
+                pending.setdefault(key, []).append(i)
+            else:
+                results[i] = TenderScore(row, p, None, "local")
+                self.stats["local"] += 1
+
+        verdicts = self._escalate(rows, pending)
+        for key, indexes in pending.items():
+            verdict = verdicts.get(key)
+            for i in indexes:
+                if verdict is None:
+                    results[i] = TenderScore(rows[i], local[i], None, "local")
+                    self.stats["llm_fallback"] += 1
+                else:
+                    results[i] = TenderScore(rows[i], verdict.score, verdict.summary, "llm")
+                    self.stats["llm"] += 1
+        return results
+
+    def _escalate(self, rows: Sequence[Dict[str, Any]], pending: "OrderedDict[str, List[int]]") -> Dict[str, Verdict]:
+        keys = list(pending)
+        verdicts: Dict[str, Verdict] = {}
+        batch_size = max(1, self.llm.batch_size) if self.llm else 1
+        for calls, start in enumerate(range(0, len(keys), batch_size)):
+            # 호출 상한 초과분은 로컬 점수 (캐시되지 않으므로 다음 실행에서 다시 시도)
+            if self.max_llm_calls is not None and calls >= self.max_llm_calls:
+                break
+            batch = [
+                (key, rows[pending[key][0]].get("bid_ntce_nm") or "", rows[pending[key][0]].get("dminstt_nm"))
+                for key in keys[start:start + batch_size]
+            ]
+            self.stats["llm_calls"] += 1
+            try:
+                result = self.llm.classify(batch)
+            except Exception as e:
+                logger.warning(f"LLM scoring failed for {len(batch)} tenders, using local scores: {e}")
+                continue
+            for key, verdict in result.items():
+                self.cache.put(key, verdict)
+            verdicts.update(result)
+        return verdicts
+
+    def train_from_cache(self, extra: Iterable[Tuple[str, int]] = (), titles: Optional[Dict[str, str]] = None) -> RelevanceModel:
+        """LLM 판정(캐시) + 추가 레이블로 로컬 모델 재학습 (titles: 해시 → 공고명)"""
+        examples = list(extra)
+        for key, verdict in self.cache.items():
+            if titles and key in titles and verdict.source == "llm":
+                examples.append((titles[key], int(verdict.score >= 0.5)))
+        self.model = RelevanceModel().fit([t for t, _ in examples], [l for _, l in examples])
+        return self.model
+
+
+def score_pending(repo, scorer: TenderScorer, limit: int = 500) -> Dict[str, Any]:
+    """relevance_score가 없는 공고를 점수 매겨 저장 (크롤링 후 단계)"""
+    rows = repo.list_unscored_tenders(limit=limit, columns=SCORING_COLUMNS)
+    if not rows:
+        return {"scored": 0}
+    scored = scorer.score(rows)
+    repo.bulk_update_tender_scores([s.to_row() for s in scored])
+    scorer.cache.save()
+    sources = Counter(s.source for s in scored)
+    return {"scored": len(scored), **{f"{source}_count": n for source, n in sources.items()}, "llm_calls": scorer.stats["llm_calls"]}
+
+
+def create_scorer() -> TenderScorer:
+    return TenderScorer(
+        model=RelevanceModel.load(MODEL_PATH),
+        llm=create_llm_classifier(),
+        cache=ScoreCache(CACHE_PATH),
+        max_llm_calls=int(os.getenv("RELEVANCE_MAX_LLM_CALLS", "10")),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tender relevance scoring")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="Train the local model from labeled titles and cached LLM verdicts")
+    train.add_argument("--data", action="append", default=[], help="JSON list of labeled tenders (label/relevant)")
+    train.add_argument("--negatives", action="append", default=[], help="JSON list of tenders known to be unrelated")
+    train.add_argument("--output", default=MODEL_PATH)
+    score = sub.add_parser("score", help="Score tenders without relevance_score")
+    score.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+
+    try:
+        from repository import create_repository
+    except ImportError:
+        from crawlers.repository import create_repository
+    repo = create_repository()
+
+    if args.command == "train":
+        examples = [example for path in args.data for example in load_labeled_titles(path)]
+        examples += [example for path in args.negatives for example in load_labeled_titles(path, default=0)]
+        titles = {}
+        if repo is not None:
+            # LLM 판정 캐시 키(공고명 해시) → 공고명
+            for row in repo.list_tenders(columns="bid_ntce_nm"):
+                title = row.get("bid_ntce_nm") or ""
+                titles[title_hash(title)] = title
+        scorer = TenderScorer(cache=ScoreCache(CACHE_PATH))
+        model = scorer.train_from_cache(examples, titles)
+        model.save(args.output)
+        print(f"Trained on {sum(model.docs.values())} titles (positive={model.docs[1]}, negative={model.docs[0]}) → {args.output}")
+    else:
+        if repo is None:
+            raise SystemExit("SUPABASE_URL / SUPABASE_KEY (or REPOSITORY_BACKEND=memory) required")
+        print(score_pending(repo, create_scorer(), limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+검색 (전문 검색 / 유사 입찰 인덱스)
+"""
+from .specs import SpecIndex, SpecMatch, normalize_origin
+from .text import InvertedIndex, TenderSearch, tokenize
+
+__all__ = ['SpecIndex', 'SpecMatch', 'normalize_origin', 'InvertedIndex', 'TenderSearch', 'tokenize']
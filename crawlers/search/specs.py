@@ -0,0 +1,332 @@
+"""
+유사 입찰 스펙 인덱스
+tender_specs 이력을 열(column) 배열로 보관하고 새 스펙과의 가중 거리를 벡터 연산으로 계산하여 top-k 반환
+
+거리 (차원별 |차이| / scale × weight 의 유클리드 합):
+    발열량: NAR 환산 (min, max) 구간의 중간값, 구간 겹침은 require_cv_overlap 필터로 선택
+    황분 / 회분 / 수분 상한, 물량(log), 인코텀즈 / 원산지 (불일치 시 weight)
+    한쪽 값이 없으면 missing_penalty (값이 없는 스펙이 과도하게 가깝거나 멀어지지 않도록)
+
+- 전체 비교가 배열 연산 1회 (행별 Python 비교 없음), top-k는 argpartition
+- 추가/수정은 제자리 갱신(용량 2배 확장), 삭제는 tombstone 후 절반 이상 비면 압축
+- repository listener로 upsert_tender_spec 결과를 즉시 반영
+"""
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+try:
+    from netback.engine import NetbackEngine, to_nar
+    from tracing import traced
+except ImportError:
+    from crawlers.netback.engine import NetbackEngine, to_nar
+    from crawlers.tracing import traced
+
+# 수치 차원
+DIMENSIONS = ("cv_nar", "sulfur_max_pct", "ash_max_pct", "moisture_max_pct", "log_quantity")
+
+# 차원별 1단위 거리 (대략 "의미 있게 다른" 차이)
+DEFAULT_SCALES = {
+    "cv_nar": 300.0,            # kcal/kg
+    "sulfur_max_pct": 0.3,
+    "ash_max_pct": 3.0,
+    "moisture_max_pct": 3.0,
+    "log_quantity": math.log(2.0),   # 물량 2배 차이
+}
+
+DEFAULT_WEIGHTS = {
+    "cv_nar": 2.0,
+    "sulfur_max_pct": 1.0,
+    "ash_max_pct": 1.0,
+    "moisture_max_pct": 1.0,
+    "log_quantity": 0.5,
+    "incoterms": 1.0,
+    "origin": 1.0,
+}
+
+# 원산지 표기 정규화
+ORIGIN_ALIASES = {
+    "인도네시아": "indonesia", "인니": "indonesia", "indonesian": "indonesia",
+    "호주": "australia", "australian": "australia",
+    "러시아": "russia", "russian": "russia",
+    "남아공": "south africa", "남아프리카공화국": "south africa", "rsa": "south africa",
+    "콜롬비아": "colombia", "캐나다": "canada", "미국": "usa", "united states": "usa",
+}
+
+
+def normalize_origin(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    text = " ".join(str(value).strip().lower().split())
+    return ORIGIN_ALIASES.get(text, text)
+
+
+def _value(spec: Any, name: str) -> Any:
+    if isinstance(spec, Mapping):
+        return spec.get(name)
+    return getattr(spec, name, None)
+
+
+def _enum_text(value: Any) -> Optional[str]:
+    value = value.value if hasattr(value, "value") else value
+    return str(value).upper() if value else None
+
+
+@dataclass(slots=True)
+class SpecMatch:
+    """유사 스펙 조회 결과"""
+    spec_id: str
+    tender_id: Optional[str]
+    distance: float
+    row: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"spec_id": self.spec_id, "tender_id": self.tender_id, "distance": round(self.distance, 4), "spec": self.row}
+
+
+class SpecIndex:
+    """
+    tender_specs 유사도 인덱스
+
+    사용법:
+        index = SpecIndex.from_repository(repo)      # 1회 조회 + listener 등록
+        matches = index.query(new_spec, k=10, exclude_tender_ids=[tender_id])
+        matches = index.similar_to_tender(tender_id, k=10)
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        scales: Optional[Dict[str, float]] = None,
+        missing_penalty: float = 0.5,
+        engine: Optional[NetbackEngine] = None,
+        initial_capacity: int = 1024,
+    ):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.scales = {**DEFAULT_SCALES, **(scales or {})}
+        self.missing_penalty = missing_penalty
+        self.engine = engine or NetbackEngine()
+        self._lock = threading.RLock()
+        self._repo = None
+
+        initial_capacity = max(initial_capacity, 1)
+        self._size = 0                  # 사용한 슬롯 수 (tombstone 포함)
+        self._features = np.full((initial_capacity, len(DIMENSIONS)), np.nan)
+        self._cv_lo = np.full(initial_capacity, np.nan)
+        self._cv_hi = np.full(initial_capacity, np.nan)
+        self._incoterms = np.full(initial_capacity, -1, dtype=np.int32)
+        self._origin = np.full(initial_capacity, -1, dtype=np.int32)
+        self._alive = np.zeros(initial_capacity, dtype=bool)
+        self._rows: List[Optional[Dict[str, Any]]] = []
+        self._slot: Dict[str, int] = {}                 # spec id → 슬롯
+        self._by_tender: Dict[str, str] = {}            # tender id → spec id
+        self._vocab: Dict[str, Dict[str, int]] = {"incoterms": {}, "origin": {}}
+
+    @classmethod
+    def from_repository(cls, repo, listen: bool = True, **kwargs: Any) -> "SpecIndex":
+        index = cls(**kwargs)
+        index.upsert_rows(repo.list_tender_specs())
+        if listen:
+            index._repo = repo
+            repo.add_listener("tender_specs", index.upsert_rows)
+        return index
+
+    def close(self):
+        if self._repo is not None:
+            self._repo.remove_listener("tender_specs", self.upsert_rows)
+            self._repo = None
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    # -------------------------------------------------
+    # 특징 벡터
+    # -------------------------------------------------
+
+    def _code(self, vocab: str, value: Optional[str], add: bool) -> int:
+        if value is None:
+            return -1
+        codes = self._vocab[vocab]
+        if value not in codes:
+            if not add:
+                return -2           # 이력에 없는 값 (항상 불일치)
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _encode(self, specs: Sequence[Any], add: bool):
+        """specs → (features, cv_lo, cv_hi, incoterms codes, origin codes)"""
+        n = len(specs)
+        _, basis, moisture = self.engine.spec_arrays(specs)
+        lo = np.array([np.nan if _value(s, "cv_min_kcal") is None else float(_value(s, "cv_min_kcal")) for s in specs])
+        hi = np.array([np.nan if _value(s, "cv_max_kcal") is None else float(_value(s, "cv_max_kcal")) for s in specs])
+        lo, hi = np.where(np.isnan(lo), hi, lo), np.where(np.isnan(hi), lo, hi)
+        args = (basis, moisture, self.engine.inherent_moisture_pct, self.engine.hydrogen_pct)
+        lo, hi = to_nar(lo, *args), to_nar(hi, *args)
+
+        features = np.full((n, len(DIMENSIONS)), np.nan)
+        features[:, 0] = (lo + hi) / 2
+        for j, name in enumerate(DIMENSIONS[1:4], start=1):
+            features[:, j] = [np.nan if _value(s, name) is None else float(_value(s, name)) for s in specs]
+        quantity = np.array([np.nan if not _value(s, "quantity_mt") else float(_value(s, "quantity_mt")) for s in specs])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            features[:, 4] = np.log(quantity)
+
+        incoterms = np.array([self._code("incoterms", _enum_text(_value(s, "incoterms")), add) for s in specs], dtype=np.int32)
+        origin = np.array([self._code("origin", normalize_origin(_value(s, "origin")), add) for s in specs], dtype=np.int32)
+        return features, lo, hi, incoterms, origin
+
+    # -------------------------------------------------
+    # 증분 갱신
+    # -------------------------------------------------
+
+    def _grow(self, needed: int):
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        def grow(a: np.ndarray, fill: Any) -> np.ndarray:
+            out = np.full((capacity,) + a.shape[1:], fill, dtype=a.dtype)
+            out[:len(a)] = a
+            return out
+
+        self._features = grow(self._features, np.nan)
+        self._cv_lo, self._cv_hi = grow(self._cv_lo, np.nan), grow(self._cv_hi, np.nan)
+        self._incoterms, self._origin = grow(self._incoterms, -1), grow(self._origin, -1)
+        self._alive = grow(self._alive, False)
+
+    def upsert_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """tender_specs row 추가/갱신 (id 기준), 반영 건수 반환"""
+        rows = [dict(r) for r in rows if r and r.get("id")]
+        if not rows:
+            return 0
+        with self._lock:
+            features, lo, hi, incoterms, origin = self._encode(rows, add=True)
+            slots = []
+            for row in rows:
+                slot = self._slot.get(row["id"])
+                if slot is None:
+                    slot = self._size
+                    self._size += 1
+                    self._rows.append(None)
+                    self._slot[row["id"]] = slot
+                else:
+                    old_tender = self._rows[slot].get("tender_id")
+                    if self._by_tender.get(old_tender) == row["id"]:
+                        del self._by_tender[old_tender]
+                slots.append(slot)
+                self._rows[slot] = row
+                if row.get("tender_id"):
+                    self._by_tender[row["tender_id"]] = row["id"]
+
+            self._grow(self._size)
+            slots = np.array(slots)
+            self._features[slots] = features
+            self._cv_lo[slots], self._cv_hi[slots] = lo, hi
+            self._incoterms[slots], self._origin[slots] = incoterms, origin
+            self._alive[slots] = True
+        return len(rows)
+
+    def remove(self, spec_id: str) -> bool:
+        with self._lock:
+            slot = self._slot.pop(spec_id, None)
+            if slot is None:
+                return False
+            tender_id = self._rows[slot].get("tender_id")
+            if self._by_tender.get(tender_id) == spec_id:
+                del self._by_tender[tender_id]
+            self._rows[slot] = None
+            self._alive[slot] = False
+            if self._size > 1024 and len(self._slot) < self._size // 2:
+                self._compact()
+            return True
+
+    def _compact(self):
+        keep = np.flatnonzero(self._alive[:self._size])
+        n = len(keep)
+        self._features[:n] = self._features[keep]
+        self._cv_lo[:n], self._cv_hi[:n] = self._cv_lo[keep], self._cv_hi[keep]
+        self._incoterms[:n], self._origin[:n] = self._incoterms[keep], self._origin[keep]
+        self._alive[:n], self._alive[n:] = True, False
+        self._rows = [self._rows[i] for i in keep]
+        self._slot = {row["id"]: i for i, row in enumerate(self._rows)}
+        self._size = n
+
+    # -------------------------------------------------
+    # 조회
+    # -------------------------------------------------
+
+    def distances(self, spec: Any) -> np.ndarray:
+        """슬롯별 거리 (삭제 슬롯은 inf)"""
+        with self._lock:
+            return self._distances(self._encode([spec], add=False))
+
+    def _distances(self, encoded) -> np.ndarray:
+        features, _, _, incoterms, origin = encoded
+        n = self._size
+        penalty = self.missing_penalty
+
+        squared = np.zeros(n)
+        for j, name in enumerate(DIMENSIONS):
+            diff = np.abs(self._features[:n, j] - features[0, j]) / self.scales[name]
+            squared += (self.weights[name] * np.where(np.isnan(diff), penalty, diff)) ** 2
+        for name, codes, code in (("incoterms", self._incoterms[:n], incoterms[0]), ("origin", self._origin[:n], origin[0])):
+            unknown = (codes == -1) | (code == -1)
+            mismatch = np.where(unknown, penalty, (codes != code).astype(np.float64))
+            squared += (self.weights[name] * mismatch) ** 2
+
+        return np.where(self._alive[:n], np.sqrt(squared), np.inf)
+
+    @traced("search", "similar_specs")
+    def query(
+        self,
+        spec: Any,
+        k: int = 10,
+        exclude_tender_ids: Iterable[str] = (),
+        same_incoterms: bool = False,
+        require_cv_overlap: bool = False,
+        max_distance: Optional[float] = None,
+    ) -> List[SpecMatch]:
+        """새 스펙(TenderSpecDTO / row dict)과 가장 가까운 과거 스펙 k개 (거리 오름차순)"""
+        with self._lock:
+            n = self._size
+            if n == 0 or k <= 0:
+                return []
+            encoded = self._encode([spec], add=False)
+            _, lo, hi, incoterms, _ = encoded
+            dist = self._distances(encoded)
+
+            if same_incoterms and incoterms[0] != -1:
+                dist[self._incoterms[:n] != incoterms[0]] = np.inf
+            if require_cv_overlap and not np.isnan(lo[0]):
+                with np.errstate(invalid="ignore"):
+                    overlap = (self._cv_lo[:n] <= hi[0]) & (self._cv_hi[:n] >= lo[0])
+                dist[~overlap] = np.inf
+            for tender_id in exclude_tender_ids:
+                spec_id = self._by_tender.get(tender_id)
+                if spec_id is not None:
+                    dist[self._slot[spec_id]] = np.inf
+            if max_distance is not None:
+                dist[dist > max_distance] = np.inf
+
+            k = min(k, n)
+            top = np.argpartition(dist, k - 1)[:k] if k < n else np.arange(n)
+            top = top[np.argsort(dist[top], kind="stable")]
+            return [
+                SpecMatch(self._rows[i]["id"], self._rows[i].get("tender_id"), float(dist[i]), dict(self._rows[i]))
+                for i in top if np.isfinite(dist[i])
+            ]
+
+    def similar_to_tender(self, tender_id: str, k: int = 10, **kwargs: Any) -> List[SpecMatch]:
+        """이미 색인된 입찰 스펙 기준 유사 입찰 (자기 자신 제외)"""
+        with self._lock:
+            spec_id = self._by_tender.get(tender_id)
+            if spec_id is None:
+                raise KeyError(f"No indexed spec for tender {tender_id}")
+            row = self._rows[self._slot[spec_id]]
+        exclude = set(kwargs.pop("exclude_tender_ids", ())) | {tender_id}
+        return self.query(row, k=k, exclude_tender_ids=exclude, **kwargs)
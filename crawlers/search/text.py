@@ -0,0 +1,253 @@
+"""
+입찰 전문 검색
+DB 검색 (supabase/migrations/002_search.sql 의 search_tenders RPC) 우선, 사용할 수 없으면 로컬 역색인으로 대체
+
+토큰화 (SQL search_tokens()와 동일):
+    한글 연속 구간 → 2-gram (유연탄 → 유연, 연탄), 1글자는 그대로
+    영문/숫자 구간 → 소문자 단어 (NAR 5800 → nar, 5800)
+
+로컬 역색인:
+    - 단위(unit) = 공고 행(공고명 + 수요기관 + AI 요약) 또는 첨부파일 1건, 단위 안에 모든 토큰이 있으면 일치
+    - BM25 점수 (필드 가중치: 공고명 1.0, 수요기관 0.4, 요약 0.2 / 파일명 0.4, 추출 텍스트 0.1), 공고별 합산
+    - repository listener로 upsert_tender / upsert_attachment 결과를 즉시 반영
+"""
+import re
+import math
+import time
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    from tracing import traced
+except ImportError:
+    from crawlers.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+_RUN = re.compile(r"[가-힣]+|[a-z0-9]+")
+_HANGUL = re.compile(r"[가-힣]{2,}")
+
+# 추출 텍스트 색인 상한 (SQL search_document()와 동일)
+MAX_TEXT_CHARS = 200_000
+
+# 필드 가중치 (ts_rank 기본 가중치 A=1.0, B=0.4, C=0.2, D=0.1)
+TENDER_FIELDS = (("bid_ntce_nm", 1.0), ("dminstt_nm", 0.4), ("ai_summary", 0.2))
+ATTACHMENT_FIELDS = (("file_name", 0.4), ("extracted_text", 0.1))
+
+# 결과 컬럼 (search_tenders RPC와 동일) / 색인 적재 projection
+RESULT_COLUMNS = ("bid_ntce_nm", "dminstt_nm", "bid_clse_dt", "source", "status")
+SEARCH_TENDER_COLUMNS = "id, bid_ntce_nm, dminstt_nm, ai_summary, bid_clse_dt, source, status"
+SEARCH_ATTACHMENT_COLUMNS = "id, tender_id, file_name, extracted_text"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """검색 토큰 (문서 순서, 중복 포함)"""
+    tokens: List[str] = []
+    for run in _RUN.findall((text or "")[:MAX_TEXT_CHARS].lower()):
+        if _HANGUL.fullmatch(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+@dataclass(slots=True)
+class _Unit:
+    key: str
+    doc_id: str
+    length: float
+    terms: Dict[str, float]
+    label: Optional[str] = None         # 첨부파일명 (matched_files)
+
+
+class InvertedIndex:
+    """
+    단위(unit) 역색인 + BM25
+    doc_id 별로 여러 단위(공고 행, 첨부파일)를 묶어 점수 합산
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._units: Dict[str, _Unit] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}    # token → unit key → 가중 tf
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def add(self, key: str, doc_id: str, fields: Sequence[Tuple[Optional[str], float]], label: Optional[str] = None):
+        """단위 추가/교체 (fields: (텍스트, 가중치) 목록)"""
+        self.remove(key)
+        terms: Counter = Counter()
+        for text, weight in fields:
+            for token in tokenize(text):
+                terms[token] += weight
+        if not terms:
+            return
+        unit = _Unit(key, doc_id, sum(terms.values()), dict(terms), label)
+        self._units[key] = unit
+        self._total_length += unit.length
+        for token, tf in unit.terms.items():
+            self._postings.setdefault(token, {})[key] = tf
+
+    def remove(self, key: str) -> bool:
+        unit = self._units.pop(key, None)
+        if unit is None:
+            return False
+        self._total_length -= unit.length
+        for token in unit.terms:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[token]
+        return True
+
+    def search(self, query: str) -> Dict[str, Tuple[float, List[str]]]:
+        """doc_id → (점수, 일치한 단위 label 목록). 모든 토큰을 포함한 단위만 일치"""
+        tokens = sorted(set(tokenize(query)), key=lambda t: len(self._postings.get(t, ())))
+        if not tokens or not self._units:
+            return {}
+
+        # 가장 희소한 토큰부터 교집합
+        candidates: Optional[Set[str]] = None
+        for token in tokens:
+            posting = self._postings.get(token)
+            if not posting:
+                return {}
+            candidates = set(posting) if candidates is None else candidates & posting.keys()
+            if not candidates:
+                return {}
+
+        n = len(self._units)
+        avg_length = self._total_length / n
+        idf = {t: math.log(1.0 + (n - len(self._postings[t]) + 0.5) / (len(self._postings[t]) + 0.5)) for t in tokens}
+
+        results: Dict[str, Tuple[float, List[str]]] = {}
+        for key in candidates:
+            unit = self._units[key]
+            norm = self.k1 * (1.0 - self.b + self.b * unit.length / avg_length)
+            score = sum(idf[t] * unit.terms[t] * (self.k1 + 1.0) / (unit.terms[t] + norm) for t in tokens)
+            total, labels = results.get(unit.doc_id, (0.0, []))
+            if unit.label:
+                labels = labels + [unit.label]
+            results[unit.doc_id] = (total + score, labels)
+        return results
+
+
+class TenderSearch:
+    """
+    입찰 검색 서비스
+
+    사용법:
+        search = TenderSearch(repo)
+        results = search.search("유연탄 NAR 5800", limit=20)
+
+    repository에 search_tenders가 없으면(InMemoryRepository) 항상 로컬 색인,
+    RPC 호출이 실패하면(마이그레이션 미적용, 일시 장애) retry_seconds 동안만 로컬 색인 후 다시 RPC 시도
+    로컬 색인: 첫 로컬 검색 시 tenders / tender_attachments를 1회 적재하여 역색인을 구축하고 이후 listener로 증분 갱신
+    (RPC가 복구되면 색인을 내려 메모리 반환)
+    """
+
+    def __init__(self, repo, use_database: bool = True, retry_seconds: float = 300.0):
+        self.repo = repo
+        self.use_database = use_database and callable(getattr(repo, "search_tenders", None))
+        self.retry_seconds = retry_seconds
+        self._database_retry_at = 0.0          # time.monotonic() 기준, 이 시각 전에는 RPC 생략
+        self.index = InvertedIndex()
+        self._docs: Dict[str, Dict[str, Any]] = {}     # tender id → 결과 메타데이터
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def close(self):
+        with self._lock:
+            if self._loaded:
+                self.repo.remove_listener("tenders", self.index_tenders)
+                self.repo.remove_listener("tender_attachments", self.index_attachments)
+                self.index = InvertedIndex()
+                self._docs.clear()
+                self._loaded = False
+
+    # -------------------------------------------------
+    # 로컬 색인
+    # -------------------------------------------------
+
+    def load(self):
+        """tenders / tender_attachments 전체 색인 (projection 조회) + listener 등록"""
+        with self._lock:
+            if self._loaded:
+                return
+            self.repo.add_listener("tenders", self.index_tenders)
+            self.repo.add_listener("tender_attachments", self.index_attachments)
+            self.index_tenders(self.repo.list_tenders(columns=SEARCH_TENDER_COLUMNS))
+            self.index_attachments(self.repo.list_attachments(columns=SEARCH_ATTACHMENT_COLUMNS))
+            self._loaded = True
+            logger.info(f"Local search index: {len(self._docs)} tenders, {len(self.index)} units")
+
+    def index_tenders(self, rows: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        with self._lock:
+            for row in rows:
+                if not row or not row.get("id"):
+                    continue
+                self._docs[row["id"]] = {name: row.get(name) for name in RESULT_COLUMNS}
+                self.index.add(f"t:{row['id']}", row["id"], [(row.get(name), w) for name, w in TENDER_FIELDS])
+                count += 1
+        return count
+
+    def index_attachments(self, rows: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        with self._lock:
+            for row in rows:
+                if not row or not row.get("id") or not row.get("tender_id"):
+                    continue
+                self.index.add(
+                    f"a:{row['id']}", row["tender_id"],
+                    [(row.get(name), w) for name, w in ATTACHMENT_FIELDS],
+                    label=row.get("file_name"),
+                )
+                count += 1
+        return count
+
+    def search_local(self, query: str, limit: int = 20, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.load()
+        with self._lock:
+            hits = self.index.search(query)
+            results = []
+            for tender_id, (score, files) in hits.items():
+                doc = self._docs.get(tender_id)
+                if doc is None or (source and doc.get("source") != source):
+                    continue
+                results.append({
+                    "tender_id": tender_id,
+                    **doc,
+                    "rank": round(score, 6),
+                    "matched_files": sorted(files),
+                })
+        # 순위 내림차순, 동점이면 마감일 최신순 (마감일 없음은 마지막)
+        results.sort(key=lambda r: str(r.get("bid_clse_dt") or ""), reverse=True)
+        results.sort(key=lambda r: r["rank"], reverse=True)
+        return results[:limit]
+
+    # -------------------------------------------------
+    # 검색
+    # -------------------------------------------------
+
+    @traced("search", "tenders")
+    def search(self, query: str, limit: int = 20, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        if self.use_database and time.monotonic() >= self._database_retry_at:
+            try:
+                results = self.repo.search_tenders(query, limit=limit, source=source)
+            except Exception as e:
+                # 마이그레이션 002 미적용 / 일시 장애 → 이번 요청과 retry_seconds 동안은 로컬 색인
+                logger.warning(f"search_tenders RPC failed, using local index for {self.retry_seconds:.0f}s: {e}")
+                self._database_retry_at = time.monotonic() + self.retry_seconds
+            else:
+                self.close()        # 복구 → 로컬 색인 해제
+                return results
+        return self.search_local(query, limit=limit, source=source)
+
@@ -0,0 +1,14 @@
+"""
+선박 운항 / 정박(Laytime) 계산
+"""
+from .laytime import (
+    CALENDARS, SOFEvent, SOFEventType, LaytimeTerms, LaytimeResult, LaytimeCalculator,
+    recalculate_fleet, recalculate_all,
+)
+from .ais import AISPosition, Port, PORTS, PortGridIndex, VesselTracker, iter_positions, batched
+
+__all__ = [
+    'CALENDARS', 'SOFEvent', 'SOFEventType', 'LaytimeTerms', 'LaytimeResult', 'LaytimeCalculator',
+    'recalculate_fleet', 'recalculate_all',
+    'AISPosition', 'Port', 'PORTS', 'PortGridIndex', 'VesselTracker', 'iter_positions', 'batched',
+]
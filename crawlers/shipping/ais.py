@@ -0,0 +1,489 @@
+"""
+AIS 위치 수신 / 선박 상태 추적
+고빈도 위치 배치를 메모리 상태에 반영하고, 변경된 선박만 주기적으로 일괄 저장
+
+- 항만 근접 판정: 위경도 격자(grid) 인덱스 → 후보 항만만 거리 계산 (메시지당 O(1))
+- 상태 전이: SAILING → WAITING(정박지) → BERTHED(선석), 선적항 접안은 LOADING,
+  양하항 접안 후 출항하면 COMPLETED
+- ETA: 목적항(discharge_port)까지 대권거리 × 항로계수 / 평활 선속(EMA)
+- flush: 상태 변경, position_tolerance_nm 이상 이동, ETA 변경, heartbeat 경과 선박만 bulk upsert
+- 시각: 모두 UTC aware로 정규화 (offset 없는 값은 UTC로 간주, AIS 보고 기준)
+
+입력 (jsonl / csv):
+    {"mmsi": "440123456", "lat": 36.9, "lng": 126.2, "sog": 11.2, "cog": 45, "at": "2024-12-20T09:00:00+09:00", "nav_status": 0}
+
+사용법:
+    python -m shipping.ais positions.jsonl --batch-size 5000
+"""
+import csv
+import gzip
+import json
+import math
+import time
+import logging
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from dto import ShipmentDTO, ShipmentStatus
+    from tracing import traced
+except ImportError:
+    from crawlers.dto import ShipmentDTO, ShipmentStatus
+    from crawlers.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_NM = 3440.065
+
+# AIS navigational status
+NAV_AT_ANCHOR = 1
+NAV_MOORED = 5
+
+
+def to_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """UTC aware datetime (naive는 UTC로 간주) - naive/aware 혼합 비교 방지"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def haversine_nm(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """대권거리 (해리)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass(slots=True, frozen=True)
+class Port:
+    """항만 (정박지 반경 / 선석 반경, 해리)"""
+    code: str
+    name: str
+    lat: float
+    lng: float
+    anchorage_nm: float = 15.0
+    berth_nm: float = 1.5
+    aliases: Tuple[str, ...] = ()
+
+
+# 주요 유연탄 양하항(발전소 부두) / 선적항
+PORTS: List[Port] = [
+    Port("KRDJN", "Dangjin", 37.055, 126.510, aliases=("당진", "당진화력")),
+    Port("KRTAE", "Taean", 36.905, 126.235, aliases=("태안", "태안화력")),
+    Port("KRBOR", "Boryeong", 36.405, 126.485, aliases=("보령", "보령화력")),
+    Port("KRYHG", "Yeongheung", 37.230, 126.435, aliases=("영흥", "영흥화력")),
+    Port("KRSCP", "Samcheonpo", 34.985, 128.045, aliases=("삼천포", "삼천포화력")),
+    Port("KRHAD", "Hadong", 34.955, 127.815, aliases=("하동", "하동화력")),
+    Port("KRDHE", "Donghae", 37.495, 129.125, aliases=("동해", "동해화력")),
+    Port("KRKAN", "Gwangyang", 34.905, 127.695, aliases=("광양",)),
+    Port("KRKPO", "Pohang", 36.015, 129.395, aliases=("포항",)),
+    Port("KRINC", "Incheon", 37.455, 126.595, aliases=("인천",)),
+    Port("AUNTL", "Newcastle", -32.925, 151.790, anchorage_nm=25.0),
+    Port("AUGLT", "Gladstone", -23.830, 151.250, anchorage_nm=25.0),
+    Port("AUHPT", "Hay Point", -21.280, 149.300, anchorage_nm=25.0),
+    Port("IDTBO", "Taboneo", -3.750, 114.480, anchorage_nm=20.0),
+    Port("IDMBR", "Muara Berau", -0.300, 117.600, anchorage_nm=20.0, aliases=("Samarinda",)),
+    Port("IDBPN", "Balikpapan", -1.270, 116.800, anchorage_nm=20.0),
+    Port("CAVAN", "Vancouver", 49.290, -123.110, anchorage_nm=20.0, aliases=("Roberts Bank",)),
+    Port("ZARCB", "Richards Bay", -28.800, 32.080, anchorage_nm=20.0),
+    Port("RUVYP", "Vostochny", 42.750, 133.050, anchorage_nm=15.0),
+]
+
+
+class PortGridIndex:
+    """
+    항만 격자 인덱스
+    각 항만을 정박지 반경의 bounding box가 겹치는 격자 셀에 등록 → 위치 조회 시 해당 셀 후보만 검사
+    (날짜변경선을 가로지르는 항만은 없다고 가정)
+    """
+
+    def __init__(self, ports: Iterable[Port] = PORTS, cell_deg: float = 0.5):
+        self.cell_deg = cell_deg
+        self.ports: Dict[str, Port] = {}
+        self._cells: Dict[Tuple[int, int], List[Port]] = defaultdict(list)
+        self._names: Dict[str, Port] = {}
+        for port in ports:
+            self.add(port)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def add(self, port: Port):
+        self.ports[port.code] = port
+        for name in (port.code, port.name, *port.aliases):
+            self._names[name.strip().lower()] = port
+
+        dlat = port.anchorage_nm / 60.0
+        dlng = port.anchorage_nm / (60.0 * max(math.cos(math.radians(port.lat)), 1e-6))
+        lat0, lng0 = self._cell(port.lat - dlat, port.lng - dlng)
+        lat1, lng1 = self._cell(port.lat + dlat, port.lng + dlng)
+        for i in range(lat0, lat1 + 1):
+            for j in range(lng0, lng1 + 1):
+                self._cells[(i, j)].append(port)
+
+    def resolve(self, name: Optional[str]) -> Optional[Port]:
+        """항만명/코드/별칭 → Port"""
+        if not name:
+            return None
+        return self._names.get(name.strip().lower())
+
+    def nearest(self, lat: float, lng: float) -> Tuple[Optional[Port], float]:
+        """정박지 반경 안의 가장 가까운 항만과 거리 (없으면 (None, inf))"""
+        best, best_nm = None, math.inf
+        for port in self._cells.get(self._cell(lat, lng), ()):
+            distance = haversine_nm(lat, lng, port.lat, port.lng)
+            if distance <= port.anchorage_nm and distance < best_nm:
+                best, best_nm = port, distance
+        return best, best_nm
+
+
+@dataclass(slots=True, frozen=True)
+class AISPosition:
+    """AIS 위치 보고 1건"""
+    mmsi: str
+    lat: float
+    lng: float
+    at: datetime
+    sog: float = 0.0                 # 대지속력 (knots)
+    cog: Optional[float] = None      # 대지침로 (deg)
+    nav_status: Optional[int] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "at", to_utc(self.at))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AISPosition":
+        at = data.get("at") or data.get("timestamp")
+        nav_status = data.get("nav_status")
+        cog = data.get("cog")
+        return cls(
+            mmsi=str(data["mmsi"]),
+            lat=float(data["lat"]),
+            lng=float(data.get("lng", data.get("lon"))),
+            at=at if isinstance(at, datetime) else datetime.fromisoformat(str(at).replace("Z", "+00:00")),
+            sog=float(data.get("sog") or 0.0),
+            cog=float(cog) if cog not in (None, "") else None,
+            nav_status=int(nav_status) if nav_status not in (None, "") else None,
+        )
+
+
+def iter_positions(path: str) -> Iterator[AISPosition]:
+    """jsonl / csv (gzip 가능) 위치 파일 스트리밍 (잘못된 행은 건너뜀)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    name = path[:-3] if path.endswith(".gz") else path
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(f) if name.endswith(".csv") else (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            try:
+                yield AISPosition.from_dict(row)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Skipping malformed AIS row: {e}")
+
+
+def batched(positions: Iterable[AISPosition], size: int) -> Iterator[List[AISPosition]]:
+    batch = []
+    for position in positions:
+        batch.append(position)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_dt(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return to_utc(value)
+    return to_utc(datetime.fromisoformat(str(value).replace("Z", "+00:00")))
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if not value or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def shipment_from_row(row: Dict[str, Any]) -> ShipmentDTO:
+    """shipments row → ShipmentDTO"""
+    return ShipmentDTO(
+        id=row.get("id"),
+        vessel_name=row.get("vessel_name") or "",
+        mmsi=row.get("mmsi"),
+        imo_number=row.get("imo_number"),
+        voyage_number=row.get("voyage_number"),
+        cargo_qty_mt=row.get("cargo_qty_mt"),
+        loading_port=row.get("loading_port"),
+        discharge_port=row.get("discharge_port"),
+        laycan_start=_parse_date(row.get("laycan_start")),
+        laycan_end=_parse_date(row.get("laycan_end")),
+        eta=_parse_dt(row.get("eta")),
+        etb=_parse_dt(row.get("etb")),
+        current_status=ShipmentStatus(row.get("current_status") or ShipmentStatus.SCHEDULED.value),
+        current_lat=row.get("current_lat"),
+        current_lng=row.get("current_lng"),
+        last_position_at=_parse_dt(row.get("last_position_at")),
+    )
+
+
+@dataclass(slots=True)
+class VesselState:
+    """선박별 최신 상태 + 마지막 저장 스냅샷"""
+    shipment: ShipmentDTO
+    loading_port: Optional[Port] = None
+    discharge_port: Optional[Port] = None
+    port: Optional[Port] = None                 # 현재 정박지/선석 항만
+    speed_ema: Optional[float] = None
+    visited_discharge_berth: bool = False
+    flushed_status: Optional[ShipmentStatus] = None
+    flushed_lat: Optional[float] = None
+    flushed_lng: Optional[float] = None
+    flushed_eta: Optional[datetime] = None
+    flushed_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class IngestStats:
+    received: int = 0
+    applied: int = 0
+    stale: int = 0
+    unknown: int = 0
+    transitions: int = 0
+    unknown_mmsi: Set[str] = field(default_factory=set)
+
+
+class VesselTracker:
+    """
+    메모리 상태 기반 선박 추적기
+
+    사용법:
+        tracker = VesselTracker(repo)
+        tracker.load()
+        for batch in batched(iter_positions("positions.jsonl"), 5000):
+            tracker.ingest(batch)
+            tracker.flush_if_due()
+        tracker.flush()
+    """
+
+    def __init__(
+        self,
+        repo=None,
+        index: Optional[PortGridIndex] = None,
+        route_factor: float = 1.15,
+        min_speed_kn: float = 3.0,
+        stopped_kn: float = 1.0,
+        moving_kn: float = 2.5,
+        speed_alpha: float = 0.2,
+        position_tolerance_nm: float = 1.0,
+        eta_tolerance: timedelta = timedelta(minutes=30),
+        heartbeat: timedelta = timedelta(minutes=30),
+        flush_interval_s: float = 60.0,
+    ):
+        self.repo = repo
+        self.index = index or PortGridIndex()
+        self.route_factor = route_factor
+        self.min_speed_kn = min_speed_kn
+        self.stopped_kn = stopped_kn
+        self.moving_kn = moving_kn
+        self.speed_alpha = speed_alpha
+        self.position_tolerance_nm = position_tolerance_nm
+        self.eta_tolerance = eta_tolerance
+        self.heartbeat = heartbeat
+        self.flush_interval_s = flush_interval_s
+        self.vessels: Dict[str, VesselState] = {}
+        self.stats = IngestStats()
+        self._last_flush = time.monotonic()
+
+    # =====================================================
+    # State
+    # =====================================================
+
+    def load(self) -> int:
+        """활성 선박을 DB에서 1회 조회하여 상태 초기화"""
+        for row in self.repo.list_active_shipments():
+            if row.get("mmsi"):
+                self.track(shipment_from_row(row))
+        return len(self.vessels)
+
+    def track(self, shipment: ShipmentDTO) -> VesselState:
+        shipment.eta, shipment.etb = to_utc(shipment.eta), to_utc(shipment.etb)
+        shipment.last_position_at = to_utc(shipment.last_position_at)
+        state = VesselState(
+            shipment=shipment,
+            loading_port=self.index.resolve(shipment.loading_port),
+            discharge_port=self.index.resolve(shipment.discharge_port),
+            flushed_status=shipment.current_status,
+            flushed_lat=shipment.current_lat,
+            flushed_lng=shipment.current_lng,
+            flushed_eta=shipment.eta,
+            flushed_at=shipment.last_position_at,
+        )
+        self.vessels[str(shipment.mmsi)] = state
+        return state
+
+    # =====================================================
+    # Ingest
+    # =====================================================
+
+    @traced("ais", "ingest")
+    def ingest(self, positions: Iterable[AISPosition]) -> int:
+        """위치 배치 반영 (오래된 보고/미등록 MMSI는 무시), 반영 건수 반환"""
+        stats = self.stats
+        applied = 0
+        for position in positions:
+            stats.received += 1
+            state = self.vessels.get(position.mmsi)
+            if state is None:
+                stats.unknown += 1
+                stats.unknown_mmsi.add(position.mmsi)
+                continue
+            last = state.shipment.last_position_at
+            if last is not None and position.at <= last:
+                stats.stale += 1
+                continue
+            self._apply(state, position)
+            applied += 1
+        stats.applied += applied
+        return applied
+
+    def _apply(self, state: VesselState, position: AISPosition):
+        shipment = state.shipment
+        shipment.current_lat = position.lat
+        shipment.current_lng = position.lng
+        shipment.last_position_at = position.at
+        if state.speed_ema is None:
+            state.speed_ema = position.sog
+        else:
+            state.speed_ema += self.speed_alpha * (position.sog - state.speed_ema)
+
+        port, distance = self.index.nearest(position.lat, position.lng)
+        status = self._next_status(state, position, port, distance)
+        if status != shipment.current_status:
+            self.stats.transitions += 1
+            shipment.current_status = status
+        state.port = port if status in (ShipmentStatus.WAITING, ShipmentStatus.BERTHED, ShipmentStatus.LOADING) else None
+
+        if status == ShipmentStatus.SAILING and state.discharge_port is not None:
+            remaining = haversine_nm(position.lat, position.lng, state.discharge_port.lat, state.discharge_port.lng)
+            speed = max(state.speed_ema, self.min_speed_kn)
+            shipment.eta = position.at + timedelta(hours=remaining * self.route_factor / speed)
+        elif status == ShipmentStatus.WAITING and port is state.discharge_port and port is not None:
+            # 정박지 도착 시각을 실제 도착(ETA 확정)으로 기록
+            if shipment.eta is None or shipment.eta > position.at:
+                shipment.eta = position.at
+
+    def _next_status(self, state: VesselState, position: AISPosition, port: Optional[Port], distance: float) -> ShipmentStatus:
+        current = state.shipment.current_status
+        if current == ShipmentStatus.COMPLETED:
+            return current
+
+        stopped = position.sog < self.stopped_kn or position.nav_status in (NAV_AT_ANCHOR, NAV_MOORED)
+        moving = position.sog >= self.moving_kn and position.nav_status not in (NAV_AT_ANCHOR, NAV_MOORED)
+        at_discharge = port is not None and port is state.discharge_port
+
+        if port is not None and stopped:
+            if distance <= port.berth_nm or position.nav_status == NAV_MOORED:
+                if port is state.loading_port and port is not state.discharge_port:
+                    return ShipmentStatus.LOADING
+                if at_discharge:
+                    state.visited_discharge_berth = True
+                return ShipmentStatus.BERTHED
+            return ShipmentStatus.WAITING
+
+        # 양하 선석에서 출항 → 항차 종료
+        if state.visited_discharge_berth and (port is None or moving) and current == ShipmentStatus.BERTHED:
+            return ShipmentStatus.COMPLETED
+
+        if moving or port is None:
+            return ShipmentStatus.SAILING
+        # 정박지 안에서 저속 이동 (히스테리시스: 상태 유지)
+        return current if current != ShipmentStatus.SCHEDULED else ShipmentStatus.SAILING
+
+    # =====================================================
+    # Flush
+    # =====================================================
+
+    def _is_dirty(self, state: VesselState) -> bool:
+        shipment = state.shipment
+        if shipment.last_position_at is None:
+            return False
+        if shipment.current_status != state.flushed_status:
+            return True
+        if state.flushed_lat is None or state.flushed_at is None:
+            return True
+        if shipment.last_position_at - state.flushed_at >= self.heartbeat:
+            return True
+        if haversine_nm(shipment.current_lat, shipment.current_lng, state.flushed_lat, state.flushed_lng) >= self.position_tolerance_nm:
+            return True
+        if (shipment.eta is None) != (state.flushed_eta is None):
+            return True
+        return shipment.eta is not None and abs(shipment.eta - state.flushed_eta) >= self.eta_tolerance
+
+    def dirty(self) -> List[VesselState]:
+        return [state for state in self.vessels.values() if self._is_dirty(state)]
+
+    @traced("ais", "flush")
+    def flush(self) -> int:
+        """변경된 선박만 bulk upsert, 저장 건수 반환"""
+        self._last_flush = time.monotonic()
+        states = self.dirty()
+        if not states:
+            return 0
+        self.repo.bulk_upsert_shipments([state.shipment for state in states])
+        for state in states:
+            shipment = state.shipment
+            state.flushed_status = shipment.current_status
+            state.flushed_lat, state.flushed_lng = shipment.current_lat, shipment.current_lng
+            state.flushed_eta = shipment.eta
+            state.flushed_at = shipment.last_position_at
+        # 완료된 항차는 추적 종료
+        for mmsi in [m for m, s in self.vessels.items() if s.shipment.current_status == ShipmentStatus.COMPLETED]:
+            del self.vessels[mmsi]
+        return len(states)
+
+    def flush_if_due(self) -> int:
+        if time.monotonic() - self._last_flush >= self.flush_interval_s:
+            return self.flush()
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest AIS positions and update shipments")
+    parser.add_argument("path", help="Positions file (.jsonl / .csv, optionally .gz)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--flush-interval", type=float, default=60.0, help="Seconds between DB flushes")
+    args = parser.parse_args()
+
+    try:
+        from repository import create_repository
+    except ImportError:
+        from crawlers.repository import create_repository
+
+    logging.basicConfig(level=logging.INFO)
+    repo = create_repository()
+    if repo is None:
+        raise SystemExit("SUPABASE_URL / SUPABASE_KEY (or REPOSITORY_BACKEND=memory) required")
+
+    tracker = VesselTracker(repo, flush_interval_s=args.flush_interval)
+    logger.info(f"Tracking {tracker.load()} active shipments")
+    written = 0
+    for batch in batched(iter_positions(args.path), args.batch_size):
+        tracker.ingest(batch)
+        written += tracker.flush_if_due()
+    written += tracker.flush()
+
+    stats = tracker.stats
+    logger.info(
+        f"Positions: {stats.received} received, {stats.applied} applied, {stats.stale} stale, "
+        f"{stats.unknown} unknown MMSI ({len(stats.unknown_mmsi)} vessels); "
+        f"{stats.transitions} status transitions, {written} shipment writes"
+    )
+
+
+if __name__ == "__main__":
+    main()
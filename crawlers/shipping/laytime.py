@@ -0,0 +1,423 @@
+"""
+Laytime / 체선료(Demurrage) / 조출료(Despatch) 계산 엔진
+Statement of Facts(SOF) 이벤트를 시간순 스트림으로 한 번 훑으며(sweep) 구간을 분류
+
+    pre_laytime       NOR 이전 / turn time 중
+    laytime           허용 정박시간 소진
+    excluded:<사유>   기상(WWD), 작업 중단, 일요일/공휴일(SHEX) 등 제외 구간
+    demurrage         허용시간 초과 (once on demurrage, always on demurrage)
+
+- 복잡도: O(이벤트 수 + 달력 경계 수) (달력 경계는 SHEX류 조건에서 주말/공휴일 시작·종료 시각)
+- 입력 이벤트는 시간순이어야 함 (역순이면 ValueError)
+- 계산 근거(약관, SOF, 구간)는 calculation_log에 저장 → recalculate_all로 선단 전체 재계산
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+try:
+    from dto import DemurrageCalcDTO
+    from tracing import traced
+except ImportError:
+    from crawlers.dto import DemurrageCalcDTO
+    from crawlers.tracing import traced
+
+HOUR = timedelta(hours=1)
+
+# 약관별 주말 제외 구간 ((요일, 시), (요일, 시)), 월=0 … 일=6
+CALENDARS: Dict[str, Optional[Tuple[Tuple[int, int], Tuple[int, int]]]] = {
+    "SHINC": None,                      # Sundays & Holidays Included
+    "SHEX": ((6, 0), (0, 0)),           # Sundays & Holidays Excluded
+    "SSHEX": ((5, 0), (0, 0)),          # Saturdays, Sundays & Holidays Excluded
+    "SATPMSHEX": ((5, 12), (0, 8)),     # 토요일 12시 ~ 월요일 08시 제외
+}
+
+_MINUTES_PER_WEEK = 7 * 24 * 60
+
+
+class SOFEventType(str, Enum):
+    """SOF 이벤트 유형"""
+    ARRIVED = "ARRIVED"
+    NOR_TENDERED = "NOR_TENDERED"
+    BERTHED = "BERTHED"
+    COMMENCED = "COMMENCED"             # 선적/하역 개시
+    COMPLETED = "COMPLETED"             # 선적/하역 완료
+    WEATHER_STOP = "WEATHER_STOP"
+    WEATHER_RESUME = "WEATHER_RESUME"
+    STOP = "STOP"                       # 기타 제외 사유 (reason으로 구분: shifting, breakdown …)
+    RESUME = "RESUME"
+
+
+@dataclass(slots=True, frozen=True)
+class SOFEvent:
+    """SOF 이벤트 1건"""
+    at: datetime
+    type: SOFEventType
+    reason: Optional[str] = None
+    remarks: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"at": self.at.isoformat(), "type": self.type.value, "reason": self.reason, "remarks": self.remarks}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SOFEvent":
+        return cls(
+            at=datetime.fromisoformat(data["at"]),
+            type=SOFEventType(data["type"]),
+            reason=data.get("reason"),
+            remarks=data.get("remarks"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class LaytimeTerms:
+    """
+    용선계약 정박 조건
+    허용 정박시간은 laytime_hrs 또는 cargo_qty_mt / rate_mt_per_day
+    """
+    dem_rate_daily_usd: float
+    laytime_hrs: Optional[float] = None
+    cargo_qty_mt: Optional[float] = None
+    rate_mt_per_day: Optional[float] = None
+    despatch_rate_daily_usd: Optional[float] = None     # 미지정 시 체선료의 1/2 (DHD)
+    turn_time_hrs: float = 12.0
+    calendar: str = "SHINC"
+    unless_used: bool = False                           # SHEXUU: 작업했으면 제외 구간도 산입
+    holidays: FrozenSet[date] = frozenset()
+    weather_working_days: bool = True                   # WWD: 기상 중단 제외
+    once_on_demurrage: bool = True
+    despatch_on_all_time_saved: bool = False            # False = working time saved
+
+    def __post_init__(self):
+        if self.calendar not in CALENDARS:
+            raise ValueError(f"Unknown laytime calendar: {self.calendar}")
+        if self.allowed_hrs is None:
+            raise ValueError("LaytimeTerms requires laytime_hrs or cargo_qty_mt with rate_mt_per_day")
+
+    @property
+    def allowed_hrs(self) -> Optional[float]:
+        if self.laytime_hrs is not None:
+            return float(self.laytime_hrs)
+        if self.cargo_qty_mt and self.rate_mt_per_day:
+            return self.cargo_qty_mt / self.rate_mt_per_day * 24.0
+        return None
+
+    @property
+    def despatch_rate(self) -> float:
+        if self.despatch_rate_daily_usd is not None:
+            return self.despatch_rate_daily_usd
+        return self.dem_rate_daily_usd / 2
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dem_rate_daily_usd": self.dem_rate_daily_usd,
+            "laytime_hrs": self.laytime_hrs,
+            "cargo_qty_mt": self.cargo_qty_mt,
+            "rate_mt_per_day": self.rate_mt_per_day,
+            "despatch_rate_daily_usd": self.despatch_rate_daily_usd,
+            "turn_time_hrs": self.turn_time_hrs,
+            "calendar": self.calendar,
+            "unless_used": self.unless_used,
+            "holidays": sorted(d.isoformat() for d in self.holidays),
+            "weather_working_days": self.weather_working_days,
+            "once_on_demurrage": self.once_on_demurrage,
+            "despatch_on_all_time_saved": self.despatch_on_all_time_saved,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LaytimeTerms":
+        data = dict(data)
+        data["holidays"] = frozenset(date.fromisoformat(d) for d in data.get("holidays", []))
+        return cls(**data)
+
+
+@dataclass(slots=True)
+class LaytimeResult:
+    """계산 결과 (시간 단위: hours)"""
+    allowed_hrs: float
+    used_hrs: float = 0.0
+    demurrage_hrs: float = 0.0
+    despatch_hrs: float = 0.0
+    excluded_hrs: Dict[str, float] = field(default_factory=dict)
+    laytime_start: Optional[datetime] = None
+    laytime_expired_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    demurrage_usd: float = 0.0
+    despatch_usd: float = 0.0
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def weather_delay_hrs(self) -> float:
+        return self.excluded_hrs.get("weather", 0.0)
+
+    @property
+    def is_final(self) -> bool:
+        return self.completed_at is not None
+
+    def to_dto(
+        self,
+        shipment_id: str,
+        terms: LaytimeTerms,
+        events: Iterable[SOFEvent] = (),
+        calc_id: Optional[str] = None,
+        sof_file_url: Optional[str] = None,
+    ) -> DemurrageCalcDTO:
+        """DemurrageCalcDTO 변환 (calculation_log에 재계산 입력 포함)"""
+        return DemurrageCalcDTO(
+            id=calc_id,
+            shipment_id=shipment_id,
+            contract_laytime_hrs=round(self.allowed_hrs, 2),
+            actual_laytime_hrs=round(self.used_hrs + self.demurrage_hrs, 2),
+            weather_delay_hrs=round(self.weather_delay_hrs, 2),
+            dem_rate_daily_usd=terms.dem_rate_daily_usd,
+            total_demurrage_usd=round(self.demurrage_usd, 2),
+            total_despatch_usd=round(self.despatch_usd, 2),
+            calculation_log={
+                "terms": terms.to_dict(),
+                "sof": [e.to_dict() for e in events],
+                "final": self.is_final,
+                "laytime_start": self.laytime_start.isoformat() if self.laytime_start else None,
+                "laytime_expired_at": self.laytime_expired_at.isoformat() if self.laytime_expired_at else None,
+                "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+                "used_hrs": round(self.used_hrs, 4),
+                "demurrage_hrs": round(self.demurrage_hrs, 4),
+                "despatch_hrs": round(self.despatch_hrs, 4),
+                "excluded_hrs": {k: round(v, 4) for k, v in self.excluded_hrs.items()},
+                "segments": self.segments,
+            },
+            sof_file_url=sof_file_url,
+        )
+
+
+class LaytimeCalculator:
+    """
+    SOF 스트림 기반 Laytime 계산기
+
+    사용법:
+        terms = LaytimeTerms(dem_rate_daily_usd=25000, cargo_qty_mt=80000, rate_mt_per_day=20000, calendar="SHEX")
+        result = LaytimeCalculator(terms).calculate(events)
+    """
+
+    def __init__(self, terms: LaytimeTerms):
+        self.terms = terms
+        weekend = CALENDARS[terms.calendar]
+        self._weekend = None if weekend is None else tuple(d * 24 * 60 + h * 60 for d, h in weekend)
+        self._holidays = terms.holidays if weekend is not None else frozenset()
+
+    # =====================================================
+    # Calendar
+    # =====================================================
+
+    def _calendar_excluded(self, t: datetime) -> bool:
+        if t.date() in self._holidays:
+            return True
+        if self._weekend is None:
+            return False
+        minute = t.weekday() * 24 * 60 + t.hour * 60 + t.minute
+        start, end = self._weekend
+        if start < end:
+            return start <= minute < end
+        return minute >= start or minute < end
+
+    def _next_calendar_boundary(self, t: datetime) -> Optional[datetime]:
+        """t 이후 제외 여부가 바뀔 수 있는 가장 가까운 시각"""
+        if self._weekend is None:
+            return None
+        candidates = []
+        if self._holidays:
+            candidates.append(datetime.combine(t.date() + timedelta(days=1), datetime.min.time(), t.tzinfo))
+        week_start = datetime.combine(t.date() - timedelta(days=t.weekday()), datetime.min.time(), t.tzinfo)
+        for minute in self._weekend:
+            boundary = week_start + timedelta(minutes=minute)
+            if boundary <= t:
+                boundary += timedelta(minutes=_MINUTES_PER_WEEK)
+            candidates.append(boundary)
+        return min(candidates)
+
+    # =====================================================
+    # Sweep
+    # =====================================================
+
+    def calculate(self, events: Iterable[SOFEvent], as_of: Optional[datetime] = None) -> LaytimeResult:
+        """
+        SOF 이벤트를 1회 순회하여 계산
+        COMPLETED가 없으면 as_of(또는 마지막 이벤트)까지의 잠정 결과
+        """
+        sweep = _Sweep(self)
+        for event in events:
+            sweep.feed(event)
+            if sweep.result.completed_at is not None:
+                break
+        if sweep.result.completed_at is None and as_of is not None:
+            sweep.advance(as_of)
+        return sweep.finish()
+
+    def _time_saved_hrs(self, start: datetime, remaining_hrs: float) -> float:
+        """all time saved: 잔여 laytime이 달력상 소진되기까지의 경과 시간"""
+        t, remaining = start, timedelta(hours=remaining_hrs)
+        while remaining > timedelta(0):
+            boundary = self._next_calendar_boundary(t)
+            if self._calendar_excluded(t):
+                t = boundary
+                continue
+            step = remaining if boundary is None else min(remaining, boundary - t)
+            t += step
+            remaining -= step
+        return (t - start) / HOUR
+
+
+class _Sweep:
+    """calculate() 1회 분 상태"""
+
+    __slots__ = ("calc", "terms", "result", "clock", "nor_at", "operating", "active", "on_demurrage")
+
+    def __init__(self, calc: LaytimeCalculator):
+        self.calc = calc
+        self.terms = calc.terms
+        self.result = LaytimeResult(allowed_hrs=calc.terms.allowed_hrs)
+        self.clock: Optional[datetime] = None
+        self.nor_at: Optional[datetime] = None
+        self.operating = False
+        self.active: Set[str] = set()
+        self.on_demurrage = calc.terms.allowed_hrs <= 0
+
+    def feed(self, event: SOFEvent):
+        if self.clock is not None and event.at < self.clock:
+            raise ValueError(f"SOF events must be time-ordered: {event.type.value} at {event.at.isoformat()}")
+        if self.clock is None:
+            self.clock = event.at
+        self.advance(event.at)
+
+        result = self.result
+        kind = event.type
+        if kind == SOFEventType.NOR_TENDERED and self.nor_at is None:
+            self.nor_at = event.at
+            if result.laytime_start is None:
+                result.laytime_start = event.at + timedelta(hours=self.terms.turn_time_hrs)
+        elif kind == SOFEventType.COMMENCED:
+            self.operating = True
+            # turn time 중 작업 개시 → 사용 시간부터 산입
+            if result.laytime_start is None or result.laytime_start > event.at:
+                result.laytime_start = event.at
+        elif kind == SOFEventType.COMPLETED:
+            self.operating = False
+            result.completed_at = event.at
+        elif kind == SOFEventType.WEATHER_STOP:
+            self.active.add("weather")
+        elif kind == SOFEventType.WEATHER_RESUME:
+            self.active.discard("weather")
+        elif kind == SOFEventType.STOP:
+            self.active.add(event.reason or "stoppage")
+        elif kind == SOFEventType.RESUME:
+            self.active.discard(event.reason or "stoppage")
+
+    def _classify(self, t: datetime) -> str:
+        if self.on_demurrage and self.terms.once_on_demurrage:
+            return "demurrage"
+        for reason in sorted(self.active):
+            if reason != "weather" or self.terms.weather_working_days:
+                return f"excluded:{reason}"
+        if self.calc._calendar_excluded(t) and not (self.terms.unless_used and self.operating):
+            return "excluded:holiday" if t.date() in self.calc._holidays else "excluded:weekend"
+        return "demurrage" if self.on_demurrage else "laytime"
+
+    def advance(self, until: datetime):
+        """clock → until 구간을 현재 상태로 분류하여 누적"""
+        result = self.result
+        while self.clock < until:
+            t = self.clock
+            start = result.laytime_start
+            if start is None or t < start:
+                seg_end = until if start is None else min(until, start)
+                self._log("pre_laytime", t, seg_end)
+                self.clock = seg_end
+                continue
+
+            boundary = self.calc._next_calendar_boundary(t)
+            seg_end = until if boundary is None else min(until, boundary)
+            kind = self._classify(t)
+
+            if kind == "laytime":
+                remaining = timedelta(hours=result.allowed_hrs - result.used_hrs)
+                if remaining <= seg_end - t:
+                    seg_end = t + remaining
+                    result.laytime_expired_at = seg_end
+                    self.on_demurrage = True
+                result.used_hrs += (seg_end - t) / HOUR
+            elif kind == "demurrage":
+                result.demurrage_hrs += (seg_end - t) / HOUR
+            else:
+                reason = kind.split(":", 1)[1]
+                result.excluded_hrs[reason] = result.excluded_hrs.get(reason, 0.0) + (seg_end - t) / HOUR
+
+            self._log(kind, t, seg_end)
+            self.clock = seg_end
+
+    def _log(self, kind: str, start: datetime, end: datetime):
+        if end <= start:
+            return
+        segments = self.result.segments
+        if segments and segments[-1]["class"] == kind and segments[-1]["to"] == start.isoformat():
+            segments[-1]["to"] = end.isoformat()
+            segments[-1]["hours"] = round(segments[-1]["hours"] + (end - start) / HOUR, 4)
+        else:
+            segments.append({"class": kind, "from": start.isoformat(), "to": end.isoformat(), "hours": round((end - start) / HOUR, 4)})
+
+    def finish(self) -> LaytimeResult:
+        result = self.result
+        terms = self.terms
+        result.demurrage_usd = result.demurrage_hrs / 24.0 * terms.dem_rate_daily_usd
+
+        remaining = result.allowed_hrs - result.used_hrs
+        if result.completed_at is not None and not self.on_demurrage and remaining > 0:
+            if terms.despatch_on_all_time_saved:
+                result.despatch_hrs = self.calc._time_saved_hrs(result.completed_at, remaining)
+            else:
+                result.despatch_hrs = remaining
+            result.despatch_usd = result.despatch_hrs / 24.0 * terms.despatch_rate
+        return result
+
+
+@traced("laytime", "recalculate_fleet")
+def recalculate_fleet(
+    repo,
+    jobs: Iterable[Tuple[str, LaytimeTerms, List[SOFEvent]]],
+    as_of: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    (shipment_id, 약관, SOF) 목록을 계산하여 일괄 upsert
+    기존 계산이 있는 선박은 같은 row를 갱신 (조회 1회 + bulk upsert)
+    """
+    jobs = list(jobs)
+    existing = {
+        row["shipment_id"]: row["id"]
+        for row in repo.list_demurrage_calcs([shipment_id for shipment_id, _, _ in jobs])
+    }
+    calcs = []
+    for shipment_id, terms, events in jobs:
+        events = list(events)
+        result = LaytimeCalculator(terms).calculate(events, as_of=as_of)
+        calcs.append(result.to_dto(shipment_id, terms, events, calc_id=existing.get(shipment_id)))
+    return repo.bulk_upsert_demurrage_calcs(calcs)
+
+
+@traced("laytime", "recalculate_all")
+def recalculate_all(repo, as_of: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    저장된 calculation_log(약관 + SOF)로 모든 선박의 체선료 재계산
+    (약관 변경 없이 엔진 로직/공휴일 갱신 반영용)
+    """
+    calcs = []
+    for row in repo.list_demurrage_calcs():
+        log = row.get("calculation_log") or {}
+        if "terms" not in log:
+            continue
+        terms = LaytimeTerms.from_dict(log["terms"])
+        events = [SOFEvent.from_dict(e) for e in log.get("sof", [])]
+        calcs.append(
+            LaytimeCalculator(terms).calculate(events, as_of=as_of).to_dto(
+                row["shipment_id"], terms, events, calc_id=row["id"], sof_file_url=row.get("sof_file_url")
+            )
+        )
+    return repo.bulk_upsert_demurrage_calcs(calcs)
@@ -0,0 +1,126 @@
+"""
+대시보드 KPI 집계
+tender_summary (supabase/migrations/004_dashboard_summary.sql) 집계 행을 대시보드 지표로 합산
+
+집계 행: (source, status, dminstt_nm, close_date) → tender_count, budget_sum
+    - 전체 tenders 대신 집계 행 수에 비례하는 비용으로 상태/출처/기관/마감 구간별 건수 계산
+    - 마감 구간(오늘/7일/30일)은 조회 시점 기준으로 close_date에서 계산 (뷰에는 날짜만 저장)
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# close_date 기준 시간대 (SQL: bid_clse_dt AT TIME ZONE 'Asia/Seoul')
+SUMMARY_TZ = timezone(timedelta(hours=9))
+
+SUMMARY_KEY_COLUMNS = ("source", "status", "dminstt_nm", "close_date")
+
+# 마감 구간 (표시 순서)
+DEADLINE_BUCKETS = ("closed", "today", "week", "month", "later", "none")
+
+
+def close_date(value: Any) -> Optional[date]:
+    """bid_clse_dt → 마감일 (KST). timezone 없는 값은 KST로 간주"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(SUMMARY_TZ)
+        return value.date()
+    return value
+
+
+def deadline_bucket(close: Optional[date], today: date) -> str:
+    if close is None:
+        return "none"
+    days = (close - today).days
+    if days < 0:
+        return "closed"
+    if days == 0:
+        return "today"
+    if days <= 7:
+        return "week"
+    if days <= 30:
+        return "month"
+    return "later"
+
+
+def summary_key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    """tenders 행 → 집계 키 (+ 예산, 값이 바뀌면 집계 재계산 필요)"""
+    return (row.get("source"), row.get("status"), row.get("dminstt_nm"), close_date(row.get("bid_clse_dt")), row.get("asign_bdgt_amt"))
+
+
+def aggregate_tenders(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """tenders 행 → tender_summary 집계 행 (materialized view와 동일한 결과)"""
+    groups: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for row in rows:
+        close = close_date(row.get("bid_clse_dt"))
+        key = (row.get("source"), row.get("status"), row.get("dminstt_nm"), close)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "source": key[0], "status": key[1], "dminstt_nm": key[2],
+                "close_date": close.isoformat() if close else None,
+                "tender_count": 0, "budget_sum": None,
+            }
+        group["tender_count"] += 1
+        budget = row.get("asign_bdgt_amt")
+        if budget is not None:
+            group["budget_sum"] = (group["budget_sum"] or 0) + float(budget)
+    return list(groups.values())
+
+
+@dataclass(slots=True)
+class DashboardSummary:
+    """대시보드 KPI (집계 행 합산 결과)"""
+    total: int = 0
+    active: int = 0                                 # OPEN + 마감 전
+    by_status: Dict[str, int] = field(default_factory=dict)
+    by_source: Dict[str, int] = field(default_factory=dict)
+    by_deadline: Dict[str, int] = field(default_factory=dict)
+    top_organizations: List[Dict[str, Any]] = field(default_factory=list)
+    open_budget: float = 0.0                        # active 공고 배정예산 합계
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], today: Optional[date] = None, top_n: int = 10) -> "DashboardSummary":
+        today = today or datetime.now(SUMMARY_TZ).date()
+        status: Counter = Counter()
+        source: Counter = Counter()
+        deadline: Counter = Counter({bucket: 0 for bucket in DEADLINE_BUCKETS})
+        organizations: Counter = Counter()
+        summary = cls()
+
+        for row in rows:
+            count = int(row.get("tender_count") or 0)
+            bucket = deadline_bucket(close_date(row.get("close_date")), today)
+            summary.total += count
+            status[row.get("status") or "UNKNOWN"] += count
+            source[row.get("source") or "UNKNOWN"] += count
+            deadline[bucket] += count
+            if row.get("dminstt_nm"):
+                organizations[row["dminstt_nm"]] += count
+            if row.get("status") == "OPEN" and bucket != "closed":
+                summary.active += count
+                summary.open_budget += float(row.get("budget_sum") or 0)
+
+        summary.by_status = dict(status)
+        summary.by_source = dict(source)
+        summary.by_deadline = {bucket: deadline[bucket] for bucket in DEADLINE_BUCKETS}
+        summary.top_organizations = [
+            {"dminstt_nm": name, "tender_count": count} for name, count in organizations.most_common(top_n)
+        ]
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "active": self.active,
+            "by_status": self.by_status,
+            "by_source": self.by_source,
+            "by_deadline": self.by_deadline,
+            "top_organizations": self.top_organizations,
+            "open_budget": round(self.open_budget, 2),
+        }
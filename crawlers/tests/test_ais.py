@@ -0,0 +1,152 @@
+"""
+AIS 위치 수신 / 선박 상태 추적 테스트 (네트워크 불필요)
+격자 인덱스, 상태 전이, ETA 및 변경분 일괄 저장 검증
+"""
+import os
+import sys
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import ShipmentDTO, ShipmentStatus
+from memory_repository import InMemoryRepository
+from shipping import AISPosition, PortGridIndex, VesselTracker, iter_positions
+from shipping.ais import haversine_nm
+
+T0 = datetime(2024, 12, 20, 0, 0, tzinfo=timezone.utc)
+
+
+def _pos(minutes, lat, lng, sog, nav_status=None, mmsi="440000001"):
+    return AISPosition(mmsi=mmsi, lat=lat, lng=lng, at=T0 + timedelta(minutes=minutes), sog=sog, nav_status=nav_status)
+
+
+class TestPortGridIndex(unittest.TestCase):
+
+    def test_nearest_within_anchorage(self):
+        index = PortGridIndex()
+        port, distance = index.nearest(37.00, 126.45)
+        self.assertEqual(port.name, "Dangjin")
+        self.assertLess(distance, 5)
+        self.assertEqual(index.nearest(33.0, 124.0), (None, float("inf")))
+
+    def test_resolve_aliases(self):
+        index = PortGridIndex()
+        self.assertEqual(index.resolve("당진화력").code, "KRDJN")
+        self.assertEqual(index.resolve(" newcastle ").code, "AUNTL")
+        self.assertIsNone(index.resolve("Atlantis"))
+
+
+class TestVesselTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.shipment_id = self.repo.upsert_shipment(ShipmentDTO(
+            vessel_name="MV CARBON STAR",
+            mmsi="440000001",
+            loading_port="Newcastle",
+            discharge_port="당진",
+            current_status=ShipmentStatus.SAILING,
+        ))["id"]
+        self.repo.upsert_shipment(ShipmentDTO(vessel_name="MV DONE", mmsi="440000009", current_status=ShipmentStatus.COMPLETED))
+        self.tracker = VesselTracker(self.repo)
+        self.assertEqual(self.tracker.load(), 1)
+
+    def test_voyage_transitions_and_eta(self):
+        tracker = self.tracker
+        tracker.ingest([_pos(0, 35.0, 125.5, 12.0)])
+        state = tracker.vessels["440000001"]
+        self.assertEqual(state.shipment.current_status, ShipmentStatus.SAILING)
+        distance = haversine_nm(35.0, 125.5, 37.055, 126.510)
+        expected = T0 + timedelta(hours=distance * 1.15 / 12.0)
+        self.assertAlmostEqual((state.shipment.eta - expected).total_seconds(), 0, delta=1)
+
+        tracker.ingest([_pos(600, 37.00, 126.40, 0.3, nav_status=1)])
+        self.assertEqual(state.shipment.current_status, ShipmentStatus.WAITING)
+        self.assertEqual(state.shipment.eta, T0 + timedelta(minutes=600))
+
+        # 정박지 내 저속 이동은 상태 유지
+        tracker.ingest([_pos(660, 37.01, 126.42, 1.8)])
+        self.assertEqual(state.shipment.current_status, ShipmentStatus.WAITING)
+
+        tracker.ingest([_pos(1200, 37.056, 126.511, 0.0, nav_status=5)])
+        self.assertEqual(state.shipment.current_status, ShipmentStatus.BERTHED)
+
+        tracker.ingest([_pos(3000, 37.0, 126.40, 9.0)])
+        self.assertEqual(state.shipment.current_status, ShipmentStatus.COMPLETED)
+        self.assertEqual(tracker.stats.transitions, 3)
+
+        tracker.flush()
+        self.assertEqual(self.repo.get_shipment_by_id(self.shipment_id)["current_status"], "COMPLETED")
+        self.assertNotIn("440000001", tracker.vessels)
+
+    def test_stale_and_unknown_positions(self):
+        tracker = self.tracker
+        tracker.ingest([_pos(10, 35.0, 125.5, 12.0), _pos(5, 35.1, 125.5, 12.0), _pos(20, 0, 0, 1, mmsi="999")])
+        self.assertEqual(tracker.stats.applied, 1)
+        self.assertEqual(tracker.stats.stale, 1)
+        self.assertEqual(tracker.stats.unknown_mmsi, {"999"})
+
+    def test_flush_writes_only_changed_shipments(self):
+        tracker = self.tracker
+        repo = self.repo
+        other = repo.upsert_shipment(ShipmentDTO(vessel_name="MV SECOND", mmsi="440000002", discharge_port="Taean"))
+        tracker.load()
+
+        # 고빈도 보고 다수 → 저장은 배치 1회
+        batch = [_pos(i, 30.0 + i * 0.001, 125.0, 12.0) for i in range(1, 500)]
+        batch += [_pos(i, 31.0, 125.0, 12.0, mmsi="440000002") for i in range(1, 3)]
+        tracker.ingest(batch)
+        repo.reset_counters()
+        self.assertEqual(tracker.flush(), 2)
+        self.assertEqual(repo.queries[("shipments", "upsert")], 1)
+        self.assertEqual(repo.get_shipment_by_id(other["id"])["current_lat"], 31.0)
+
+        # 미세 이동 → 저장 생략, 큰 이동 → 해당 선박만 저장
+        tracker.ingest([_pos(20, 31.001, 125.0, 12.0, mmsi="440000002")])
+        self.assertEqual(tracker.flush(), 0)
+        tracker.ingest([_pos(510, 30.9, 125.0, 12.0)])
+        self.assertEqual([s.shipment.id for s in tracker.dirty()], [self.shipment_id])
+
+    def test_mixed_naive_and_aware_timestamps(self):
+        # DB의 naive 시각(UTC) + offset 포함 보고 + naive 보고 혼합 → TypeError 없이 UTC 기준 비교
+        self.repo.upsert_shipment(ShipmentDTO(
+            vessel_name="MV MIXED", mmsi="440000003", current_status=ShipmentStatus.SAILING,
+            last_position_at=datetime(2024, 12, 20, 0, 0),
+        ))
+        tracker = VesselTracker(self.repo)
+        tracker.load()
+        positions = [
+            AISPosition.from_dict({"mmsi": "440000003", "lat": 31.0, "lng": 125.0, "at": "2024-12-20T08:30:00+09:00"}),   # 23:30Z 이전
+            AISPosition.from_dict({"mmsi": "440000003", "lat": 31.1, "lng": 125.0, "at": "2024-12-20T10:00:00+09:00"}),   # 01:00Z
+            AISPosition(mmsi="440000003", lat=31.2, lng=125.0, at=datetime(2024, 12, 20, 0, 30)),                       # naive, 이전
+            AISPosition.from_dict({"mmsi": "440000003", "lat": 31.3, "lng": 125.0, "at": "2024-12-20T02:00:00Z"}),
+        ]
+        self.assertEqual(tracker.ingest(positions), 2)
+        shipment = tracker.vessels["440000003"].shipment
+        self.assertEqual(shipment.last_position_at, datetime(2024, 12, 20, 2, 0, tzinfo=timezone.utc))
+        self.assertEqual(shipment.current_lat, 31.3)
+        self.assertEqual(tracker.stats.stale, 2)
+
+    def test_iter_positions_jsonl_and_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl = os.path.join(tmp, "p.jsonl")
+            with open(jsonl, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"mmsi": 440000001, "lat": 35.0, "lon": 125.5, "sog": 11, "at": "2024-12-20T00:00:00"}) + "\n")
+                f.write("{\"mmsi\": \"bad\"}\n")
+            csv_path = os.path.join(tmp, "p.csv")
+            with open(csv_path, "w", encoding="utf-8") as f:
+                f.write("mmsi,lat,lng,sog,cog,at,nav_status\n440000001,35.0,125.5,11,,2024-12-20T00:00:00,\n")
+
+            for path in (jsonl, csv_path):
+                positions = list(iter_positions(path))
+                self.assertEqual(len(positions), 1)
+                self.assertEqual(positions[0].mmsi, "440000001")
+                self.assertEqual(positions[0].lng, 125.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+backfill 구간 분할 테스트 (브라우저 불필요, 일자별 공고 수를 흉내 낸 fetch 사용)
+상한 도달 구간 축소 / 희소 구간 확대, checkpoint 재개, coverage 리포트, 검색 실패 → FAILED, id 검증
+"""
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backfill import FAILED, Backfill, BackfillWindow, checkpoint_path_for, find_gaps, kepco_fetcher
+
+
+class FakeGrid:
+    """일자별 공고 수 → 구간 검색 결과 수 (그리드 상한 cap에서 잘림)"""
+
+    def __init__(self, per_day, cap: int = 50, fail_on=()):
+        self.per_day = per_day
+        self.cap = cap
+        self.fail_on = set(fail_on)
+        self.calls = []
+
+    async def __call__(self, keyword: str, start: date, end: date) -> int:
+        self.calls.append((keyword, start, end))
+        await asyncio.sleep(0)
+        if any(start <= day <= end for day in self.fail_on):
+            raise RuntimeError("grid not loaded")
+        total = sum(self.per_day(start + timedelta(days=i)) for i in range((end - start).days + 1))
+        return min(total, self.cap)
+
+
+def _density(day: date) -> int:
+    # 2024년 3월은 공고 집중 (하루 12건, 3월 15일은 60건), 나머지는 주 1건
+    if day == date(2024, 3, 15):
+        return 60
+    if day.month == 3 and day.year == 2024:
+        return 12
+    return 1 if day.weekday() == 0 else 0
+
+
+class TestBackfill(unittest.TestCase):
+
+    def test_adaptive_windows_cover_range(self):
+        grid = FakeGrid(_density)
+        job = Backfill(grid, ["유연탄"], date(2023, 1, 1), date(2024, 12, 31), initial_days=14, max_days=90, segment_days=365, retry_seconds=0)
+        report = asyncio.run(job.run())
+
+        self.assertEqual(report["status"], "completed")
+        self.assertEqual(report["coverage"], 1.0)
+        coverage = report["keywords"]["유연탄"]
+        self.assertEqual(coverage["gaps"], [])
+        self.assertEqual(coverage["saturated"], ["2024-03-15"])
+
+        # 상한 미만 구간만 기록, 집중 기간은 1~4일, 희소 기간은 최대 90일까지 확대
+        done = [w for w in job.windows if w.status == "done"]
+        self.assertTrue(all(w.count < 50 for w in done))
+        march = [w for w in done if w.start.year == 2024 and w.start.month == 3 and w.end.month == 3]
+        self.assertTrue(march and max(w.days for w in march) <= 4)
+        self.assertEqual(max(w.days for w in done), 90)
+        # 구간은 겹치지 않음
+        ordered = sorted(job.windows, key=lambda w: w.start)
+        self.assertTrue(all(a.end < b.start for a, b in zip(ordered, ordered[1:])))
+        self.assertLess(len(grid.calls), 100)
+
+    def test_checkpoint_resume_retries_only_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bf.json")
+            failing = FakeGrid(lambda day: 1, fail_on=[date(2024, 2, 10)])
+            job = Backfill(failing, ["유연탄", "석탄"], date(2024, 1, 1), date(2024, 3, 31),
+                           backfill_id="bf", segment_days=30, concurrency=3, retries=1, retry_seconds=0, checkpoint_path=path)
+            report = asyncio.run(job.run())
+
+            self.assertEqual(report["status"], "incomplete")
+            gaps = report["keywords"]["유연탄"]["gaps"]
+            self.assertEqual(len(gaps), 1)
+            self.assertTrue(gaps[0]["start"] <= "2024-02-10" <= gaps[0]["end"])
+            self.assertEqual(len(report["keywords"]["석탄"]["failed"]), 1)
+
+            grid = FakeGrid(lambda day: 1)
+            resumed = Backfill.resume(path, grid)
+            report = asyncio.run(resumed.run())
+            self.assertEqual((report["status"], report["coverage"]), ("completed", 1.0))
+            self.assertEqual({kw for kw, _, _ in grid.calls}, {"유연탄", "석탄"})
+            for _, start, end in grid.calls:
+                self.assertTrue(start.isoformat() >= gaps[0]["start"] and end.isoformat() <= gaps[0]["end"])
+            self.assertEqual(report["results"], 91 * 2)
+
+    def test_find_gaps(self):
+        windows = [BackfillWindow("k", date(2024, 1, 5), date(2024, 1, 10)), BackfillWindow("k", date(2024, 1, 15), date(2024, 2, 5))]
+        self.assertEqual(find_gaps(date(2024, 1, 1), date(2024, 1, 31), windows), [
+            (date(2024, 1, 1), date(2024, 1, 4)),
+            (date(2024, 1, 11), date(2024, 1, 14)),
+        ])
+
+    def test_kepco_search_failure_is_failed_window(self):
+        class FailingCrawler:
+            configs = []
+
+            async def search(self, config):
+                self.configs.append(config)
+                raise RuntimeError("Date inputs not found (0)")
+
+        crawler = FailingCrawler()
+        job = Backfill(kepco_fetcher(crawler), ["유연탄"], date(2024, 1, 1), date(2024, 1, 10), initial_days=10, retries=0)
+        asyncio.run(job.run())
+        self.assertTrue(crawler.configs[0].strict)
+        self.assertEqual([w.status for w in job.windows], [FAILED])
+        self.assertEqual(job.status, "incomplete")
+
+    def test_checkpoint_id_validated(self):
+        self.assertTrue(checkpoint_path_for("0af3c2", "ckpt").endswith("0af3c2.json"))
+        for bad in ("../main", "..%2Fx", "/etc/passwd", "ABC", ""):
+            with self.assertRaises(ValueError):
+                checkpoint_path_for(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
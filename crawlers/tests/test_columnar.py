@@ -0,0 +1,109 @@
+"""
+열 지향 내보내기 테스트 (네트워크 불필요, 임시 디렉터리)
+source / month 파티션, 증분 append 후 최신 행 로드, mmap IPC, compact, 저장소 watermark 검증
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyarrow.dataset as ds
+
+from columnar import ColumnarStore, g2b_rows, kepco_rows
+from dto import MarketDataDTO, NetbackSimulationDTO, TenderDTO, TenderSource, TenderSpecDTO
+from memory_repository import InMemoryRepository
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "output", "coal_tenders.json")
+
+
+def _kepco(no: str, title: str, crawled_at: str) -> dict:
+    return {"announcement_no": no, "title": title, "organization": "한국남동발전", "close_date": "2025/02/10 18:00",
+            "detail_url": f"https://srm.kepco.net/notice/{no}", "crawled_at": crawled_at}
+
+
+class TestColumnarStore(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_incremental_append_and_latest_load(self):
+        store = ColumnarStore(self.root, "ipc")
+        with open(DATA_PATH, encoding="utf-8") as f:
+            g2b = g2b_rows(json.load(f))
+        store.append("tenders", g2b, exported_at=datetime(2025, 1, 1))
+        store.append("tenders", kepco_rows([_kepco("K-1", "유연탄 구매", "2025-01-05T09:00:00"),
+                                            _kepco("K-2", "석탄 운송", "2025-02-03T09:00:00")]), exported_at=datetime(2025, 2, 3))
+        store.append("tenders", kepco_rows([_kepco("K-1", "유연탄 구매 (정정)", "2025-01-05T09:00:00")]), exported_at=datetime(2025, 2, 4))
+
+        partitions = sorted(os.path.relpath(os.path.dirname(p), self.root) for p in store.part_files("tenders"))
+        self.assertIn(os.path.join("tenders", "source=KEPCO", "month=2025-01"), partitions)
+        self.assertIn(os.path.join("tenders", "source=KEPCO", "month=2025-02"), partitions)
+
+        self.assertEqual(store.load("tenders", latest=False).num_rows, len(g2b) + 3)
+        self.assertEqual(store.load("tenders").num_rows, len(g2b) + 2)
+
+        kepco = store.load("tenders", columns=["bid_ntce_no", "bid_ntce_nm", "bid_clse_dt"], filter=ds.field("source") == "KEPCO")
+        rows = {row["bid_ntce_no"]: row for row in kepco.to_pylist()}
+        self.assertEqual(kepco.column_names, ["bid_ntce_no", "bid_ntce_nm", "bid_clse_dt"])
+        self.assertEqual(rows["K-1"]["bid_ntce_nm"], "유연탄 구매 (정정)")
+        self.assertEqual(rows["K-2"]["bid_clse_dt"], datetime(2025, 2, 10, 18, 0))
+
+        # 월 파티션 필터
+        january = store.load("tenders", filter=(ds.field("source") == "KEPCO") & (ds.field("month") == "2025-01"))
+        self.assertEqual(january.column("bid_ntce_no").to_pylist(), ["K-1"])
+
+    def test_compact_keeps_latest_row(self):
+        store = ColumnarStore(self.root, "parquet")
+        for title, exported in (("유연탄 구매", datetime(2025, 1, 5)), ("유연탄 구매 (정정)", datetime(2025, 1, 6))):
+            store.append("tenders", kepco_rows([_kepco("K-1", title, "2025-01-05T09:00:00")]), exported_at=exported)
+        self.assertEqual(len(store.part_files("tenders")), 2)
+
+        self.assertEqual(store.compact("tenders"), {os.path.join("tenders", "source=KEPCO", "month=2025-01"): 1})
+        self.assertEqual(len(store.part_files("tenders")), 1)
+        table = store.load("tenders", latest=False)
+        self.assertEqual(table.column("bid_ntce_nm").to_pylist(), ["유연탄 구매 (정정)"])
+        self.assertEqual(table.column("exported_at").to_pylist(), [datetime(2025, 1, 6)])
+
+    def test_export_repository_since_watermark(self):
+        repo = InMemoryRepository()
+        tender = repo.upsert_tender(TenderDTO(bid_ntce_no="K-1", source=TenderSource.KEPCO, bid_ntce_nm="유연탄 구매"))
+        repo.upsert_tender_spec(TenderSpecDTO(tender_id=tender["id"], cv_min_kcal=5800, origin="Indonesia"))
+        repo.bulk_upsert_market_data([MarketDataDTO(data_date=date(2025, 1, 2), index_name="ICI4", price_usd=55.1, source="Argus")])
+        repo.bulk_insert_netback_simulations([NetbackSimulationDTO(tender_id=tender["id"], simulation_date=date(2025, 1, 3),
+                                                                   netback_usd=48.2, assumptions={"freight": 12})])
+        store = ColumnarStore(self.root)
+
+        self.assertEqual(store.export_repository(repo),
+                         {"tenders": 1, "tender_specs": 1, "market_data": 1, "netback_simulations": 1})
+        specs = store.load("tender_specs").to_pylist()
+        self.assertEqual((specs[0]["source"], specs[0]["cv_min_kcal"]), ("KEPCO", 5800))
+        market = store.load("market_data").to_pylist()
+        self.assertEqual((market[0]["source"], market[0]["month"], market[0]["data_date"]), ("Argus", "2025-01", date(2025, 1, 2)))
+        sims = store.load("netback_simulations").to_pylist()
+        self.assertEqual(json.loads(sims[0]["assumptions"]), {"freight": 12})
+
+        # 변경 없음 → 추가 없음 / 갱신된 공고만 추가
+        self.assertEqual(store.export_repository(repo)["tenders"], 0)
+        repo.upsert_tender(TenderDTO(bid_ntce_no="K-1", source=TenderSource.KEPCO, bid_ntce_nm="유연탄 구매 (정정)"))
+        self.assertEqual(store.export_repository(repo),
+                         {"tenders": 1, "tender_specs": 0, "market_data": 0, "netback_simulations": 0})
+        self.assertEqual(store.load("tenders").column("bid_ntce_nm").to_pylist(), ["유연탄 구매 (정정)"])
+
+        # 재파싱으로 갱신된 스펙도 다시 추가
+        repo.upsert_tender_spec(TenderSpecDTO(tender_id=tender["id"], cv_min_kcal=6000, origin="Indonesia"))
+        self.assertEqual(store.export_repository(repo),
+                         {"tenders": 0, "tender_specs": 1, "market_data": 0, "netback_simulations": 0})
+        self.assertEqual(store.load("tender_specs").column("cv_min_kcal").to_pylist(), [6000])
+
+
+if __name__ == "__main__":
+    unittest.main()
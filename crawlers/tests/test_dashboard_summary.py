@@ -0,0 +1,90 @@
+"""
+대시보드 집계 테스트 (네트워크 불필요)
+dirty 표시 기반 갱신, 집계 행 → KPI 합산, 마감 임박 목록 검증
+"""
+import os
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderDTO, TenderSource, TenderStatus
+from memory_repository import InMemoryRepository
+from summary import DashboardSummary, aggregate_tenders, close_date, deadline_bucket
+
+
+def _tender(no: str, **kwargs) -> TenderDTO:
+    fields = dict(bid_ntce_no=no, source=TenderSource.KEPCO, bid_ntce_nm=f"유연탄 구매 {no}", dminstt_nm="한국남동발전")
+    fields.update(kwargs)
+    return TenderDTO(**fields)
+
+
+class TestDashboardSummary(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.closing = datetime.combine(date.today() + timedelta(days=3), datetime.min.time()).replace(hour=12)
+        self.repo.upsert_tender(_tender("A", bid_clse_dt=self.closing, asign_bdgt_amt=100.0))
+        self.repo.upsert_tender(_tender("B", bid_clse_dt=self.closing + timedelta(minutes=1), asign_bdgt_amt=50.0))
+        self.repo.upsert_tender(_tender("C", bid_clse_dt=self.closing - timedelta(days=5), status=TenderStatus.CLOSED))
+        self.repo.upsert_tender(_tender("D", source=TenderSource.G2B, dminstt_nm="한국서부발전", bid_clse_dt=None))
+
+    def test_refresh_only_when_dirty(self):
+        self.assertEqual(self.repo.get_tender_summary(), [])
+        self.assertTrue(self.repo.refresh_tender_summary())
+        self.assertFalse(self.repo.refresh_tender_summary())
+
+        # 같은 값 재수집 → 집계 불변, 갱신 생략
+        self.repo.upsert_tender(_tender("A", bid_clse_dt=self.closing, asign_bdgt_amt=100.0))
+        self.assertFalse(self.repo.refresh_tender_summary())
+
+        self.repo.upsert_tender(_tender("B", bid_clse_dt=None, status=TenderStatus.CANCELLED))
+        self.assertTrue(self.repo.refresh_tender_summary())
+        self.assertTrue(self.repo.refresh_tender_summary(force=True))
+
+        rows = self.repo.get_tender_summary()
+        self.assertEqual(sum(r["tender_count"] for r in rows), 4)
+        self.assertEqual({r["source"] for r in self.repo.get_tender_summary(source="G2B")}, {"G2B"})
+
+    def test_summary_matches_row_scan(self):
+        self.repo.refresh_tender_summary()
+        rows = self.repo.get_tender_summary()
+        # 같은 날 마감 A/B는 한 집계 행
+        self.assertEqual(len(rows), 3)
+
+        summary = DashboardSummary.from_rows(rows).to_dict()
+        self.assertEqual(summary["total"], 4)
+        self.assertEqual(summary["active"], 3)          # A, B (마감 전) + D (마감일 없음)
+        self.assertEqual(summary["by_status"], {"OPEN": 3, "CLOSED": 1})
+        self.assertEqual(summary["by_source"], {"KEPCO": 3, "G2B": 1})
+        self.assertEqual(summary["by_deadline"]["week"], 2)
+        self.assertEqual(summary["by_deadline"]["closed"], 1)
+        self.assertEqual(summary["by_deadline"]["none"], 1)
+        self.assertEqual(summary["top_organizations"][0], {"dminstt_nm": "한국남동발전", "tender_count": 3})
+        self.assertEqual(summary["open_budget"], 150.0)
+
+        # 집계 행 합산 == 전체 행 직접 집계
+        direct = DashboardSummary.from_rows(aggregate_tenders(self.repo.list_tenders()))
+        self.assertEqual(direct.to_dict(), summary)
+
+    def test_upcoming_deadlines(self):
+        rows = self.repo.list_upcoming_deadlines(limit=5, columns="bid_ntce_no,bid_clse_dt")
+        self.assertEqual([r["bid_ntce_no"] for r in rows], ["A", "B"])
+        self.assertEqual(set(rows[0]), {"bid_ntce_no", "bid_clse_dt"})
+        self.assertEqual(self.repo.list_upcoming_deadlines(source="G2B"), [])
+
+    def test_buckets(self):
+        today = date(2025, 3, 10)
+        self.assertEqual(close_date("2025-03-09T20:00:00+00:00"), date(2025, 3, 10))   # KST 기준 날짜
+        self.assertEqual(deadline_bucket(date(2025, 3, 9), today), "closed")
+        self.assertEqual(deadline_bucket(today, today), "today")
+        self.assertEqual(deadline_bucket(date(2025, 3, 17), today), "week")
+        self.assertEqual(deadline_bucket(date(2025, 4, 9), today), "month")
+        self.assertEqual(deadline_bucket(date(2025, 4, 10), today), "later")
+        self.assertEqual(deadline_bucket(None, today), "none")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+신규/변경 공고 delta 테스트 (네트워크 불필요)
+1회 적재 후 listener 증분 판정, 배치별 new / changed 수집, 실패 시 되돌림,
+다른 replica 기록 재확인 / 동시 배치 분리 검증
+"""
+import asyncio
+import os
+import sys
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delta import TenderDeltaIndex
+from dto import TenderDTO, TenderSource, TenderStatus
+from memory_repository import InMemoryRepository
+
+
+def _tender(no: str, title: str = "유연탄 구매", **kwargs) -> TenderDTO:
+    return TenderDTO(bid_ntce_no=no, source=TenderSource.KEPCO, bid_ntce_nm=title, **kwargs)
+
+
+class TestTenderDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        for i in range(3):
+            self.repo.upsert_tender(_tender(f"K-{i}", bid_clse_dt=datetime(2025, 3, 1, 18, 0)))
+        self.delta = TenderDeltaIndex(self.repo)
+
+    def tearDown(self):
+        self.delta.close()
+
+    def test_new_and_changed_only(self):
+        self.repo.reset_counters()
+        with self.delta.batch() as batch:
+            self.repo.upsert_tender(_tender("K-0", bid_clse_dt=datetime(2025, 3, 1, 18, 0)))    # 동일
+            self.repo.upsert_tender(_tender("K-1", bid_clse_dt=datetime(2025, 3, 5, 18, 0)))    # 마감일 변경
+            self.repo.upsert_tender(_tender("K-9", bid_ntce_dtl_url="https://srm.kepco.net/notice/K-9"))
+            self.repo.upsert_tender(_tender("K-9", title="유연탄 구매 (정정)"))                  # 같은 배치 재기록
+
+        # 적재는 projection 조회 1회, 이후 행별 조회 없음
+        self.assertEqual(self.repo.calls["list_tenders"], 1)
+        self.assertEqual(self.repo.queries[("tenders", "select")], 1)
+
+        result = batch.to_dict()
+        self.assertEqual(result["new_tenders_count"], 1)
+        self.assertEqual(result["changed_tenders_count"], 1)
+        self.assertEqual(result["unchanged_count"], 1)
+        new, changed = result["results"]
+        self.assertEqual(new["tender_number"], "K-9")
+        self.assertEqual(new["change"], "new")
+        self.assertEqual(new["title"], "유연탄 구매 (정정)")
+        self.assertTrue({"tender_number", "title", "organization", "deadline", "status", "url"} <= set(new))
+        self.assertEqual((changed["tender_number"], changed["change"]), ("K-1", "changed"))
+
+        # 다음 배치에서는 이미 알려진 공고
+        with self.delta.batch() as batch:
+            self.repo.upsert_tender(_tender("K-9", title="유연탄 구매 (정정)"))
+        self.assertEqual(batch.to_dict()["results"], [])
+
+    def test_failed_batch_is_rolled_back(self):
+        with self.assertRaises(RuntimeError):
+            with self.delta.batch():
+                self.repo.upsert_tender(_tender("K-7"))
+                self.repo.upsert_tender(_tender("K-2", status=TenderStatus.CLOSED))
+                raise RuntimeError("crawl failed")
+
+        # 응답하지 못한 delta는 다음 크롤링에서 다시 감지
+        with self.delta.batch() as batch:
+            self.repo.upsert_tender(_tender("K-7"))
+            self.repo.upsert_tender(_tender("K-2", status=TenderStatus.CLOSED))
+        result = batch.to_dict()
+        self.assertEqual(result["new_tenders_count"], 1)
+        self.assertEqual(result["changed_tenders_count"], 1)
+
+    def test_writes_outside_batch_update_known_keys(self):
+        self.delta.load()
+        self.repo.upsert_tender(_tender("K-5"))
+        self.assertIn(("KEPCO", "K-5", "00"), self.delta)
+        with self.delta.batch() as batch:
+            self.repo.upsert_tender(_tender("K-5"))
+        self.assertEqual(batch.to_dict()["new_tenders_count"], 0)
+
+    def _other_writer(self, *tenders: TenderDTO):
+        # 다른 replica / crawler-worker: 이 프로세스 listener를 거치지 않는 기록
+        self.repo.remove_listener("tenders", self.delta.observe)
+        try:
+            for tender in tenders:
+                self.repo.upsert_tender(tender)
+        finally:
+            self.repo.add_listener("tenders", self.delta.observe)
+
+    def test_rows_written_elsewhere_are_not_new(self):
+        self.delta.load()
+        self._other_writer(_tender("K-8"), _tender("K-0", bid_clse_dt=datetime(2025, 3, 9, 18, 0)))
+
+        with self.delta.batch() as batch:
+            # 배치 진입 시 워터마크 이후 행 동기화 → 이미 알림된 변경
+            self.assertIn(("KEPCO", "K-8", "00"), self.delta)
+            self._other_writer(_tender("K-6"))                  # 동기화 이후 다른 writer가 먼저 기록
+            self.repo.upsert_tender(_tender("K-6"))
+            self.repo.upsert_tender(_tender("K-8"))
+            self.repo.upsert_tender(_tender("K-0", bid_clse_dt=datetime(2025, 3, 9, 18, 0)))
+            self.repo.upsert_tender(_tender("K-4"))
+        result = batch.to_dict()
+        self.assertEqual([item["tender_number"] for item in result["results"]], ["K-4"])
+        self.assertEqual(result["unchanged_count"], 3)
+
+    def test_concurrent_batches_are_isolated(self):
+        self.delta.load()
+
+        async def crawl(no: str, started: asyncio.Event, other: asyncio.Event):
+            with self.delta.batch() as batch:
+                started.set()
+                await other.wait()                              # 두 배치가 동시에 열린 상태에서 기록
+                self.repo.upsert_tender(_tender(no))
+                await asyncio.sleep(0)
+            return batch
+
+        async def main():
+            a, b = asyncio.Event(), asyncio.Event()
+            return await asyncio.gather(crawl("K-10", a, b), crawl("K-11", b, a))
+
+        first, second = asyncio.run(main())
+        self.assertEqual([item["tender_number"] for item in first.new], ["K-10"])
+        self.assertEqual([item["tender_number"] for item in second.new], ["K-11"])
+
+        # 배치 밖 기록은 어느 배치에도 들어가지 않음
+        with self.delta.batch() as batch:
+            pass
+        self.repo.upsert_tender(_tender("K-12"))
+        self.assertEqual(batch.to_dict()["results"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
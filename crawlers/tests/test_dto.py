@@ -0,0 +1,103 @@
+"""
+DTO 테스트 (네트워크 불필요)
+RawPayload 지연 디코드 / 읽기 전용, G2BApiResponse.from_api_item 변환, 불변 TenderResult 검증
+"""
+import os
+import sys
+import json
+import unittest
+from dataclasses import FrozenInstanceError, dataclass
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import G2BApiResponse, RawPayload
+from kepco.crawler import TenderResult
+
+ITEM = {
+    "bidNtceNo": "20250101234",
+    "bidNtceOrd": "000",
+    "bidNtceNm": "유연탄 구매",
+    "asignBdgtAmt": "1500000000",
+    "presmptPrce": "",
+    "bidClseDt": "2025/01/20 18:00",
+    "dminsttNm": "한국남동발전",
+    "bidNtceDtlUrl": "",
+    "spec": {"gar": [5800, 6000]},
+}
+
+
+@dataclass(slots=True)
+class _Record:
+    no: str
+    qty: int
+
+
+class TestRawPayload(unittest.TestCase):
+
+    def test_lazy_decode_and_mapping(self):
+        payload = RawPayload(json.dumps(ITEM, ensure_ascii=False))
+        self.assertIsNone(payload._decoded)
+        self.assertEqual(len(payload.raw), len(json.dumps(ITEM, ensure_ascii=False).encode("utf-8")))
+        self.assertEqual(payload["bidNtceNo"], "20250101234")
+        self.assertIsNotNone(payload._decoded)
+        self.assertEqual(set(payload), set(ITEM))
+        self.assertEqual(len(payload), len(ITEM))
+        self.assertEqual(payload.get("missing", "-"), "-")
+        self.assertEqual(payload, ITEM)
+        self.assertEqual(payload, RawPayload.from_obj(ITEM))
+
+    def test_to_dict_is_independent_copy(self):
+        payload = RawPayload.from_obj(ITEM)
+        payload["bidNtceNo"]                                # 캐시 생성 후에도
+        data = payload.to_dict()
+        data["bidNtceNo"] = "changed"
+        data["spec"]["gar"].append(0)
+        self.assertEqual(payload["bidNtceNo"], "20250101234")
+        self.assertEqual(payload.to_dict()["spec"], {"gar": [5800, 6000]})
+        self.assertIsNot(payload.to_dict(), payload.to_dict())
+
+    def test_from_obj_and_from_record(self):
+        payload = RawPayload.from_obj(ITEM)
+        self.assertIs(RawPayload.from_obj(payload), payload)
+        self.assertEqual(payload.raw, json.dumps(ITEM, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        self.assertEqual(RawPayload.from_record(_Record("K-1", 3)).to_dict(), {"no": "K-1", "qty": 3})
+
+
+class TestG2BApiResponse(unittest.TestCase):
+
+    def test_from_api_item_dict_and_bytes(self):
+        for item in (ITEM, json.dumps(ITEM, ensure_ascii=False).encode("utf-8")):
+            response = G2BApiResponse.from_api_item(item)
+            self.assertEqual(response.bidNtceNo, "20250101234")
+            self.assertEqual(response.bidNtceOrd, "000")
+            self.assertEqual(response.asignBdgtAmt, 1_500_000_000.0)
+            self.assertIsNone(response.presmptPrce)            # 빈 문자열 → None
+            self.assertIsNone(response.bidNtceDtlUrl)
+            self.assertEqual(response.rbidNo, "")
+            self.assertIsInstance(response.raw_response, RawPayload)
+            self.assertEqual(response.raw_response, ITEM)
+
+    def test_invalid_amount_and_frozen(self):
+        response = G2BApiResponse.from_api_item({"bidNtceNo": "X", "asignBdgtAmt": "미정"})
+        self.assertIsNone(response.asignBdgtAmt)
+        with self.assertRaises(FrozenInstanceError):
+            response.bidNtceNm = "changed"
+
+
+class TestTenderResult(unittest.TestCase):
+
+    def test_frozen_slots(self):
+        result = TenderResult(
+            announcement_no="K-1", title="유연탄 구매", organization="한국남동발전", bid_method="", announce_date="",
+            close_date="", status="", detail_url="", keyword_matched="유연탄", crawled_at="2025-01-01T09:00:00",
+        )
+        with self.assertRaises(FrozenInstanceError):
+            result.title = "changed"
+        self.assertFalse(hasattr(result, "__dict__"))
+        self.assertEqual(result, TenderResult(**{name: getattr(result, name) for name in TenderResult.__slots__}))
+        self.assertEqual(RawPayload.from_record(result)["keyword_matched"], "유연탄")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+크롤링 작업 대기열 테스트 (InMemoryJobQueue, DB / 브라우저 불필요)
+작업 분할, 중복 등록, 우선순위 / 배타적 가져가기, lease 만료 회수, 재시도 backoff, worker 처리 검증
+"""
+import os
+import sys
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobqueue import CrawlUnit, InMemoryJobQueue, Worker, kepco_handler, plan_units, retry_delay
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+
+
+class TestPlanUnits(unittest.TestCase):
+
+    def test_windows_cover_range_newest_first(self):
+        units = plan_units(["KEPCO"], ["유연탄", "석탄"], date(2025, 1, 1), date(2025, 1, 20), window_days=7)
+        windows = sorted({(u.window_start, u.window_end) for u in units}, reverse=True)
+        self.assertEqual(windows, [
+            (date(2025, 1, 14), date(2025, 1, 20)),
+            (date(2025, 1, 7), date(2025, 1, 13)),
+            (date(2025, 1, 1), date(2025, 1, 6)),
+        ])
+        self.assertEqual(len(units), 6)
+        self.assertEqual(units[0], CrawlUnit("KEPCO", "유연탄", date(2025, 1, 14), date(2025, 1, 20)))
+        with self.assertRaises(ValueError):
+            plan_units(["KEPCO"], ["유연탄"], date(2025, 2, 1), date(2025, 1, 1))
+
+
+class TestInMemoryJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock(datetime(2025, 3, 10, 9, 0, tzinfo=timezone.utc))
+        self.queue = InMemoryJobQueue(clock=self.clock)
+        self.units = plan_units(["KEPCO"], ["유연탄"], date(2025, 1, 1), date(2025, 1, 21), window_days=7)
+
+    def test_enqueue_skips_active_units(self):
+        self.assertEqual(self.queue.enqueue(self.units, batch_id="b1"), 3)
+        self.assertEqual(self.queue.enqueue(self.units, batch_id="b2"), 0)
+        job, = self.queue.claim("w1", lease_seconds=60)
+        self.queue.complete(job.id, "w1", {"count": 3})
+        # 완료된 단위는 다시 등록 가능
+        self.assertEqual(self.queue.enqueue(self.units, batch_id="b2"), 1)
+        self.assertEqual(self.queue.stats("b1"), {"queued": 2, "running": 0, "succeeded": 1, "failed": 0})
+
+    def test_claim_is_exclusive_and_ordered(self):
+        self.queue.enqueue(self.units[:2])
+        self.queue.enqueue(self.units[2:], priority=10)
+        first = self.queue.claim("w1", lease_seconds=60, limit=2)
+        second = self.queue.claim("w2", lease_seconds=60, limit=2)
+        self.assertEqual(first[0].unit, self.units[2])         # 우선순위 높은 작업 먼저
+        self.assertEqual(len(first) + len(second), 3)
+        self.assertFalse({j.id for j in first} & {j.id for j in second})
+        self.assertEqual(self.queue.claim("w3", lease_seconds=60), [])
+        self.assertEqual(first[0].attempts, 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        self.queue.enqueue(self.units[:1])
+        job, = self.queue.claim("w1", lease_seconds=60)
+        self.clock.advance(50)
+        self.assertTrue(self.queue.heartbeat(job.id, "w1", lease_seconds=60))
+        self.clock.advance(50)
+        self.assertEqual(self.queue.claim("w2", lease_seconds=60), [])     # heartbeat로 연장됨
+
+        self.clock.advance(30)
+        reclaimed, = self.queue.claim("w2", lease_seconds=60)
+        self.assertEqual((reclaimed.id, reclaimed.attempts), (job.id, 2))
+        self.assertIn("lease expired", reclaimed.last_error)
+        # 원래 worker는 lease 상실
+        self.assertFalse(self.queue.heartbeat(job.id, "w1", lease_seconds=60))
+        self.assertFalse(self.queue.complete(job.id, "w1", {"count": 0}))
+        self.assertTrue(self.queue.complete(job.id, "w2", {"count": 1}))
+
+    def test_retry_backoff_then_failed(self):
+        self.queue.enqueue(self.units[:1], max_attempts=2)
+        job, = self.queue.claim("w1", lease_seconds=60)
+        self.assertEqual(self.queue.fail(job.id, "w1", "TimeoutError: grid"), "queued")
+        self.assertEqual(self.queue.claim("w1", lease_seconds=60), [])      # backoff 대기 중
+        self.clock.advance(retry_delay(1))
+        job, = self.queue.claim("w1", lease_seconds=60)
+        self.assertEqual(self.queue.fail(job.id, "w1", "TimeoutError: grid"), "failed")
+        self.assertEqual(self.queue.stats()["failed"], 1)
+        self.assertEqual(retry_delay(20), 1800.0)
+
+
+class TestWorker(unittest.TestCase):
+
+    def test_processes_jobs_with_retry(self):
+        queue = InMemoryJobQueue()
+        queue.enqueue(plan_units(["KEPCO"], ["유연탄", "석탄"], date(2025, 1, 1), date(2025, 1, 7)))
+        seen = []
+
+        async def handler(job):
+            seen.append(job.keyword)
+            if job.keyword == "석탄":
+                raise RuntimeError("grid not loaded")
+            await asyncio.sleep(0)
+            return {"count": 2}
+
+        worker = Worker(queue, handler, worker_id="w1", concurrency=2, lease_seconds=5, heartbeat_seconds=1, poll_seconds=0.01)
+        asyncio.run(worker.run(max_jobs=2))
+
+        self.assertEqual(sorted(seen), ["석탄", "유연탄"])
+        self.assertEqual(worker.processed["succeeded"], 1)
+        self.assertEqual(worker.processed["queued"], 1)
+        done, = queue.list_jobs(status="succeeded")
+        self.assertEqual(done.result, {"count": 2})
+
+    def test_lease_lost_cancels_handler(self):
+        queue = InMemoryJobQueue()
+        queue.enqueue(plan_units(["KEPCO"], ["유연탄"], date(2025, 1, 1), date(2025, 1, 7)))
+        cancelled = []
+
+        async def handler(job):
+            # 다른 worker가 회수한 상황
+            queue._jobs[job.id].lease_owner = "w2"
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(job.id)
+                raise
+
+        worker = Worker(queue, handler, worker_id="w1", lease_seconds=1, heartbeat_seconds=0.05, poll_seconds=0.01)
+        asyncio.run(worker.run(max_jobs=1))
+        self.assertEqual(cancelled, [1])
+        self.assertEqual(worker.processed["lease_lost"], 1)
+
+    def test_kepco_search_failure_is_retried(self):
+        # 날짜 필터 / 그리드 실패가 0건 성공으로 기록되지 않고 재시도 대기열로
+        class FailingCrawler:
+            configs = []
+
+            async def search(self, config):
+                self.configs.append(config)
+                raise RuntimeError("Date inputs not found (0)")
+
+        queue = InMemoryJobQueue()
+        queue.enqueue(plan_units(["KEPCO"], ["유연탄"], date(2025, 1, 1), date(2025, 1, 7)))
+        crawler = FailingCrawler()
+        worker = Worker(queue, kepco_handler(crawler), worker_id="w1", lease_seconds=5, heartbeat_seconds=1, poll_seconds=0.01)
+        asyncio.run(worker.run(max_jobs=1))
+
+        self.assertTrue(crawler.configs[0].strict)
+        self.assertEqual(worker.processed["succeeded"], 0)
+        self.assertEqual(worker.processed["queued"], 1)
+        self.assertEqual(queue.list_jobs(status="succeeded"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+JSONL 스트리밍 출력 테스트 (임시 디렉터리)
+레코드별 즉시 기록, 회전 순서, gzip, 중단으로 잘린 꼬리 처리, 재시도된 검색의 중복 기록 방지 검증
+"""
+import os
+import sys
+import gzip
+import asyncio
+import functools
+import shutil
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl import JsonlWriter, iter_jsonl, jsonl_files
+from tenacity import wait_none
+
+from kepco.crawler import KEPCOCrawler, SearchConfig, TenderResult
+from memory_repository import InMemoryRepository
+
+
+def _result(no: str) -> TenderResult:
+    return TenderResult(announcement_no=no, title="유연탄 구매", organization="한국남동발전", bid_method="", announce_date="",
+                        close_date="", status="", detail_url="", keyword_matched="유연탄", crawled_at="2025-01-01T09:00:00")
+
+
+class TestJsonl(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_streamed_and_rotated_in_order(self):
+        path = os.path.join(self.dir, "results.jsonl")
+        writer = JsonlWriter(path, max_records=2)
+        writer.write(_result("K-1"))
+        # flush 즉시 → 쓰는 중에도 읽기 가능
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(path)], ["K-1"])
+        for no in ("K-2", "K-3", "K-4", "K-5"):
+            writer.write(_result(no))
+        writer.close()
+
+        self.assertEqual(len(writer.rotated), 2)
+        self.assertEqual(jsonl_files(path), writer.rotated + [path])
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(path)], ["K-1", "K-2", "K-3", "K-4", "K-5"])
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(path, include_rotated=False)], ["K-5"])
+
+    def test_crash_leftovers_are_skipped(self):
+        path = os.path.join(self.dir, "results.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"announcement_no":"K-1"}\n{"announcement_no":"K-')     # 줄 중간에 중단
+        with JsonlWriter(path) as writer:
+            writer.write({"announcement_no": "K-2"})
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(path)], ["K-1", "K-2"])
+
+        gz_path = os.path.join(self.dir, "results.jsonl.gz")
+        with JsonlWriter(gz_path) as writer:
+            for no in ("K-1", "K-2", "K-3"):
+                writer.write({"announcement_no": no})
+            size = os.path.getsize(gz_path)             # trailer 기록 전 (sync flush까지만)
+        with open(gz_path, "rb") as f:
+            truncated = f.read(size)
+        with open(gz_path, "wb") as f:
+            f.write(truncated)
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(gz_path)], ["K-1", "K-2", "K-3"])
+
+        # 재시작: 기존 gzip은 회전 후 새 파일
+        with JsonlWriter(gz_path) as writer:
+            writer.write({"announcement_no": "K-4"})
+        self.assertEqual(len(writer.rotated), 1)
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(gz_path)], ["K-1", "K-2", "K-3", "K-4"])
+        with gzip.open(gz_path, "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), '{"announcement_no":"K-4"}\n')
+
+    def test_search_streams_per_keyword_and_retry_writes_once(self):
+        class _Context:
+            async def close(self):
+                pass
+
+        class FlakyCrawler(KEPCOCrawler):
+            # 첫 시도: 1번째 키워드 파싱 후 2번째 키워드에서 실패 → 재시도
+            attempts = 0
+            written_before_failure = None
+
+            async def _open_search_page(self):
+                FlakyCrawler.attempts += 1
+                return _Context(), None
+
+            async def _search_keyword(self, page, keyword, config):
+                if keyword == "석탄" and FlakyCrawler.attempts == 1:
+                    FlakyCrawler.written_before_failure = [r["announcement_no"] for r in iter_jsonl(path)]
+                    raise RuntimeError("grid timeout")
+                return [_result(f"K-{keyword}")]
+
+        path = os.path.join(self.dir, "results.jsonl")
+        crawler = FlakyCrawler(repo=InMemoryRepository(), session_dir=self.dir, download_dir=self.dir)
+        crawler.browser = object()
+        crawler._search = functools.partial(KEPCOCrawler._search.retry_with(wait=wait_none()), crawler)
+        with JsonlWriter(path) as writer:
+            crawler.on_result = writer.write
+            results = asyncio.run(crawler.search(SearchConfig(keywords=["유연탄", "석탄"])))
+
+        self.assertEqual(FlakyCrawler.attempts, 2)
+        # 키워드 완료마다 기록 (실패 전에 이미 파일에 있음), 재시도에서 다시 쓰지 않음
+        self.assertEqual(FlakyCrawler.written_before_failure, ["K-유연탄"])
+        self.assertEqual(len(results), 2)
+        self.assertEqual([r["announcement_no"] for r in iter_jsonl(path)], ["K-유연탄", "K-석탄"])
+
+
+if __name__ == "__main__":
+    unittest.main()
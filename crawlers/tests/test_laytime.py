@@ -0,0 +1,169 @@
+"""
+Laytime 계산 엔진 테스트 (네트워크 불필요)
+SOF 시나리오별 체선/조출 시간 및 선단 일괄 재계산 검증
+"""
+import os
+import sys
+import unittest
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import ShipmentDTO
+from memory_repository import InMemoryRepository
+from shipping import LaytimeCalculator, LaytimeTerms, SOFEvent, SOFEventType, recalculate_all, recalculate_fleet
+
+E = SOFEventType
+
+
+def _events(*items):
+    return [SOFEvent(at=datetime.fromisoformat(at), type=kind, reason=rest[0] if rest else None) for at, kind, *rest in items]
+
+
+class TestLaytimeCalculator(unittest.TestCase):
+
+    def test_shinc_demurrage(self):
+        # 2024-01-01 = 월요일, NOR + 12h turn time → 20:00부터 산입
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=72)
+        result = LaytimeCalculator(terms).calculate(_events(
+            ("2024-01-01T08:00", E.NOR_TENDERED),
+            ("2024-01-02T02:00", E.COMMENCED),
+            ("2024-01-05T20:00", E.COMPLETED),
+        ))
+        self.assertEqual(result.laytime_start, datetime(2024, 1, 1, 20, 0))
+        self.assertEqual(result.laytime_expired_at, datetime(2024, 1, 4, 20, 0))
+        self.assertAlmostEqual(result.demurrage_hrs, 24.0)
+        self.assertAlmostEqual(result.demurrage_usd, 24000.0)
+        self.assertEqual(result.despatch_usd, 0.0)
+
+    def test_weather_stop_excluded(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=72)
+        result = LaytimeCalculator(terms).calculate(_events(
+            ("2024-01-01T08:00", E.NOR_TENDERED),
+            ("2024-01-02T02:00", E.COMMENCED),
+            ("2024-01-03T00:00", E.WEATHER_STOP),
+            ("2024-01-03T06:00", E.WEATHER_RESUME),
+            ("2024-01-05T20:00", E.COMPLETED),
+        ))
+        self.assertAlmostEqual(result.weather_delay_hrs, 6.0)
+        self.assertEqual(result.laytime_expired_at, datetime(2024, 1, 5, 2, 0))
+        self.assertAlmostEqual(result.demurrage_hrs, 18.0)
+
+    def test_once_on_demurrage(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=24, turn_time_hrs=0)
+        events = _events(
+            ("2024-01-01T00:00", E.NOR_TENDERED),
+            ("2024-01-02T06:00", E.WEATHER_STOP),
+            ("2024-01-02T12:00", E.WEATHER_RESUME),
+            ("2024-01-02T18:00", E.COMPLETED),
+        )
+        self.assertAlmostEqual(LaytimeCalculator(terms).calculate(events).demurrage_hrs, 18.0)
+
+        lenient = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=24, turn_time_hrs=0, once_on_demurrage=False)
+        result = LaytimeCalculator(lenient).calculate(events)
+        self.assertAlmostEqual(result.demurrage_hrs, 12.0)
+        self.assertAlmostEqual(result.weather_delay_hrs, 6.0)
+
+    def test_shex_skips_sunday_and_holiday(self):
+        # 2024-01-05 = 금요일
+        events = _events(
+            ("2024-01-04T20:00", E.NOR_TENDERED),
+            ("2024-01-05T08:00", E.COMMENCED),
+            ("2024-01-08T20:00", E.COMPLETED),
+        )
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=48, calendar="SHEX")
+        result = LaytimeCalculator(terms).calculate(events)
+        self.assertAlmostEqual(result.excluded_hrs["weekend"], 24.0)
+        self.assertEqual(result.laytime_expired_at, datetime(2024, 1, 8, 8, 0))
+        self.assertAlmostEqual(result.demurrage_hrs, 12.0)
+
+        # 월요일 공휴일 → 만료 전 완료, 남은 8시간 조출 (working time saved, 반액)
+        holiday = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=48, calendar="SHEX", holidays=frozenset({date(2024, 1, 8)}))
+        result = LaytimeCalculator(holiday).calculate(events)
+        self.assertAlmostEqual(result.excluded_hrs["holiday"], 20.0)
+        self.assertAlmostEqual(result.demurrage_hrs, 0.0)
+        self.assertAlmostEqual(result.despatch_hrs, 8.0)
+        self.assertAlmostEqual(result.despatch_usd, 4000.0)
+
+    def test_shex_unless_used(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=48, calendar="SHEX", unless_used=True)
+        result = LaytimeCalculator(terms).calculate(_events(
+            ("2024-01-04T20:00", E.NOR_TENDERED),
+            ("2024-01-05T08:00", E.COMMENCED),
+            ("2024-01-08T20:00", E.COMPLETED),
+        ))
+        self.assertNotIn("weekend", result.excluded_hrs)
+        self.assertEqual(result.laytime_expired_at, datetime(2024, 1, 7, 8, 0))
+
+    def test_all_time_saved_despatch(self):
+        # 토 20:00 완료, 잔여 10h: 토 4h + (일요일 제외) + 월 6h → 34h
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=54, calendar="SHEX", despatch_on_all_time_saved=True)
+        result = LaytimeCalculator(terms).calculate(_events(
+            ("2024-01-05T00:00", E.COMMENCED),
+            ("2024-01-06T20:00", E.COMPLETED),
+        ))
+        self.assertAlmostEqual(result.used_hrs, 44.0)
+        self.assertAlmostEqual(result.despatch_hrs, 34.0)
+
+    def test_commenced_during_turn_time_counts(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=100)
+        result = LaytimeCalculator(terms).calculate(_events(
+            ("2024-01-01T08:00", E.NOR_TENDERED),
+            ("2024-01-01T10:00", E.COMMENCED),
+            ("2024-01-02T10:00", E.COMPLETED),
+        ))
+        self.assertEqual(result.laytime_start, datetime(2024, 1, 1, 10, 0))
+        self.assertAlmostEqual(result.used_hrs, 24.0)
+
+    def test_stoppage_reasons_and_provisional(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=10, turn_time_hrs=0)
+        result = LaytimeCalculator(terms).calculate(_events(
+            ("2024-01-01T00:00", E.NOR_TENDERED),
+            ("2024-01-01T02:00", E.STOP, "shifting"),
+            ("2024-01-01T05:00", E.RESUME, "shifting"),
+        ), as_of=datetime(2024, 1, 1, 20, 0))
+        self.assertFalse(result.is_final)
+        self.assertAlmostEqual(result.excluded_hrs["shifting"], 3.0)
+        self.assertAlmostEqual(result.demurrage_hrs, 7.0)
+
+    def test_rejects_unordered_events(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=10)
+        with self.assertRaises(ValueError):
+            LaytimeCalculator(terms).calculate(_events(
+                ("2024-01-02T00:00", E.NOR_TENDERED),
+                ("2024-01-01T00:00", E.COMMENCED),
+            ))
+
+    def test_allowed_laytime_from_rate(self):
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, cargo_qty_mt=80000, rate_mt_per_day=20000)
+        self.assertAlmostEqual(terms.allowed_hrs, 96.0)
+        with self.assertRaises(ValueError):
+            LaytimeTerms(dem_rate_daily_usd=24000)
+
+
+class TestFleetRecalculation(unittest.TestCase):
+
+    def test_fleet_bulk_upsert_and_recalculate_all(self):
+        repo = InMemoryRepository()
+        ids = [repo.upsert_shipment(ShipmentDTO(vessel_name=f"MV TEST {i}"))["id"] for i in range(3)]
+        terms = LaytimeTerms(dem_rate_daily_usd=24000, laytime_hrs=24, turn_time_hrs=0)
+        sof = _events(("2024-01-01T00:00", E.NOR_TENDERED), ("2024-01-02T12:00", E.COMPLETED))
+
+        repo.reset_counters()
+        rows = recalculate_fleet(repo, [(sid, terms, sof) for sid in ids])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["total_demurrage_usd"], 12000.0)
+        self.assertEqual(repo.queries[("demurrage_calculations", "insert")], 1)
+
+        # 저장된 약관/SOF로 전체 재계산 → 같은 row 갱신
+        repo.reset_counters()
+        again = recalculate_all(repo)
+        self.assertEqual({r["id"] for r in again}, {r["id"] for r in rows})
+        self.assertEqual(len(repo.tables["demurrage_calculations"]), 3)
+        self.assertEqual(repo.queries[("demurrage_calculations", "select")], 1)
+        self.assertEqual(repo.queries[("demurrage_calculations", "upsert")], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
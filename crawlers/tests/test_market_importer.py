@@ -0,0 +1,119 @@
+"""
+MarketDataImporter 테스트 (네트워크 불필요)
+long / wide CSV 파싱, 지수명 정규화, 검증, 중복 병합, chunk 단위 bulk upsert 검증
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_repository import InMemoryRepository
+from market import MarketDataImporter, MarketDataStore, normalize_index
+from market.importer import parse_date, parse_number
+
+
+class TestMarketDataImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _csv(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_parsing_helpers(self):
+        self.assertEqual(normalize_index(" gC NEWC "), "Newcastle")
+        self.assertEqual(normalize_index("ICI-4"), "ICI4")
+        self.assertIsNone(normalize_index("Brent"))
+        for value in ("2024-01-05", "2024/01/05", "20240105", 20240105, 20240105.0, "05-Jan-2024", 45296, "2024-01-05T00:00:00+09:00"):
+            self.assertEqual(parse_date(value), date(2024, 1, 5), value)
+        for value in (0, 250000, 3000000000, 20241341):
+            with self.assertRaises(ValueError):
+                parse_date(value)
+        self.assertEqual(parse_number("$1,234.50"), 1234.5)
+        self.assertIsNone(parse_number(" - "))
+
+    def test_long_format_validates_and_merges(self):
+        path = self._csv("long.csv", "\n".join([
+            "Date,Index,Price,USD/KRW,Source",
+            "2024-01-02,NEWC,130.5,1300.1,Argus",
+            "2024-01-02,ICI 4,58.2,1300.1,Argus",
+            "2024-01-03,Newcastle,131,,Argus",
+            "2024-01-03,Brent,80,,ICE",          # 미등록 지수
+            "2024-01-04,Newcastle,13100,,Argus",   # 범위 밖
+            "not-a-date,Newcastle,130,,Argus",
+            "2024-01-03,Newcastle,,1301.5,",       # 중복 → 환율만 보강
+        ]))
+        importer = MarketDataImporter(self.repo)
+        self.assertEqual(importer.add_file(path), 3)
+
+        stats = importer.stats
+        self.assertEqual((stats.rows_read, stats.records, stats.duplicates, stats.rejected), (7, 3, 1, 3))
+        self.assertEqual(stats.unknown_indices, {"Brent": 1})
+        merged = [r for r in importer.records() if r.data_date == date(2024, 1, 3)][0]
+        self.assertEqual((merged.price_usd, merged.fx_rate_krw, merged.source), (131.0, 1301.5, "Argus"))
+
+    def test_wide_format_bulk_upsert_in_chunks(self):
+        lines = ["date;Newcastle;ICI4;USD/KRW"]
+        for day in range(1, 29):
+            lines.append(f"2024-02-{day:02d};{120 + day};{55 + day / 10};1320")
+        path = self._csv("wide.csv", "\n".join(lines))
+
+        store = MarketDataStore(self.repo)
+        store.load()
+        self.repo.reset_counters()
+
+        importer = MarketDataImporter(self.repo, chunk_size=20)
+        importer.add_file(path)
+        importer.commit()
+
+        self.assertEqual(importer.stats.written, 56)
+        self.assertEqual(self.repo.queries[("market_data", "upsert")], 3)
+        self.assertEqual(self.repo.calls["bulk_upsert_market_data"], 1)
+
+        # listener로 캐시 무효화 → 새 데이터 조회
+        nc = store.series("Newcastle")
+        self.assertEqual(len(nc), 28)
+        self.assertEqual(nc.asof_row(date(2024, 2, 10))["fx_rate_krw"], 1320.0)
+
+        # 재적재는 upsert (행 수 불변)
+        importer.add_file(path)
+        importer.commit()
+        self.assertEqual(len(self.repo.get_market_data_between(date(2024, 1, 1), date(2024, 12, 31))), 56)
+
+    def test_fixed_index_file(self):
+        path = self._csv("fx_only.csv", "일자,환율\n2024-03-04,1330.2\n2024-03-05,1331.0\n")
+        importer = MarketDataImporter(self.repo)
+        self.assertEqual(importer.add_file(path, index_name="ICI4"), 2)
+        self.assertEqual(importer.records()[0].index_name, "ICI4")
+        with self.assertRaises(ValueError):
+            importer.add_file(path, index_name="Brent")
+
+    def test_bad_date_cell_rejects_row_and_partial_file_keeps_columns(self):
+        importer = MarketDataImporter(self.repo)
+        importer.add_rows([
+            {"date": 20240102, "index": "ICI4", "price": 58.0, "fx": 1300.0},
+            {"date": 987654321, "index": "ICI4", "price": 58.5},       # 일련번호 범위 밖 → 해당 행만 거부
+        ])
+        self.assertEqual((importer.stats.records, importer.stats.rejected), (1, 1))
+        importer.commit()
+
+        # 환율 열이 없는 가격 파일 재적재 → 기존 환율 유지
+        importer.add_rows([{"date": "2024-01-02", "index": "ICI4", "price": 59.0}])
+        importer.commit()
+        row = self.repo.get_market_data(date(2024, 1, 2), "ICI4")
+        self.assertEqual((row["price_usd"], row["fx_rate_krw"]), (59.0, 1300.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
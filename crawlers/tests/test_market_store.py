@@ -0,0 +1,101 @@
+"""
+MarketDataStore 테스트 (네트워크 불필요)
+구간/as-of 조회, 롤링 통계, 스프레드 및 캐시 무효화 검증
+"""
+import os
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import MarketDataDTO
+from memory_repository import InMemoryRepository
+from market import MarketDataStore
+
+START = date(2024, 1, 1)
+
+
+class TestMarketDataStore(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        # Newcastle: 평일만 (주말 결측), ICI4: 매일
+        for i in range(60):
+            day = START + timedelta(days=i)
+            if day.weekday() < 5:
+                self.repo.upsert_market_data(MarketDataDTO(
+                    data_date=day, index_name="Newcastle", price_usd=100.0 + i, fx_rate_krw=1300.0 + i,
+                    freight_rate=None if i == 10 else 15.0,
+                ))
+            self.repo.upsert_market_data(MarketDataDTO(data_date=day, index_name="ICI4", price_usd=60.0 + i / 2))
+        self.store = MarketDataStore(self.repo)
+
+    def test_range_and_asof(self):
+        nc = self.store.series("Newcastle")
+        window = nc.between(date(2024, 1, 6), date(2024, 1, 12))
+        self.assertEqual([str(d) for d in window.dates], ["2024-01-08", "2024-01-09", "2024-01-10", "2024-01-11", "2024-01-12"])
+
+        # 토요일 마감 → 금요일 가격, 첫 관측 이전 → NaN
+        prices = nc.asof([datetime(2024, 1, 6, 18, 0), "2024-01-08T10:00:00+09:00", date(2023, 12, 31)])
+        np.testing.assert_array_equal(prices[:2], [104.0, 107.0])
+        self.assertTrue(np.isnan(prices[2]))
+        self.assertTrue(np.isnan(nc.asof([date(2024, 1, 7)], max_staleness_days=1)[0]))
+        self.assertEqual(nc.asof_row(date(2024, 1, 11))["freight_rate"], None)
+
+    def test_rolling_statistics_match_naive(self):
+        nc = self.store.series("Newcastle")
+        mean = nc.rolling_mean(5)
+        self.assertTrue(np.isnan(mean[3]))
+        self.assertAlmostEqual(mean[10], nc.price[6:11].mean())
+
+        # 결측(freight) 포함 평균은 유효값만 사용
+        freight = nc.rolling_mean(5, column="freight", min_periods=3)
+        self.assertFalse(np.isnan(freight[4:]).any())
+        self.assertTrue(np.allclose(freight[4:], 15.0))
+
+        returns = np.diff(np.log(nc.price))
+        vol = nc.rolling_vol(10)
+        self.assertAlmostEqual(vol[20], returns[10:20].std(ddof=1))
+        self.assertAlmostEqual(nc.rolling_vol(10, annualize=252)[20], vol[20] * np.sqrt(252))
+
+    def test_spread(self):
+        dates, spread = self.store.spread("Newcastle", "ICI4")
+        self.assertEqual(len(dates), len(self.store.series("Newcastle")))
+        self.assertAlmostEqual(spread[0], 100.0 - 60.0)
+
+        dates, spread = self.store.spread("ICI4", "Newcastle", asof=True)
+        # 일요일 ICI4 vs 금요일 Newcastle
+        sunday = int(np.where(dates == np.datetime64("2024-01-07"))[0][0])
+        self.assertAlmostEqual(spread[sunday], (60.0 + 6 / 2) - 104.0)
+
+    def test_cache_and_invalidation(self):
+        self.store.series("Newcastle")
+        self.store.series("Newcastle")
+        self.assertEqual(self.store.loads, 1)
+
+        self.repo.upsert_market_data(MarketDataDTO(data_date=date(2024, 3, 1), index_name="Newcastle", price_usd=200.0))
+        self.assertEqual(self.store.series("Newcastle").latest()["price_usd"], 200.0)
+        self.assertEqual(self.store.loads, 2)
+
+        # 다른 지수 변경은 영향 없음
+        self.repo.upsert_market_data(MarketDataDTO(data_date=date(2024, 3, 1), index_name="ICI4", price_usd=70.0))
+        self.store.series("Newcastle")
+        self.assertEqual(self.store.loads, 2)
+
+        self.store.close()
+        self.repo.upsert_market_data(MarketDataDTO(data_date=date(2024, 3, 2), index_name="Newcastle", price_usd=201.0))
+        self.assertEqual(self.store.series("Newcastle").latest()["price_usd"], 200.0)
+
+    def test_load_all_in_one_query(self):
+        self.repo.reset_counters()
+        loaded = self.store.load()
+        self.assertEqual(set(loaded), {"Newcastle", "ICI4"})
+        self.assertEqual(self.repo.calls["list_market_data"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
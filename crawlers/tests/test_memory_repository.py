@@ -0,0 +1,84 @@
+"""
+InMemoryRepository 테스트 (네트워크 불필요)
+스키마 제약조건 및 호출/쿼리 집계 검증
+"""
+import os
+import sys
+import unittest
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderDTO, TenderAttachmentDTO, TenderSpecDTO, TenderSource, MarketDataDTO
+from memory_repository import InMemoryRepository, IntegrityError
+
+
+class TestInMemoryRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+
+    def _tender(self, no="20241220001", **kwargs):
+        return TenderDTO(
+            bid_ntce_no=no,
+            bid_ntce_ord="00",
+            source=TenderSource.KEPCO,
+            bid_ntce_nm="Test Coal Tender",
+            bid_clse_dt=datetime(2024, 12, 20, 18, 0),
+            **kwargs
+        )
+
+    def test_tender_upsert_uses_unique_key(self):
+        """(source, bid_ntce_no, bid_ntce_ord) 동일하면 같은 row 갱신"""
+        first = self.repo.upsert_tender(self._tender(ai_summary="v1"))
+        second = self.repo.upsert_tender(self._tender(ai_summary="v2"))
+
+        self.assertEqual(first["id"], second["id"])
+        self.assertEqual(len(self.repo.tables["tenders"]), 1)
+        self.assertEqual(self.repo.get_tender_by_id(first["id"])["ai_summary"], "v2")
+        self.assertEqual(second["bid_clse_dt"], "2024-12-20T18:00:00")
+
+        other_source = self._tender()
+        other_source.source = TenderSource.G2B
+        self.repo.upsert_tender(other_source)
+        self.assertEqual(len(self.repo.tables["tenders"]), 2)
+
+    def test_market_data_unique_key(self):
+        day = date(2024, 12, 20)
+        self.repo.upsert_market_data(MarketDataDTO(data_date=day, index_name="Newcastle", price_usd=130.0))
+        self.repo.upsert_market_data(MarketDataDTO(data_date=day, index_name="Newcastle", price_usd=132.5))
+
+        self.assertEqual(len(self.repo.tables["market_data"]), 1)
+        self.assertEqual(self.repo.get_market_data(day, "Newcastle")["price_usd"], 132.5)
+
+    def test_duplicate_insert_by_id_violates_unique(self):
+        """다른 id로 같은 유니크 키를 쓰면 IntegrityError"""
+        self.repo.upsert_tender(self._tender())
+        row = self.repo._tender_row(self._tender())
+        row["id"] = "another-id"
+        with self.assertRaises(IntegrityError):
+            self.repo._insert("tenders", row)
+
+    def test_foreign_key_enforced(self):
+        with self.assertRaises(IntegrityError):
+            self.repo.upsert_tender_spec(TenderSpecDTO(tender_id="missing-tender"))
+
+    def test_attachment_dedup_and_query_count(self):
+        """첨부파일은 (tender_id, file_name) 조회 후 갱신 - 쿼리 2회/호출"""
+        tender_id = self.repo.upsert_tender(self._tender())["id"]
+        self.repo.reset_counters()
+
+        for _ in range(3):
+            self.repo.upsert_attachment(TenderAttachmentDTO(
+                tender_id=tender_id, file_name="spec.hwp", file_type="hwp"
+            ))
+
+        self.assertEqual(len(self.repo.get_attachments_by_tender_id(tender_id)), 1)
+        self.assertEqual(self.repo.calls["upsert_attachment"], 3)
+        self.assertEqual(self.repo.queries[("tender_attachments", "select")], 4)
+        self.assertEqual(sum(self.repo.queries.values()), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
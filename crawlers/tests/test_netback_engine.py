@@ -0,0 +1,111 @@
+"""
+NetbackEngine 테스트 (네트워크 불필요)
+벡터화 결과를 스칼라 계산과 대조하고 bulk 저장 검증
+"""
+import os
+import sys
+import unittest
+from datetime import date
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderSpecDTO, CVBasis
+from memory_repository import InMemoryRepository
+from netback import NetbackEngine, ScenarioGrid, to_nar
+
+
+class TestNetbackEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = NetbackEngine(index_name="Newcastle")
+        self.grid = ScenarioGrid(
+            market_price_usd=[100.0, 130.0, 160.0],
+            freight_usd=[10.0, 20.0],
+            fx_rate_krw=[1300.0, 1400.0],
+            insurance_pct=[0.1, 0.2],
+            import_duty_pct=[0.0, 1.0],
+            port_charges_usd=3.0,
+        )
+        self.specs = [
+            TenderSpecDTO(tender_id="t1", cv_min_kcal=5800, cv_max_kcal=6200, cv_basis=CVBasis.NAR),
+            TenderSpecDTO(tender_id="t2", cv_min_kcal=4200, cv_basis=CVBasis.GAR, moisture_max_pct=30.0),
+            {"tender_id": "t3", "cv_min_kcal": None, "cv_max_kcal": None, "cv_basis": "ADB"},
+        ]
+
+    def test_matches_scalar_formula(self):
+        result = self.engine.run(self.specs, self.grid)
+        self.assertEqual(result.netback_usd.shape, (3, 3, 2, 2, 2, 2))
+
+        factor = result.cv_factor[1]
+        p, f, x, ins, duty = 130.0, 20.0, 1400.0, 0.2, 1.0
+        adjusted = p * factor
+        expected = adjusted - f - adjusted * ins / 100 - 3.0 - adjusted * duty / 100
+        self.assertAlmostEqual(result.netback_usd[1, 1, 1, 1, 1, 1], expected, places=9)
+        self.assertAlmostEqual(result.netback_krw[1, 1, 1, 1, 1, 1], expected * x, places=6)
+
+    def test_cv_basis_adjustment(self):
+        nar, factor = self.engine.cv_factors(self.specs)
+        # 6000 NAR = 지수 기준 → 계수 1
+        self.assertAlmostEqual(factor[0], 1.0)
+        # 4200 GAR (TM 30%) → NAR 환산 후 할인
+        expected_nar = 4200 - 5.83 * (30.0 + 8.94 * 4.0)
+        self.assertAlmostEqual(nar[1], expected_nar)
+        self.assertAlmostEqual(factor[1], expected_nar / 6000)
+        # 발열량 미상 → 조정 없음
+        self.assertTrue(np.isnan(nar[2]))
+        self.assertEqual(factor[2], 1.0)
+
+    def test_adb_converts_through_gar(self):
+        nar = to_nar(np.array([6000.0]), np.array([2]), np.array([12.0]), inherent_moisture_pct=8.0, hydrogen_pct=4.0)
+        gar = 6000.0 * 88.0 / 92.0
+        self.assertAlmostEqual(nar[0], gar - 5.83 * (12.0 + 8.94 * 4.0))
+
+    def test_gar_reference_index(self):
+        engine = NetbackEngine(index_name="ICI4")
+        spec = TenderSpecDTO(tender_id="t", cv_min_kcal=4200, cv_basis=CVBasis.GAR)
+        _, factor = engine.cv_factors([spec])
+        self.assertAlmostEqual(factor[0], 1.0)
+
+    def test_summaries(self):
+        result = self.engine.run(self.specs, self.grid)
+        summary = result.summaries()[0]
+        flat = result.netback_usd[0].ravel()
+        self.assertAlmostEqual(summary["usd_mean"], flat.mean())
+        self.assertAlmostEqual(summary["usd_p50"], np.percentile(flat, 50))
+        self.assertAlmostEqual(summary["prob_loss"], 0.0)
+
+    def test_bulk_persist_single_query(self):
+        repo = InMemoryRepository()
+        for no in ("t1", "t2", "t3"):
+            repo.tables["tenders"][no] = {"id": no}
+        repo.reset_counters()
+
+        result = self.engine.run(self.specs, self.grid)
+        rows = self.engine.persist(repo, result, simulation_date=date(2024, 12, 20))
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(repo.queries[("netback_simulations", "insert")], 1)
+        self.assertEqual(rows[0]["simulation_date"], "2024-12-20")
+        self.assertEqual(rows[0]["fx_rate"], 1400.0)
+        self.assertEqual(rows[0]["assumptions"]["grid"]["scenarios"], self.grid.size)
+        self.assertEqual(len(repo.get_simulations_by_tender_id("t2")), 1)
+
+    def test_empty_batch(self):
+        repo = InMemoryRepository()
+        result = self.engine.run([], self.grid)
+        self.assertEqual(result.summaries(), [])
+        self.assertEqual(result.to_simulations(), [])
+        self.assertEqual(self.engine.persist(repo, result), [])
+
+    def test_grid_around_market_data(self):
+        grid = ScenarioGrid.from_market_data({"price_usd": 130.0, "fx_rate_krw": 1350.0, "freight_rate": None}, steps=5)
+        self.assertEqual(grid.shape, (5, 5, 5, 1, 1))
+        self.assertAlmostEqual(grid.base_case()["market_price_usd"], 130.0)
+        self.assertAlmostEqual(grid.base_case()["freight_usd"], 15.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
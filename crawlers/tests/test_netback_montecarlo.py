@@ -0,0 +1,106 @@
+"""
+MonteCarloSimulator 테스트 (네트워크 불필요)
+캘리브레이션, 시드 재현성, 분포 요약 및 저장 검증
+"""
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import MarketDataDTO, TenderSpecDTO, CVBasis
+from memory_repository import InMemoryRepository
+from netback import MarketCalibration, MonteCarloSimulator
+
+
+def _history(days=200, seed=7):
+    rng = np.random.default_rng(seed)
+    price, fx, freight = 130.0, 1350.0, 15.0
+    rows = []
+    for i in range(days):
+        shock = rng.standard_normal(2)
+        price *= np.exp(0.02 * shock[0])
+        fx *= np.exp(0.005 * (0.8 * shock[0] + 0.6 * shock[1]))
+        freight *= np.exp(0.03 * rng.standard_normal())
+        rows.append(MarketDataDTO(
+            data_date=date(2024, 1, 1) + timedelta(days=i),
+            index_name="Newcastle",
+            price_usd=round(price, 2),
+            fx_rate_krw=round(fx, 4),
+            freight_rate=round(freight, 2),
+        ))
+    return rows
+
+
+class TestMonteCarloSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        for row in _history():
+            self.repo.upsert_market_data(row)
+        self.simulator = MonteCarloSimulator.from_repository(self.repo, lookback_days=365, end=date(2024, 12, 31))
+        self.specs = [
+            TenderSpecDTO(tender_id="t1", cv_min_kcal=6000, cv_basis=CVBasis.NAR),
+            TenderSpecDTO(tender_id="t2", cv_min_kcal=4200, cv_basis=CVBasis.GAR),
+        ]
+
+    def test_calibration_from_history(self):
+        cal = self.simulator.calibration
+        self.assertEqual(cal.observations, 200)
+        self.assertAlmostEqual(cal.vol[0], 0.02, delta=0.004)
+        self.assertAlmostEqual(cal.vol[2], 0.005, delta=0.001)
+        self.assertGreater(cal.corr[0, 2], 0.6)
+        self.assertEqual(cal.end, date(2024, 7, 18))
+
+    def test_seed_reproducible_across_shards_and_workers(self):
+        serial = MonteCarloSimulator(self.simulator.calibration, shard_size=10_000, parallel_threshold=10 ** 9)
+        parallel = MonteCarloSimulator(self.simulator.calibration, shard_size=10_000, parallel_threshold=1, max_workers=2)
+        a = serial.sample(30_000, horizon_days=30, seed=11)
+        b = parallel.sample(30_000, horizon_days=30, seed=11)
+        np.testing.assert_array_equal(a, b)
+        self.assertFalse(np.array_equal(a, serial.sample(30_000, horizon_days=30, seed=12)))
+
+    def test_terminal_distribution_matches_gbm(self):
+        cal = self.simulator.calibration
+        samples = self.simulator.sample(200_000, horizon_days=25, seed=3)
+        log_returns = np.log(samples / cal.spot)
+        np.testing.assert_allclose(log_returns.std(axis=0), cal.vol * 5, rtol=0.02)
+        # drift 미사용 → 기대값 보존 (martingale)
+        np.testing.assert_allclose(samples.mean(axis=0), cal.spot, rtol=0.01)
+
+    def test_summary_and_risk_measures(self):
+        result = self.simulator.run(self.specs, paths=50_000, horizon_days=30, averaging_days=10, seed=5)
+        summary = result.summaries[0]
+        self.assertLess(summary["usd_p1"], summary["usd_p5"])
+        self.assertLess(summary["usd_p5"], summary["usd_p50"])
+        self.assertAlmostEqual(summary["var_95"], summary["usd_mean"] - summary["usd_p5"])
+        self.assertGreater(summary["cvar_95"], summary["var_95"])
+        self.assertTrue(0.0 <= summary["prob_loss"] <= 1.0)
+        # 저발열량 스펙은 netback 낮음
+        self.assertLess(result.summaries[1]["usd_mean"], summary["usd_mean"])
+
+    def test_persist_writes_assumptions(self):
+        self.repo.tables["tenders"]["t1"] = {"id": "t1"}
+        self.repo.tables["tenders"]["t2"] = {"id": "t2"}
+        result = self.simulator.run(self.specs, paths=10_000, seed=9)
+        rows = self.simulator.persist(self.repo, result, simulation_date=date(2024, 7, 18))
+
+        self.assertEqual(len(rows), 2)
+        assumptions = rows[0]["assumptions"]
+        self.assertEqual(assumptions["engine"], "monte_carlo")
+        self.assertEqual(assumptions["seed"], 9)
+        self.assertEqual(assumptions["paths"], 10_000)
+        self.assertIn("var_95", assumptions["distribution"])
+        self.assertEqual(assumptions["calibration"]["observations"], 200)
+
+    def test_requires_price_history(self):
+        with self.assertRaises(ValueError):
+            MarketCalibration.from_rows([], index_name="ICI4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+목록 조회 API 테스트 (네트워크 불필요)
+keyset 커서 순회(NULL 마감일 포함), projection, 필터, ETag 검증
+"""
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderAttachmentDTO, TenderDTO, TenderFilter, TenderSource, TenderStatus
+from memory_repository import InMemoryRepository
+from pagination import decode_cursor, encode_cursor, etag, etag_matches, paginate_attachments, paginate_tenders
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        base = datetime(2025, 1, 1, 10, 0)
+        for i in range(25):
+            self.repo.upsert_tender(TenderDTO(
+                bid_ntce_no=f"T-{i:03d}", source=TenderSource.KEPCO if i % 2 else TenderSource.G2B,
+                bid_ntce_nm=f"유연탄 구매 {i}" if i % 3 else f"사무용품 {i}",
+                # 같은 마감일(동점) 및 마감일 없는 공고 포함
+                bid_clse_dt=None if i % 7 == 0 else base + timedelta(days=i // 2),
+                status=TenderStatus.CLOSED if i < 5 else TenderStatus.OPEN,
+                raw_api_response={"payload": "x" * 100},
+            ))
+
+    def _walk(self, **kwargs):
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = paginate_tenders(self.repo, cursor=cursor, **kwargs)
+            seen.extend(page.items)
+            pages += 1
+            if page.next_cursor is None:
+                return seen, pages
+            cursor = page.next_cursor
+
+    def test_walk_all_pages_in_order(self):
+        rows, pages = self._walk(limit=4)
+        self.assertEqual(pages, 7)
+        self.assertEqual(len({r["id"] for r in rows}), 25)
+
+        # NULL 마감일 먼저, 이후 (bid_clse_dt, id) 내림차순
+        nulls = [r for r in rows if r["bid_clse_dt"] is None]
+        self.assertEqual(rows[:len(nulls)], nulls)
+        keys = [(r["bid_clse_dt"], r["id"]) for r in rows[len(nulls):]]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_projection_and_filters(self):
+        page = paginate_tenders(self.repo, limit=5)
+        self.assertNotIn("raw_api_response", page.items[0])
+
+        page = paginate_tenders(self.repo, fields="bid_ntce_nm", limit=5)
+        self.assertEqual(set(page.items[0]), {"id", "bid_clse_dt", "bid_ntce_nm"})
+        with self.assertRaises(ValueError):
+            paginate_tenders(self.repo, fields="bid_ntce_nm,password")
+
+        rows, _ = self._walk(filters=TenderFilter(source="KEPCO", status=["OPEN"], title_contains="유연탄"), limit=3)
+        self.assertTrue(rows)
+        self.assertTrue(all(r["source"] == "KEPCO" and r["status"] == "OPEN" and "유연탄" in r["bid_ntce_nm"] for r in rows))
+
+        rows, _ = self._walk(filters=TenderFilter(closing_from=datetime(2025, 1, 5)), limit=50)
+        self.assertTrue(rows and all(r["bid_clse_dt"] >= "2025-01-05" for r in rows))
+
+    def test_cursor_validation(self):
+        token = encode_cursor([None, "abc"])
+        self.assertEqual(decode_cursor(token, 2), [None, "abc"])
+        for bad in ("!!!", encode_cursor([1, 2]), encode_cursor(["only-one"])):
+            with self.assertRaises(ValueError):
+                decode_cursor(bad, 2)
+
+    def test_cursor_values_validated(self):
+        # PostgREST or_ 필터에 들어가는 값: id는 UUID, 마감일은 ISO-8601만
+        valid = encode_cursor(["2025-01-05T18:00:00", "0b7c6f1e-3d1a-4f7e-9c55-2f0d9a1b6c11"])
+        self.assertIsInstance(paginate_tenders(self.repo, cursor=valid, limit=1).items, list)
+        injected = [
+            encode_cursor(["2025-01-05", "1),id.gt.(0"]),
+            encode_cursor(['2025-01-05",bid_ntce_nm.ilike."*', "0b7c6f1e-3d1a-4f7e-9c55-2f0d9a1b6c11"]),
+            encode_cursor([None, "not-a-uuid"]),
+        ]
+        for token in injected:
+            with self.assertRaises(ValueError):
+                paginate_tenders(self.repo, cursor=token)
+        with self.assertRaises(ValueError):
+            paginate_attachments(self.repo, "0b7c6f1e-3d1a-4f7e-9c55-2f0d9a1b6c11", cursor=encode_cursor(["x,id.gt.0"]))
+
+    def test_attachments_page(self):
+        tender_id = self.repo.list_tenders(columns="id")[0]["id"]
+        for i in range(5):
+            self.repo.upsert_attachment(TenderAttachmentDTO(
+                tender_id=tender_id, file_name=f"f{i}.hwp", extracted_text="본문" * 1000,
+            ))
+        first = paginate_attachments(self.repo, tender_id, limit=3)
+        second = paginate_attachments(self.repo, tender_id, limit=3, cursor=first.next_cursor)
+        self.assertNotIn("extracted_text", first.items[0])
+        self.assertEqual(len(first.items) + len(second.items), 5)
+        self.assertIsNone(second.next_cursor)
+
+    def test_etag(self):
+        page = paginate_tenders(self.repo, limit=5).to_dict()
+        tag = etag(page)
+        self.assertTrue(etag_matches(tag, tag))
+        self.assertTrue(etag_matches(f'"other", {tag.removeprefix("W/")}', tag))
+        self.assertFalse(etag_matches('W/"other"', tag))
+        self.assertEqual(etag(paginate_tenders(self.repo, limit=5).to_dict()), tag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+문서 파서 테스트 (PDF / XLSX / DOCX / HWP, 임시 파일 생성)
+페이지 / 시트 / 블록 / 구역 단위 지연 읽기, 공통 스펙 추출 경로, factory 등록, TenderSpecDTO 매핑 검증
+"""
+import os
+import sys
+import struct
+import shutil
+import zipfile
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+
+from dto import Incoterms
+from parsers.docx import DOCXParser
+from parsers.factory import ParserFactory
+from parsers.hwp import HWPParser
+from parsers.pdf import PDFParser
+from parsers.xlsx import XLSXParser
+
+SPEC_LINES = ["Thermal coal (bituminous) tender", "NAR 5800 kcal/kg", "Sulfur 0.8 %", "Ash 12.5 %", "Quantity 75,000 MT CIF"]
+
+
+def _write_pdf(path: str, pages):
+    """텍스트 레이어만 있는 최소 PDF (Helvetica, ASCII)"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        ops = "BT /F1 11 Tf 14 TL 50 750 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+def _write_docx(path: str):
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    para = lambda text, brk="": f"<w:p><w:r>{brk}<w:t>{text}</w:t></w:r></w:p>"
+    cell = lambda text: f"<w:tc>{para(text)}</w:tc>"
+    rows = [("항목", "규격"), ("발열량", "5800 kcal/kg 이상"), ("유황분", "0.8 % 이하"), ("회분", "12.5 % 이하")]
+    table = "<w:tbl>" + "".join(f"<w:tr>{cell(a)}{cell(b)}</w:tr>" for a, b in rows) + "</w:tbl>"
+    body = (para("입찰 공고문") + para("입찰참가자격 안내", '<w:br w:type="page"/>')
+            + para("발전용 유연탄 구매 규격") + table + para("인도조건 : FOB"))
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f'<?xml version="1.0" encoding="UTF-8"?><w:document {w}><w:body>{body}</w:body></w:document>')
+
+
+def _hwp_section(paragraphs) -> bytes:
+    """HWPTAG_PARA_TEXT 레코드 (탭은 8 WCHAR 인라인 컨트롤), 4096 bytes 이상이 되도록 다른 레코드로 채움"""
+    data = b""
+    for text in paragraphs:
+        body = b"".join(b"\x09\x00" + b"\x00" * 14 if ch == "\t" else ch.encode("utf-16-le") for ch in text) + b"\x0d\x00"
+        data += struct.pack("<I", 67 | len(body) << 20) + body
+    filler = b"\x00" * max(4096 - len(data), 0)
+    return data + struct.pack("<I", 66 | 0xFFF << 20) + struct.pack("<I", len(filler)) + filler
+
+
+def _write_hwp(path: str, preview: str, sections):
+    """최소 OLE(CFB v3) 파일: FileHeader(비압축) / PrvText / BodyText/SectionN (모두 4096 bytes 이상 → mini stream 없음)"""
+    end, no_stream = 0xFFFFFFFE, 0xFFFFFFFF
+    header = b"HWP Document File".ljust(32, b"\x00") + struct.pack("<II", 0x05000300, 0)
+    streams = [("FileHeader", header.ljust(4096, b"\x00")), ("PrvText", (preview + " " * 2048).encode("utf-16-le"))]
+    streams += [(f"Section{i}", _hwp_section(paragraphs)) for i, paragraphs in enumerate(sections)]
+
+    # 디렉터리: Root → FileHeader → PrvText → BodyText (오른쪽 형제), BodyText → Section0 → Section1 ...
+    entries = [("Root Entry", 5, no_stream, no_stream, 1, end, 0)]
+    fat = [0xFFFFFFFD]
+    dir_sectors = (len(streams) + 2 + 3) // 4
+    fat += [i + 2 for i in range(dir_sectors - 1)] + [end]
+    data, next_sector = b"", 1 + dir_sectors
+    starts = {}
+    for name, payload in streams:
+        payload = payload.ljust(-(-len(payload) // 512) * 512, b"\x00")
+        count = len(payload) // 512
+        starts[name] = next_sector
+        fat += [next_sector + i + 1 for i in range(count - 1)] + [end]
+        next_sector += count
+        data += payload
+    section_ids = list(range(4, 4 + len(sections)))
+    entries += [("FileHeader", 2, no_stream, 2, no_stream, starts["FileHeader"], len(streams[0][1])),
+                ("PrvText", 2, no_stream, 3, no_stream, starts["PrvText"], len(streams[1][1])),
+                ("BodyText", 1, no_stream, no_stream, section_ids[0], end, 0)]
+    for i, (name, payload) in enumerate(streams[2:]):
+        right = section_ids[i + 1] if i + 1 < len(section_ids) else no_stream
+        entries.append((name, 2, no_stream, right, no_stream, starts[name], len(payload)))
+
+    directory = b""
+    for name, kind, left, right, child, start, size in entries:
+        encoded = (name + "\x00").encode("utf-16-le")
+        directory += (encoded.ljust(64, b"\x00") + struct.pack("<HBBIII", len(encoded), kind, 1, left, right, child)
+                      + b"\x00" * 36 + struct.pack("<IQ", start, size))
+    directory = directory.ljust(dir_sectors * 512, b"\x00")
+    fat_sector = b"".join(struct.pack("<I", v) for v in fat).ljust(512, b"\xff")
+    header = (bytes.fromhex("D0CF11E0A1B11AE1") + b"\x00" * 16 + struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\x00" * 6
+              + struct.pack("<IIIIIIIII", 0, 1, 1, 0, 4096, end, 0, end, 0) + struct.pack("<I", 0) + b"\xff" * 4 * 108)
+    with open(path, "wb") as f:
+        f.write(header + fat_sector + directory + data)
+
+
+class TestDocumentParsers(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_factory_registration(self):
+        for name, parser_cls in (("a.hwp", "HWPParser"), ("b.PDF", "PDFParser"), ("c.xlsx", "XLSXParser"), ("d.docx", "DOCXParser")):
+            self.assertEqual(type(ParserFactory.get_parser(name)).__name__, parser_cls)
+        self.assertFalse(ParserFactory.supports("e.zip"))
+        with self.assertRaises(ValueError):
+            ParserFactory.get_parser("e.zip")
+
+    def test_pdf_pages_streamed(self):
+        path = os.path.join(self.dir, "spec.pdf")
+        _write_pdf(path, [["General tender notice", "Bidder qualification"], SPEC_LINES, ["Appendix"]])
+
+        doc = PDFParser().parse(path)
+        self.assertEqual(doc.file_type, "pdf")
+        self.assertTrue(doc.is_coal_related)
+        self.assertEqual(doc.metadata, {"pages": 3, "relevant_pages": [2]})
+        spec = doc.coal_spec
+        self.assertEqual((spec.calorific_value_min, spec.sulfur_max, spec.ash_max, spec.quantity_mt, spec.incoterms),
+                         (5800, 0.8, 12.5, 75000.0, "CIF"))
+
+        dto = spec.to_tender_spec("tender-1")
+        self.assertEqual((dto.tender_id, dto.cv_min_kcal, dto.sulfur_max_pct, dto.incoterms), ("tender-1", 5800, 0.8, Incoterms.CIF))
+
+        # max_pages: 앞 페이지만 읽음
+        self.assertEqual(PDFParser(max_pages=1).parse(path).metadata["pages"], 1)
+
+    def test_xlsx_sheets_and_docx_blocks(self):
+        path = os.path.join(self.dir, "spec.xlsx")
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "안내"
+        workbook.active.append(["입찰 일정", "2025-03-01"])
+        sheet = workbook.create_sheet("규격")
+        for row in (["항목", "규격", None], ["발열량", "5800 kcal/kg"], ["황분", "0.8 %"], ["물량", "50,000 MT"], [None, None]):
+            sheet.append(row)
+        workbook.save(path)
+
+        doc = XLSXParser().parse(path)
+        self.assertEqual(doc.metadata, {"pages": 2, "relevant_pages": ["규격"]})
+        self.assertEqual((doc.coal_spec.calorific_value_min, doc.coal_spec.sulfur_max, doc.coal_spec.quantity_mt), (5800, 0.8, 50000.0))
+        pages = list(XLSXParser().iter_pages(path))
+        self.assertEqual(pages[1].tables, [[["항목", "규격"], ["발열량", "5800 kcal/kg"], ["황분", "0.8 %"], ["물량", "50,000 MT"]]])
+
+        path = os.path.join(self.dir, "spec.docx")
+        _write_docx(path)
+        pages = list(DOCXParser().iter_pages(path))
+        self.assertEqual([page.text.splitlines()[0] for page in pages], ["입찰 공고문", "발전용 유연탄 구매 규격", "항목 : 규격", "인도조건 : FOB"])
+        self.assertEqual(pages[2].tables[0][1], ["발열량", "5800 kcal/kg 이상"])
+
+        doc = DOCXParser().parse(path)
+        self.assertEqual((doc.coal_spec.calorific_value_min, doc.coal_spec.ash_max), (5800, 12.5))
+        self.assertEqual(doc.metadata["relevant_pages"], [2, "table 3"])
+
+    def test_hwp_body_sections_preferred_over_preview(self):
+        path = os.path.join(self.dir, "notice.hwp")
+        _write_hwp(path, "입찰 공고 (미리보기: 첫 페이지만)", [
+            ["발전용 유연탄 구매 입찰 공고", "입찰참가자격 안내"],
+            ["구매 규격", "발열량 : 5,800 kcal/kg 이상", "유황분\t0.8 % 이하", "회분 : 12.5 % 이하"],
+        ])
+        pages = list(HWPParser().iter_pages(path))
+        self.assertEqual([page.label for page in pages], ["Section0", "Section1"])
+        self.assertEqual(pages[1].text.splitlines()[2], "유황분\t0.8 % 이하")
+
+        doc = HWPParser().parse(path)
+        self.assertEqual((doc.coal_spec.calorific_value_min, doc.coal_spec.sulfur_max, doc.coal_spec.ash_max), (5800, 0.8, 12.5))
+        self.assertNotIn("미리보기", doc.full_text)
+
+        # 본문이 없으면 PrvText
+        _write_hwp(path, "유연탄 발열량 5800 kcal/kg", [[]])
+        self.assertEqual([page.label for page in HWPParser().iter_pages(path)], ["PrvText"])
+
+
+if __name__ == "__main__":
+    unittest.main()
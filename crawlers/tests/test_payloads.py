@@ -0,0 +1,112 @@
+"""
+원본 응답 분리 저장 테스트 (네트워크 불필요)
+canonical 해시, 압축 / 복원, 같은 내용 재수집 시 쓰기 생략, prune 후 재저장, 지연 조회 검증
+"""
+import os
+import sys
+import json
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import G2BApiResponse, RawPayload, TenderDTO, TenderSource
+from memory_repository import InMemoryRepository
+from payloads import canonical, decode_row, encode
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "output", "coal_tenders.json")
+
+
+def _kepco(no: str, crawled_at: str, title: str = "유연탄 구매") -> TenderDTO:
+    record = {"announcement_no": no, "title": title, "organization": "한국남동발전", "crawled_at": crawled_at}
+    return TenderDTO(bid_ntce_no=no, source=TenderSource.KEPCO, bid_ntce_nm=title, raw_api_response=RawPayload.from_obj(record))
+
+
+class TestPayloadEncoding(unittest.TestCase):
+
+    def test_canonical_hash_ignores_key_order_and_crawl_time(self):
+        a = encode({"b": 1, "a": "석탄", "crawled_at": "2025-01-01T09:00:00"})
+        b = encode(RawPayload('{"a":"석탄","b":1,"crawled_at":"2025-01-02T09:00:00"}'))
+        self.assertEqual(a.content_hash, b.content_hash)
+        self.assertEqual(canonical({"b": 1, "a": "석탄"}), '{"a":"석탄","b":1}'.encode("utf-8"))
+        self.assertIsNone(encode({}))
+        self.assertIsNone(encode(RawPayload("{}")))
+
+    def test_g2b_rows_compress_and_round_trip(self):
+        with open(DATA_PATH, encoding="utf-8") as f:
+            items = json.load(f)
+        raw_total = stored_total = 0
+        for item in items:
+            payload = G2BApiResponse.from_api_item(item).raw_response
+            encoded = encode(payload)
+            raw_total += encoded.raw_size
+            stored_total += len(encoded.body)
+            restored = decode_row(encoded.to_row())      # PostgREST bytea(\x hex) 형식
+            self.assertEqual(restored.to_dict(), item)
+        self.assertIn(encoded.codec, ("zstd", "zlib"))
+        self.assertLess(stored_total, raw_total * 0.5)
+
+        tiny = encode({"a": 1})
+        self.assertEqual(tiny.codec, "identity")
+
+
+class TestRawPayloadStore(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+
+    def test_unchanged_payload_written_once(self):
+        first = self.repo.upsert_tender(_kepco("K-1", "2025-01-01T09:00:00"))
+        second = self.repo.upsert_tender(_kepco("K-1", "2025-01-02T09:00:00"))
+
+        self.assertEqual(self.repo.queries[("raw_payloads", "upsert")], 1)
+        self.assertEqual(len(self.repo.tables["raw_payloads"]), 1)
+        self.assertEqual(first["raw_payload_hash"], second["raw_payload_hash"])
+        self.assertNotIn("raw_api_response", second)
+
+        # 재시작(해시 캐시 없음) 후에는 전송하지만 DB에서 충돌 무시
+        self.repo._known_payloads.clear()
+        self.repo.upsert_tender(_kepco("K-1", "2025-01-03T09:00:00"))
+        self.assertEqual(self.repo.queries[("raw_payloads", "upsert")], 2)
+        self.assertEqual(len(self.repo.tables["raw_payloads"]), 1)
+
+        changed = self.repo.upsert_tender(_kepco("K-1", "2025-01-04T09:00:00", title="유연탄 구매 (정정)"))
+        self.assertNotEqual(changed["raw_payload_hash"], first["raw_payload_hash"])
+        self.assertEqual(len(self.repo.tables["raw_payloads"]), 2)
+
+        # 원본 응답 없는 갱신은 기존 해시 유지
+        kept = self.repo.upsert_tender(TenderDTO(bid_ntce_no="K-1", source=TenderSource.KEPCO, bid_ntce_nm="유연탄 구매 (정정)"))
+        self.assertEqual(kept["raw_payload_hash"], changed["raw_payload_hash"])
+
+    def test_pruned_payload_is_written_again(self):
+        first = self.repo.upsert_tender(_kepco("K-3", "2025-01-01T09:00:00"))
+        self.repo.upsert_tender(_kepco("K-3", "2025-01-02T09:00:00", title="유연탄 구매 (정정)"))
+        # 다른 프로세스의 prune_raw_payloads: 참조가 끊긴 원본 삭제 (이 프로세스 해시 캐시에는 남아 있음)
+        del self.repo.tables["raw_payloads"][first["raw_payload_hash"]]
+        self.assertIn(first["raw_payload_hash"], self.repo._known_payloads)
+
+        reverted = self.repo.upsert_tender(_kepco("K-3", "2025-01-03T09:00:00"))
+        self.assertEqual(reverted["raw_payload_hash"], first["raw_payload_hash"])
+        self.assertIn(first["raw_payload_hash"], self.repo.tables["raw_payloads"])
+        self.assertEqual(self.repo.get_tender_raw_payload(reverted["id"])["announcement_no"], "K-3")
+
+    def test_lazy_fetch(self):
+        tender_id = self.repo.upsert_tender(_kepco("K-2", "2025-01-01T09:00:00"))["id"]
+        self.repo.reset_counters()
+        self.assertEqual(len(self.repo.list_tenders(columns="id, bid_ntce_nm")), 1)
+        self.assertEqual(self.repo.queries[("raw_payloads", "select")], 0)
+
+        payload = self.repo.get_tender_raw_payload(tender_id)
+        self.assertEqual(payload["announcement_no"], "K-2")
+        self.assertNotIn("crawled_at", payload)
+        self.assertIsNone(self.repo.get_tender_raw_payload("missing"))
+
+        # 이관 전 행은 raw_api_response 그대로
+        legacy = self.repo._upsert("tenders", {"source": "G2B", "bid_ntce_no": "G-1", "bid_ntce_ord": "000",
+                                               "bid_ntce_nm": "legacy", "raw_api_response": {"bidNtceNo": "G-1"}},
+                                   on_conflict=("source", "bid_ntce_no", "bid_ntce_ord"))
+        self.assertEqual(self.repo.get_tender_raw_payload(legacy["id"]).to_dict(), {"bidNtceNo": "G-1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
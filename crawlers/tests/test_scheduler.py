@@ -0,0 +1,189 @@
+"""
+크롤링 스케줄러 테스트 (브라우저 / 네트워크 불필요)
+cron 계산, 놓친 실행 보충, single-flight, 마감 임박 우선순위(probe 캐시), 상태 저장 검증
+"""
+import os
+import sys
+import asyncio
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import SCHEDULER_TZ, CronExpression, CrawlScheduler, ScheduleEntry, SingleFlight
+
+
+def _at(*args) -> datetime:
+    return datetime(*args, tzinfo=SCHEDULER_TZ)
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class TestCronExpression(unittest.TestCase):
+
+    def test_next_after(self):
+        # n8n 6필드(초 포함) 형식
+        self.assertEqual(CronExpression("0 30 8 * * *").next_after(_at(2025, 1, 1, 8, 30)), _at(2025, 1, 2, 8, 30))
+        weekdays = CronExpression("0 9,13,17 * * 1-5")
+        self.assertEqual(weekdays.next_after(_at(2025, 1, 3, 17, 0)), _at(2025, 1, 6, 9, 0))     # 금 → 월
+        self.assertEqual(CronExpression("*/20 * * * *").next_after(_at(2025, 1, 1, 10, 41)), _at(2025, 1, 1, 11, 0))
+        self.assertEqual(CronExpression("0 0 29 2 *").next_after(_at(2025, 1, 1)), _at(2028, 2, 29))
+        # 일/요일 모두 지정 → OR
+        self.assertEqual(CronExpression("0 0 15 * 0").next_after(_at(2025, 1, 1)), _at(2025, 1, 5))
+
+    def test_invalid(self):
+        for expression in ("* * *", "61 * * * *", "*/0 * * * *", "5-1 * * * *"):
+            with self.assertRaises(ValueError):
+                CronExpression(expression)
+        with self.assertRaises(ValueError):
+            CronExpression("0 0 31 2 *").next_after(_at(2025, 1, 1))
+
+
+class TestCrawlScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock(_at(2025, 3, 10, 8, 0))
+        self.calls = []
+
+    async def _runner(self, entry, keywords):
+        self.calls.append((entry.name, list(keywords)))
+        await asyncio.sleep(0)
+        return {"count": len(keywords)}
+
+    def _scheduler(self, entries, **kwargs):
+        return CrawlScheduler(entries, runner=self._runner, clock=self.clock, **kwargs)
+
+    def test_cron_run_and_history(self):
+        scheduler = self._scheduler([ScheduleEntry("coal", "30 8 * * *", keywords=["유연탄", "석탄"], jitter_seconds=60)])
+        fire_at = datetime.fromisoformat(scheduler.next_runs()["coal"]["fire_at"])
+        self.assertTrue(_at(2025, 3, 10, 8, 30) <= fire_at <= _at(2025, 3, 10, 8, 31))
+
+        self.assertEqual(scheduler.tick(_at(2025, 3, 10, 8, 29)), [])
+        self.clock.now = _at(2025, 3, 10, 8, 31)
+        asyncio.run(scheduler.run_pending())
+
+        self.assertEqual(self.calls, [("coal", ["유연탄", "석탄"])])
+        run = scheduler.runs()[0]
+        self.assertEqual((run["status"], run["trigger"], run["result"]), ("success", "cron", {"count": 2}))
+        self.assertEqual(scheduler.next_runs()["coal"]["scheduled_for"], _at(2025, 3, 11, 8, 30).isoformat())
+
+    def test_missed_runs_coalesce_or_expire(self):
+        scheduler = self._scheduler([
+            ScheduleEntry("hourly", "0 * * * *", catch_up_hours=6),
+            ScheduleEntry("daily", "0 9 * * *", keywords=["석탄"], catch_up_hours=1),
+        ])
+        # 루프가 8시 → 12시 30분까지 멈췄다가 재개
+        self.clock.now = _at(2025, 3, 10, 12, 30)
+        asyncio.run(scheduler.run_pending())
+
+        runs = {r["entry"]: r for r in scheduler.runs()}
+        self.assertEqual((runs["hourly"]["status"], runs["hourly"]["trigger"]), ("success", "catch_up"))
+        self.assertEqual(runs["daily"]["status"], "missed")
+        self.assertEqual(self.calls, [("hourly", ["유연탄"])])     # 놓친 4회를 1회로 합침
+        self.assertEqual(scheduler.next_runs()["hourly"]["scheduled_for"], _at(2025, 3, 10, 13, 0).isoformat())
+
+    def test_single_flight_skips_running_keywords(self):
+        flight = SingleFlight()
+        scheduler = self._scheduler([ScheduleEntry("coal", "0 9 * * *", keywords=["유연탄", "석탄"])], single_flight=flight)
+        self.clock.now = _at(2025, 3, 10, 9, 0)
+
+        async def scenario():
+            with flight.acquire("KEPCO", ["유연탄"]) as held:
+                self.assertEqual(held, ["유연탄"])
+                await scheduler.run_pending()
+            self.assertEqual(flight.active(), [])
+            with flight.acquire("KEPCO", ["유연탄", "석탄"]):
+                scheduler.trigger("coal")
+                await scheduler.run_pending()
+
+        asyncio.run(scenario())
+        self.assertEqual(self.calls, [("coal", ["석탄"])])
+        manual, cron = scheduler.runs()
+        self.assertEqual((manual["trigger"], manual["status"]), ("manual", "skipped"))
+        self.assertEqual(cron["keywords"], ["석탄"])
+
+    def test_near_deadline_priority(self):
+        self.clock.now = _at(2025, 3, 10, 9, 30)
+        scheduler = self._scheduler(
+            [
+                ScheduleEntry("g2b", "0 11 * * *", source="G2B", priority=5),
+                ScheduleEntry("kepco", "0 11 * * *", urgent_cron="0 */2 * * *", urgent_hours=12),
+            ],
+            deadline_probe=lambda source: _at(2025, 3, 10, 15, 0) if source == "KEPCO" else None,
+        )
+        # 마감 임박 → urgent_cron(2시간 간격)이 일반 일정보다 먼저
+        self.assertEqual(scheduler.next_runs()["kepco"], {
+            "scheduled_for": _at(2025, 3, 10, 10, 0).isoformat(),
+            "fire_at": _at(2025, 3, 10, 10, 0).isoformat(),
+            "trigger": "urgent",
+        })
+        self.assertEqual(scheduler.next_runs()["g2b"]["trigger"], "cron")
+
+        # urgent 실행 후에는 일반 일정(11:00)이 더 빠름, 같은 시각 대기 항목 중 마감 임박 source 먼저
+        self.clock.now = _at(2025, 3, 10, 10, 0)
+        asyncio.run(scheduler.run_pending())
+        self.assertEqual(scheduler.next_runs()["kepco"]["scheduled_for"], _at(2025, 3, 10, 11, 0).isoformat())
+        self.clock.now = _at(2025, 3, 10, 11, 0)
+        asyncio.run(scheduler.run_pending())
+        self.assertEqual([name for name, _ in self.calls], ["kepco", "kepco", "g2b"])
+
+    def test_deadline_probe_off_event_loop_and_cached(self):
+        probes = []
+
+        def probe(source):
+            probes.append(threading.current_thread() is threading.main_thread())
+            return _at(2025, 3, 10, 15, 0)
+
+        async def scenario():
+            # 이벤트 루프 안에서 생성 → 생성 시 동기 조회 없음
+            scheduler = self._scheduler(
+                [ScheduleEntry("kepco", "0 11 * * *", urgent_cron="0 */2 * * *", urgent_hours=12)],
+                deadline_probe=probe,
+                deadline_ttl_seconds=600,
+            )
+            self.assertEqual(probes, [])
+            await scheduler.start()
+            await scheduler.stop()
+            self.assertEqual(scheduler.next_runs()["kepco"]["trigger"], "urgent")
+            scheduler.trigger("kepco")                                  # 캐시 사용
+            self.clock.now = _at(2025, 3, 10, 10, 0)
+            await scheduler.run_pending()                               # TTL 이내 → 재조회 없음
+            self.clock.now = _at(2025, 3, 10, 10, 20)
+            await scheduler.run_pending()                               # TTL 만료 → 스레드에서 재조회
+            return scheduler
+
+        self.clock.now = _at(2025, 3, 10, 9, 55)
+        asyncio.run(scenario())
+        self.assertEqual(probes, [False, False])
+        self.assertEqual([name for name, _ in self.calls], ["kepco"])        # 수동 실행에 10:00 urgent 합쳐짐
+
+    def test_state_resume_catches_up_after_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scheduler_state.json")
+            entries = lambda: [ScheduleEntry("coal", "30 8 * * *")]
+
+            scheduler = self._scheduler(entries(), state_path=path)
+            self.clock.now = _at(2025, 3, 10, 8, 30)
+            asyncio.run(scheduler.run_pending())
+            self.assertTrue(os.path.exists(path))
+
+            # 다음날 08:30 이후 재시작 → 놓친 1회 보충
+            self.clock.now = _at(2025, 3, 11, 10, 0)
+            restarted = self._scheduler(entries(), state_path=path)
+            self.assertEqual(restarted.next_runs()["coal"]["trigger"], "catch_up")
+            asyncio.run(restarted.run_pending())
+            self.assertEqual(len(self.calls), 2)
+            self.assertEqual(restarted.runs()[0]["scheduled_for"], _at(2025, 3, 11, 8, 30).isoformat())
+
+
+if __name__ == "__main__":
+    unittest.main()
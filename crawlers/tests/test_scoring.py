@@ -0,0 +1,122 @@
+"""
+관련도 점수 테스트 (네트워크 불필요, LLM은 로컬 stub)
+로컬 분류 / 애매한 공고만 배치 호출 / 공고명 해시 캐시 / 실패 시 로컬 점수 / 저장 검증
+"""
+import os
+import sys
+import json
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderDTO, TenderSource
+from memory_repository import InMemoryRepository
+from scoring import RelevanceModel, ScoreCache, TenderScorer, Verdict, load_labeled_titles, parse_verdicts, score_pending
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "output", "coal_tenders.json")
+
+
+class StubLLM:
+    """'연료' 포함 공고는 관련(0.8), 나머지는 0.1"""
+
+    def __init__(self, batch_size: int = 2, fail: bool = False):
+        self.batch_size = batch_size
+        self.fail = fail
+        self.batches = []
+
+    def classify(self, items):
+        self.batches.append([title for _, title, _ in items])
+        if self.fail:
+            raise TimeoutError("LLM timeout")
+        return {key: Verdict(0.8 if "연료" in title else 0.1, f"{title} 요약") for key, title, _ in items}
+
+
+def _row(no: str, title: str) -> dict:
+    return {"id": no, "source": "G2B", "bid_ntce_no": no, "bid_ntce_ord": "00", "bid_ntce_nm": title, "dminstt_nm": "한국남동발전"}
+
+
+class TestRelevanceModel(unittest.TestCase):
+
+    def test_trained_on_g2b_sample(self):
+        self.assertEqual(load_labeled_titles(DATA_PATH), [])       # 레이블 없음 → 키워드 규칙으로 레이블 만들지 않음
+        examples = load_labeled_titles(DATA_PATH, default=0)       # 일반 G2B 공고 표본 → 무관
+        self.assertEqual(len(examples), 50)
+        self.assertFalse(any(label for _, label in examples))
+
+        positives = ["발전용 유연탄 구매", "영흥 저열량탄 해상운송", "석탄 하역 용역", "연료탄 구매 입찰 (호주산)"]
+        model = RelevanceModel().fit([t for t, _ in examples] + positives, [l for _, l in examples] + [1] * len(positives))
+        restored = RelevanceModel.from_dict(json.loads(json.dumps(model.to_dict())))
+
+        self.assertGreater(restored.predict("2025년 하반기 유연탄 구매"), 0.7)
+        self.assertLess(restored.predict("2026학년도 신입생 교복 구매"), 0.1)
+        self.assertLess(restored.predict("학교급식용 부식류 구매"), RelevanceModel().predict("학교급식용 부식류 구매"))
+
+
+class TestTenderScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            _row("1", "발전용 유연탄 구매"),            # 확실 → 로컬
+            _row("2", "학교급식용 부식류 구매"),         # 확실 → 로컬
+            _row("3", "발전 연료 공급 용역"),           # 애매
+            _row("4", "발전  연료 공급 용역"),          # 공백만 다름 → 같은 해시
+            _row("5", "화력 설비 연료 구매"),           # 애매
+            _row("6", "화력 연료 운송"),                # 애매
+        ]
+
+    def test_only_ambiguous_batched_and_cached(self):
+        llm = StubLLM(batch_size=2)
+        scorer = TenderScorer(llm=llm, cache=ScoreCache())
+        results = scorer.score(self.rows)
+
+        self.assertEqual([r.source for r in results], ["local", "local", "llm", "llm", "llm", "llm"])
+        self.assertEqual(llm.batches, [["발전 연료 공급 용역", "화력 설비 연료 구매"], ["화력 연료 운송"]])
+        self.assertGreater(results[0].score, 0.7)
+        self.assertLess(results[1].score, 0.3)
+        self.assertEqual(results[3].summary, "발전 연료 공급 용역 요약")
+
+        # 같은 공고명은 캐시 → LLM 재호출 없음
+        again = scorer.score([_row("7", "화력 연료 운송")])
+        self.assertEqual((again[0].source, len(llm.batches)), ("cache", 2))
+
+    def test_llm_failure_and_call_cap_fall_back_to_local(self):
+        scorer = TenderScorer(llm=StubLLM(fail=True), cache=ScoreCache())
+        results = scorer.score(self.rows)
+        self.assertTrue(all(r.source == "local" for r in results))
+        self.assertEqual(len(scorer.cache), 0)
+
+        capped = TenderScorer(llm=StubLLM(batch_size=1), cache=ScoreCache(), max_llm_calls=1)
+        self.assertEqual([r.source for r in capped.score(self.rows)].count("llm"), 2)
+
+    def test_parse_verdicts(self):
+        text = '```json\n[{"id": "a", "score": 1.4, "summary": "석탄 구매"}, {"id": "x", "score": 0.2}]\n```'
+        verdicts = parse_verdicts(text, ["a", "b"])
+        self.assertEqual(list(verdicts), ["a"])
+        self.assertEqual((verdicts["a"].score, verdicts["a"].summary), (1.0, "석탄 구매"))
+        with self.assertRaises(ValueError):
+            parse_verdicts("죄송합니다", ["a"])
+
+    def test_score_pending_updates_repository(self):
+        repo = InMemoryRepository()
+        for no, title in (("K-1", "유연탄 구매"), ("K-2", "화력 연료 운송"), ("K-3", "사무용 PC 구매")):
+            repo.upsert_tender(TenderDTO(bid_ntce_no=no, source=TenderSource.KEPCO, bid_ntce_nm=title, ai_summary="기존 요약"))
+        scorer = TenderScorer(llm=StubLLM(), cache=ScoreCache())
+
+        self.assertEqual(score_pending(repo, scorer)["scored"], 3)
+        rows = {row["bid_ntce_no"]: row for row in repo.list_tenders()}
+        self.assertEqual(rows["K-2"]["relevance_score"], 0.8)
+        self.assertEqual(rows["K-2"]["ai_summary"], "화력 연료 운송 요약")
+        self.assertEqual(rows["K-1"]["ai_summary"], "기존 요약")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(repo.list_unscored_tenders(), [])
+        self.assertEqual(score_pending(repo, scorer), {"scored": 0})
+
+        # 재크롤링 upsert (점수 / 요약 없음) → 기존 점수 / 요약 유지
+        repo.upsert_tender(TenderDTO(bid_ntce_no="K-2", source=TenderSource.KEPCO, bid_ntce_nm="화력 연료 운송"))
+        row = [row for row in repo.list_tenders() if row["bid_ntce_no"] == "K-2"][0]
+        self.assertEqual((row["relevance_score"], row["ai_summary"]), (0.8, "화력 연료 운송 요약"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+전문 검색 테스트 (네트워크 불필요)
+한글 bigram 토큰화, 로컬 역색인(BM25 / 단위별 AND), DB RPC fallback, listener 증분 갱신 검증
+"""
+import os
+import sys
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderAttachmentDTO, TenderDTO, TenderSource
+from memory_repository import InMemoryRepository
+from search import InvertedIndex, TenderSearch, tokenize
+
+
+class FailingRPCRepository(InMemoryRepository):
+    """마이그레이션 002 미적용 / 일시 장애 DB (fail=True 동안 RPC 호출 실패)"""
+
+    fail = True
+
+    def search_tenders(self, query, limit=20, source=None):
+        if self.fail:
+            raise RuntimeError("Could not find the function public.search_tenders")
+        return [{"tender_id": "rpc"}]
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_hangul_bigrams_and_words(self):
+        self.assertEqual(tokenize("유연탄 NAR 5800"), ["유연", "연탄", "nar", "5800"])
+        self.assertEqual(tokenize("(발전용) 탄, S-0.8%"), ["발전", "전용", "탄", "s", "0", "8"])
+        self.assertEqual(tokenize(None), [])
+
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def test_and_within_unit_and_removal(self):
+        index = InvertedIndex()
+        index.add("t:1", "1", [("유연탄 구매 입찰", 1.0)])
+        index.add("a:1", "1", [("NAR 5800 kcal", 0.1)], label="spec.hwp")
+        index.add("t:2", "2", [("유연탄 NAR 5800 구매", 1.0)])
+
+        # 공고 1은 토큰이 두 단위에 나뉘어 있어 불일치
+        self.assertEqual(set(index.search("유연탄 NAR 5800")), {"2"})
+        self.assertEqual(index.search("5800")["1"][1], ["spec.hwp"])
+
+        index.remove("t:2")
+        self.assertEqual(index.search("유연탄 NAR 5800"), {})
+        self.assertEqual(len(index), 2)
+
+
+class TestTenderSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.t1 = self._tender("T-1", "2025년 발전용 유연탄 구매", "한국남동발전", datetime(2025, 1, 10))
+        self.t2 = self._tender("T-2", "연료 구매 입찰", "한국남부발전", datetime(2025, 2, 10), source=TenderSource.G2B)
+        self.t3 = self._tender("T-3", "사무용품 구매", "한국전력공사", datetime(2025, 3, 10))
+        self.repo.upsert_attachment(TenderAttachmentDTO(
+            tender_id=self.t2, file_name="규격서.hwp", file_type="hwp", is_parsed=True,
+            extracted_text="수입 유연탄 (NAR 5800 kcal/kg, 황분 0.8% 이하) 70,000톤",
+        ))
+
+    def _tender(self, no, title, org, close, source=TenderSource.KEPCO):
+        return self.repo.upsert_tender(TenderDTO(
+            bid_ntce_no=no, bid_ntce_ord="00", source=source, bid_ntce_nm=title, dminstt_nm=org, bid_clse_dt=close,
+        ))["id"]
+
+    def test_local_fallback_search(self):
+        search = TenderSearch(self.repo)
+        results = search.search("유연탄")
+        self.assertFalse(search.use_database)
+        self.assertEqual([r["tender_id"] for r in results], [self.t1, self.t2])      # 공고명 가중치 > 첨부 텍스트
+        self.assertEqual(results[1]["matched_files"], ["규격서.hwp"])
+
+        results = search.search("유연탄 NAR 5800")
+        self.assertEqual([r["tender_id"] for r in results], [self.t2])
+        self.assertEqual(search.search("유연탄", source="KEPCO")[0]["tender_id"], self.t1)
+        self.assertEqual(search.search("석유"), [])
+
+    def test_index_follows_repository_writes(self):
+        search = TenderSearch(self.repo)
+        self.assertEqual(search.search("5800")[0]["tender_id"], self.t2)
+        self.repo.reset_counters()
+
+        t4 = self._tender("T-4", "유연탄 NAR 5800 단기 구매", "한국서부발전", datetime(2025, 4, 1))
+        self.repo.upsert_attachment(TenderAttachmentDTO(
+            tender_id=self.t2, file_name="규격서.hwp", file_type="hwp", is_parsed=True, extracted_text="무연탄 규격",
+        ))
+        self.assertEqual([r["tender_id"] for r in search.search("5800")], [t4])
+        self.assertEqual(self.repo.calls["list_tenders"], 0)
+
+    def test_rpc_failure_falls_back(self):
+        repo = FailingRPCRepository()
+        repo.upsert_tender(TenderDTO(bid_ntce_no="X", source=TenderSource.KEPCO, bid_ntce_nm="유연탄 구매"))
+        search = TenderSearch(repo, retry_seconds=60)
+        with self.assertLogs("search.text", level="WARNING"):
+            self.assertEqual(len(search.search("유연탄")), 1)
+        self.assertTrue(search.use_database)
+
+        # 대기 시간 동안은 RPC 생략, 이후 복구되면 RPC 결과 + 로컬 색인 해제
+        repo.fail = False
+        self.assertNotEqual(search.search("유연탄")[0]["tender_id"], "rpc")
+        search._database_retry_at = 0.0
+        self.assertEqual(search.search("유연탄"), [{"tender_id": "rpc"}])
+        self.assertEqual(search._docs, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+표 인식 석탄 스펙 추출 테스트 (parsers/specs.py)
+min/max/단위/기준 열, "항목 : 값" 줄, 단위 환산, 신뢰도 기반 병합, 유사 라벨 오인식 방지, 신뢰도 저장 검증
+"""
+import os
+import sys
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import TenderDTO, TenderSource
+from memory_repository import InMemoryRepository
+from parsers.base import DocumentPage
+from parsers.hwp import HWPParser
+from parsers.specs import Candidate, SpecExtractor, match_field, normalize
+
+
+class TestSpecExtraction(unittest.TestCase):
+
+    def test_table_with_min_max_unit_basis_columns(self):
+        table = [
+            ["Parameter", "Basis", "Min", "Max", "Unit"],
+            ["Calorific Value", "NAR", "5,600", "6,000", "kcal/kg"],
+            ["Total Sulphur", "ARB", "", "0.8", "%"],
+            ["Ash", "ARB", "", "14", "%"],
+            ["Total Moisture", "ARB", "", "18", "%"],
+        ]
+        spec = SpecExtractor().extract([DocumentPage(1, "", tables=[table])])
+        self.assertEqual((spec.calorific_value_min, spec.calorific_value_max, spec.cv_basis), (5600, 6000, "NAR"))
+        self.assertEqual((spec.sulfur_max, spec.ash_max, spec.moisture_max), (0.8, 14.0, 18.0))
+        self.assertGreaterEqual(spec.confidence["calorific_value_min"], 0.7)
+
+    def test_label_value_lines_and_unit_conversion(self):
+        text = "\n".join([
+            "1. 품명 : 발전용 유연탄",
+            "2. 발열량(GAR) : 25.1 MJ/kg 이상",
+            "3. 유황분 : 0.6 % 이하",
+            "4. 물량 : 15만톤",
+            "5. 원산지 : 호주",
+            "6. 인도조건 : CIF 삼천포항",
+        ])
+        spec = SpecExtractor().extract([DocumentPage(1, text)])
+        self.assertEqual((spec.calorific_value_min, spec.cv_basis), (5995, "GAR"))
+        self.assertEqual((spec.sulfur_max, spec.quantity_mt, spec.origin), (0.6, 150000.0, "호주"))
+        self.assertEqual((spec.incoterms, spec.delivery_port), ("CIF", "삼천포항"))
+        self.assertEqual(normalize("calorific_value", 25_000, "kJ/kg")[0] // 1, 5971)
+        self.assertEqual(normalize("sulfur", 80, "%"), (None, True))          # 범위 밖 → 버림
+
+    def test_highest_confidence_wins(self):
+        spec = SpecExtractor.merge([
+            Candidate("sulfur", 1.0, 0.35),
+            Candidate("sulfur", 0.8, 0.85),
+            Candidate("calorific_value", 6200, 0.7, "min"),
+            Candidate("calorific_value", 5800, 0.7, "max"),
+        ])
+        self.assertEqual(spec.sulfur_max, 0.8)
+        self.assertEqual(spec.confidence["sulfur_max"], 0.85)
+        # 뒤바뀐 범위는 교정
+        self.assertEqual((spec.calorific_value_min, spec.calorific_value_max), (5800, 6200))
+
+    def test_near_miss_labels_not_matched(self):
+        for label in ("Cash deposit", "Washing plant", "Flash point", "Crash test", "Destinations", "Origination fee"):
+            self.assertIsNone(match_field(label), label)
+        for label, field_name in (("Ash (ARB)", "ash"), ("TotalSulfur", "sulfur"), ("Total  Sulphur", "sulfur"),
+                                  ("Port of Discharge", "delivery_port"), ("회분 (%)", "ash")):
+            self.assertEqual(match_field(label), field_name, label)
+
+        text = "Cash deposit : 5 %\nWashing plant : 2 %\nAsh 12.5 %"
+        spec = HWPParser().extract_spec([DocumentPage(1, text)])
+        self.assertEqual((spec.ash_max, spec.confidence["ash_max"]), (12.5, 0.35))
+
+    def test_confidence_persisted_with_spec(self):
+        repo = InMemoryRepository()
+        tender_id = repo.upsert_tender(TenderDTO(bid_ntce_no="K-1", source=TenderSource.KEPCO, bid_ntce_nm="유연탄 구매"))["id"]
+        spec = SpecExtractor().extract([DocumentPage(1, "", tables=[[["항목", "규격"], ["발열량", "5800 kcal/kg 이상"]]])])
+        repo.upsert_tender_spec(spec.to_tender_spec(tender_id))
+        stored = repo.get_tender_spec_by_tender_id(tender_id)
+        self.assertEqual(stored["cv_min_kcal"], 5800)
+        self.assertEqual(stored["extraction_confidence"], spec.confidence)
+        self.assertGreater(stored["extraction_confidence"]["calorific_value_min"], 0.7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+SpecIndex 테스트 (네트워크 불필요)
+가중 거리 top-k, 필터, 증분 갱신(listener) / 삭제 / 압축 검증
+"""
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dto import CVBasis, Incoterms, TenderDTO, TenderSource, TenderSpecDTO
+from memory_repository import InMemoryRepository
+from search import SpecIndex
+
+
+class TestSpecIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.tender_ids = {}
+        self._spec("T-5800", cv_min_kcal=5600, cv_max_kcal=6000, sulfur_max_pct=0.8, ash_max_pct=15.0,
+                   quantity_mt=70000, incoterms=Incoterms.CFR, origin="인도네시아")
+        self._spec("T-5900", cv_min_kcal=5700, cv_max_kcal=6100, sulfur_max_pct=0.7, ash_max_pct=14.0,
+                   quantity_mt=75000, incoterms=Incoterms.CFR, origin="Indonesia")
+        self._spec("T-6300", cv_min_kcal=6200, cv_max_kcal=6400, sulfur_max_pct=0.6, ash_max_pct=12.0,
+                   quantity_mt=150000, incoterms=Incoterms.FOB, origin="호주")
+        self._spec("T-4200", cv_min_kcal=4200, cv_basis=CVBasis.GAR, sulfur_max_pct=0.3,
+                   quantity_mt=50000, incoterms=Incoterms.FOB)
+        self.index = SpecIndex.from_repository(self.repo)
+
+    def _spec(self, no: str, **kwargs) -> str:
+        tender = self.repo.upsert_tender(TenderDTO(
+            bid_ntce_no=no, bid_ntce_ord="00", source=TenderSource.KEPCO,
+            bid_ntce_nm=f"Coal {no}", bid_clse_dt=datetime(2024, 12, 20, 18, 0),
+        ))
+        self.tender_ids[no] = tender["id"]
+        self.repo.upsert_tender_spec(TenderSpecDTO(tender_id=tender["id"], **kwargs))
+        return tender["id"]
+
+    def _nos(self, matches):
+        by_id = {v: k for k, v in self.tender_ids.items()}
+        return [by_id[m.tender_id] for m in matches]
+
+    def test_top_k_order(self):
+        query = TenderSpecDTO(cv_min_kcal=5650, cv_max_kcal=6050, sulfur_max_pct=0.75, ash_max_pct=14.5,
+                              quantity_mt=72000, incoterms=Incoterms.CFR, origin="indonesian")
+        matches = self.index.query(query, k=3)
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(set(self._nos(matches)[:2]), {"T-5800", "T-5900"})
+        self.assertTrue(all(a.distance <= b.distance for a, b in zip(matches, matches[1:])))
+        self.assertNotIn("T-4200", self._nos(matches))
+
+    def test_matches_brute_force_distance(self):
+        query = {"cv_min_kcal": 6000, "cv_max_kcal": 6200, "sulfur_max_pct": 0.65, "incoterms": "FOB"}
+        full = self.index.distances(query)
+        matches = self.index.query(query, k=4)
+        self.assertEqual([m.distance for m in matches], sorted(full[np.isfinite(full)].tolist()))
+
+    def test_filters_and_exclusions(self):
+        query = TenderSpecDTO(cv_min_kcal=5800, cv_max_kcal=6000, incoterms=Incoterms.FOB)
+        self.assertEqual(set(self._nos(self.index.query(query, k=10, same_incoterms=True))), {"T-6300", "T-4200"})
+        overlap = set(self._nos(self.index.query(query, k=10, require_cv_overlap=True)))
+        self.assertEqual(overlap, {"T-5800", "T-5900"})
+
+        similar = self._nos(self.index.similar_to_tender(self.tender_ids["T-5800"], k=2))
+        self.assertEqual(similar[0], "T-5900")
+        self.assertNotIn("T-5800", similar)
+        with self.assertRaises(KeyError):
+            self.index.similar_to_tender("missing")
+
+    def test_incremental_updates_via_listener(self):
+        new_id = self._spec("T-5850", cv_min_kcal=5650, cv_max_kcal=6050, sulfur_max_pct=0.8, ash_max_pct=15.0,
+                            quantity_mt=70000, incoterms=Incoterms.CFR, origin="Indonesia")
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.index.similar_to_tender(self.tender_ids["T-5800"], k=1)[0].tender_id, new_id)
+
+        # 같은 tender의 스펙 갱신 → 슬롯 재사용
+        self.repo.upsert_tender_spec(TenderSpecDTO(tender_id=new_id, cv_min_kcal=4100, cv_basis=CVBasis.GAR, sulfur_max_pct=0.3))
+        self.assertEqual(len(self.index), 5)
+        self.assertNotEqual(self.index.similar_to_tender(self.tender_ids["T-5800"], k=1)[0].tender_id, new_id)
+
+        self.index.close()
+        self._spec("T-9999", cv_min_kcal=5800)
+        self.assertEqual(len(self.index), 5)
+
+    def test_growth_remove_and_compact(self):
+        index = SpecIndex(initial_capacity=1)
+        rows = [{"id": f"s{i}", "tender_id": f"t{i}", "cv_min_kcal": 4000 + i, "cv_max_kcal": 4000 + i} for i in range(3000)]
+        index.upsert_rows(rows)
+        self.assertEqual(len(index), 3000)
+        for i in range(2000):
+            index.remove(f"s{i}")
+        self.assertEqual(len(index), 1000)
+        self.assertLess(index._size, 3000)
+
+        match = index.query({"cv_min_kcal": 4500, "cv_max_kcal": 4500}, k=1)[0]
+        self.assertEqual(match.spec_id, "s2000")
+        self.assertEqual(index.similar_to_tender("t2999", k=1)[0].spec_id, "s2998")
+
+
+if __name__ == "__main__":
+    unittest.main()
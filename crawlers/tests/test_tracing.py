@@ -0,0 +1,51 @@
+"""
+계측 테스트 (네트워크 불필요)
+traced 호출이 /metrics 응답에 노출되는지, import 경로가 섞여도 collector를 공유하는지 검증
+"""
+import os
+import sys
+import importlib
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.testclient import TestClient
+
+import main
+from tracing import STAGE_DURATION, traced
+
+
+@traced("test", "metrics_probe")
+def _probe():
+    return 42
+
+
+@traced("test", "metrics_failure")
+def _failure():
+    raise RuntimeError("boom")
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_traced_call_in_metrics_endpoint(self):
+        self.assertEqual(_probe(), 42)
+        with self.assertRaises(RuntimeError):
+            _failure()
+
+        response = TestClient(main.app).get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        body = response.text
+        self.assertIn('carbonflow_stage_calls_total{component="test",outcome="ok",stage="metrics_probe"}', body)
+        self.assertIn('carbonflow_stage_calls_total{component="test",outcome="error",stage="metrics_failure"}', body)
+        self.assertIn('carbonflow_stage_duration_seconds_count{component="test",stage="metrics_probe"}', body)
+
+    def test_collectors_shared_across_import_paths(self):
+        # Docker(tracing) / 로컬(crawlers.tracing) 경로가 한 프로세스에서 섞여도 중복 등록 없이 같은 메트릭
+        package_tracing = importlib.import_module("crawlers.tracing")
+        self.assertIs(package_tracing.STAGE_DURATION, STAGE_DURATION)
+
+
+if __name__ == "__main__":
+    unittest.main()
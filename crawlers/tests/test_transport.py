@@ -0,0 +1,101 @@
+"""
+RecordReplayTransport 테스트
+MockTransport로 기록한 카세트를 SupabaseRepository 재생에 사용, max-rows 제한 서버에서 페이지 단위 조회 검증
+"""
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+import httpx
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+
+from dto import TenderDTO, TenderSource
+from repository import SupabaseRepository
+from transport import RecordReplayTransport, CassetteMissError
+
+SUPABASE_URL = "http://localhost:3000"
+SUPABASE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.test"
+
+
+def _fake_postgrest(request: httpx.Request) -> httpx.Response:
+    if request.method == "POST":
+        row = json.loads(request.content)
+        return httpx.Response(201, json=[{**row, "id": "tender-1"}])
+    return httpx.Response(200, json=[{"id": "tender-1", "bid_ntce_no": "20241220001"}])
+
+
+class TestRecordReplayTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.tmp.name, "tenders.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _tender(self):
+        return TenderDTO(
+            bid_ntce_no="20241220001",
+            bid_ntce_ord="00",
+            source=TenderSource.KEPCO,
+            bid_ntce_nm="Test Coal Tender",
+        )
+
+    def test_record_then_replay(self):
+        recorder = RecordReplayTransport(self.cassette, mode="record", inner=httpx.MockTransport(_fake_postgrest))
+        repo = SupabaseRepository(SUPABASE_URL, SUPABASE_KEY, transport=recorder)
+        recorded = repo.upsert_tender(self._tender())
+        repo.get_tender_by_id("tender-1")
+
+        with open(self.cassette, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(len(saved["interactions"]), 2)
+        self.assertNotIn("apikey", saved["interactions"][0]["request"]["headers"])
+
+        replayer = RecordReplayTransport(self.cassette, mode="replay")
+        repo = SupabaseRepository(SUPABASE_URL, SUPABASE_KEY, transport=replayer)
+        self.assertEqual(repo.upsert_tender(self._tender()), recorded)
+        self.assertEqual(repo.get_tender_by_id("tender-1")["bid_ntce_no"], "20241220001")
+
+        with self.assertRaises(CassetteMissError):
+            repo.get_tender_by_id("unknown")
+
+
+class TestPagedReads(unittest.TestCase):
+    """PostgREST max-rows(1000)보다 많은 행 → offset / limit 페이지로 모두 조회"""
+
+    MAX_ROWS = 1000
+
+    def _server(self, rows):
+        self.requests = 0
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            self.requests += 1
+            offset = int(request.url.params.get("offset", 0))
+            limit = min(int(request.url.params.get("limit", self.MAX_ROWS)), self.MAX_ROWS)
+            return httpx.Response(200, json=rows[offset:offset + limit])
+        return SupabaseRepository(SUPABASE_URL, SUPABASE_KEY, transport=httpx.MockTransport(handle))
+
+    def test_market_data_and_demurrage_calcs_are_paged(self):
+        rows = [{"id": str(i), "data_date": "2020-01-01", "index_name": f"I{i}"} for i in range(2500)]
+        repo = self._server(rows)
+        self.assertEqual(len(repo.get_market_data_between(date(2000, 1, 1), date(2030, 1, 1))), 2500)
+        self.assertEqual(self.requests, 3)
+        self.assertEqual(len(repo.list_demurrage_calcs()), 2500)
+        self.assertEqual(repo.list_demurrage_calcs([]), [])
+
+    def test_active_shipments_are_paged(self):
+        rows = [{"id": f"{i:05d}", "mmsi": str(440000000 + i), "current_status": "SAILING"} for i in range(1500)]
+        repo = self._server(rows)
+        self.assertEqual(len(repo.list_active_shipments()), 1500)
+        self.assertEqual(self.requests, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
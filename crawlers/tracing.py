@@ -0,0 +1,195 @@
+"""
+CarbonFlow 크롤링 계측 (Tracing & Metrics)
+단계별 소요 시간 히스토그램, 호출/에러 카운터, 선택적 구조화 span 로그
+
+사용법:
+    @traced("kepco", "search_keyword")
+    async def _search_keyword(...): ...
+
+    with span("parser", "hwp.parse", file=path):
+        ...
+
+    @instrument("repository")
+    class SupabaseRepository: ...
+
+환경 변수:
+    TRACE_SPANS=1  → span 종료 시 JSON 한 줄 로그 출력 (logger: carbonflow.trace)
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import inspect
+import logging
+import functools
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+
+logger = logging.getLogger("carbonflow.trace")
+
+SPAN_LOG_ENABLED = os.getenv("TRACE_SPANS", "").lower() in ("1", "true", "yes")
+
+
+# =====================================================
+# Metrics
+# =====================================================
+
+# 브라우저 대기(수 초)부터 DB 호출(수 ms)까지 포괄하는 버킷
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _shared_collectors() -> Dict[str, Any]:
+    """
+    이름 → collector 맵
+    로컬(crawlers.tracing)과 Docker(tracing) import 경로가 한 프로세스에서 섞이면
+    같은 파일이 모듈 2개로 로드됨 → 먼저 로드된 쪽의 맵을 공유 (중복 등록 에러 방지)
+    """
+    for name in ("tracing", "crawlers.tracing"):
+        module = sys.modules.get(name)
+        if (
+            module is not None and name != __name__ and isinstance(getattr(module, "_COLLECTORS", None), dict)
+            and os.path.samefile(module.__file__, __file__)
+        ):
+            return module._COLLECTORS
+    return {}
+
+
+_COLLECTORS: Dict[str, Any] = _shared_collectors()
+
+
+def _metric(metric_cls, name: str, *args, **kwargs):
+    """메트릭 생성 (이미 생성된 경우 기존 collector 반환)"""
+    existing = _COLLECTORS.get(name)
+    if existing is None:
+        existing = _COLLECTORS[name] = metric_cls(name, *args, **kwargs)
+    return existing
+
+
+STAGE_DURATION = _metric(
+    Histogram,
+    "carbonflow_stage_duration_seconds",
+    "Duration of crawl / repository / parser stages",
+    ["component", "stage"],
+    buckets=_BUCKETS,
+)
+STAGE_CALLS = _metric(
+    Counter,
+    "carbonflow_stage_calls_total",
+    "Number of stage invocations by outcome",
+    ["component", "stage", "outcome"],
+)
+STAGE_IN_PROGRESS = _metric(
+    Gauge,
+    "carbonflow_stage_in_progress",
+    "Stages currently running",
+    ["component", "stage"],
+)
+CRAWL_RESULTS = _metric(
+    Counter,
+    "carbonflow_crawl_results_total",
+    "Tender rows extracted by crawlers",
+    ["source"],
+)
+
+
+def render_metrics() -> bytes:
+    """Prometheus exposition 포맷으로 메트릭 직렬화"""
+    return generate_latest(REGISTRY)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+# =====================================================
+# Spans
+# =====================================================
+
+# 현재 실행 중인 span (중첩 span의 parent 추적용)
+_current_span: contextvars.ContextVar[Optional[Dict[str, str]]] = contextvars.ContextVar(
+    "carbonflow_current_span", default=None
+)
+
+
+@contextmanager
+def span(component: str, stage: str, **attrs: Any):
+    """단계 하나를 계측하는 컨텍스트 매니저 (sync / async 코드 모두 사용 가능)"""
+    parent = _current_span.get()
+    current = {
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex[:16],
+        "span_id": uuid.uuid4().hex[:8],
+    }
+    token = _current_span.set(current)
+    in_progress = STAGE_IN_PROGRESS.labels(component, stage)
+    in_progress.inc()
+
+    outcome = "ok"
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        in_progress.dec()
+        STAGE_DURATION.labels(component, stage).observe(elapsed)
+        STAGE_CALLS.labels(component, stage, outcome).inc()
+        _current_span.reset(token)
+
+        if SPAN_LOG_ENABLED:
+            record = {
+                "ts": datetime.now().isoformat(),
+                "trace_id": current["trace_id"],
+                "span_id": current["span_id"],
+                "parent_id": parent["span_id"] if parent else None,
+                "component": component,
+                "stage": stage,
+                "duration_ms": round(elapsed * 1000, 2),
+                "outcome": outcome,
+            }
+            if attrs:
+                record["attrs"] = attrs
+            logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def traced(component: str, stage: Optional[str] = None) -> Callable:
+    """함수/코루틴을 span으로 감싸는 데코레이터 (stage 기본값: 함수명)"""
+
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__.lstrip("_")
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(component, name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(component, name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def instrument(component: str, methods: Optional[Iterable[str]] = None) -> Callable:
+    """클래스의 public 메서드 전체(또는 지정 메서드)에 traced 적용하는 클래스 데코레이터"""
+
+    def decorator(cls):
+        names = methods or [
+            name for name, attr in vars(cls).items()
+            if inspect.isfunction(attr) and not name.startswith("_")
+        ]
+        for name in names:
+            setattr(cls, name, traced(component, name)(getattr(cls, name)))
+        return cls
+
+    return decorator
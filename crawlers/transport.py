@@ -0,0 +1,128 @@
+"""
+PostgREST HTTP Record/Replay Transport
+실제 Supabase 트래픽을 카세트(JSON)로 기록하고, 이후 네트워크 없이 재생
+
+사용법:
+    # 기록
+    transport = RecordReplayTransport("cassettes/tenders.json", mode="record")
+    repo = SupabaseRepository(url, key, transport=transport)
+
+    # 재생 (URL/KEY는 형식만 맞으면 됨)
+    transport = RecordReplayTransport("cassettes/tenders.json", mode="replay")
+    repo = SupabaseRepository(url, key, transport=transport)
+"""
+import os
+import json
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# 카세트에 저장하지 않는 헤더 (인증 정보 / 재생 시 의미 없는 헤더)
+_SENSITIVE_HEADERS = {"apikey", "authorization", "cookie", "set-cookie"}
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class CassetteMissError(Exception):
+    """재생 모드에서 기록되지 않은 요청"""
+
+
+class RecordReplayTransport(httpx.BaseTransport):
+    """
+    httpx Transport
+    - record: 실제 요청 수행 후 요청/응답 쌍을 카세트에 추가
+    - replay: (method, path, query, body) 키로 기록된 응답 반환
+      같은 키가 여러 번 기록되면 순서대로 반환하고 마지막 응답을 반복
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, cassette_path: str, mode: str = "replay", inner: Optional[httpx.BaseTransport] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.cassette_path = cassette_path
+        self.mode = mode
+        self.inner = inner or httpx.HTTPTransport(http2=True)
+        self._lock = threading.Lock()
+        self._recorded: List[Dict[str, Any]] = []
+        self._replay: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+        if mode == "replay":
+            with open(cassette_path, "r", encoding="utf-8") as f:
+                for entry in json.load(f)["interactions"]:
+                    self._replay[entry["key"]].append(entry)
+
+    @staticmethod
+    def request_key(request: httpx.Request) -> str:
+        body = request.content or b""
+        query = "&".join(sorted(request.url.query.decode().split("&"))) if request.url.query else ""
+        digest = hashlib.sha1(body).hexdigest()[:12] if body else "-"
+        return f"{request.method} {request.url.path}?{query} {digest}"
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.request_key(request)
+        if self.mode == "replay":
+            return self._play(key, request)
+        return self._record(key, request)
+
+    def _play(self, key: str, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            queue = self._replay.get(key)
+            if not queue:
+                raise CassetteMissError(f"No recorded interaction for: {key}")
+            entry = queue.pop(0) if len(queue) > 1 else queue[0]
+
+        response = entry["response"]
+        return httpx.Response(
+            status_code=response["status"],
+            headers=response["headers"],
+            content=response["body"].encode("utf-8"),
+            request=request,
+        )
+
+    def _record(self, key: str, request: httpx.Request) -> httpx.Response:
+        response = self.inner.handle_request(request)
+        content = response.read()
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in _DROPPED_RESPONSE_HEADERS | _SENSITIVE_HEADERS
+        }
+
+        entry = {
+            "key": key,
+            "request": {
+                "method": request.method,
+                "url": str(request.url),
+                "headers": {k: v for k, v in request.headers.items() if k.lower() not in _SENSITIVE_HEADERS},
+                "body": (request.content or b"").decode("utf-8", errors="replace"),
+            },
+            "response": {
+                "status": response.status_code,
+                "headers": headers,
+                "body": content.decode("utf-8", errors="replace"),
+            },
+        }
+        with self._lock:
+            self._recorded.append(entry)
+            self._save()
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+        )
+
+    def _save(self):
+        directory = os.path.dirname(self.cassette_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.cassette_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"interactions": self._recorded}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cassette_path)
+
+    def close(self):
+        self.inner.close()
@@ -1,12 +1,14 @@
 'use client'
 
 import { useEffect, useState } from 'react'
-import { supabase, Tender } from '@/lib/supabase'
+import { Tender } from '@/lib/supabase'
+import { DashboardSummary, fetchDashboardSummary, fetchTenderPage } from '@/lib/api'
 import { BarChart, Activity, ShoppingCart, TrendingUp, Anchor, FileText } from 'lucide-react'
 import { format } from 'date-fns'
 
 export default function Dashboard() {
   const [tenders, setTenders] = useState<Tender[]>([])
+  const [summary, setSummary] = useState<DashboardSummary | null>(null)
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
@@ -15,14 +17,9 @@ export default function Dashboard() {
 
   const fetchTenders = async () => {
     try {
-      const { data, error } = await supabase
-        .from('tenders')
-        .select('*')
-        .order('bid_clse_dt', { ascending: false })
-        .limit(10)
-
-      if (error) throw error
-      setTenders(data || [])
+      const [page, kpi] = await Promise.all([fetchTenderPage(10), fetchDashboardSummary()])
+      setTenders(page.items)
+      setSummary(kpi)
     } catch (error) {
       console.error('Error fetching tenders:', error)
     } finally {
@@ -50,7 +47,7 @@ export default function Dashboard() {
 
       {/* Stats Grid */}
       <div className="grid grid-cols-1 md:grid-cols-4 gap-6">
-        <StatCard title="Active Tenders" value={loading ? "..." : tenders.length.toString()} icon={<FileText className="text-blue-400" />} />
+        <StatCard title="Active Tenders" value={loading ? "..." : (summary ? summary.active : tenders.length).toLocaleString()} icon={<FileText className="text-blue-400" />} />
         <StatCard title="Avg. GCV" value="5,820" unit="kcal/kg" icon={<Activity className="text-emerald-400" />} />
         <StatCard title="Bituminous Idx" value="$124.50" change="+2.4%" icon={<TrendingUp className="text-indigo-400" />} />
         <StatCard title="Shipments" value="3" unit="En Route" icon={<Anchor className="text-cyan-400" />} />
@@ -0,0 +1,52 @@
+import { supabase, Tender } from '@/lib/supabase'
+
+// Crawler API (keyset pagination / projection / ETag) - set in .env.local
+const crawlerApiUrl = process.env.NEXT_PUBLIC_CRAWLER_API_URL || ""
+
+export const TENDER_LIST_FIELDS = ['id', 'bid_ntce_no', 'bid_ntce_nm', 'dminstt_nm', 'bid_clse_dt', 'status'] as const
+
+export type TenderPage = {
+    items: Tender[]
+    nextCursor: string | null
+}
+
+export async function fetchTenderPage(limit = 10, cursor?: string | null): Promise<TenderPage> {
+    if (crawlerApiUrl) {
+        const params = new URLSearchParams({ limit: String(limit), fields: TENDER_LIST_FIELDS.join(',') })
+        if (cursor) params.set('cursor', cursor)
+
+        // 브라우저 HTTP 캐시가 ETag로 재검증 (변경 없으면 304, 본문 재전송 없음)
+        const res = await fetch(`${crawlerApiUrl}/tenders?${params}`, { cache: 'no-cache' })
+        if (!res.ok) throw new Error(`Crawler API error: ${res.status}`)
+        const body = await res.json()
+        return { items: body.items, nextCursor: body.next_cursor }
+    }
+
+    // Crawler API 미설정 시 Supabase 직접 조회 (필요한 컬럼만)
+    const { data, error } = await supabase
+        .from('tenders')
+        .select(TENDER_LIST_FIELDS.join(','))
+        .order('bid_clse_dt', { ascending: false })
+        .limit(limit)
+
+    if (error) throw error
+    return { items: (data || []) as unknown as Tender[], nextCursor: null }
+}
+
+export type DashboardSummary = {
+    total: number
+    active: number
+    by_status: Record<string, number>
+    by_source: Record<string, number>
+    by_deadline: Record<string, number>
+    top_organizations: { dminstt_nm: string; tender_count: number }[]
+    open_budget: number
+}
+
+// 집계 뷰(tender_summary) 기반 KPI - crawler API 미설정 시 null (목록 건수로 대체)
+export async function fetchDashboardSummary(): Promise<DashboardSummary | null> {
+    if (!crawlerApiUrl) return null
+    const res = await fetch(`${crawlerApiUrl}/dashboard/summary`, { cache: 'no-cache' })
+    if (!res.ok) throw new Error(`Crawler API error: ${res.status}`)
+    return res.json()
+}
@@ -0,0 +1,141 @@
+-- CarbonFlow Intelligence System - 전문 검색 (Full-text search)
+-- 입찰공고명 / 수요기관 / 첨부파일 추출 텍스트 검색
+--
+-- PostgreSQL에는 한국어 text search 설정이 없으므로 토큰화를 직접 수행:
+--   한글 연속 구간 → 2-gram (유연탄 → 유연, 연탄), 영문/숫자 구간 → 소문자 단어 (NAR 5800 → nar, 5800)
+--   'simple' 설정으로 tsvector 생성 (불용어 / 형태소 처리 없음)
+-- crawlers/search/text.py 의 tokenize()와 동일한 규칙 (로컬 인덱스 fallback과 결과 일치)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- =====================================================
+-- 토큰화 함수
+-- =====================================================
+CREATE OR REPLACE FUNCTION search_tokens(input TEXT)
+RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT COALESCE(array_agg(
+        CASE WHEN runs.run ~ '^[가-힣]{2,}$' THEN substr(runs.run, i, 2) ELSE runs.run END
+        ORDER BY runs.ord, i
+    ), '{}'::TEXT[])
+    FROM regexp_matches(lower(COALESCE(input, '')), '[가-힣]+|[a-z0-9]+', 'g') WITH ORDINALITY AS m(arr, ord)
+    CROSS JOIN LATERAL (SELECT m.arr[1] AS run, m.ord) AS runs
+    CROSS JOIN LATERAL generate_series(
+        1, CASE WHEN runs.run ~ '^[가-힣]{2,}$' THEN char_length(runs.run) - 1 ELSE 1 END
+    ) AS i
+$$;
+
+-- 문서 → tsvector (tsvector 1MB 제한 대비 앞 200,000자만 사용)
+CREATE OR REPLACE FUNCTION search_document(input TEXT)
+RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT to_tsvector('simple', array_to_string(search_tokens(left(COALESCE(input, ''), 200000)), ' '))
+$$;
+
+-- 검색어 → tsquery (모든 토큰 AND), 토큰이 없으면 NULL
+CREATE OR REPLACE FUNCTION search_tsquery(input TEXT)
+RETURNS tsquery
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT CASE WHEN cardinality(tokens) = 0 THEN NULL
+                ELSE to_tsquery('simple', array_to_string(tokens, ' & ')) END
+    FROM (SELECT ARRAY(SELECT DISTINCT unnest(search_tokens(input))) AS tokens) AS q
+$$;
+
+-- =====================================================
+-- 검색 컬럼 / 인덱스
+-- =====================================================
+ALTER TABLE tenders ADD COLUMN IF NOT EXISTS search_vector tsvector;
+ALTER TABLE tender_attachments ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+UPDATE tenders SET search_vector =
+    setweight(search_document(bid_ntce_nm), 'A') ||
+    setweight(search_document(dminstt_nm), 'B') ||
+    setweight(search_document(ai_summary), 'C');
+
+UPDATE tender_attachments SET search_vector =
+    setweight(search_document(file_name), 'B') ||
+    setweight(search_document(extracted_text), 'D');
+
+CREATE INDEX IF NOT EXISTS idx_tenders_search ON tenders USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_attachments_search ON tender_attachments USING GIN (search_vector);
+
+-- 공고명 부분 일치 / 오타 허용 (ILIKE '%...%', similarity) - 영문/숫자 위주
+-- (C locale에서는 한글이 trigram에서 제외되므로 한글 검색은 search_vector 사용)
+CREATE INDEX IF NOT EXISTS idx_tenders_bid_ntce_nm_trgm ON tenders USING GIN (bid_ntce_nm gin_trgm_ops);
+
+-- =====================================================
+-- 검색 컬럼 갱신 트리거
+-- =====================================================
+CREATE OR REPLACE FUNCTION tenders_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(search_document(NEW.bid_ntce_nm), 'A') ||
+        setweight(search_document(NEW.dminstt_nm), 'B') ||
+        setweight(search_document(NEW.ai_summary), 'C');
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER tenders_search_vector
+    BEFORE INSERT OR UPDATE OF bid_ntce_nm, dminstt_nm, ai_summary ON tenders
+    FOR EACH ROW EXECUTE FUNCTION tenders_search_vector_update();
+
+CREATE OR REPLACE FUNCTION attachments_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(search_document(NEW.file_name), 'B') ||
+        setweight(search_document(NEW.extracted_text), 'D');
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER attachments_search_vector
+    BEFORE INSERT OR UPDATE OF file_name, extracted_text ON tender_attachments
+    FOR EACH ROW EXECUTE FUNCTION attachments_search_vector_update();
+
+-- =====================================================
+-- 검색 RPC (PostgREST: POST /rpc/search_tenders)
+-- 공고 행 또는 첨부파일 1건에 모든 토큰이 있으면 일치, 공고별 순위 합산
+-- =====================================================
+CREATE OR REPLACE FUNCTION search_tenders(query TEXT, max_results INTEGER DEFAULT 20, source_filter TEXT DEFAULT NULL)
+RETURNS TABLE (
+    tender_id UUID,
+    bid_ntce_nm TEXT,
+    dminstt_nm VARCHAR,
+    bid_clse_dt TIMESTAMP WITH TIME ZONE,
+    source VARCHAR,
+    status VARCHAR,
+    rank REAL,
+    matched_files TEXT[]
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH q AS (
+        SELECT search_tsquery(query) AS tsq
+    ),
+    hits AS (
+        SELECT t.id AS hit_tender_id, ts_rank(t.search_vector, q.tsq) AS hit_rank, NULL::TEXT AS file_name
+        FROM tenders t, q
+        WHERE q.tsq IS NOT NULL AND t.search_vector @@ q.tsq
+        UNION ALL
+        SELECT a.tender_id, ts_rank(a.search_vector, q.tsq), a.file_name::TEXT
+        FROM tender_attachments a, q
+        WHERE q.tsq IS NOT NULL AND a.search_vector @@ q.tsq
+    )
+    SELECT t.id, t.bid_ntce_nm, t.dminstt_nm, t.bid_clse_dt, t.source, t.status,
+           SUM(h.hit_rank)::REAL,
+           COALESCE(array_agg(h.file_name ORDER BY h.file_name) FILTER (WHERE h.file_name IS NOT NULL), '{}'::TEXT[])
+    FROM hits h
+    JOIN tenders t ON t.id = h.hit_tender_id
+    WHERE source_filter IS NULL OR t.source = source_filter
+    GROUP BY t.id
+    ORDER BY 7 DESC, t.bid_clse_dt DESC NULLS LAST
+    LIMIT max_results
+$$;
+
+GRANT EXECUTE ON FUNCTION search_tenders(TEXT, INTEGER, TEXT) TO anon, authenticated;
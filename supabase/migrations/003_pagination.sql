@@ -0,0 +1,9 @@
+-- CarbonFlow Intelligence System - 목록 조회 (keyset pagination)
+-- 대시보드 / crawler API 의 tenders 목록: ORDER BY bid_clse_dt DESC, id DESC (NULL 마감일 먼저)
+-- 커서 조건 (bid_clse_dt, id) < (:dt, :id) 를 인덱스 범위 스캔으로 처리
+
+CREATE INDEX IF NOT EXISTS idx_tenders_clse_dt_id ON tenders (bid_clse_dt DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tenders_source_clse_dt_id ON tenders (source, bid_clse_dt DESC, id DESC);
+
+-- 첨부파일 목록: WHERE tender_id = :id AND id > :cursor ORDER BY id
+CREATE INDEX IF NOT EXISTS idx_attachments_tender_id_id ON tender_attachments (tender_id, id);
@@ -0,0 +1,131 @@
+-- CarbonFlow Intelligence System - 대시보드 집계 (materialized view)
+-- 상태/출처/수요기관/마감일별 건수를 tenders 전체 스캔 대신 집계 행으로 조회
+--
+-- tender_summary: (source, status, dminstt_nm, close_date) → 건수 / 배정예산 합계
+--   close_date = 마감일 (Asia/Seoul 기준 날짜), 마감 임박 구간(오늘/7일/30일)은 조회 시 close_date로 계산
+--   → now() 기준 구간을 뷰에 고정하지 않으므로 날짜가 바뀌어도 재계산 불필요
+--
+-- 갱신: tenders 변경 시 트리거가 dirty 표시, 크롤링 배치 후 refresh_tender_summary() 호출
+--   dirty가 아니면 아무 것도 하지 않음 (변경 없는 재수집은 집계 컬럼이 같으므로 dirty 표시 안 함)
+
+-- =====================================================
+-- 집계 뷰
+-- =====================================================
+CREATE MATERIALIZED VIEW IF NOT EXISTS tender_summary AS
+SELECT
+    source,
+    status,
+    dminstt_nm,
+    (bid_clse_dt AT TIME ZONE 'Asia/Seoul')::DATE AS close_date,
+    COUNT(*)::INTEGER AS tender_count,
+    SUM(asign_bdgt_amt) AS budget_sum
+FROM tenders
+GROUP BY 1, 2, 3, 4;
+
+-- REFRESH ... CONCURRENTLY 에 필요한 unique index (NULL 상태/기관/마감일도 한 그룹)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tender_summary_key
+    ON tender_summary (source, status, dminstt_nm, close_date) NULLS NOT DISTINCT;
+
+-- 로컬 docker-compose postgres에는 Supabase 기본 role이 없음 (001의 anon / authenticated와 같은 방식으로 생성)
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT FROM pg_roles WHERE rolname = 'service_role') THEN
+        CREATE ROLE service_role NOLOGIN BYPASSRLS;
+    END IF;
+END $$;
+
+-- service_role: 001 이후 생성된 role → 기존 테이블 권한 부여 (001의 authenticated와 동일)
+GRANT USAGE ON SCHEMA public TO service_role;
+GRANT ALL ON ALL TABLES IN SCHEMA public TO service_role;
+GRANT USAGE ON ALL SEQUENCES IN SCHEMA public TO service_role;
+
+-- 이후 마이그레이션에서 생성되는 테이블도 001과 같은 권한 (anon 읽기, authenticated / service_role 쓰기)
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT SELECT ON TABLES TO anon;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON TABLES TO authenticated, service_role;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT USAGE ON SEQUENCES TO authenticated, service_role;
+
+GRANT SELECT ON tender_summary TO anon, authenticated, service_role;
+
+-- 마감 임박 목록: WHERE status = 'OPEN' AND bid_clse_dt >= now() ORDER BY bid_clse_dt LIMIT n
+CREATE INDEX IF NOT EXISTS idx_tenders_open_clse_dt ON tenders (bid_clse_dt) WHERE status = 'OPEN';
+
+-- =====================================================
+-- 갱신 상태 (dirty flag)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS summary_refresh_state (
+    view_name TEXT PRIMARY KEY,
+    dirty BOOLEAN NOT NULL DEFAULT FALSE,
+    changed_at TIMESTAMP WITH TIME ZONE,       -- 마지막 dirty 표시 시각
+    refreshed_at TIMESTAMP WITH TIME ZONE      -- 마지막 갱신 시각
+);
+
+INSERT INTO summary_refresh_state (view_name, dirty, refreshed_at)
+VALUES ('tender_summary', FALSE, NOW())
+ON CONFLICT (view_name) DO NOTHING;
+
+GRANT SELECT, INSERT, UPDATE ON summary_refresh_state TO authenticated, service_role;
+
+-- ON CONFLICT DO UPDATE는 진행 중인 refresh의 행 잠금을 기다린 뒤 최신 값으로 WHERE를 평가
+-- (refresh 도중 들어온 변경이 dirty = FALSE 로 덮이지 않음)
+-- SECURITY DEFINER: tenders를 쓰는 호출 role에 summary_refresh_state 권한이 없어도 동작
+CREATE OR REPLACE FUNCTION mark_tender_summary_dirty()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO summary_refresh_state (view_name, dirty, changed_at)
+    VALUES ('tender_summary', TRUE, NOW())
+    ON CONFLICT (view_name) DO UPDATE
+        SET dirty = TRUE, changed_at = EXCLUDED.changed_at
+        WHERE NOT summary_refresh_state.dirty;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER tender_summary_dirty_insert_delete
+    AFTER INSERT OR DELETE ON tenders
+    FOR EACH ROW EXECUTE FUNCTION mark_tender_summary_dirty();
+
+-- upsert 재수집은 UPDATE로 처리됨 → 집계 컬럼이 바뀐 경우에만 dirty
+CREATE TRIGGER tender_summary_dirty_update
+    AFTER UPDATE OF source, status, dminstt_nm, bid_clse_dt, asign_bdgt_amt ON tenders
+    FOR EACH ROW
+    WHEN (
+        OLD.source IS DISTINCT FROM NEW.source
+        OR OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.dminstt_nm IS DISTINCT FROM NEW.dminstt_nm
+        OR OLD.bid_clse_dt IS DISTINCT FROM NEW.bid_clse_dt
+        OR OLD.asign_bdgt_amt IS DISTINCT FROM NEW.asign_bdgt_amt
+    )
+    EXECUTE FUNCTION mark_tender_summary_dirty();
+
+-- =====================================================
+-- 갱신 RPC (PostgREST: POST /rpc/refresh_tender_summary)
+-- 갱신했으면 TRUE, dirty가 아니거나 다른 세션이 갱신 중이면 FALSE
+-- =====================================================
+CREATE OR REPLACE FUNCTION refresh_tender_summary(force BOOLEAN DEFAULT FALSE)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('tender_summary')) THEN
+        RETURN FALSE;
+    END IF;
+
+    UPDATE summary_refresh_state
+    SET dirty = FALSE, refreshed_at = NOW()
+    WHERE view_name = 'tender_summary' AND (dirty OR force);
+    IF NOT FOUND THEN
+        RETURN FALSE;
+    END IF;
+
+    REFRESH MATERIALIZED VIEW CONCURRENTLY tender_summary;
+    RETURN TRUE;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION refresh_tender_summary(BOOLEAN) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION refresh_tender_summary(BOOLEAN) TO authenticated, service_role;
@@ -0,0 +1,54 @@
+-- CarbonFlow Intelligence System - 크롤링 작업 대기열 (crawl_jobs)
+-- 여러 crawler-worker 컨테이너가 같은 대기열에서 작업을 나눠 가져감 (crawlers/jobqueue.py)
+--
+-- 작업 단위: source × keyword × 날짜 구간 (window_start ~ window_end)
+-- 가져가기: SELECT ... FOR UPDATE SKIP LOCKED → 다른 worker가 잡은 행은 대기 없이 건너뜀
+-- lease: 가져간 worker가 lease_expires_at 전까지 heartbeat로 연장, 만료 시 다른 worker가 회수
+-- 재시도: 실패 시 available_at = NOW() + backoff 로 다시 대기, attempts >= max_attempts 이면 failed
+
+CREATE TABLE IF NOT EXISTS crawl_jobs (
+    id BIGSERIAL PRIMARY KEY,
+
+    source VARCHAR(20) NOT NULL,
+    keyword TEXT NOT NULL,
+    window_start DATE NOT NULL,
+    window_end DATE NOT NULL,
+    batch_id TEXT,                                  -- 같은 요청으로 등록된 작업 묶음 (예: backfill 실행 id)
+
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',   -- queued, running, succeeded, failed
+    priority INTEGER NOT NULL DEFAULT 0,            -- 클수록 먼저
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    lease_owner TEXT,                               -- worker id
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+
+    result JSONB,
+    last_error TEXT,
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+
+    CHECK (window_start <= window_end),
+    CHECK (status IN ('queued', 'running', 'succeeded', 'failed'))
+);
+
+-- 같은 작업 단위는 대기/실행 중 1건만 (중복 등록 시 ON CONFLICT DO NOTHING)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_crawl_jobs_active_unit
+    ON crawl_jobs (source, keyword, window_start, window_end)
+    WHERE status IN ('queued', 'running');
+
+-- 가져가기: WHERE status = 'queued' AND available_at <= NOW() ORDER BY priority DESC, available_at, id
+CREATE INDEX IF NOT EXISTS idx_crawl_jobs_claim
+    ON crawl_jobs (priority DESC, available_at, id)
+    WHERE status = 'queued';
+
+-- lease 만료 회수
+CREATE INDEX IF NOT EXISTS idx_crawl_jobs_lease
+    ON crawl_jobs (lease_expires_at)
+    WHERE status = 'running';
+
+CREATE INDEX IF NOT EXISTS idx_crawl_jobs_batch ON crawl_jobs (batch_id);
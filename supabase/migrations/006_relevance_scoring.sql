@@ -0,0 +1,12 @@
+-- CarbonFlow Intelligence System - 관련도 점수 단계 (crawlers/scoring.py)
+-- 크롤링 후 relevance_score가 없는 공고만 조회하여 점수 / 요약 기록
+
+-- list_unscored_tenders: WHERE relevance_score IS NULL ORDER BY id LIMIT n
+CREATE INDEX IF NOT EXISTS idx_tenders_unscored
+    ON tenders (id)
+    WHERE relevance_score IS NULL;
+
+-- 대시보드 관련도 순 정렬
+CREATE INDEX IF NOT EXISTS idx_tenders_relevance
+    ON tenders (relevance_score DESC)
+    WHERE relevance_score IS NOT NULL;
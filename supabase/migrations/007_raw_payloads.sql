@@ -0,0 +1,71 @@
+-- CarbonFlow Intelligence System - 원본 응답 분리 저장 (raw_payloads)
+-- tenders.raw_api_response(JSONB 전체)를 매 upsert마다 쓰지 않고 내용 해시로 1회만 저장 (crawlers/payloads.py)
+--
+-- content_hash = sha256(canonical JSON: 키 정렬, 공백 제거, crawled_at 등 수집 시각 제외)
+-- body = 애플리케이션에서 압축한 bytes (codec: zstd / zlib / identity)
+-- 같은 내용 재수집 시: raw_payloads 쓰기 생략, tenders 행에는 64자 해시만 전송
+
+CREATE TABLE IF NOT EXISTS raw_payloads (
+    content_hash CHAR(64) PRIMARY KEY,
+    codec VARCHAR(10) NOT NULL,
+    body BYTEA NOT NULL,
+    raw_size INTEGER NOT NULL,                      -- 압축 전 bytes
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    CHECK (codec IN ('zstd', 'zlib', 'identity'))
+);
+
+-- 이미 압축된 본문 → TOAST 재압축 생략
+ALTER TABLE raw_payloads ALTER COLUMN body SET STORAGE EXTERNAL;
+
+-- upsert_tender마다 본문 insert (authenticated / service_role), /tenders/{id}/raw 조회 (anon 포함)
+GRANT SELECT, INSERT ON raw_payloads TO authenticated, service_role;
+GRANT SELECT ON raw_payloads TO anon;
+
+ALTER TABLE tenders
+    ADD COLUMN IF NOT EXISTS raw_payload_hash CHAR(64) REFERENCES raw_payloads(content_hash);
+
+CREATE INDEX IF NOT EXISTS idx_tenders_raw_payload_hash ON tenders (raw_payload_hash);
+
+-- =====================================================
+-- 기존 raw_api_response 이관 (identity, 다음 수집 시 압축본으로 교체됨)
+-- =====================================================
+
+INSERT INTO raw_payloads (content_hash, codec, body, raw_size)
+SELECT DISTINCT ON (content_hash) content_hash, 'identity', body, length(body)
+FROM (
+    SELECT encode(sha256(convert_to(raw_api_response::text, 'UTF8')), 'hex') AS content_hash,
+           convert_to(raw_api_response::text, 'UTF8') AS body
+    FROM tenders
+    WHERE raw_api_response IS NOT NULL AND raw_api_response <> '{}'::jsonb AND raw_payload_hash IS NULL
+) legacy
+ON CONFLICT (content_hash) DO NOTHING;
+
+UPDATE tenders
+SET raw_payload_hash = encode(sha256(convert_to(raw_api_response::text, 'UTF8')), 'hex'),
+    raw_api_response = NULL
+WHERE raw_api_response IS NOT NULL AND raw_api_response <> '{}'::jsonb AND raw_payload_hash IS NULL;
+
+-- =====================================================
+-- 참조되지 않는 본문 정리 (교체된 이관본 등)
+-- tender upsert 직전에 저장된 본문을 지우지 않도록 grace 기간 이후만
+-- 실행 중인 크롤러 해시 캐시에 남은 본문이 삭제된 경우: upsert FK 위반 시 본문 재저장 후 재시도 (repository._write_tender)
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION prune_raw_payloads(grace INTERVAL DEFAULT INTERVAL '1 day')
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH deleted AS (
+        DELETE FROM raw_payloads p
+        WHERE p.created_at < NOW() - grace
+          AND NOT EXISTS (SELECT 1 FROM tenders t WHERE t.raw_payload_hash = p.content_hash)
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM deleted;
+$$;
+
+-- 정리 작업은 service_role 전용 (호출자 권한으로 실행 → DELETE 권한 필요)
+REVOKE EXECUTE ON FUNCTION prune_raw_payloads(INTERVAL) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION prune_raw_payloads(INTERVAL) TO service_role;
+GRANT DELETE ON raw_payloads TO service_role;
@@ -0,0 +1,6 @@
+-- CarbonFlow Intelligence System - 스펙 추출 신뢰도 (crawlers/parsers/specs.py)
+-- 필드별 0~1 신뢰도: {"calorific_value_min": 0.9, "sulfur_max": 0.35, ...}
+-- (표 > "항목 : 값" 줄 > 본문 정규식, 단위 / 상하한 / 헤더 열 인식 시 가산)
+
+ALTER TABLE tender_specs
+    ADD COLUMN IF NOT EXISTS extraction_confidence JSONB;
@@ -0,0 +1,16 @@
+-- CarbonFlow Intelligence System - 스펙 갱신 시각 (crawlers/columnar.py export_repository)
+-- 재파싱으로 갱신된 스펙도 watermark 이후 분으로 다시 내보내도록 updated_at 추가
+
+ALTER TABLE tender_specs
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+
+-- 기존 행: 생성 시각을 갱신 시각으로
+UPDATE tender_specs SET updated_at = created_at WHERE created_at IS NOT NULL;
+
+DROP TRIGGER IF EXISTS update_tender_specs_updated_at ON tender_specs;
+CREATE TRIGGER update_tender_specs_updated_at
+    BEFORE UPDATE ON tender_specs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- list_tender_specs(updated_since): WHERE updated_at >= ? ORDER BY id
+CREATE INDEX IF NOT EXISTS idx_tender_specs_updated_at ON tender_specs (updated_at);